@@ -1,9 +1,14 @@
 """
 API dependencies.
 """
+import hmac
+from typing import Optional
+from fastapi import Header
 from sqlalchemy.orm import Session
+from app.config import get_settings
 from app.database import get_db
 from app.services.learning_item_service import LearningItemService
+from app.core.exceptions import PermissionDeniedException
 
 
 def get_learning_item_service(db: Session = None) -> LearningItemService:
@@ -19,5 +24,19 @@ def get_learning_item_service(db: Session = None) -> LearningItemService:
     return LearningItemService(db)
 
 
+def require_admin(x_admin_token: Optional[str] = Header(None)) -> None:
+    """
+    Guard for admin endpoints.
+
+    Raises:
+        PermissionDeniedException: If admin endpoints are disabled or the token doesn't match
+    """
+    expected = get_settings().ADMIN_TOKEN
+    if not expected:
+        raise PermissionDeniedException("Admin endpoints are disabled")
+    if not x_admin_token or not hmac.compare_digest(x_admin_token, expected):
+        raise PermissionDeniedException("Invalid admin token")
+
+
 # Export get_db for convenience
-__all__ = ["get_db", "get_learning_item_service"]
+__all__ = ["get_db", "get_learning_item_service", "require_admin"]
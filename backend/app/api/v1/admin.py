@@ -0,0 +1,145 @@
+"""
+Admin API endpoints (require X-Admin-Token).
+"""
+import time
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import PlainTextResponse
+from sqlalchemy.orm import Session
+
+from app.api.deps import get_db, require_admin
+from app.config import get_settings
+from app.core.profiling import profile_store, sign_profile_token
+from app.core.single_flight import single_flight_group
+from app.database import engine, init_db, tenant_pool
+from app.migrations import get_status
+from app.services.idempotency_store import get_idempotency_store
+from app.services.item_purge_service import ItemPurgeService
+
+router = APIRouter(prefix="/admin", tags=["admin"], dependencies=[Depends(require_admin)])
+
+
+@router.get("/metrics")
+def get_metrics():
+    """
+    Get runtime metrics.
+
+    - **single_flight**: per service method, how many calls ran a query
+      (`executed`) and how many shared an identical in-flight call (`coalesced`)
+    - **tenants**: tenant engine pool counters (only with TENANCY_ENABLED)
+    - **idempotency**: stored responses replayed from memory (`cache_hits`) or the
+      database (`stored_hits`, incl. keys still in progress) and keys reserved
+    """
+    metrics = {
+        "single_flight": single_flight_group.stats()
+    }
+    if tenant_pool is not None:
+        metrics["tenants"] = tenant_pool.stats()
+    if get_settings().IDEMPOTENCY_ENABLED:
+        metrics["idempotency"] = get_idempotency_store().stats()
+    return metrics
+
+
+@router.get("/migrations")
+def get_migrations():
+    """
+    Get schema migration status: applied migrations, pending ones and the
+    progress of their backfills.
+    """
+    return get_status(engine)
+
+
+@router.post("/migrations/run")
+def run_migrations(
+    budget_seconds: float = Query(20, gt=0, le=600, description="Stop after this many seconds")
+):
+    """
+    Apply pending migrations within a time budget.
+
+    Meant for serverless deployments where a CLI can't be run: call it again
+    while `complete` is false, each call resumes the running backfill.
+    """
+    messages = []
+    result = init_db(time_budget=budget_seconds, echo=messages.append)
+    return {**result, "log": messages}
+
+
+@router.post("/purge")
+def purge_deleted_items(
+    retention_days: Optional[int] = Query(None, ge=0, description="Default: PURGE_RETENTION_DAYS"),
+    budget_seconds: float = Query(20, gt=0, le=600, description="Stop after this many seconds"),
+    analyze: bool = Query(False, description="Run ANALYZE afterwards"),
+    vacuum: bool = Query(False, description="Run VACUUM afterwards (locks a SQLite database while it runs)"),
+    db: Session = Depends(get_db)
+):
+    """
+    Hard-delete items soft-deleted more than `retention_days` ago, with their
+    review history and derived rows, in batches within a time budget.
+
+    Call it again while `complete` is false. ANALYZE/VACUUM run only once the
+    purge is complete.
+    """
+    settings = get_settings()
+    messages = []
+    service = ItemPurgeService(db)
+    result = service.purge_deleted(
+        retention_days=retention_days if retention_days is not None else settings.PURGE_RETENTION_DAYS,
+        batch_size=settings.PURGE_BATCH_SIZE,
+        pause_ms=settings.PURGE_BATCH_PAUSE_MS,
+        time_budget=budget_seconds,
+        echo=messages.append
+    )
+    if result["complete"]:
+        service.optimize(vacuum=vacuum, analyze=analyze, echo=messages.append)
+    return {**result, "log": messages}
+
+
+@router.get("/profiles")
+def list_profiles():
+    """Get summaries of the stored request profiles, newest first."""
+    return [profile.summary() for profile in profile_store.list()]
+
+
+@router.get("/profiles/{profile_id}")
+def get_profile(profile_id: str):
+    """
+    Get one request profile: summary, SQL statements in execution order and
+    sampled stacks (collapsed "frame;frame" -> sample count).
+    """
+    profile = profile_store.get(profile_id)
+    if not profile:
+        raise HTTPException(status_code=404, detail=f"Profile {profile_id} not found")
+    return {
+        **profile.summary(),
+        "sql": profile.statements,
+        "stacks": profile.stacks
+    }
+
+
+@router.get("/profiles/{profile_id}/collapsed", response_class=PlainTextResponse)
+def get_profile_collapsed(profile_id: str):
+    """Get a profile's stacks in collapsed format for flamegraph.pl or speedscope."""
+    profile = profile_store.get(profile_id)
+    if not profile:
+        raise HTTPException(status_code=404, detail=f"Profile {profile_id} not found")
+    return profile.collapsed()
+
+
+@router.post("/profiles/token")
+def create_profile_token(
+    ttl_seconds: int = Query(600, gt=0, le=86400, description="How long the token is valid")
+):
+    """
+    Mint a signed X-Profile-Token header value. Requests sending it are
+    profiled until it expires (needs PROFILING_ENABLED).
+    """
+    settings = get_settings()
+    secret = settings.PROFILING_SECRET or settings.ADMIN_TOKEN
+    expires_at = int(time.time()) + ttl_seconds
+    return {
+        "header": "X-Profile-Token",
+        "value": sign_profile_token(secret, expires_at),
+        "expires_at": expires_at,
+        "profiling_enabled": settings.PROFILING_ENABLED
+    }
@@ -11,14 +11,21 @@ from app.schemas.learning_item import (
     LearningItemCreate,
     LearningItemUpdate,
     LearningItemResponse,
-    LearningItemListResponse
+    LearningItemCreateResponse,
+    SimilarItemsResponse,
+    LearningItemListResponse,
+    LearningItemBatchGetRequest,
+    LearningItemBatchGetResponse,
+    LearningItemBulkUpdate,
+    LearningItemBulkUpdateResponse
 )
+from app.schemas.subject import SubjectPriorityUpdate, SubjectRename, SubjectResponse
 from app.core.exceptions import ItemNotFoundException
 
 router = APIRouter(prefix="/learning-items", tags=["learning-items"])
 
 
-@router.post("/", response_model=LearningItemResponse, status_code=201)
+@router.post("/", response_model=LearningItemCreateResponse, status_code=201)
 def create_learning_item(
     item_data: LearningItemCreate,
     db: Session = Depends(get_db)
@@ -27,7 +34,8 @@ def create_learning_item(
     Create a new learning item.
 
     The item will be automatically set for review today (Day 0).
-    Timestamp is automatically added.
+    Timestamp is automatically added. Existing items with nearly the same
+    title and content are listed in `duplicates` (the item is created anyway).
     """
     service = LearningItemService(db)
     item = service.create_item(
@@ -35,7 +43,10 @@ def create_learning_item(
         title=item_data.title,
         content=item_data.content
     )
-    return item
+    return LearningItemCreateResponse(
+        **LearningItemResponse.model_validate(item).model_dump(),
+        duplicates=service.find_duplicates(item)
+    )
 
 
 @router.get("/", response_model=LearningItemListResponse)
@@ -54,7 +65,7 @@ def get_learning_items(
     """
     service = LearningItemService(db)
     items = service.get_all_items(subject=subject, skip=skip, limit=limit)
-    total = service.item_repo.count_all(subject=subject)
+    total = service.count_items(subject=subject)
 
     return LearningItemListResponse(items=items, total=total)
 
@@ -70,6 +81,90 @@ def get_subjects(db: Session = Depends(get_db)):
     return service.get_all_subjects()
 
 
+@router.put("/subjects/{subject:path}", response_model=SubjectResponse)
+def rename_subject(
+    subject: str,
+    subject_data: SubjectRename,
+    db: Session = Depends(get_db)
+):
+    """
+    Rename a subject.
+
+    All items of the subject are renamed at once (a single-row update).
+    Fails with 400 if another subject already has the new name.
+    """
+    service = LearningItemService(db)
+    try:
+        return service.rename_subject(subject, subject_data.name)
+    except ItemNotFoundException as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+
+@router.patch("/subjects/{subject:path}", response_model=SubjectResponse)
+def set_subject_priority(
+    subject: str,
+    subject_data: SubjectPriorityUpdate,
+    db: Session = Depends(get_db)
+):
+    """
+    Set a subject's weight in the priority due order (`/reviews/due?order=priority`).
+
+    The subject's queued items are re-ranked at once (one UPDATE).
+    """
+    service = LearningItemService(db)
+    try:
+        return service.set_subject_priority(subject, subject_data.priority_weight)
+    except ItemNotFoundException as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+
+@router.post("/batch-get", response_model=LearningItemBatchGetResponse)
+def batch_get_learning_items(
+    request: LearningItemBatchGetRequest,
+    db: Session = Depends(get_db)
+):
+    """
+    Get up to 500 learning items by ID in one call.
+
+    IDs that don't exist (or are deleted) are listed in `missing`.
+    """
+    service = LearningItemService(db)
+    items, missing = service.get_items_by_ids(request.ids)
+
+    return LearningItemBatchGetResponse(
+        items=[LearningItemResponse.model_validate(item) for item in items],
+        missing=missing
+    )
+
+
+@router.patch("/bulk", response_model=LearningItemBulkUpdateResponse)
+def bulk_update_learning_items(
+    request: LearningItemBulkUpdate,
+    db: Session = Depends(get_db)
+):
+    """
+    Change many learning items at once.
+
+    The filter selects live items by `subject`, `ids` (up to 500) and/or due
+    range (`due_from`, `due_to`, inclusive); all given fields must match.
+    The change moves them to `set_subject`, shifts their next review by
+    `shift_days`, and/or resets their progress (`reset_progress`: day-0
+    review today, shifted by `shift_days` if given). Items are changed with
+    one UPDATE; `updated` is the number of items changed.
+    """
+    service = LearningItemService(db)
+    updated = service.bulk_update(
+        subject=request.filter.subject,
+        item_ids=request.filter.ids,
+        due_from=request.filter.due_from,
+        due_to=request.filter.due_to,
+        set_subject=request.set_subject,
+        shift_days=request.shift_days,
+        reset_progress=request.reset_progress
+    )
+    return LearningItemBulkUpdateResponse(updated=updated)
+
+
 @router.get("/{item_id}", response_model=LearningItemResponse)
 def get_learning_item(
     item_id: str,
@@ -86,6 +181,29 @@ def get_learning_item(
         raise HTTPException(status_code=404, detail=str(e))
 
 
+@router.get("/{item_id}/similar", response_model=SimilarItemsResponse)
+def get_similar_learning_items(
+    item_id: str,
+    limit: int = Query(10, ge=1, le=100, description="Maximum number of items to return"),
+    min_similarity: Optional[float] = Query(
+        None, ge=0, le=1, description="Minimum similarity (default: DUPLICATE_SIMILARITY_THRESHOLD)"
+    ),
+    db: Session = Depends(get_db)
+):
+    """
+    Get live items with nearly the same title and content (near-duplicates).
+
+    Similarity is the estimated Jaccard similarity of character shingles,
+    answered from the MinHash/LSH index; most similar first.
+    """
+    service = LearningItemService(db)
+    try:
+        similar = service.get_similar_items(item_id, limit=limit, min_similarity=min_similarity)
+    except ItemNotFoundException as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    return SimilarItemsResponse(id=item_id, similar=similar)
+
+
 @router.put("/{item_id}", response_model=LearningItemResponse)
 def update_learning_item(
     item_id: str,
@@ -2,27 +2,54 @@
 Reviews API endpoints.
 """
 from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
 from typing import List, Optional
-from datetime import date
+from datetime import date, datetime, timedelta, timezone
 
 from app.api.deps import get_db
+from app.database import mark_written
+from app.config import get_settings
 from app.services.learning_item_service import LearningItemService
+from app.services.review_write_behind import get_review_writer
+from app.services.schedule_simulation_service import ScheduleSimulationService
+from app.services.review_analytics_service import ReviewAnalyticsService
 from app.schemas.review import (
     ReviewResponse,
+    ReviewHistoryBatchRequest,
+    ReviewHistoryBatchResponse,
     DueItemsResponse,
-    ReviewStatsResponse
+    ReviewSessionResponse,
+    ReviewActivityResponse,
+    ReviewStatsResponse,
+    SubjectStatsResponse,
+    AdherenceResponse
 )
+from app.schemas.simulation import SimulationRequest, SimulationResponse
 from app.schemas.learning_item import LearningItemResponse
-from app.core.exceptions import ItemNotFoundException
+from app.core.exceptions import ItemNotFoundException, ValidationException
 
 router = APIRouter(prefix="/reviews", tags=["reviews"])
+settings = get_settings()
+
+# Longest range the activity endpoint serves in one call (about three years)
+MAX_ACTIVITY_DAYS = 1100
+
+
+def _review_accepted() -> JSONResponse:
+    """Answer a write-behind review still being committed when the wait timed out."""
+    return JSONResponse(
+        status_code=202,
+        content={"message": "Review accepted and being committed; do not submit it again"}
+    )
 
 
 @router.get("/due", response_model=DueItemsResponse)
 def get_due_items(
     subject: Optional[str] = Query(None, description="Filter by subject"),
     target_date: Optional[date] = Query(None, description="Target date (default: today)"),
+    limit: Optional[int] = Query(None, ge=1, le=500, description="Return only the next N due items"),
+    order: str = Query("due", description="due (scheduler order) or priority (most overdue for its interval first)"),
     db: Session = Depends(get_db)
 ):
     """
@@ -33,20 +60,97 @@ def get_due_items(
 
     - **subject**: Optional filter by subject
     - **target_date**: Optional target date (defaults to today)
+    - **limit**: Optional maximum number of items (total_due still counts all)
+    - **order**: `due` (by due date) or `priority` (subject weight * days
+      overdue / interval, as of today, most urgent first)
     """
     service = LearningItemService(db)
 
     # Get due items
-    due_items = service.get_due_items(subject=subject, target_date=target_date)
+    due_items = service.get_due_items(subject=subject, target_date=target_date, limit=limit, order=order)
     by_subject = service.get_due_items_by_subject(target_date=target_date)
+    total_due = by_subject.get(subject, 0) if subject else sum(by_subject.values())
 
     return DueItemsResponse(
         items=[LearningItemResponse.model_validate(item) for item in due_items],
-        total_due=len(due_items),
+        total_due=total_due,
         by_subject=by_subject
     )
 
 
+@router.get("/session/next", response_model=ReviewSessionResponse)
+def get_review_session_next(
+    n: int = Query(20, ge=1, le=100, description="Number of cards to serve"),
+    subject: Optional[str] = Query(None, description="Filter by subject"),
+    lease: Optional[str] = Query(None, max_length=36, description="Lease token from a previous call"),
+    order: str = Query("due", description="due (scheduler order) or priority (most overdue for its interval first)"),
+    db: Session = Depends(get_db)
+):
+    """
+    Get the next N due cards for a review session, with full content.
+
+    Cards are returned in scheduler order (or `order=priority`) and leased to the returned
+    `lease_token`, so another device won't be served the same cards.
+    Pass the token back on the next call to keep the session's unanswered
+    cards and top up to N; clients can prefetch while the user answers.
+
+    - **n**: Number of cards to serve
+    - **subject**: Optional filter by subject
+    - **lease**: Lease token from a previous call
+    - **order**: `due` or `priority` (see /reviews/due)
+    """
+    service = LearningItemService(db)
+    items, lease_token, lease_expires_at = service.get_review_session(
+        n=n,
+        subject=subject,
+        lease_token=lease,
+        order=order
+    )
+
+    return ReviewSessionResponse(
+        items=[LearningItemResponse.model_validate(item) for item in items],
+        lease_token=lease_token,
+        lease_expires_at=lease_expires_at
+    )
+
+
+@router.delete("/session/{lease_token}", status_code=204)
+def release_review_session(
+    lease_token: str,
+    db: Session = Depends(get_db)
+):
+    """
+    End a review session and release its unanswered cards.
+    """
+    service = LearningItemService(db)
+    service.release_review_session(lease_token)
+    return None
+
+
+@router.post("/simulate", response_model=SimulationResponse)
+def simulate_review_load(
+    request: SimulationRequest,
+    db: Session = Depends(get_db)
+):
+    """
+    Project the daily review load under candidate interval ladders.
+
+    Starts from the current items' review counts and due dates and assumes
+    every item is reviewed on its due day. The current ladder
+    (REVIEW_INTERVALS / CYCLE_BACK_TO_LEVEL) is always the first scenario.
+
+    - **ladders**: Candidate interval ladders to compare
+    - **days**: Days to project (default 365)
+    - **new_items_per_day**: Items assumed to be added each day
+    """
+    service = ScheduleSimulationService(db)
+    return service.simulate(
+        ladders=[ladder.model_dump() for ladder in request.ladders],
+        days=request.days,
+        new_items_per_day=request.new_items_per_day
+    )
+
+
 @router.post("/{item_id}", response_model=ReviewResponse, status_code=201)
 def mark_item_reviewed(
     item_id: str,
@@ -65,6 +169,13 @@ def mark_item_reviewed(
     """
     service = LearningItemService(db)
     try:
+        if settings.REVIEW_WRITE_BEHIND and not settings.TENANCY_ENABLED:
+            # Validate now, then wait for the background group commit
+            # (the writer commits to the default database, so not with tenancy)
+            service.get_item_by_id(item_id)
+            review = get_review_writer().submit(item_id)
+            mark_written(db)
+            return review if review is not None else _review_accepted()
         updated_item, review = service.mark_as_reviewed(item_id)
         return review
     except ItemNotFoundException as e:
@@ -89,6 +200,11 @@ def manual_review_item(
     """
     service = LearningItemService(db)
     try:
+        if settings.REVIEW_WRITE_BEHIND and not settings.TENANCY_ENABLED:
+            service.get_item_by_id(item_id)
+            review = get_review_writer().submit(item_id, is_manual=True)
+            mark_written(db)
+            return review if review is not None else _review_accepted()
         updated_item, review = service.manual_review(item_id)
         return review
     except ItemNotFoundException as e:
@@ -114,6 +230,86 @@ def get_review_history(
         raise HTTPException(status_code=404, detail=str(e))
 
 
+@router.post("/history/batch", response_model=ReviewHistoryBatchResponse)
+def get_review_history_batch(
+    request: ReviewHistoryBatchRequest,
+    db: Session = Depends(get_db)
+):
+    """
+    Get review history for up to 500 learning items in one call.
+
+    Returns up to `limit` most recent reviews per item in descending order.
+    IDs that don't exist (or are deleted) are listed in `missing`.
+    """
+    service = LearningItemService(db)
+    history, missing = service.get_review_histories(request.item_ids, limit=request.limit)
+
+    return ReviewHistoryBatchResponse(
+        histories={
+            item_id: [ReviewResponse.model_validate(review) for review in reviews]
+            for item_id, reviews in history.items()
+        },
+        missing=missing
+    )
+
+
+@router.get("/activity", response_model=ReviewActivityResponse)
+def get_review_activity(
+    from_date: Optional[date] = Query(None, alias="from", description="First day (default: a year before `to`)"),
+    to_date: Optional[date] = Query(None, alias="to", description="Last day (default: today, UTC)"),
+    db: Session = Depends(get_db)
+):
+    """
+    Get review counts per day for a calendar heatmap.
+
+    Each day is split into scheduled and manual reviews (UTC days).
+    Past days are cached (until a purge changes them); only today is recomputed.
+
+    - **from**: First day (inclusive)
+    - **to**: Last day (inclusive)
+    """
+    to_date = to_date or datetime.now(timezone.utc).date()
+    from_date = from_date or to_date - timedelta(days=364)
+    if from_date > to_date:
+        raise ValidationException("`from` must not be after `to`")
+    if (to_date - from_date).days >= MAX_ACTIVITY_DAYS:
+        raise ValidationException(f"Date range must not exceed {MAX_ACTIVITY_DAYS} days")
+
+    service = LearningItemService(db)
+    days = service.get_review_activity(from_date, to_date)
+
+    return ReviewActivityResponse(from_date=from_date, to_date=to_date, days=days)
+
+
+@router.get("/analytics/adherence", response_model=AdherenceResponse)
+def get_review_adherence(
+    from_date: Optional[date] = Query(None, alias="from", description="First day (default: 90 days before `to`)"),
+    to_date: Optional[date] = Query(None, alias="to", description="Last day (default: today, UTC)"),
+    db: Session = Depends(get_db)
+):
+    """
+    Get how closely scheduled reviews followed the schedule.
+
+    Lateness is the review day minus the day the review was due (UTC days;
+    manual reviews are not counted). Overall and per subject:
+    - On-time rate (reviewed on or before the due day)
+    - Mean and p50/p90/p99/max lateness, and a lateness histogram
+    - Current and longest streak of days with reviews and none late
+
+    Past days are cached (until a purge or subject move changes them); only
+    today is recomputed.
+    """
+    to_date = to_date or datetime.now(timezone.utc).date()
+    from_date = from_date or to_date - timedelta(days=89)
+    if from_date > to_date:
+        raise ValidationException("`from` must not be after `to`")
+    if (to_date - from_date).days >= MAX_ACTIVITY_DAYS:
+        raise ValidationException(f"Date range must not exceed {MAX_ACTIVITY_DAYS} days")
+
+    service = ReviewAnalyticsService(db)
+    return service.get_adherence(from_date, to_date)
+
+
 @router.get("/stats", response_model=ReviewStatsResponse)
 def get_review_stats(db: Session = Depends(get_db)):
     """
@@ -128,3 +324,17 @@ def get_review_stats(db: Session = Depends(get_db)):
     stats = service.get_review_stats()
 
     return ReviewStatsResponse(**stats)
+
+
+@router.get("/stats/by-subject", response_model=List[SubjectStatsResponse])
+def get_subject_stats(db: Session = Depends(get_db)):
+    """
+    Get review statistics for every subject in one call.
+
+    Per subject:
+    - Total items, items due today and this week
+    - Total and manual reviews
+    - Average current interval in days
+    """
+    service = LearningItemService(db)
+    return service.get_subject_stats()
@@ -0,0 +1,305 @@
+"""
+Online, incremental SQLite backups.
+
+A snapshot is taken with SQLite's online backup API a few pages at a time,
+so writers can commit between steps instead of waiting for a whole-file
+copy. The copy is split into fixed-size chunks stored by their sha256:
+chunks that didn't change since an earlier snapshot are stored once, so
+each snapshot only adds the chunks that changed. A JSON manifest per
+snapshot lists its chunks and the sha256 of the whole file.
+
+Layout of a backup directory:
+    snapshots/<snapshot id>.json
+    chunks/<first 2 hex digits>/<sha256>
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, Iterator, List, Optional
+
+
+class BackupError(Exception):
+    """Raised when a snapshot is missing or fails verification."""
+
+
+class _Restarted(Exception):
+    """The source changed between backup steps; SQLite would start the copy over."""
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def online_copy(
+    source_path: str,
+    target_path: str,
+    step_pages: int = 256,
+    pause_ms: float = 20,
+    echo: Callable[[str], None] = print
+) -> Dict:
+    """
+    Copy a live SQLite database to target_path with the online backup API.
+
+    In WAL mode the copy is a single step: it reads one snapshot, and
+    writers carry on meanwhile. Otherwise each step copies step_pages pages
+    under a shared lock, then the lock is released for pause_ms so writers
+    can commit. A commit by another connection makes SQLite restart the
+    copy; each restart doubles the step size, so under steady writes the
+    copy still finishes (in the limit as a single step, which holds writers
+    off for the whole copy).
+
+    Returns:
+        Statistics: pages, steps, restarts, duration and step durations
+        (outside WAL mode, a step is the longest a writer is held off)
+    """
+    source = sqlite3.connect(source_path, timeout=30)
+    started = time.perf_counter()
+    restarts = 0
+    try:
+        journal_mode = source.execute("PRAGMA journal_mode").fetchone()[0]
+        if journal_mode == "wal":
+            step_pages = -1
+        while True:
+            steps: List[float] = []
+            state = {"remaining": None, "step_started": time.perf_counter()}
+
+            def progress(status, remaining, total):
+                now = time.perf_counter()
+                steps.append((now - state["step_started"]) * 1000)
+                if state["remaining"] is not None and remaining > state["remaining"]:
+                    raise _Restarted()
+                state["remaining"] = remaining
+                if remaining and pause_ms:
+                    time.sleep(pause_ms / 1000)
+                state["step_started"] = time.perf_counter()
+
+            target = sqlite3.connect(target_path)
+            try:
+                source.backup(target, pages=step_pages, progress=progress, sleep=0.005)
+                page_count = target.execute("PRAGMA page_count").fetchone()[0]
+                page_size = target.execute("PRAGMA page_size").fetchone()[0]
+                break
+            except _Restarted:
+                restarts += 1
+                step_pages = step_pages * 2 if step_pages > 0 else step_pages
+                echo(f"Source changed during the copy, restarting with {step_pages} pages per step")
+            finally:
+                target.close()
+    finally:
+        source.close()
+
+    return {
+        "journal_mode": journal_mode,
+        "page_size": page_size,
+        "page_count": page_count,
+        "steps": len(steps),
+        "restarts": restarts,
+        "duration_seconds": time.perf_counter() - started,
+        "step_ms_p50": _percentile(steps, 50),
+        "step_ms_max": max(steps, default=0.0)
+    }
+
+
+class BackupStore:
+    """Snapshots and their content-addressed chunks in one directory."""
+
+    def __init__(self, directory: str, chunk_bytes: int = 64 * 1024):
+        self.directory = directory
+        self.chunk_bytes = chunk_bytes
+        self.snapshot_dir = os.path.join(directory, "snapshots")
+        self.chunk_dir = os.path.join(directory, "chunks")
+
+    def create_snapshot(
+        self,
+        source_path: str,
+        step_pages: int = 256,
+        pause_ms: float = 20,
+        echo: Callable[[str], None] = print
+    ) -> Dict:
+        """
+        Back up a live database and store it as a snapshot.
+
+        Returns:
+            The snapshot manifest (with copy statistics and the chunks it added)
+        """
+        if not os.path.exists(source_path):
+            raise BackupError(f"Database {source_path} does not exist")
+        os.makedirs(self.snapshot_dir, exist_ok=True)
+        os.makedirs(self.chunk_dir, exist_ok=True)
+
+        created_at = datetime.now(timezone.utc)
+        snapshot_id = created_at.strftime("%Y%m%dT%H%M%S%fZ")
+        fd, copy_path = tempfile.mkstemp(prefix="snapshot-", suffix=".db", dir=self.directory)
+        os.close(fd)
+        try:
+            stats = online_copy(source_path, copy_path, step_pages=step_pages, pause_ms=pause_ms, echo=echo)
+
+            chunks, new_chunks, new_bytes = [], 0, 0
+            whole = hashlib.sha256()
+            with open(copy_path, "rb") as copy:
+                for data in iter(lambda: copy.read(self.chunk_bytes), b""):
+                    whole.update(data)
+                    digest = hashlib.sha256(data).hexdigest()
+                    chunks.append(digest)
+                    if self._write_chunk(digest, data):
+                        new_chunks += 1
+                        new_bytes += len(data)
+            size = os.path.getsize(copy_path)
+        finally:
+            os.remove(copy_path)
+
+        manifest = {
+            "id": snapshot_id,
+            "created_at": created_at.isoformat(),
+            "source": os.path.abspath(source_path),
+            "size": size,
+            "sha256": whole.hexdigest(),
+            "chunk_bytes": self.chunk_bytes,
+            "chunks": chunks,
+            "new_chunks": new_chunks,
+            "new_bytes": new_bytes,
+            **stats
+        }
+        # The manifest is written last: a snapshot exists only once all its chunks
+        # are on disk (one sync for all of them rather than an fsync per chunk)
+        if new_chunks and hasattr(os, "sync"):
+            os.sync()
+        self._write_atomic(self._manifest_path(snapshot_id), json.dumps(manifest, indent=1).encode())
+        return manifest
+
+    def list_snapshots(self) -> List[Dict]:
+        """Get all manifests, oldest first."""
+        if not os.path.isdir(self.snapshot_dir):
+            return []
+        return [
+            self.get_snapshot(name[:-len(".json")])
+            for name in sorted(os.listdir(self.snapshot_dir)) if name.endswith(".json")
+        ]
+
+    def get_snapshot(self, snapshot_id: Optional[str] = None) -> Dict:
+        """Get a snapshot's manifest (the latest if no ID is given)."""
+        if snapshot_id is None:
+            snapshots = self.list_snapshots()
+            if not snapshots:
+                raise BackupError(f"No snapshots in {self.directory}")
+            return snapshots[-1]
+        path = self._manifest_path(snapshot_id)
+        if not os.path.exists(path):
+            raise BackupError(f"Snapshot {snapshot_id} not found in {self.directory}")
+        with open(path, encoding="utf-8") as manifest:
+            return json.load(manifest)
+
+    def verify(self, manifest: Dict) -> None:
+        """
+        Check every chunk of a snapshot and the whole-file checksum.
+
+        Raises:
+            BackupError: If a chunk is missing or any checksum doesn't match
+        """
+        for _ in self._read_chunks(manifest):
+            pass
+
+    def restore(self, manifest: Dict, target_path: str) -> None:
+        """
+        Write a snapshot to target_path, replacing it atomically once the
+        checksums and SQLite's quick_check have passed. The application must
+        not be using the target database.
+        """
+        directory = os.path.dirname(os.path.abspath(target_path))
+        os.makedirs(directory, exist_ok=True)
+        fd, restore_path = tempfile.mkstemp(prefix="restore-", suffix=".db", dir=directory)
+        try:
+            with os.fdopen(fd, "wb") as restored:
+                for data in self._read_chunks(manifest):
+                    restored.write(data)
+                restored.flush()
+                os.fsync(restored.fileno())
+
+            check = sqlite3.connect(restore_path)
+            try:
+                result = check.execute("PRAGMA quick_check").fetchone()[0]
+            finally:
+                check.close()
+            if result != "ok":
+                raise BackupError(f"Snapshot {manifest['id']} failed quick_check: {result}")
+
+            # A journal left next to the old file would be applied to the restored one
+            for suffix in ("-journal", "-wal", "-shm"):
+                if os.path.exists(target_path + suffix):
+                    os.remove(target_path + suffix)
+            os.replace(restore_path, target_path)
+        finally:
+            if os.path.exists(restore_path):
+                os.remove(restore_path)
+
+    def prune(self, keep: int) -> Dict[str, int]:
+        """
+        Delete all but the newest `keep` snapshots and the chunks no remaining snapshot uses.
+
+        `keep` of 0 or less keeps everything (it never means "delete all").
+
+        Returns:
+            Number of snapshots and chunks deleted
+        """
+        if keep <= 0:
+            return {"snapshots": 0, "chunks": 0}
+        snapshots = self.list_snapshots()
+        removed = snapshots[:-keep]
+        for manifest in removed:
+            os.remove(self._manifest_path(manifest["id"]))
+
+        in_use = {digest for manifest in snapshots[len(removed):] for digest in manifest["chunks"]}
+        chunks_removed = 0
+        if os.path.isdir(self.chunk_dir):
+            for prefix in os.listdir(self.chunk_dir):
+                for name in os.listdir(os.path.join(self.chunk_dir, prefix)):
+                    if name not in in_use:
+                        os.remove(os.path.join(self.chunk_dir, prefix, name))
+                        chunks_removed += 1
+        return {"snapshots": len(removed), "chunks": chunks_removed}
+
+    def _read_chunks(self, manifest: Dict) -> Iterator[bytes]:
+        whole = hashlib.sha256()
+        for digest in manifest["chunks"]:
+            path = self._chunk_path(digest)
+            if not os.path.exists(path):
+                raise BackupError(f"Snapshot {manifest['id']}: chunk {digest} is missing")
+            with open(path, "rb") as chunk:
+                data = chunk.read()
+            if hashlib.sha256(data).hexdigest() != digest:
+                raise BackupError(f"Snapshot {manifest['id']}: chunk {digest} is corrupt")
+            whole.update(data)
+            yield data
+        if whole.hexdigest() != manifest["sha256"]:
+            raise BackupError(f"Snapshot {manifest['id']}: checksum mismatch")
+
+    def _write_chunk(self, digest: str, data: bytes) -> bool:
+        path = self._chunk_path(digest)
+        if os.path.exists(path):
+            return False
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._write_atomic(path, data, fsync=False)
+        return True
+
+    @staticmethod
+    def _write_atomic(path: str, data: bytes, fsync: bool = True) -> None:
+        partial = path + ".partial"
+        with open(partial, "wb") as target:
+            target.write(data)
+            if fsync:
+                target.flush()
+                os.fsync(target.fileno())
+        os.replace(partial, path)
+
+    def _chunk_path(self, digest: str) -> str:
+        return os.path.join(self.chunk_dir, digest[:2], digest)
+
+    def _manifest_path(self, snapshot_id: str) -> str:
+        return os.path.join(self.snapshot_dir, f"{snapshot_id}.json")
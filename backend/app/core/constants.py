@@ -7,3 +7,7 @@ REVIEW_INTERVALS = [0, 1, 3, 7, 30]
 
 # After reaching the last interval (30 days), cycle back to this level
 CYCLE_BACK_TO_LEVEL = 3  # 7 days
+
+# Number of days ahead the materialized due queue is filled
+# (covers "due today" and "due this week" reads)
+DUE_QUEUE_HORIZON_DAYS = 7
@@ -0,0 +1,65 @@
+"""
+Cache for per-day aggregates of closed (past) days.
+"""
+import threading
+from datetime import date
+from typing import Any, Dict, Hashable, Iterable, List, Tuple
+
+
+class ClosedDayCache:
+    """
+    Cache of per-day values that can no longer change once the day is over.
+
+    Only days strictly before `today` are stored, so the current day is
+    always recomputed while every past day is computed once per process.
+
+    Past days do change when history is purged or rewritten, possibly by
+    another process. Callers therefore pass the cache's version, read from
+    the database (CacheVersionRepository, under `name`), with every lookup:
+    a scope cached under another version is dropped and recomputed.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self._scopes: Dict[Hashable, Tuple[int, Dict[date, Any]]] = {}
+
+    def get_many(self, scope: Hashable, version: int, days: Iterable[date]) -> Tuple[Dict[date, Any], List[date]]:
+        """
+        Look up many days of one scope (e.g. a tenant).
+
+        Returns:
+            Tuple of (cached values by day, days not in the cache)
+        """
+        found = {}
+        missing = []
+        with self._lock:
+            cached_version, values = self._scopes.get(scope, (version, {}))
+            if cached_version != version:
+                del self._scopes[scope]
+                values = {}
+            for day in days:
+                if day in values:
+                    found[day] = values[day]
+                else:
+                    missing.append(day)
+        return found, missing
+
+    def put(self, scope: Hashable, version: int, day: date, value: Any, today: date) -> None:
+        """Store a value if its day is closed (before today) and its version is current."""
+        if day >= today:
+            return
+        with self._lock:
+            cached_version, values = self._scopes.setdefault(scope, (version, {}))
+            if cached_version == version:
+                values[day] = value
+            elif cached_version < version:
+                self._scopes[scope] = (version, {day: value})
+
+    def clear(self) -> None:
+        """Drop all cached days of this process."""
+        with self._lock:
+            self._scopes.clear()
+
+    def __len__(self) -> int:
+        return sum(len(values) for _, values in self._scopes.values())
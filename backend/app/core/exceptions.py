@@ -22,7 +22,25 @@ class ValidationException(AppException):
         super().__init__(message, status_code=400)
 
 
+class PermissionDeniedException(AppException):
+    """Raised when a caller is not allowed to use an endpoint."""
+    def __init__(self, message: str):
+        super().__init__(message, status_code=403)
+
+
 class DatabaseException(AppException):
     """Raised for database errors."""
     def __init__(self, message: str):
         super().__init__(message, status_code=500)
+
+
+class ServiceUnavailableException(AppException):
+    """Raised when the server is temporarily overloaded (backpressure)."""
+    def __init__(self, message: str):
+        super().__init__(message, status_code=503)
+
+
+class ConflictException(AppException):
+    """Raised when a request conflicts with one still in progress."""
+    def __init__(self, message: str):
+        super().__init__(message, status_code=409)
@@ -0,0 +1,208 @@
+"""
+Idempotency-Key handling: repeated requests get the stored response instead of running again.
+"""
+import hashlib
+import json
+import logging
+from typing import List, NamedTuple, Optional, Tuple
+
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers
+
+from app.core.exceptions import AppException, ConflictException, ValidationException
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+MAX_KEY_LENGTH = 255
+
+# Routes never deduplicated (need credentials, or aren't application traffic)
+EXCLUDED_PREFIXES = ("/api/v1/admin",)
+
+# Responses not stored: the request didn't take effect and may be retried with the same key
+RETRYABLE_STATUSES = {409, 429}
+
+
+# Response headers not stored: recomputed when a response is replayed
+UNSTORED_HEADERS = {b"content-length"}
+
+
+class StoredResponse(NamedTuple):
+    """Outcome recorded for a key; status_code 0 means the request is still running."""
+    request_hash: bytes
+    status_code: int
+    body: bytes
+    headers: Tuple[Tuple[bytes, bytes], ...] = ()
+
+
+def encode_headers(headers: Tuple[Tuple[bytes, bytes], ...]) -> bytes:
+    """Serialize response headers for the idempotency_keys table."""
+    return json.dumps([[name.decode("latin-1"), value.decode("latin-1")] for name, value in headers]).encode()
+
+
+def decode_headers(data: Optional[bytes]) -> Tuple[Tuple[bytes, bytes], ...]:
+    """Inverse of encode_headers (rows stored without headers give none)."""
+    if not data:
+        return ()
+    return tuple((name.encode("latin-1"), value.encode("latin-1")) for name, value in json.loads(data))
+
+
+def request_key(tenant: Optional[str], method: str, path: str, key: str) -> bytes:
+    """Digest identifying a key: the same header value on another route or tenant is another key."""
+    return hashlib.blake2b(f"{tenant or ''}\0{method}\0{path}\0{key}".encode(), digest_size=16).digest()
+
+
+def request_hash(query: bytes, body: bytes) -> bytes:
+    """Digest of what a request asks for, to detect a key reused for a different request."""
+    return hashlib.blake2b(query + b"\0" + body, digest_size=16).digest()
+
+
+class IdempotencyMiddleware:
+    """
+    ASGI middleware deduplicating POST/PATCH requests that carry an Idempotency-Key header.
+
+    The first request for a key runs as usual and its response is stored
+    (see IdempotencyStore) before it is sent. A repeat of the key gets that
+    response back with an Idempotent-Replayed header and never reaches the
+    endpoint; its headers (content type, cookies, ...) are stored and replayed
+    too. A repeat while the first request is still running gets 409; the
+    same key with a different query or body gets 400. Server errors (5xx) and
+    409/429 responses are not stored, so the request can be retried.
+
+    Register it before CORSMiddleware (so CORS wraps it and adds its headers to
+    replays and to the errors sent here) and after compression (so bodies are
+    stored uncompressed).
+
+    With tenant_header set (tenancy enabled), keys are kept in the requesting
+    tenant's database.
+    """
+
+    def __init__(self, app, store, tenant_header: Optional[str] = None, methods=("POST", "PATCH")):
+        self.app = app
+        self.store = store
+        self.tenant_header = tenant_header
+        self.methods = set(methods)
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or scope["method"] not in self.methods
+            or scope["path"].startswith(EXCLUDED_PREFIXES)
+        ):
+            await self.app(scope, receive, send)
+            return
+        headers = Headers(scope=scope)
+        value = headers.get(IDEMPOTENCY_HEADER)
+        if value is None:
+            await self.app(scope, receive, send)
+            return
+        if not value.strip() or len(value) > MAX_KEY_LENGTH:
+            await self._send_error(send, ValidationException(
+                f"{IDEMPOTENCY_HEADER} header must be 1-{MAX_KEY_LENGTH} characters"
+            ))
+            return
+
+        body = await self._read_body(receive)
+        tenant = headers.get(self.tenant_header) if self.tenant_header else None
+        key = request_key(tenant, scope["method"], scope["path"], value)
+        fingerprint = request_hash(scope.get("query_string", b""), body)
+
+        stored = self.store.cached(key)
+        if stored is None:
+            try:
+                stored = await run_in_threadpool(self.store.begin, tenant, key, fingerprint)
+            except AppException as exc:
+                await self._send_error(send, exc)
+                return
+        if stored is not None:
+            await self._replay(send, stored, fingerprint)
+            return
+
+        await self._run(scope, receive, send, body, tenant, key, fingerprint)
+
+    async def _run(self, scope, receive, send, body: bytes, tenant: Optional[str], key: bytes, fingerprint: bytes):
+        """Run the request, storing its response before it is sent."""
+        body_sent = False
+        start_message = None
+        chunks = []
+        completed = False
+
+        async def receive_body():
+            nonlocal body_sent
+            if body_sent:
+                return await receive()
+            body_sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+
+        async def send_after_storing(message):
+            nonlocal start_message, completed
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+            chunks.append(message.get("body", b""))
+            if message.get("more_body", False):
+                return
+
+            status = start_message["status"]
+            if status < 500 and status not in RETRYABLE_STATUSES:
+                headers = tuple(
+                    (name, value) for name, value in start_message.get("headers", [])
+                    if name.lower() not in UNSTORED_HEADERS
+                )
+                response = StoredResponse(fingerprint, status, b"".join(chunks), headers)
+                try:
+                    await run_in_threadpool(self.store.complete, tenant, key, response)
+                    completed = True
+                except Exception:
+                    # The request took effect; answer it anyway (the key is released below)
+                    logger.exception("Storing an idempotent response failed")
+            await send(start_message)
+            await send({"type": "http.response.body", "body": b"".join(chunks)})
+
+        try:
+            await self.app(scope, receive_body, send_after_storing)
+        finally:
+            if not completed:
+                try:
+                    await run_in_threadpool(self.store.release, tenant, key)
+                except Exception:
+                    logger.exception("Releasing an idempotency key failed")
+
+    async def _replay(self, send, stored: StoredResponse, fingerprint: bytes) -> None:
+        if stored.status_code == 0:
+            await self._send_error(send, ConflictException(
+                f"A request with this {IDEMPOTENCY_HEADER} is still in progress"
+            ))
+        elif stored.request_hash != fingerprint:
+            await self._send_error(send, ValidationException(
+                f"{IDEMPOTENCY_HEADER} was already used for a different request"
+            ))
+        else:
+            headers = [*stored.headers, (b"idempotent-replayed", b"true")]
+            await self._send(send, stored.status_code, stored.body, headers)
+
+    async def _send_error(self, send, exc: AppException) -> None:
+        """Send an error in the shape of the application's exception handler."""
+        body = json.dumps({"error": exc.__class__.__name__, "message": exc.message}).encode()
+        await self._send(send, exc.status_code, body, [(b"content-type", b"application/json")])
+
+    @staticmethod
+    async def _send(send, status: int, body: bytes, headers: List[Tuple[bytes, bytes]]) -> None:
+        headers = [*headers, (b"content-length", str(len(body)).encode())]
+        await send({"type": "http.response.start", "status": status, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
+
+    @staticmethod
+    async def _read_body(receive) -> bytes:
+        chunks = []
+        while True:
+            message = await receive()
+            if message["type"] != "http.request":
+                break
+            chunks.append(message.get("body", b""))
+            if not message.get("more_body", False):
+                break
+        return b"".join(chunks)
@@ -0,0 +1,84 @@
+"""
+MinHash signatures and LSH band keys for near-duplicate detection.
+
+Two texts' Jaccard similarity (over character shingles) is estimated by the
+fraction of equal signature values. Signatures are split into bands; texts
+sharing any band key are candidates, so a lookup only compares against the
+items in its own buckets instead of every item.
+"""
+import hashlib
+import re
+from typing import List
+
+import numpy as np
+
+# 32 bands of 4 rows: texts with Jaccard similarity 0.8 share a band with
+# probability ~1.0, at 0.5 ~0.87, at 0.3 ~0.23 (candidates are then re-scored)
+NUM_PERM = 128
+BANDS = 32
+ROWS_PER_BAND = NUM_PERM // BANDS
+
+# Characters per shingle
+SHINGLE_SIZE = 5
+
+# Fixed seed: stored signatures must stay comparable across processes and restarts
+_PERMUTATION_SEED = 20240601
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+_SHINGLE_BASE = np.uint64(1099511628211)
+
+_rng = np.random.default_rng(_PERMUTATION_SEED)
+# a < 2^31 and x < 2^32 keep a * x + b below 2^64
+_PERM_A = _rng.integers(1, 1 << 31, size=NUM_PERM, dtype=np.uint64)
+_PERM_B = _rng.integers(0, 1 << 31, size=NUM_PERM, dtype=np.uint64)
+
+_NON_WORD = re.compile(r"\W+")
+
+
+def normalize(text: str) -> str:
+    """Lowercase and collapse punctuation/whitespace runs into single spaces."""
+    return _NON_WORD.sub(" ", text.lower()).strip()
+
+
+def shingle_hashes(text: str) -> np.ndarray:
+    """Get the distinct 32-bit hashes of a text's character shingles."""
+    text = normalize(text) or text
+    codes = np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32).astype(np.uint64)
+    if len(codes) < SHINGLE_SIZE:
+        codes = np.concatenate([codes, np.zeros(SHINGLE_SIZE - len(codes), dtype=np.uint64)])
+
+    # Polynomial hash of each window (uint64 arithmetic wraps around)
+    windows = len(codes) - SHINGLE_SIZE + 1
+    hashes = np.zeros(windows, dtype=np.uint64)
+    for offset in range(SHINGLE_SIZE):
+        hashes = hashes * _SHINGLE_BASE + codes[offset:offset + windows]
+    return np.unique((hashes >> np.uint64(32)) ^ (hashes & _MAX_HASH))
+
+
+def signature(title: str, content: str) -> np.ndarray:
+    """Compute the MinHash signature (NUM_PERM uint32 values) of an item."""
+    shingles = shingle_hashes(f"{title} {content}")
+    permuted = (np.outer(_PERM_A, shingles) + _PERM_B[:, None]) % _MERSENNE_PRIME & _MAX_HASH
+    return permuted.min(axis=1).astype(np.uint32)
+
+
+def band_keys(sig: np.ndarray) -> List[int]:
+    """Get one signed 64-bit bucket key per band (the band number is part of the key)."""
+    keys = []
+    for band, rows in enumerate(sig.reshape(BANDS, ROWS_PER_BAND)):
+        digest = hashlib.blake2b(rows.tobytes(), digest_size=8, salt=band.to_bytes(16, "little")).digest()
+        keys.append(int.from_bytes(digest, "little", signed=True))
+    return keys
+
+
+def to_bytes(sig: np.ndarray) -> bytes:
+    return sig.astype("<u4").tobytes()
+
+
+def from_bytes(value: bytes) -> np.ndarray:
+    return np.frombuffer(value, dtype="<u4")
+
+
+def similarities(sig: np.ndarray, candidates: np.ndarray) -> np.ndarray:
+    """Estimate Jaccard similarity of a signature against rows of candidate signatures."""
+    return (candidates == sig).mean(axis=1)
@@ -0,0 +1,243 @@
+"""
+Opt-in per-request profiling: stack sampling and SQL statement capture.
+"""
+import contextvars
+import hashlib
+import hmac
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from sqlalchemy import event
+
+# Header carrying "<expires unix time>:<hex HMAC-SHA256 of the expiry>"
+PROFILE_TOKEN_HEADER = b"x-profile-token"
+
+# Limits that keep one profile small
+MAX_STACK_DEPTH = 128
+MAX_DISTINCT_STACKS = 5000
+MAX_STATEMENTS = 1000
+MAX_STATEMENT_LENGTH = 2000
+
+_current_profile: contextvars.ContextVar = contextvars.ContextVar("current_profile", default=None)
+
+
+class RequestProfile:
+    """Samples and SQL statements recorded for one request."""
+
+    def __init__(self, method: str, path: str, trigger: str):
+        self.id = uuid.uuid4().hex
+        self.method = method
+        self.path = path
+        self.trigger = trigger
+        self.started_at = datetime.now(timezone.utc)
+        self.duration_ms = 0.0
+        self.status_code: Optional[int] = None
+        self.sample_count = 0
+        self.stacks: Dict[str, int] = {}
+        self.statements: List[Dict] = []
+        self.threads = set()
+        self._lock = threading.Lock()
+
+    def register_thread(self) -> None:
+        """Include the calling thread in stack sampling."""
+        ident = threading.get_ident()
+        if ident not in self.threads:
+            with self._lock:
+                self.threads.add(ident)
+
+    def add_stack(self, stack: str) -> None:
+        self.sample_count += 1
+        if stack in self.stacks or len(self.stacks) < MAX_DISTINCT_STACKS:
+            self.stacks[stack] = self.stacks.get(stack, 0) + 1
+        else:
+            self.stacks["[truncated]"] = self.stacks.get("[truncated]", 0) + 1
+
+    def add_statement(self, statement: str, duration_ms: float, rowcount: int, executemany: bool) -> None:
+        if len(self.statements) >= MAX_STATEMENTS:
+            return
+        self.statements.append({
+            "statement": statement[:MAX_STATEMENT_LENGTH],
+            "duration_ms": round(duration_ms, 3),
+            "rowcount": rowcount,
+            "executemany": executemany
+        })
+
+    def summary(self) -> Dict:
+        return {
+            "id": self.id,
+            "method": self.method,
+            "path": self.path,
+            "trigger": self.trigger,
+            "started_at": self.started_at,
+            "duration_ms": round(self.duration_ms, 3),
+            "status_code": self.status_code,
+            "samples": self.sample_count,
+            "sql_count": len(self.statements),
+            "sql_ms": round(sum(s["duration_ms"] for s in self.statements), 3)
+        }
+
+    def collapsed(self) -> str:
+        """Stacks in collapsed format ("frame;frame;frame count"), as read by flamegraph tools."""
+        return "\n".join(f"{stack} {count}" for stack, count in sorted(self.stacks.items()))
+
+
+class ProfileStore:
+    """Keeps the most recent profiles, evicting the oldest beyond max_profiles."""
+
+    def __init__(self, max_profiles: int = 50):
+        self.max_profiles = max_profiles
+        self._profiles: "OrderedDict[str, RequestProfile]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add(self, profile: RequestProfile) -> None:
+        with self._lock:
+            self._profiles[profile.id] = profile
+            while len(self._profiles) > self.max_profiles:
+                self._profiles.popitem(last=False)
+
+    def get(self, profile_id: str) -> Optional[RequestProfile]:
+        with self._lock:
+            return self._profiles.get(profile_id)
+
+    def list(self) -> List[RequestProfile]:
+        with self._lock:
+            return list(reversed(self._profiles.values()))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._profiles.clear()
+
+
+profile_store = ProfileStore()
+
+
+class StackSampler:
+    """Background thread sampling the stacks of a profile's threads at a fixed interval."""
+
+    def __init__(self, profile: RequestProfile, interval_ms: int = 5):
+        self.profile = profile
+        self.interval = interval_ms / 1000
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        # Not joined: the thread exits within one interval, without blocking the event loop
+        self._stop.set()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            if not self.profile.threads:
+                continue
+            frames = sys._current_frames()
+            for ident in list(self.profile.threads):
+                frame = frames.get(ident)
+                if frame is not None:
+                    self.profile.add_stack(_collapse(frame))
+
+
+def _collapse(frame) -> str:
+    names = []
+    while frame is not None and len(names) < MAX_STACK_DEPTH:
+        code = frame.f_code
+        module = frame.f_globals.get("__name__", "?")
+        names.append(f"{module}:{code.co_name}:{frame.f_lineno}")
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+def sign_profile_token(secret: str, expires_at: int) -> str:
+    """Build an X-Profile-Token value valid until expires_at (unix time)."""
+    signature = hmac.new(secret.encode(), str(expires_at).encode(), hashlib.sha256).hexdigest()
+    return f"{expires_at}:{signature}"
+
+
+def verify_profile_token(secret: str, token: str) -> bool:
+    expires_at, _, signature = token.partition(":")
+    # ASCII digits only: str.isdigit() accepts e.g. "²", which int() rejects
+    if not secret or not re.fullmatch(r"[0-9]+", expires_at) or int(expires_at) < time.time():
+        return False
+    expected = sign_profile_token(secret, int(expires_at)).partition(":")[2]
+    return hmac.compare_digest(signature, expected)
+
+
+def install_sql_capture(engine) -> None:
+    """Record statements of profiled requests; a context variable check otherwise."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        profile = _current_profile.get()
+        if profile is not None:
+            profile.register_thread()
+            conn.info.setdefault("profile_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        profile = _current_profile.get()
+        if profile is not None and conn.info.get("profile_started"):
+            started = conn.info["profile_started"].pop()
+            profile.add_statement(statement, (time.perf_counter() - started) * 1000, cursor.rowcount, executemany)
+
+
+class ProfilingMiddleware:
+    """
+    ASGI middleware profiling requests that carry a valid X-Profile-Token
+    or are picked by sample_rate. The response of a profiled request gets an
+    X-Profile-Id header; the profile is read through the admin endpoints.
+    """
+
+    def __init__(self, app, secret: str = "", sample_rate: float = 0.0, interval_ms: int = 5, store: ProfileStore = None):
+        self.app = app
+        self.secret = secret
+        self.sample_rate = sample_rate
+        self.interval_ms = interval_ms
+        self.store = store or profile_store
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        trigger = self._trigger(scope)
+        if trigger is None:
+            await self.app(scope, receive, send)
+            return
+
+        profile = RequestProfile(scope["method"], scope["path"], trigger)
+        sampler = StackSampler(profile, self.interval_ms)
+
+        async def send_with_id(message):
+            if message["type"] == "http.response.start":
+                profile.status_code = message["status"]
+                headers = list(message.get("headers", []))
+                headers.append((b"x-profile-id", profile.id.encode("ascii")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        token = _current_profile.set(profile)
+        started = time.perf_counter()
+        sampler.start()
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            sampler.stop()
+            profile.duration_ms = (time.perf_counter() - started) * 1000
+            _current_profile.reset(token)
+            self.store.add(profile)
+
+    def _trigger(self, scope) -> Optional[str]:
+        for name, value in scope.get("headers", []):
+            if name == PROFILE_TOKEN_HEADER:
+                return "token" if verify_profile_token(self.secret, value.decode("latin-1")) else None
+        if self.sample_rate and random.random() < self.sample_rate:
+            return "sampled"
+        return None
@@ -0,0 +1,104 @@
+"""
+Request coalescing (single-flight) for expensive reads.
+"""
+import functools
+import threading
+from typing import Any, Callable, Dict, Hashable
+
+
+class _Call:
+    """An in-flight computation that concurrent callers can wait on."""
+
+    __slots__ = ("done", "result", "error", "waiters")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Share one in-flight computation between concurrent identical calls.
+
+    The first caller for a key runs the function; callers arriving while it
+    is running wait for it and receive the same result (or exception).
+    Nothing is cached: once the call finishes the next caller runs it again.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self._executed: Dict[str, int] = {}
+        self._coalesced: Dict[str, int] = {}
+
+    def do(self, key: Hashable, fn: Callable[[], Any], name: str = "") -> Any:
+        """Run fn for key, or wait for the identical call already running."""
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                self._coalesced[name] = self._coalesced.get(name, 0) + 1
+                leader = False
+            else:
+                call = _Call()
+                self._calls[key] = call
+                self._executed[name] = self._executed.get(name, 0) + 1
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Get executed/coalesced call counts per name."""
+        with self._lock:
+            names = set(self._executed) | set(self._coalesced)
+            return {
+                name: {
+                    "executed": self._executed.get(name, 0),
+                    "coalesced": self._coalesced.get(name, 0),
+                    "in_flight": sum(1 for key in self._calls if key[0] == name)
+                }
+                for name in sorted(names)
+            }
+
+
+single_flight_group = SingleFlight()
+
+
+def coalesce(method: Callable) -> Callable:
+    """
+    Decorator for service methods whose concurrent identical calls should share one query.
+    Calls are keyed by method name, tenant (the session's, if any), read
+    routing and arguments; results must be safe to share between callers
+    (plain data, not session-bound ORM objects).
+
+    Sessions that must read from the primary (pinned by a recent write of
+    the client, or that wrote themselves) never share a replica read, so a
+    pinned caller still sees its own writes.
+    """
+    name = method.__qualname__
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        info = self.db.info if hasattr(self, "db") else {}
+        primary = bool(info.get("pin_primary") or info.get("wrote"))
+        key = (name, info.get("tenant"), primary, args, tuple(sorted(kwargs.items())))
+        return single_flight_group.do(key, lambda: method(self, *args, **kwargs), name=name)
+
+    return wrapper
@@ -0,0 +1,156 @@
+"""
+Workload recording: anonymized request traces for replay load tests.
+"""
+import hashlib
+import hmac
+import json
+import os
+import random
+import re
+import threading
+import time
+from typing import Any, Dict, Optional
+from urllib.parse import parse_qsl
+
+# Parameters holding learning item IDs; replay maps them onto items of the target database
+ITEM_ID_KEYS = {"item_id", "ids", "item_ids"}
+# Parameters naming a subject; replay maps them onto existing subjects
+SUBJECT_KEYS = {"subject", "name"}
+# Opaque client-chosen keys (e.g. session leases); replay reuses the hash itself
+OPAQUE_KEYS = {"lease", "lease_token"}
+
+# Routes never recorded (need credentials, or aren't application traffic)
+EXCLUDED_PREFIXES = ("/api/v1/admin", "/docs", "/redoc", "/openapi.json")
+
+# Request bodies larger than this are recorded without their body
+MAX_BODY_BYTES = 1024 * 1024
+
+_PLAIN_VALUE = re.compile(r"^(-?\d+(\.\d+)?|\d{4}-\d{2}-\d{2}|true|false)$", re.IGNORECASE)
+
+
+class Anonymizer:
+    """
+    Replace identifying values with keyed hashes (stable within one salt)
+    and free text with its length, keeping numbers, dates and booleans.
+    """
+
+    def __init__(self, salt: str = ""):
+        self.salt = (salt or os.urandom(16).hex()).encode()
+
+    def token(self, kind: str, value: str) -> str:
+        digest = hmac.new(self.salt, value.encode(), hashlib.sha256).hexdigest()[:16]
+        return f"{kind}:{digest}"
+
+    def value(self, key: str, value: Any) -> Any:
+        if isinstance(value, list):
+            return [self.value(key, element) for element in value]
+        if isinstance(value, dict):
+            return {k: self.value(k, v) for k, v in value.items()}
+        if not isinstance(value, str):
+            return value
+        if key in ITEM_ID_KEYS:
+            return self.token("id", value)
+        if key in SUBJECT_KEYS:
+            return self.token("s", value)
+        if key in OPAQUE_KEYS:
+            return self.token("k", value)
+        if _PLAIN_VALUE.match(value):
+            return value
+        return {"$text": len(value)}
+
+    def params(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        return {key: self.value(key, value) for key, value in params.items()}
+
+
+class WorkloadRecorder:
+    """Appends one JSON line per recorded request to a file (thread-safe)."""
+
+    def __init__(self, path: str, salt: str = ""):
+        self.path = path
+        self.anonymizer = Anonymizer(salt)
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def record(self, entry: Dict) -> None:
+        line = json.dumps(entry, separators=(",", ":"), default=str) + "\n"
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as trace:
+                trace.write(line)
+
+
+class WorkloadRecordingMiddleware:
+    """
+    ASGI middleware logging each request's route template, anonymized path,
+    query and JSON body parameters, status and duration to a WorkloadRecorder.
+    Requests that match no route are not recorded.
+    """
+
+    def __init__(self, app, recorder: WorkloadRecorder, sample_rate: float = 1.0):
+        self.app = app
+        self.recorder = recorder
+        self.sample_rate = sample_rate
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or scope["path"].startswith(EXCLUDED_PREFIXES)
+            or (self.sample_rate < 1.0 and random.random() >= self.sample_rate)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        body = []
+        body_size = 0
+        status = None
+
+        async def receive_and_keep():
+            nonlocal body_size
+            message = await receive()
+            if message["type"] == "http.request" and body_size <= MAX_BODY_BYTES:
+                chunk = message.get("body", b"")
+                body_size += len(chunk)
+                body.append(chunk)
+            return message
+
+        async def send_and_watch(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        started_at = time.time()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive_and_keep, send_and_watch)
+        finally:
+            duration_ms = (time.perf_counter() - started) * 1000
+            route = scope.get("route")
+            if route is not None:
+                self.recorder.record(self._entry(
+                    scope, route, started_at, duration_ms, status or 500,
+                    b"".join(body) if body_size <= MAX_BODY_BYTES else None
+                ))
+
+    def _entry(self, scope, route, started_at: float, duration_ms: float, status: int, body: Optional[bytes]) -> Dict:
+        anonymizer = self.recorder.anonymizer
+        query = dict(parse_qsl(scope.get("query_string", b"").decode("latin-1"), keep_blank_values=True))
+
+        parsed_body = None
+        if body:
+            try:
+                parsed_body = anonymizer.value("", json.loads(body))
+            except ValueError:
+                parsed_body = {"$text": len(body)}
+
+        return {
+            "ts": round(started_at, 6),
+            "method": scope["method"],
+            "route": route.path_format,
+            "path_params": anonymizer.params({k: str(v) for k, v in scope.get("path_params", {}).items()}),
+            "query": anonymizer.params(query),
+            "body": parsed_body,
+            "status": status,
+            "duration_ms": round(duration_ms, 3)
+        }
@@ -1,54 +1,433 @@
 """
 Database configuration and session management.
 """
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import Engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.sql.dml import UpdateBase
+from fastapi import Request, Response
+from collections import OrderedDict
+from contextlib import contextmanager
 from app.config import get_settings
+from app.core.exceptions import ValidationException
+import functools
 import os
+import random
+import re
+import threading
+import time
+from typing import Callable, Dict, Iterator, Optional
 
 settings = get_settings()
 
+# Cookie holding the time until which a client reads from the primary
+PRIMARY_COOKIE = "rt_primary_until"
+
 # Ensure data directory exists (only needed for SQLite in local dev)
 if settings.DATABASE_URL.startswith("sqlite"):
     data_dir = os.getenv("DATA_DIR", "data")
     os.makedirs(data_dir, exist_ok=True)
 
-# Create database engine
-# PostgreSQL doesn't need connect_args, SQLite needs check_same_thread=False
-if settings.DATABASE_URL.startswith("sqlite"):
-    engine = create_engine(
-        settings.DATABASE_URL,
-        connect_args={"check_same_thread": False}
-    )
-else:
+
+def create_db_engine(url: str, pool_size: int = 5, max_overflow: int = 10, connect_args: Optional[dict] = None):
+    """
+    Create a database engine.
+    PostgreSQL doesn't need connect_args, SQLite needs check_same_thread=False
+    """
+    if url.startswith("sqlite"):
+        sqlite_engine = create_engine(
+            url,
+            connect_args={"check_same_thread": False}
+        )
+        if settings.SQLITE_WAL:
+            event.listen(sqlite_engine, "connect", _enable_wal)
+        return sqlite_engine
     # PostgreSQL or other databases
-    engine = create_engine(
-        settings.DATABASE_URL,
+    return create_engine(
+        url,
         pool_pre_ping=True,  # Verify connections before using
-        pool_size=5,
-        max_overflow=10
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        connect_args=connect_args or {}
     )
 
+
+def _enable_wal(dbapi_connection, connection_record):
+    """Readers (e.g. online backups) no longer block writers and vice versa."""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.close()
+
+
+# Primary (all writes) and optional read replicas
+engine = create_db_engine(settings.DATABASE_URL)
+replica_engines = [create_db_engine(url) for url in settings.database_replica_urls_list]
+
+
+class RoutingSession(Session):
+    """
+    Session that routes reads of read_only() service methods to a replica.
+
+    Flushes and INSERT/UPDATE/DELETE statements always go to the primary
+    (the session's bind: `engine`, or a tenant's engine). Once a session has
+    written it reads from the primary too, and sessions pinned by a recent
+    write of the same client never use a replica.
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if self._flushing or isinstance(clause, UpdateBase):
+            self.info["wrote"] = True
+            return self.bind
+        if (
+            replica_engines
+            and self.bind is engine  # Replicas mirror the default database only
+            and self.info.get("read_only")
+            and not self.info.get("wrote")
+            and not self.info.get("pin_primary")
+        ):
+            # One replica per session, so a request sees one consistent snapshot
+            if "replica" not in self.info:
+                self.info["replica"] = random.choice(replica_engines)
+            return self.info["replica"]
+        return self.bind
+
+
+@event.listens_for(RoutingSession, "after_commit")
+def _after_commit(session):
+    """Notify the request (sticky primary cookie) that it committed a write."""
+    if session.info.get("wrote") and "on_write" in session.info:
+        session.info["on_write"]()
+
+
+@contextmanager
+def use_replica(db: Session):
+    """Let reads inside the block go to a replica (no-op without replicas)."""
+    previous = db.info.get("read_only", False)
+    db.info["read_only"] = True
+    try:
+        yield db
+    finally:
+        db.info["read_only"] = previous
+
+
+@contextmanager
+def use_primary(db: Session):
+    """Read from the primary inside the block, e.g. before a dependent write."""
+    previous = db.info.get("read_only", False)
+    db.info["read_only"] = False
+    try:
+        yield db
+    finally:
+        db.info["read_only"] = previous
+
+
+@contextmanager
+def primary_session(db: Session) -> Iterator[Session]:
+    """
+    Open a short-lived session on the primary of `db` (the same tenant's
+    database) for maintenance writes. `db` itself doesn't count as having
+    written, so it keeps reading from its replica and the client isn't pinned.
+    """
+    maintenance = SessionLocal(bind=db.bind)
+    if "tenant" in db.info:
+        maintenance.info["tenant"] = db.info["tenant"]
+    try:
+        yield maintenance
+    finally:
+        maintenance.close()
+
+
+def read_only(method):
+    """
+    Decorator for service methods that only read; their queries may be served
+    by a replica. The service must keep its session in `self.db`.
+
+    A write such a method can't avoid (e.g. rolling the due queue over) is
+    made on its own primary_session(), rather than relying on flushes and
+    INSERT/UPDATE/DELETE falling back to the primary in RoutingSession: a
+    write on the request's session would send its later reads to the
+    primary, mixing two snapshots in one response.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with use_replica(self.db):
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
 # Create session factory
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Objects keep their loaded state across commit, so write paths return them
+# without reloading every attribute (values generated at insert are set in Python)
+SessionLocal = sessionmaker(
+    class_=RoutingSession,
+    autocommit=False,
+    autoflush=False,
+    expire_on_commit=False,
+    bind=engine
+)
 
 # Base class for models
 Base = declarative_base()
 
 
-def get_db():
+def get_db(request: Request, response: Response):
     """
     Dependency to get database session.
     Use with FastAPI's Depends().
+
+    With replicas configured, a client that just wrote gets a short-lived
+    cookie and reads from the primary until it expires (read-your-writes).
+    With tenancy enabled the session is bound to the requesting tenant's database.
     """
+    if tenant_pool is not None:
+        with tenant_pool.session(tenant_pool.tenant_key(request.headers.get(settings.TENANT_HEADER))) as db:
+            yield db
+        return
+
     db = SessionLocal()
+    if replica_engines:
+        db.info["pin_primary"] = _primary_pinned(request)
+        db.info["on_write"] = lambda: pin_primary(response)
     try:
         yield db
     finally:
         db.close()
 
 
-def init_db():
-    """Initialize database (create all tables)."""
-    Base.metadata.create_all(bind=engine)
+@contextmanager
+def open_session(tenant: Optional[str] = None) -> Iterator[Session]:
+    """
+    Open a session outside of request dependencies (e.g. in middleware):
+    on the given tenant's database when tenancy is enabled, else on the default one.
+
+    Raises:
+        ValidationException: If tenancy is enabled and the tenant key is invalid
+    """
+    if tenant_pool is not None:
+        with tenant_pool.session(tenant_pool.tenant_key(tenant)) as db:
+            yield db
+        return
+
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def _primary_pinned(request: Request) -> bool:
+    try:
+        return float(request.cookies.get(PRIMARY_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+
+def mark_written(db: Session) -> None:
+    """Pin the client to the primary for a write committed outside its session (write-behind)."""
+    if "on_write" in db.info:
+        db.info["on_write"]()
+
+
+def pin_primary(response: Response) -> None:
+    """Send the client's reads to the primary for READ_YOUR_WRITES_SECONDS."""
+    seconds = settings.READ_YOUR_WRITES_SECONDS
+    if replica_engines and seconds > 0:
+        response.set_cookie(
+            PRIMARY_COOKIE,
+            str(time.time() + seconds),
+            max_age=seconds,
+            httponly=True,
+            samesite="lax"
+        )
+
+
+def create_tables(bind: Optional[Engine] = None):
+    """Create all model tables that don't exist yet."""
+    import app.models  # noqa: F401  (registers the models on Base)
+    Base.metadata.create_all(bind=bind or engine)
+
+
+def init_db(
+    time_budget: Optional[float] = None,
+    echo: Callable[[str], None] = print,
+    bind: Optional[Engine] = None
+):
+    """
+    Initialize database (the default one, or `bind`, e.g. a tenant's).
+    A new database gets all tables; an existing one gets pending migrations.
+
+    Returns:
+        Migration result (see app.migrations.upgrade)
+    """
+    from app.migrations import upgrade
+
+    bind = bind or engine
+    return upgrade(
+        bind,
+        create_all=lambda: create_tables(bind),
+        batch_size=settings.MIGRATION_BATCH_SIZE,
+        pause_ms=settings.MIGRATION_BATCH_PAUSE_MS,
+        time_budget=time_budget if time_budget is not None else (settings.MIGRATION_TIME_BUDGET_SECONDS or None),
+        echo=echo
+    )
+
+
+class _TenantEngine:
+    """A pooled engine; created only by TenantEnginePool.acquire(), which sets last_used."""
+    __slots__ = ("engine", "in_use", "last_used")
+
+    def __init__(self, engine: Engine):
+        self.engine = engine
+        self.in_use = 0
+
+
+class TenantEnginePool:
+    """
+    Bounded LRU pool of per-tenant engines.
+
+    A tenant's engine is opened on its first request, and its schema is
+    created (or migrated) once per process before first use. Engines beyond
+    max_engines (least recently used first) and engines idle for longer than
+    idle_seconds are disposed when another tenant is acquired; an engine
+    with sessions still open is never disposed, so the pool can briefly hold
+    more than max_engines under load.
+    """
+
+    # Lowercase only: SQLite file names may be case-insensitive
+    KEY_PATTERN = re.compile(r"^[a-z0-9_-]{1,64}$")
+
+    def __init__(self, url_template: str, max_engines: int, idle_seconds: float):
+        self.url_template = url_template
+        self.per_schema = "{tenant}" not in url_template
+        if self.per_schema and not url_template.startswith("postgresql"):
+            raise ValueError("TENANT_DATABASE_URL needs a {tenant} placeholder (schemas need PostgreSQL)")
+        self.max_engines = max_engines
+        self.idle_seconds = idle_seconds
+        self._lock = threading.Lock()
+        self._engines: "OrderedDict[str, _TenantEngine]" = OrderedDict()
+        self._prepared = set()
+        self._prepare_locks: Dict[str, threading.Lock] = {}
+        self._counters = {"hits": 0, "opened": 0, "evicted": 0, "schemas_prepared": 0}
+
+    @classmethod
+    def tenant_key(cls, value: Optional[str]) -> str:
+        """
+        Validate a tenant key from a request.
+
+        Raises:
+            ValidationException: If the key is missing or malformed
+        """
+        if not value or not cls.KEY_PATTERN.match(value):
+            raise ValidationException(
+                f"{settings.TENANT_HEADER} header must be 1-64 characters of a-z, 0-9, '_' or '-'"
+            )
+        return value
+
+    @contextmanager
+    def session(self, tenant: str) -> Iterator[Session]:
+        """Open a session on a tenant's database."""
+        tenant_engine = self.acquire(tenant)
+        db = SessionLocal(bind=tenant_engine)
+        db.info["tenant"] = tenant
+        try:
+            yield db
+        finally:
+            db.close()
+            self.release(tenant)
+
+    def acquire(self, tenant: str) -> Engine:
+        """Get a tenant's engine (opening it if needed) and mark it in use until release()."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._engines.get(tenant)
+            if entry is None:
+                entry = self._engines[tenant] = _TenantEngine(self._create_engine(tenant))
+                self._counters["opened"] += 1
+            else:
+                self._engines.move_to_end(tenant)
+                self._counters["hits"] += 1
+            entry.in_use += 1
+            entry.last_used = now
+            evicted = self._evict(now)
+
+        for stale in evicted:
+            stale.dispose()
+        if tenant not in self._prepared:
+            try:
+                self._prepare(tenant, entry.engine)
+            except Exception:
+                self.release(tenant)
+                raise
+        return entry.engine
+
+    def release(self, tenant: str) -> None:
+        with self._lock:
+            entry = self._engines.get(tenant)
+            if entry is not None:
+                entry.in_use -= 1
+                entry.last_used = time.monotonic()
+
+    def stats(self) -> Dict[str, int]:
+        """Pool counters: open engines, cache hits, engines opened/evicted, schemas prepared."""
+        with self._lock:
+            return {"open": len(self._engines), **self._counters}
+
+    def dispose_all(self) -> None:
+        with self._lock:
+            entries, self._engines = list(self._engines.values()), OrderedDict()
+        for entry in entries:
+            entry.engine.dispose()
+
+    def _create_engine(self, tenant: str) -> Engine:
+        # Small pools: the tenants' engines share the server's connection limit
+        if self.per_schema:
+            return create_db_engine(
+                self.url_template,
+                pool_size=2,
+                max_overflow=3,
+                connect_args={"options": f"-csearch_path={self._schema(tenant)}"}
+            )
+        url = self.url_template.replace("{tenant}", tenant)
+        if url.startswith("sqlite:///"):
+            os.makedirs(os.path.dirname(os.path.abspath(url[len("sqlite:///"):])), exist_ok=True)
+        return create_db_engine(url, pool_size=2, max_overflow=3)
+
+    def _evict(self, now: float) -> list:
+        """Drop idle and least recently used engines (call with the lock held)."""
+        evicted = []
+        for tenant, entry in list(self._engines.items()):
+            if entry.in_use:
+                continue
+            if len(self._engines) > self.max_engines or now - entry.last_used > self.idle_seconds:
+                del self._engines[tenant]
+                evicted.append(entry.engine)
+                self._counters["evicted"] += 1
+        return evicted
+
+    def _prepare(self, tenant: str, tenant_engine: Engine) -> None:
+        """Create or migrate a tenant's schema, once per process."""
+        with self._lock:
+            prepare_lock = self._prepare_locks.setdefault(tenant, threading.Lock())
+        with prepare_lock:
+            if tenant in self._prepared:
+                return
+            if self.per_schema:
+                with tenant_engine.begin() as conn:
+                    conn.execute(text(f"CREATE SCHEMA IF NOT EXISTS {self._schema(tenant)}"))
+            init_db(echo=lambda message: None, bind=tenant_engine)
+            with self._lock:
+                self._prepared.add(tenant)
+                self._prepare_locks.pop(tenant, None)
+                self._counters["schemas_prepared"] += 1
+
+    @staticmethod
+    def _schema(tenant: str) -> str:
+        return '"tenant_' + tenant + '"'
+
+
+tenant_pool = TenantEnginePool(
+    settings.TENANT_DATABASE_URL,
+    max_engines=settings.TENANT_MAX_ENGINES,
+    idle_seconds=settings.TENANT_IDLE_SECONDS
+) if settings.TENANCY_ENABLED else None
@@ -3,13 +3,19 @@ FastAPI application entry point.
 """
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.responses import JSONResponse
 from fastapi.exceptions import RequestValidationError
 
 from app.config import get_settings
-from app.database import init_db
-from app.api.v1 import learning_items, reviews
+from app.database import init_db, engine, replica_engines, tenant_pool
+from app.api.v1 import learning_items, reviews, admin
 from app.core.exceptions import AppException
+from app.core.idempotency import IdempotencyMiddleware
+from app.core.profiling import ProfilingMiddleware, install_sql_capture, profile_store
+from app.core.workload import WorkloadRecorder, WorkloadRecordingMiddleware
+from app.services.idempotency_store import get_idempotency_store
+from app.services.review_write_behind import flush_review_writer
 
 settings = get_settings()
 
@@ -20,6 +26,16 @@ app = FastAPI(
     description="A spaced repetition learning review system to help you remember what you've learned"
 )
 
+# Replay stored responses for repeated Idempotency-Key requests (added before
+# CORS so replays and its own errors get CORS headers, and before compression
+# so it stores and replays uncompressed bodies)
+if settings.IDEMPOTENCY_ENABLED:
+    app.add_middleware(
+        IdempotencyMiddleware,
+        store=get_idempotency_store(),
+        tenant_header=settings.TENANT_HEADER if settings.TENANCY_ENABLED else None
+    )
+
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
@@ -29,6 +45,30 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress responses for clients that accept gzip
+if settings.RESPONSE_COMPRESSION:
+    app.add_middleware(GZipMiddleware, minimum_size=settings.RESPONSE_COMPRESSION_MIN_BYTES)
+
+# Opt-in request profiling; nothing is installed when disabled
+if settings.PROFILING_ENABLED:
+    profile_store.max_profiles = settings.PROFILING_MAX_PROFILES
+    for profiled_engine in [engine, *replica_engines]:
+        install_sql_capture(profiled_engine)
+    app.add_middleware(
+        ProfilingMiddleware,
+        secret=settings.PROFILING_SECRET or settings.ADMIN_TOKEN,
+        sample_rate=settings.PROFILING_SAMPLE_RATE,
+        interval_ms=settings.PROFILING_INTERVAL_MS
+    )
+
+# Opt-in workload recording for replay load tests (benchmarks/replay.py)
+if settings.WORKLOAD_RECORDING:
+    app.add_middleware(
+        WorkloadRecordingMiddleware,
+        recorder=WorkloadRecorder(settings.WORKLOAD_RECORD_FILE, salt=settings.WORKLOAD_RECORD_SALT),
+        sample_rate=settings.WORKLOAD_RECORD_SAMPLE_RATE
+    )
+
 
 # Exception handlers
 @app.exception_handler(AppException)
@@ -71,6 +111,7 @@ async def general_exception_handler(request: Request, exc: Exception):
 # Include routers
 app.include_router(learning_items.router, prefix="/api/v1")
 app.include_router(reviews.router, prefix="/api/v1")
+app.include_router(admin.router, prefix="/api/v1")
 
 
 # Startup event - only for local development
@@ -81,6 +122,14 @@ app.include_router(reviews.router, prefix="/api/v1")
 #     init_db()
 
 
+@app.on_event("shutdown")
+def on_shutdown():
+    """Commit any reviews still queued by the write-behind worker, close tenant engines."""
+    flush_review_writer()
+    if tenant_pool is not None:
+        tenant_pool.dispose_all()
+
+
 # Root endpoint
 @app.get("/")
 def read_root():
@@ -0,0 +1,7 @@
+"""
+Versioned schema migrations for SQLite and PostgreSQL.
+"""
+from app.migrations.context import MigrationContext, MigrationPaused
+from app.migrations.runner import get_status, load_migrations, stamp, upgrade
+
+__all__ = ["MigrationContext", "MigrationPaused", "get_status", "load_migrations", "stamp", "upgrade"]
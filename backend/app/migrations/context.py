@@ -0,0 +1,246 @@
+"""
+Helpers available to migrations: idempotent DDL and resumable chunked backfills.
+"""
+import time
+from datetime import datetime, timezone
+from typing import Callable, Optional
+
+from sqlalchemy import Column, MetaData, inspect, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.schema import CreateColumn, Table
+
+from app.migrations.tables import migration_progress
+
+# PostgreSQL: give up waiting for a table lock after this long and retry,
+# instead of queueing every other query behind the ALTER
+LOCK_TIMEOUT = "5s"
+LOCK_RETRIES = 5
+LOCK_NOT_AVAILABLE = "55P03"
+
+
+class MigrationPaused(Exception):
+    """Raised when the time budget runs out; the migration resumes on the next run."""
+
+
+class MigrationContext:
+    """
+    Passed to each migration's upgrade(ctx).
+
+    Every helper runs in its own short transaction and is safe to repeat,
+    so a migration interrupted at any point can simply be run again.
+    """
+
+    def __init__(
+        self,
+        engine: Engine,
+        version: int,
+        batch_size: int = 1000,
+        pause_ms: int = 0,
+        deadline: Optional[float] = None,
+        echo: Callable[[str], None] = print
+    ):
+        self.engine = engine
+        self.version = version
+        self.batch_size = batch_size
+        self.pause = pause_ms / 1000
+        self.deadline = deadline
+        self.echo = echo
+
+    @property
+    def dialect(self) -> str:
+        return self.engine.dialect.name
+
+    # ---- Introspection ----
+
+    def has_table(self, table: str) -> bool:
+        return inspect(self.engine).has_table(table)
+
+    def has_column(self, table: str, column: str) -> bool:
+        if not self.has_table(table):
+            return False
+        return any(col["name"] == column for col in inspect(self.engine).get_columns(table))
+
+    def has_index(self, table: str, name: str) -> bool:
+        if not self.has_table(table):
+            return False
+        return any(index["name"] == name for index in inspect(self.engine).get_indexes(table))
+
+    def log(self, message: str) -> None:
+        self.echo(f"[{self.version:04d}] {message}")
+
+    def check_budget(self) -> None:
+        """Stop here if the time budget is used up."""
+        if self.deadline is not None and time.monotonic() >= self.deadline:
+            raise MigrationPaused()
+
+    # ---- DDL ----
+
+    def execute(self, sql: str, **params) -> int:
+        """Run one statement in its own transaction; returns the affected row count."""
+        self.check_budget()
+        for attempt in range(LOCK_RETRIES):
+            try:
+                with self.engine.begin() as conn:
+                    if self.dialect == "postgresql":
+                        conn.execute(text(f"SET LOCAL lock_timeout = '{LOCK_TIMEOUT}'"))
+                    return conn.execute(text(sql), params).rowcount
+            except OperationalError as exc:
+                if getattr(exc.orig, "pgcode", None) != LOCK_NOT_AVAILABLE or attempt == LOCK_RETRIES - 1:
+                    raise
+                self.log(f"Table is busy, retrying ({attempt + 1}/{LOCK_RETRIES})")
+                time.sleep(2 ** attempt)
+
+    def create_table(self, table: Table) -> None:
+        """Create a table (defined in the migration itself) if it doesn't exist."""
+        if self.has_table(table.name):
+            return
+        table.create(self.engine, checkfirst=True)
+        self.log(f"Created table {table.name}")
+
+    def add_column(self, table: str, column: Column, references: Optional[str] = None) -> None:
+        """
+        Add a column if it doesn't exist.
+        Adding a nullable column or one with a constant default only changes the
+        catalog on both backends; fill computed values with backfill().
+        """
+        if self.has_column(table, column.name):
+            return
+        if column.table is None:
+            # CreateColumn needs the column to belong to a table
+            Table(table, MetaData(), column)
+        spec = CreateColumn(column).compile(dialect=self.engine.dialect)
+        if references:
+            spec = f"{spec} REFERENCES {references}"
+        self.execute(f"ALTER TABLE {table} ADD COLUMN {spec}")
+        self.log(f"Added column {table}.{column.name}")
+
+    def drop_column(self, table: str, column: str) -> None:
+        if not self.has_column(table, column):
+            return
+        self.execute(f"ALTER TABLE {table} DROP COLUMN {column}")
+        self.log(f"Dropped column {table}.{column}")
+
+    def create_index(self, name: str, table: str, columns: str, unique: bool = False) -> None:
+        """
+        Create an index if it doesn't exist.
+        On PostgreSQL the index is built CONCURRENTLY, so writes continue during the build.
+        """
+        kind = "UNIQUE INDEX" if unique else "INDEX"
+        if self.dialect != "postgresql":
+            if not self.has_index(table, name):
+                self.execute(f"CREATE {kind} IF NOT EXISTS {name} ON {table} ({columns})")
+                self.log(f"Created index {name}")
+            return
+
+        self.check_budget()
+        with self.engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            valid = conn.execute(text(
+                "SELECT i.indisvalid FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+                "WHERE c.relname = :name"
+            ), {"name": name}).scalar()
+            if valid:
+                return
+            if valid is False:
+                # Left behind by an interrupted concurrent build
+                conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {name}"))
+            conn.execute(text(f"CREATE {kind} CONCURRENTLY IF NOT EXISTS {name} ON {table} ({columns})"))
+        self.log(f"Created index {name}")
+
+    def drop_index(self, name: str) -> None:
+        if self.dialect == "postgresql":
+            with self.engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+                conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {name}"))
+        else:
+            self.execute(f"DROP INDEX IF EXISTS {name}")
+
+    def drop_table(self, table: str) -> None:
+        if self.has_table(table):
+            self.execute(f"DROP TABLE {table}")
+            self.log(f"Dropped table {table}")
+
+    # ---- Backfills ----
+
+    def backfill(self, step: str, table: str, set_clause: str, where: str = "1 = 1", key: str = "id", **params) -> None:
+        """
+        UPDATE a table in key-ordered chunks of batch_size rows.
+
+        Each chunk commits together with its cursor in schema_migration_progress,
+        so an interrupted backfill resumes after the last committed chunk. Chunks
+        are separated by pause_ms to leave room for application writes.
+
+        Args:
+            step: Name of this backfill, unique within the migration
+            table: Table to update
+            set_clause: SQL for the SET part, e.g. "subject_id = (SELECT ...)"
+            where: Extra condition rows must match to be updated
+            key: Unique column to walk the table by (SQLite always uses rowid)
+        """
+        cursor_column = "rowid" if self.dialect == "sqlite" else key
+        last, rows_done, done = self._load_progress(step)
+        if done:
+            return
+
+        with self.engine.connect() as conn:
+            total = conn.execute(text(f"SELECT COUNT(*) FROM {table}")).scalar()
+        started = time.monotonic()
+        started_rows = rows_done
+
+        while True:
+            self.check_budget()
+            with self.engine.begin() as conn:
+                after = f"{cursor_column} > :last" if last is not None else "1 = 1"
+                upper = conn.execute(text(
+                    f"SELECT {cursor_column} FROM {table} WHERE {after} "
+                    f"ORDER BY {cursor_column} LIMIT 1 OFFSET :offset"
+                ), {"last": last, "offset": self.batch_size - 1}).scalar()
+                bound = f" AND {cursor_column} <= :upper" if upper is not None else ""
+                conn.execute(
+                    text(f"UPDATE {table} SET {set_clause} WHERE {after}{bound} AND ({where})"),
+                    {**params, "last": last, "upper": upper}
+                )
+                rows_done = min(total, rows_done + self.batch_size) if upper is not None else total
+                if upper is not None:
+                    last = upper
+                self._save_progress(conn, step, None if last is None else str(last), rows_done, done=upper is None)
+
+            elapsed = time.monotonic() - started
+            rate = (rows_done - started_rows) / elapsed if elapsed > 0 else 0
+            percent = rows_done * 100 / total if total else 100
+            self.log(f"{step}: {rows_done:,}/{total:,} rows ({percent:.1f}%, {rate:,.0f} rows/s)")
+
+            if upper is None:
+                return
+            if self.pause:
+                time.sleep(self.pause)
+
+    def _load_progress(self, step: str):
+        with self.engine.connect() as conn:
+            row = conn.execute(
+                migration_progress.select().where(
+                    migration_progress.c.version == self.version,
+                    migration_progress.c.step == step
+                )
+            ).first()
+        if row is None:
+            return None, 0, False
+        last = row.cursor
+        if last is not None and self.dialect == "sqlite":
+            last = int(last)
+        return last, row.rows_done, row.done
+
+    def _save_progress(self, conn: Connection, step: str, cursor: Optional[str], rows_done: int, done: bool) -> None:
+        values = {
+            "cursor": cursor,
+            "rows_done": rows_done,
+            "done": done,
+            "updated_at": datetime.now(timezone.utc)
+        }
+        updated = conn.execute(
+            migration_progress.update().where(
+                migration_progress.c.version == self.version,
+                migration_progress.c.step == step
+            ).values(**values)
+        ).rowcount
+        if not updated:
+            conn.execute(migration_progress.insert().values(version=self.version, step=step, **values))
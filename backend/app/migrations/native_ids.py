@@ -0,0 +1,125 @@
+"""
+Conversion of existing text IDs to native UUID storage (ID_STORAGE=native).
+
+Not a versioned migration: it only applies when a deployment switches
+ID_STORAGE, and must run before the application starts with the new setting.
+"""
+import time
+import uuid
+from typing import Callable, Optional
+
+from sqlalchemy import event, inspect, text
+from sqlalchemy.engine import Engine
+
+from app.migrations.context import MigrationContext, MigrationPaused
+from app.migrations.tables import metadata, migration_progress
+
+# Progress rows of this conversion use a version no migration has
+NATIVE_IDS_VERSION = 0
+
+# Columns holding learning item / review IDs
+ID_COLUMNS = [
+    ("learning_items", "id"),
+    ("review_history", "id"),
+    ("review_history", "learning_item_id"),
+    ("due_queue", "learning_item_id"),
+    ("item_signatures", "learning_item_id"),
+    ("item_signature_bands", "learning_item_id"),
+    ("cold_item_contents", "learning_item_id"),
+]
+
+
+def uuid_to_blob(value):
+    """Convert a textual UUID to its 16 bytes (SQLite function)."""
+    return uuid.UUID(value).bytes
+
+
+def convert_ids_to_native(
+    engine: Engine,
+    batch_size: int = 1000,
+    pause_ms: int = 0,
+    time_budget: Optional[float] = None,
+    echo: Callable[[str], None] = print
+) -> bool:
+    """
+    Convert ID columns to native storage.
+
+    SQLite: text values are rewritten as 16-byte BLOBs in resumable chunks.
+    PostgreSQL: columns are altered to the uuid type. This rewrites the tables
+    under an exclusive lock, so run it in a maintenance window.
+
+    Returns:
+        True when done, False if the time budget ran out (run again to resume)
+    """
+    metadata.create_all(engine)
+    deadline = time.monotonic() + time_budget if time_budget else None
+    ctx = MigrationContext(
+        engine, NATIVE_IDS_VERSION,
+        batch_size=batch_size, pause_ms=pause_ms, deadline=deadline, echo=echo
+    )
+    try:
+        if engine.dialect.name == "postgresql":
+            _alter_to_uuid(ctx)
+        else:
+            _rewrite_as_blobs(ctx)
+    except MigrationPaused:
+        echo("[PAUSED] Time budget used up, run again to resume")
+        return False
+
+    with engine.begin() as conn:
+        conn.execute(migration_progress.delete().where(migration_progress.c.version == NATIVE_IDS_VERSION))
+    return True
+
+
+def _rewrite_as_blobs(ctx: MigrationContext) -> None:
+    @event.listens_for(ctx.engine, "connect")
+    def register(dbapi_connection, connection_record):
+        dbapi_connection.create_function("uuid_to_blob", 1, uuid_to_blob, deterministic=True)
+
+    # Connections opened before the listener was added need it too
+    ctx.engine.dispose()
+    try:
+        for table, column in ID_COLUMNS:
+            if ctx.has_table(table):
+                ctx.backfill(
+                    f"{table}.{column}", table,
+                    f"{column} = uuid_to_blob({column})",
+                    where=f"typeof({column}) = 'text'"
+                )
+    finally:
+        event.remove(ctx.engine, "connect", register)
+        ctx.engine.dispose()
+
+
+def _alter_to_uuid(ctx: MigrationContext) -> None:
+    inspector = inspect(ctx.engine)
+    id_column = next(col for col in inspector.get_columns("learning_items") if col["name"] == "id")
+    if str(id_column["type"]) == "UUID":
+        ctx.log("IDs already use the uuid type")
+        return
+
+    tables = [
+        t for t in ("review_history", "due_queue", "item_signatures", "item_signature_bands", "cold_item_contents")
+        if inspector.has_table(t)
+    ]
+    foreign_keys = [
+        (table, fk["name"])
+        for table in tables
+        for fk in inspector.get_foreign_keys(table)
+        if fk["referred_table"] == "learning_items"
+    ]
+    with ctx.engine.begin() as conn:
+        for table, name in foreign_keys:
+            conn.execute(text(f"ALTER TABLE {table} DROP CONSTRAINT {name}"))
+        for table, column in ID_COLUMNS:
+            if table == "learning_items" or table in tables:
+                conn.execute(text(
+                    f"ALTER TABLE {table} ALTER COLUMN {column} TYPE uuid USING {column}::uuid"
+                ))
+                ctx.log(f"Converted {table}.{column} to uuid")
+        # Every model references learning_items with ondelete="CASCADE"
+        for table, name in foreign_keys:
+            conn.execute(text(
+                f"ALTER TABLE {table} ADD CONSTRAINT {name} "
+                f"FOREIGN KEY (learning_item_id) REFERENCES learning_items (id) ON DELETE CASCADE"
+            ))
@@ -0,0 +1,188 @@
+"""
+Versioned schema migrations: discovery, bookkeeping and execution.
+"""
+import importlib
+import pkgutil
+import time
+import zlib
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Engine
+
+from app.migrations import versions
+from app.migrations.context import MigrationContext, MigrationPaused
+from app.migrations.tables import metadata, migration_progress, schema_migrations
+
+# Key for pg_try_advisory_lock, so only one process migrates at a time
+ADVISORY_LOCK_KEY = zlib.crc32(b"review_tool.schema_migrations")
+
+
+class Migration:
+    """A migration module in app/migrations/versions (vNNNN_name.py with upgrade(ctx))."""
+
+    def __init__(self, module):
+        self.version: int = module.VERSION
+        self.name: str = module.__name__.rsplit(".", 1)[-1]
+        self.description: str = (module.__doc__ or "").strip().split("\n")[0]
+        self.upgrade: Callable[[MigrationContext], None] = module.upgrade
+
+
+def load_migrations() -> List[Migration]:
+    """Get all migrations ordered by version."""
+    migrations = [
+        Migration(importlib.import_module(f"{versions.__name__}.{info.name}"))
+        for info in pkgutil.iter_modules(versions.__path__)
+        if info.name.startswith("v")
+    ]
+    migrations.sort(key=lambda m: m.version)
+    seen = set()
+    for migration in migrations:
+        if migration.version in seen:
+            raise RuntimeError(f"Duplicate migration version {migration.version}")
+        seen.add(migration.version)
+    return migrations
+
+
+def get_applied_versions(engine: Engine) -> set:
+    if not inspect(engine).has_table(schema_migrations.name):
+        return set()
+    with engine.connect() as conn:
+        return {row.version for row in conn.execute(schema_migrations.select())}
+
+
+def get_status(engine: Engine) -> Dict:
+    """Get applied and pending migrations, with backfill progress of unfinished ones."""
+    applied = get_applied_versions(engine)
+    progress = {}
+    if inspect(engine).has_table(migration_progress.name):
+        with engine.connect() as conn:
+            for row in conn.execute(migration_progress.select()):
+                progress.setdefault(row.version, []).append({
+                    "step": row.step,
+                    "rows_done": row.rows_done,
+                    "done": row.done
+                })
+    return {
+        "applied": [m.name for m in load_migrations() if m.version in applied],
+        "pending": [
+            {"name": m.name, "description": m.description, "backfills": progress.get(m.version, [])}
+            for m in load_migrations() if m.version not in applied
+        ]
+    }
+
+
+def stamp(engine: Engine, migrations: Optional[List[Migration]] = None) -> None:
+    """Record migrations as applied without running them (schema created by create_all)."""
+    metadata.create_all(engine)
+    applied = get_applied_versions(engine)
+    now = datetime.now(timezone.utc)
+    with engine.begin() as conn:
+        for migration in migrations if migrations is not None else load_migrations():
+            if migration.version not in applied:
+                conn.execute(schema_migrations.insert().values(
+                    version=migration.version, name=migration.name, applied_at=now
+                ))
+
+
+def upgrade(
+    engine: Engine,
+    create_all: Optional[Callable[[], None]] = None,
+    batch_size: int = 1000,
+    pause_ms: int = 0,
+    time_budget: Optional[float] = None,
+    echo: Callable[[str], None] = print
+) -> Dict:
+    """
+    Bring the database schema up to date.
+
+    A fresh database gets the current schema from create_all() and every
+    migration is stamped as applied. Otherwise pending migrations run in
+    order; if the time budget runs out the run stops between chunks and the
+    next call resumes where it left off.
+
+    Args:
+        engine: Engine of the database to migrate
+        create_all: Creates the current model tables (Base.metadata.create_all)
+        batch_size: Rows per backfill chunk
+        pause_ms: Pause between backfill chunks (throttling)
+        time_budget: Seconds to spend before pausing (None = no limit)
+        echo: Progress output
+
+    Returns:
+        Dictionary with applied migration names and whether the schema is current
+    """
+    deadline = time.monotonic() + time_budget if time_budget else None
+    migrations = load_migrations()
+
+    if not inspect(engine).has_table("learning_items"):
+        if create_all:
+            create_all()
+        stamp(engine, migrations)
+        echo("[OK] Created schema, all migrations marked as applied")
+        return {"applied": [], "complete": True}
+
+    metadata.create_all(engine)
+    applied_now = []
+    with _migration_lock(engine) as acquired:
+        if not acquired:
+            echo("[SKIP] Another process is running migrations")
+            return {"applied": [], "complete": False}
+
+        applied = get_applied_versions(engine)
+        for migration in migrations:
+            if migration.version in applied:
+                continue
+            echo(f"Applying {migration.name}...")
+            ctx = MigrationContext(
+                engine, migration.version,
+                batch_size=batch_size, pause_ms=pause_ms, deadline=deadline, echo=echo
+            )
+            try:
+                migration.upgrade(ctx)
+            except MigrationPaused:
+                echo(f"[PAUSED] Time budget used up during {migration.name}, run again to resume")
+                return {"applied": applied_now, "complete": False}
+
+            with engine.begin() as conn:
+                conn.execute(migration_progress.delete().where(migration_progress.c.version == migration.version))
+                conn.execute(schema_migrations.insert().values(
+                    version=migration.version,
+                    name=migration.name,
+                    applied_at=datetime.now(timezone.utc)
+                ))
+            applied_now.append(migration.name)
+            echo(f"[OK] Applied {migration.name}")
+
+    # Tables added since the last migration (e.g. new models) are created as usual
+    if create_all:
+        create_all()
+    return {"applied": applied_now, "complete": True}
+
+
+class _migration_lock:
+    """Session-level PostgreSQL advisory lock; always acquired on other backends."""
+
+    def __init__(self, engine: Engine):
+        self.engine = engine
+        self.conn = None
+        self.acquired = False
+
+    def __enter__(self) -> bool:
+        if self.engine.dialect.name != "postgresql":
+            return True
+        self.conn = self.engine.connect()
+        self.acquired = bool(
+            self.conn.execute(text("SELECT pg_try_advisory_lock(:key)"), {"key": ADVISORY_LOCK_KEY}).scalar()
+        )
+        self.conn.commit()
+        return self.acquired
+
+    def __exit__(self, *exc_info) -> None:
+        if self.conn is None:
+            return
+        if self.acquired:
+            self.conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": ADVISORY_LOCK_KEY})
+            self.conn.commit()
+        self.conn.close()
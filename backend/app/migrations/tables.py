@@ -0,0 +1,26 @@
+"""
+Bookkeeping tables for schema migrations.
+Kept out of the models' metadata so create_all never touches them.
+"""
+from sqlalchemy import Boolean, Column, DateTime, Integer, MetaData, String, Table
+
+metadata = MetaData()
+
+# One row per applied migration version
+schema_migrations = Table(
+    "schema_migrations", metadata,
+    Column("version", Integer, primary_key=True, autoincrement=False),
+    Column("name", String(100), nullable=False),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+# Cursor of each backfill that has started but not finished its migration
+migration_progress = Table(
+    "schema_migration_progress", metadata,
+    Column("version", Integer, primary_key=True, autoincrement=False),
+    Column("step", String(100), primary_key=True),
+    Column("cursor", String(64)),
+    Column("rows_done", Integer, nullable=False, default=0),
+    Column("done", Boolean, nullable=False, default=False),
+    Column("updated_at", DateTime, nullable=False),
+)
@@ -0,0 +1,6 @@
+"""
+Migration modules, applied in VERSION order.
+
+Each module is named vNNNN_<description>.py and defines VERSION and upgrade(ctx).
+Steps must be idempotent: a migration interrupted halfway runs again from the start.
+"""
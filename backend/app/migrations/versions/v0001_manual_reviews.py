@@ -0,0 +1,17 @@
+"""
+Track manual reviews (learning_items.manual_review_count, review_history.is_manual).
+"""
+from sqlalchemy import Boolean, Column, Integer, false
+
+VERSION = 1
+
+
+def upgrade(ctx):
+    ctx.add_column(
+        "learning_items",
+        Column("manual_review_count", Integer, nullable=False, server_default="0")
+    )
+    ctx.add_column(
+        "review_history",
+        Column("is_manual", Boolean, nullable=False, server_default=false())
+    )
@@ -0,0 +1,14 @@
+"""
+Review session leases on due_queue (lease_token, leased_until).
+"""
+from sqlalchemy import Column, DateTime, String
+
+VERSION = 2
+
+
+def upgrade(ctx):
+    # A database without the due queue gets it, leases included, from create_all
+    if not ctx.has_table("due_queue"):
+        return
+    ctx.add_column("due_queue", Column("lease_token", String(36)))
+    ctx.add_column("due_queue", Column("leased_until", DateTime(timezone=True)))
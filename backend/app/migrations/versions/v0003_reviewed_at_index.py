@@ -0,0 +1,8 @@
+"""
+Index review_history.reviewed_at for per-day activity aggregates.
+"""
+VERSION = 3
+
+
+def upgrade(ctx):
+    ctx.create_index("ix_review_history_reviewed_at", "review_history", "reviewed_at")
@@ -0,0 +1,58 @@
+"""
+Move learning_items.subject into the subjects table (learning_items.subject_id).
+"""
+from sqlalchemy import Column, Date, DateTime, Integer, MetaData, String, Table, func
+
+VERSION = 4
+
+# Table as of this migration (not the current model)
+subjects = Table(
+    "subjects", MetaData(),
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    Column("name", String(255), nullable=False, unique=True),
+    Column("live_count", Integer, nullable=False, server_default="0"),
+    Column("due_count", Integer, nullable=False, server_default="0"),
+    Column("due_count_date", Date),
+    Column("created_at", DateTime(timezone=True), nullable=False, server_default=func.now()),
+)
+
+
+def upgrade(ctx):
+    ctx.create_table(subjects)
+    if not ctx.has_column("learning_items", "subject"):
+        return
+
+    # Distinct subjects are few; one statement is fine
+    ctx.execute("""
+        INSERT INTO subjects (name)
+        SELECT DISTINCT subject FROM learning_items
+        WHERE NOT EXISTS (SELECT 1 FROM subjects WHERE subjects.name = learning_items.subject)
+    """)
+    ctx.add_column("learning_items", Column("subject_id", Integer), references="subjects (id)")
+    ctx.backfill(
+        "learning_items.subject_id",
+        "learning_items",
+        "subject_id = (SELECT id FROM subjects WHERE subjects.name = learning_items.subject)",
+        where="subject_id IS NULL"
+    )
+    # The model declares subject_id NOT NULL. PostgreSQL can enforce it now that
+    # every row is backfilled; SQLite can't add the constraint to an existing
+    # column (it would take a table rebuild), so there it stays nullable in the
+    # schema and only the application keeps it set
+    if ctx.dialect == "postgresql":
+        ctx.execute("ALTER TABLE learning_items ALTER COLUMN subject_id SET NOT NULL")
+    ctx.execute("""
+        UPDATE subjects
+        SET live_count = (
+            SELECT COUNT(*) FROM learning_items
+            WHERE learning_items.subject_id = subjects.id AND learning_items.is_deleted = :deleted
+        )
+    """, deleted=False)
+    ctx.create_index("ix_learning_items_subject_id", "learning_items", "subject_id")
+    ctx.drop_index("ix_learning_items_subject")
+    ctx.drop_column("learning_items", "subject")
+
+    # The due queue was keyed by subject name; create_all recreates it and the
+    # first due read rebuilds it by subject ID
+    ctx.drop_table("due_queue")
+    ctx.drop_table("due_queue_state")
@@ -0,0 +1,10 @@
+"""
+Index review_history (learning_item_id, reviewed_at) for adherence analytics.
+"""
+VERSION = 5
+
+
+def upgrade(ctx):
+    ctx.create_index(
+        "ix_review_history_item_reviewed_at", "review_history", "learning_item_id, reviewed_at"
+    )
@@ -0,0 +1,13 @@
+"""
+Hot/cold tiering flag (learning_items.is_cold); cold_item_contents comes from create_all.
+"""
+from sqlalchemy import Boolean, Column, false
+
+VERSION = 6
+
+
+def upgrade(ctx):
+    ctx.add_column(
+        "learning_items",
+        Column("is_cold", Boolean, nullable=False, server_default=false())
+    )
@@ -0,0 +1,13 @@
+"""
+Soft delete timestamp (learning_items.deleted_at) for purging after a retention period.
+"""
+from sqlalchemy import Column, DateTime
+
+VERSION = 7
+
+
+def upgrade(ctx):
+    ctx.add_column("learning_items", Column("deleted_at", DateTime(timezone=True), nullable=True))
+    # Items deleted before the column existed: their last update was the delete
+    ctx.backfill("deleted_at", "learning_items", "deleted_at = updated_at", where="is_deleted = :deleted", deleted=True)
+    ctx.create_index("ix_learning_items_deleted_at", "learning_items", "deleted_at")
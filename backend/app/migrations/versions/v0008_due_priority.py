@@ -0,0 +1,20 @@
+"""
+Priority due order: subjects.priority_weight, due_queue.interval_days and due_queue.priority_key.
+"""
+from sqlalchemy import Column, Float, Integer
+
+VERSION = 8
+
+
+def upgrade(ctx):
+    ctx.add_column("subjects", Column("priority_weight", Float, nullable=False, server_default="1"))
+    # A database without the due queue (e.g. dropped by v0004) gets it, priorities included, from create_all
+    if not ctx.has_table("due_queue"):
+        return
+    ctx.add_column("due_queue", Column("interval_days", Integer, nullable=False, server_default="0"))
+    ctx.add_column("due_queue", Column("priority_key", Float, nullable=False, server_default="0"))
+    ctx.create_index("ix_due_queue_priority_key", "due_queue", "priority_key")
+    ctx.create_index("ix_due_queue_subject_id_priority_key", "due_queue", "subject_id, priority_key")
+    # Dropping the bookkeeping row makes the next due read rebuild the queue with priorities
+    if ctx.has_table("due_queue_state"):
+        ctx.execute("DELETE FROM due_queue_state")
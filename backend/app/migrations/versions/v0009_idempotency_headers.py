@@ -0,0 +1,12 @@
+"""
+Stored response headers for idempotency keys (idempotency_keys.response_headers).
+"""
+from sqlalchemy import Column, LargeBinary
+
+VERSION = 9
+
+
+def upgrade(ctx):
+    # Databases without the table get it, column included, from create_all
+    if ctx.has_table("idempotency_keys"):
+        ctx.add_column("idempotency_keys", Column("response_headers", LargeBinary, nullable=True))
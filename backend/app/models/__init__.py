@@ -1,7 +1,24 @@
 """
 Database models.
 """
+from app.models.subject import Subject
 from app.models.learning_item import LearningItem
 from app.models.review_history import ReviewHistory
+from app.models.due_queue import DueQueueEntry, DueQueueState
+from app.models.item_signature import ItemSignature, ItemSignatureBand
+from app.models.cold_item_content import ColdItemContent
+from app.models.idempotency_key import IdempotencyKey
+from app.models.cache_version import CacheVersion
 
-__all__ = ["LearningItem", "ReviewHistory"]
+__all__ = [
+    "Subject",
+    "LearningItem",
+    "ReviewHistory",
+    "DueQueueEntry",
+    "DueQueueState",
+    "ItemSignature",
+    "ItemSignatureBand",
+    "ColdItemContent",
+    "IdempotencyKey",
+    "CacheVersion"
+]
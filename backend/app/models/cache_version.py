@@ -0,0 +1,20 @@
+"""
+Cache version database model.
+"""
+from sqlalchemy import Column, Integer, String
+from app.database import Base
+
+
+class CacheVersion(Base):
+    """
+    Model for the version stamp of a process-local cache.
+    Bumped in the transaction that invalidates the cached data (e.g. a purge),
+    so every process sees the new version and drops what it cached before.
+    """
+    __tablename__ = "cache_versions"
+
+    name = Column(String(50), primary_key=True)
+    version = Column(Integer, default=0, nullable=False)
+
+    def __repr__(self):
+        return f"<CacheVersion(name={self.name}, version={self.version})>"
@@ -0,0 +1,21 @@
+"""
+Cold tier database model.
+"""
+from sqlalchemy import Column, ForeignKey
+from app.database import Base
+from app.models.types import CompressedText, id_column_type
+
+
+class ColdItemContent(Base):
+    """
+    Model for the content of cold (long-interval) items.
+    While an item is cold its learning_items row keeps an empty content, so
+    scans of the hot table don't read content that is rarely needed.
+    """
+    __tablename__ = "cold_item_contents"
+
+    learning_item_id = Column(id_column_type(), ForeignKey("learning_items.id", ondelete="CASCADE"), primary_key=True)
+    content = Column(CompressedText, nullable=False)
+
+    def __repr__(self):
+        return f"<ColdItemContent(item_id={self.learning_item_id})>"
@@ -0,0 +1,56 @@
+"""
+Due Queue database models.
+"""
+from sqlalchemy import Column, String, Integer, Float, Date, DateTime, ForeignKey, Index
+from app.database import Base
+from app.models.types import id_column_type
+
+
+class DueQueueEntry(Base):
+    """
+    Model for the materialized due queue.
+    Holds one row per live item whose next review falls inside the queue horizon,
+    so due reads are an indexed range scan instead of a full table filter and sort.
+    """
+    __tablename__ = "due_queue"
+
+    learning_item_id = Column(id_column_type(), ForeignKey("learning_items.id", ondelete="CASCADE"), primary_key=True)
+    due_date = Column(Date, nullable=False)
+    subject_id = Column(Integer, ForeignKey("subjects.id"), nullable=False)
+
+    # Tie-breaker within a due date (item creation time)
+    sort_key = Column(DateTime(timezone=True), nullable=False)
+
+    # Priority order: subject weight * days overdue / interval, as of the last
+    # roll-over (recomputed daily); higher is more urgent
+    interval_days = Column(Integer, default=0, nullable=False)
+    priority_key = Column(Float, default=0, nullable=False)
+
+    # Review session lease (keeps two devices from getting the same cards)
+    lease_token = Column(String(36), nullable=True)
+    leased_until = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        Index("ix_due_queue_due_date_sort_key", "due_date", "sort_key"),
+        Index("ix_due_queue_subject_id_due_date_sort_key", "subject_id", "due_date", "sort_key"),
+        Index("ix_due_queue_priority_key", "priority_key"),
+        Index("ix_due_queue_subject_id_priority_key", "subject_id", "priority_key"),
+    )
+
+    def __repr__(self):
+        return f"<DueQueueEntry(item_id={self.learning_item_id}, due_date={self.due_date})>"
+
+
+class DueQueueState(Base):
+    """
+    Model for the due queue bookkeeping row.
+    Records how far ahead the queue has been filled by the roll-over job.
+    """
+    __tablename__ = "due_queue_state"
+
+    id = Column(Integer, primary_key=True)
+    horizon_end = Column(Date, nullable=False)
+    rolled_over_at = Column(DateTime(timezone=True), nullable=False)
+
+    def __repr__(self):
+        return f"<DueQueueState(horizon_end={self.horizon_end})>"
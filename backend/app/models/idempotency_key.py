@@ -0,0 +1,27 @@
+"""
+Idempotency key database model.
+"""
+from sqlalchemy import Column, DateTime, LargeBinary, SmallInteger
+from app.database import Base
+
+
+class IdempotencyKey(Base):
+    """
+    Model for the stored outcome of a request sent with an Idempotency-Key header.
+    Repeats of the key get the stored response instead of running the request again.
+
+    Keys are stored as a 16-byte digest of (tenant, method, path, header value)
+    and requests as a 16-byte digest of their query and body, keeping rows small.
+    A row with status_code 0 is a request still in progress.
+    """
+    __tablename__ = "idempotency_keys"
+
+    key = Column(LargeBinary(16), primary_key=True)
+    request_hash = Column(LargeBinary(16), nullable=False)
+    status_code = Column(SmallInteger, default=0, nullable=False)
+    response_body = Column(LargeBinary, nullable=True)
+    response_headers = Column(LargeBinary, nullable=True)  # JSON list of [name, value]
+    created_at = Column(DateTime(timezone=True), nullable=False, index=True)
+
+    def __repr__(self):
+        return f"<IdempotencyKey(key={self.key.hex()}, status={self.status_code})>"
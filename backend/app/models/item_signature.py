@@ -0,0 +1,38 @@
+"""
+Near-duplicate index database models.
+"""
+from sqlalchemy import Column, BigInteger, LargeBinary, ForeignKey, Index
+from app.database import Base
+from app.models.types import id_column_type
+
+
+class ItemSignature(Base):
+    """
+    Model for an item's MinHash signature (title + content).
+    Only live items have a signature.
+    """
+    __tablename__ = "item_signatures"
+
+    learning_item_id = Column(id_column_type(), ForeignKey("learning_items.id", ondelete="CASCADE"), primary_key=True)
+    signature = Column(LargeBinary, nullable=False)
+
+    def __repr__(self):
+        return f"<ItemSignature(item_id={self.learning_item_id})>"
+
+
+class ItemSignatureBand(Base):
+    """
+    Model for the LSH buckets of an item: one row per signature band.
+    Items sharing a bucket are near-duplicate candidates.
+    """
+    __tablename__ = "item_signature_bands"
+
+    bucket = Column(BigInteger, primary_key=True)
+    learning_item_id = Column(id_column_type(), ForeignKey("learning_items.id", ondelete="CASCADE"), primary_key=True)
+
+    __table_args__ = (
+        Index("ix_item_signature_bands_learning_item_id", "learning_item_id"),
+    )
+
+    def __repr__(self):
+        return f"<ItemSignatureBand(bucket={self.bucket}, item_id={self.learning_item_id})>"
@@ -1,16 +1,11 @@
 """
 Learning Item database model.
 """
-from sqlalchemy import Column, String, Text, Integer, Boolean, Date, DateTime
+from sqlalchemy import Column, String, Integer, Boolean, Date, DateTime, ForeignKey
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database import Base
-import uuid
-
-
-def generate_uuid():
-    """Generate UUID string."""
-    return str(uuid.uuid4())
+from app.models.types import CompressedText, generate_id, id_column_type, utc_now
 
 
 class LearningItem(Base):
@@ -20,14 +15,17 @@ class LearningItem(Base):
     """
     __tablename__ = "learning_items"
 
-    id = Column(String(36), primary_key=True, default=generate_uuid)
-    subject = Column(String(255), nullable=False, index=True)
+    id = Column(id_column_type(), primary_key=True, default=generate_id)
+    subject_id = Column(Integer, ForeignKey("subjects.id"), nullable=False, index=True)
     title = Column(String(500), nullable=False)
-    content = Column(Text, nullable=False)
+    # Empty while the item is cold; read `content`, which hides the tier
+    hot_content = Column("content", CompressedText, nullable=False)
 
     # Timestamps
-    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
-    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+    created_at = Column(DateTime(timezone=True), default=utc_now, server_default=func.now(), nullable=False)
+    updated_at = Column(
+        DateTime(timezone=True), default=utc_now, server_default=func.now(), onupdate=utc_now, nullable=False
+    )
 
     # Review tracking
     review_count = Column(Integer, default=0, nullable=False)
@@ -37,11 +35,38 @@ class LearningItem(Base):
     # Manual review tracking (independent from scheduled reviews)
     manual_review_count = Column(Integer, default=0, nullable=False)
 
-    # Soft delete
+    # Soft delete (hard-deleted after PURGE_RETENTION_DAYS, see ItemPurgeRepository)
     is_deleted = Column(Boolean, default=False, nullable=False)
+    deleted_at = Column(DateTime(timezone=True), nullable=True, index=True)
+
+    # Cold tier: content moved to cold_item_contents (see ItemTierRepository)
+    is_cold = Column(Boolean, default=False, nullable=False)
 
     # Relationships
+    subject_ref = relationship("Subject", lazy="joined")
+    # Loaded on access, i.e. only for cold items (see content)
+    cold_content = relationship("ColdItemContent", uselist=False, cascade="all, delete-orphan")
     review_history = relationship("ReviewHistory", back_populates="learning_item", cascade="all, delete-orphan")
 
+    @property
+    def subject(self) -> str:
+        """Subject name (stored once in the subjects table)."""
+        return self.subject_ref.name if self.subject_ref else None
+
+    @property
+    def content(self) -> str:
+        """Content, from the cold tier if the item is cold."""
+        if self.is_cold and self.cold_content is not None:
+            return self.cold_content.content
+        return self.hot_content
+
+    @content.setter
+    def content(self, value: str) -> None:
+        self.hot_content = value
+        if self.is_cold:
+            # New content is hot; delete-orphan removes the cold row
+            self.is_cold = False
+            self.cold_content = None
+
     def __repr__(self):
         return f"<LearningItem(id={self.id}, subject={self.subject}, title={self.title})>"
@@ -1,16 +1,11 @@
 """
 Review History database model.
 """
-from sqlalchemy import Column, String, Integer, Date, DateTime, ForeignKey, Boolean
+from sqlalchemy import Column, Integer, Date, DateTime, ForeignKey, Boolean, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database import Base
-import uuid
-
-
-def generate_uuid():
-    """Generate UUID string."""
-    return str(uuid.uuid4())
+from app.models.types import generate_id, id_column_type, utc_now
 
 
 class ReviewHistory(Base):
@@ -19,12 +14,16 @@ class ReviewHistory(Base):
     Records each time an item is reviewed.
     """
     __tablename__ = "review_history"
+    __table_args__ = (
+        # An item's history in review order (previous scheduled review lookups)
+        Index("ix_review_history_item_reviewed_at", "learning_item_id", "reviewed_at"),
+    )
 
-    id = Column(String(36), primary_key=True, default=generate_uuid)
-    learning_item_id = Column(String(36), ForeignKey("learning_items.id", ondelete="CASCADE"), nullable=False, index=True)
+    id = Column(id_column_type(), primary_key=True, default=generate_id)
+    learning_item_id = Column(id_column_type(), ForeignKey("learning_items.id", ondelete="CASCADE"), nullable=False, index=True)
 
     # Review details
-    reviewed_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    reviewed_at = Column(DateTime(timezone=True), default=utc_now, server_default=func.now(), nullable=False, index=True)
     interval_days = Column(Integer, nullable=False)
     next_review_date = Column(Date, nullable=False)
     review_number = Column(Integer, nullable=False)
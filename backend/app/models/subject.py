@@ -0,0 +1,32 @@
+"""
+Subject database model.
+"""
+from sqlalchemy import Column, String, Integer, Float, Date, DateTime
+from sqlalchemy.sql import func
+from app.database import Base
+from app.models.types import utc_now
+
+
+class Subject(Base):
+    """
+    Model for subjects.
+    Items reference a subject by integer ID; the counters are maintained by
+    the write paths so the subject list never scans learning_items.
+    """
+    __tablename__ = "subjects"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    name = Column(String(255), nullable=False, unique=True)
+
+    # Cached counters
+    live_count = Column(Integer, default=0, nullable=False)  # Non-deleted items
+    due_count = Column(Integer, default=0, nullable=False)  # Items due as of due_count_date
+    due_count_date = Column(Date, nullable=True)
+
+    # Weight of the subject's items in the priority due order (0 = never ahead of others)
+    priority_weight = Column(Float, default=1.0, nullable=False)
+
+    created_at = Column(DateTime(timezone=True), default=utc_now, server_default=func.now(), nullable=False)
+
+    def __repr__(self):
+        return f"<Subject(id={self.id}, name={self.name})>"
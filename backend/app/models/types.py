@@ -0,0 +1,166 @@
+"""
+Shared column types, column defaults and primary key generation.
+"""
+import base64
+import os
+import time
+import uuid
+import zlib
+from datetime import datetime, timezone
+from sqlalchemy import String, LargeBinary, Text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.types import TypeDecorator
+from app.config import get_settings
+
+try:
+    import zstandard
+except ImportError:  # Optional: pip install zstandard
+    zstandard = None
+
+settings = get_settings()
+
+# Compressed text values start with a control character followed by the codec;
+# anything else is plain (uncompressed) text. Plain text that itself starts
+# with the marker is escaped as marker + CODEC_PLAIN + text.
+COMPRESSED_MARKER = "\x01"
+CODEC_ZLIB = "z"
+CODEC_ZSTD = "s"
+CODEC_PLAIN = "p"
+
+
+def uuid7() -> uuid.UUID:
+    """
+    Generate a time-ordered UUIDv7 (RFC 9562).
+    48-bit millisecond timestamp followed by random bits, so new keys land at
+    the right edge of the index instead of splitting random pages.
+    """
+    timestamp_ms = time.time_ns() // 1_000_000
+    value = int.from_bytes(timestamp_ms.to_bytes(6, "big") + os.urandom(10), "big")
+    value = (value & ~(0xF << 76)) | (0x7 << 76)  # version 7
+    value = (value & ~(0x3 << 62)) | (0x2 << 62)  # RFC 4122 variant
+    return uuid.UUID(int=value)
+
+
+def generate_id() -> str:
+    """Generate a primary key string using the configured ID_SCHEME."""
+    if settings.ID_SCHEME == "uuid7":
+        return str(uuid7())
+    return str(uuid.uuid4())
+
+
+def utc_now() -> datetime:
+    """
+    Current UTC time, as a Python-side column default.
+    The value is known to the session after insert, so no reload is needed.
+    """
+    return datetime.now(timezone.utc)
+
+
+class CompactUUID(TypeDecorator):
+    """
+    UUID stored natively: PostgreSQL `uuid`, 16-byte BLOB elsewhere.
+    Values are plain strings in Python, so the API keeps string IDs.
+    """
+    impl = LargeBinary(16)
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect):
+        if dialect.name == "postgresql":
+            return dialect.type_descriptor(postgresql.UUID(as_uuid=False))
+        return dialect.type_descriptor(LargeBinary(16))
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        try:
+            raw = bytes.fromhex(str(value).replace("-", ""))
+        except ValueError:
+            raw = b""
+        if len(raw) != 16:
+            # Not a UUID: can't match any row, compare against NULL instead of erroring
+            return None
+        if dialect.name == "postgresql":
+            return value
+        return raw
+
+    def process_result_value(self, value, dialect):
+        if value is None or isinstance(value, str):
+            # PostgreSQL returns strings; SQLite rows not migrated yet are still text
+            return value
+        h = bytes(value).hex()
+        return f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
+
+
+def id_column_type():
+    """Get the column type for primary/foreign keys according to ID_STORAGE."""
+    if settings.ID_STORAGE == "native":
+        return CompactUUID()
+    return String(36)
+
+
+def _content_codec() -> str:
+    """Get the codec for new values, or "" when compression is off."""
+    if settings.CONTENT_COMPRESSION == "zstd" and zstandard is not None:
+        return CODEC_ZSTD
+    if settings.CONTENT_COMPRESSION in ("zlib", "zstd"):
+        # zstd requested but not installed: zlib keeps rows readable everywhere
+        return CODEC_ZLIB
+    return ""
+
+
+def compress_text(value: str) -> str:
+    """
+    Compress a text value if compression is on and it is large enough.
+    Returns the value unchanged (escaped if it starts with the marker) when
+    compressing doesn't make it smaller.
+    """
+    plain = COMPRESSED_MARKER + CODEC_PLAIN + value if value.startswith(COMPRESSED_MARKER) else value
+    codec = _content_codec()
+    raw = value.encode("utf-8")
+    if not codec or len(raw) < settings.CONTENT_COMPRESSION_MIN_BYTES:
+        return plain
+    if codec == CODEC_ZSTD:
+        packed = zstandard.ZstdCompressor(level=settings.CONTENT_COMPRESSION_LEVEL).compress(raw)
+    else:
+        packed = zlib.compress(raw, settings.CONTENT_COMPRESSION_LEVEL)
+    # Base64 keeps the value valid text on PostgreSQL
+    encoded = COMPRESSED_MARKER + codec + base64.b64encode(packed).decode("ascii")
+    return encoded if len(encoded) < len(plain) else plain
+
+
+def decompress_text(value: str) -> str:
+    """Read a value written by compress_text (plain text passes through)."""
+    if not value.startswith(COMPRESSED_MARKER):
+        return value
+    codec = value[1:2]
+    if codec == CODEC_PLAIN:
+        return value[2:]
+    if codec not in (CODEC_ZLIB, CODEC_ZSTD):
+        # Plain text stored before the marker was escaped
+        return value
+    packed = base64.b64decode(value[2:])
+    if codec == CODEC_ZSTD:
+        if zstandard is None:
+            raise RuntimeError("Content is zstd-compressed; install zstandard to read it")
+        return zstandard.ZstdDecompressor().decompress(packed).decode("utf-8")
+    return zlib.decompress(packed).decode("utf-8")
+
+
+class CompressedText(TypeDecorator):
+    """
+    Text column compressed at rest (CONTENT_COMPRESSION).
+    Rows written before compression was enabled, or below the size
+    threshold, are stored and read as plain text.
+    """
+    impl = Text
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        return compress_text(value)
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return decompress_text(value)
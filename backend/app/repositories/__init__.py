@@ -3,5 +3,22 @@ Repository layer for data access.
 """
 from app.repositories.learning_item_repository import LearningItemRepository
 from app.repositories.review_history_repository import ReviewHistoryRepository
+from app.repositories.due_queue_repository import DueQueueRepository
+from app.repositories.subject_repository import SubjectRepository
+from app.repositories.item_signature_repository import ItemSignatureRepository
+from app.repositories.item_tier_repository import ItemTierRepository
+from app.repositories.item_purge_repository import ItemPurgeRepository
+from app.repositories.idempotency_repository import IdempotencyRepository
+from app.repositories.cache_version_repository import CacheVersionRepository
 
-__all__ = ["LearningItemRepository", "ReviewHistoryRepository"]
+__all__ = [
+    "LearningItemRepository",
+    "ReviewHistoryRepository",
+    "DueQueueRepository",
+    "SubjectRepository",
+    "ItemSignatureRepository",
+    "ItemTierRepository",
+    "ItemPurgeRepository",
+    "IdempotencyRepository",
+    "CacheVersionRepository"
+]
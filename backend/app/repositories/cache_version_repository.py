@@ -0,0 +1,41 @@
+"""
+Repository for shared cache version stamps.
+"""
+from sqlalchemy.orm import Session
+from sqlalchemy import insert, select, update
+from sqlalchemy.exc import IntegrityError
+from app.models.cache_version import CacheVersion
+
+cache_versions = CacheVersion.__table__
+
+
+class CacheVersionRepository:
+    """Data access layer for cache version stamps."""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get(self, name: str) -> int:
+        """Get a cache's current version (0 if it was never bumped)."""
+        version = self.db.execute(
+            select(cache_versions.c.version).where(cache_versions.c.name == name)
+        ).scalar()
+        return version or 0
+
+    def bump(self, name: str, commit: bool = True) -> None:
+        """Invalidate a cache in every process by incrementing its version."""
+        if not self._increment(name):
+            try:
+                with self.db.begin_nested():
+                    self.db.execute(insert(cache_versions).values(name=name, version=1))
+            except IntegrityError:
+                # Another transaction created the row first
+                self._increment(name)
+        if commit:
+            self.db.commit()
+
+    def _increment(self, name: str) -> int:
+        return self.db.execute(
+            update(cache_versions).where(cache_versions.c.name == name)
+            .values(version=cache_versions.c.version + 1)
+        ).rowcount
@@ -0,0 +1,406 @@
+"""
+Repository for the materialized due queue.
+"""
+from sqlalchemy.orm import Session
+from sqlalchemy import insert, delete, select, update, or_, func
+from sqlalchemy.exc import IntegrityError
+from typing import Any, List, Optional, Dict, Tuple
+from datetime import date, datetime, timedelta, timezone
+from app.models.learning_item import LearningItem
+from app.models.due_queue import DueQueueEntry, DueQueueState
+from app.models.subject import Subject
+from app.core.constants import DUE_QUEUE_HORIZON_DAYS
+from app.database import use_primary
+from app.repositories.learning_item_repository import ITEM_ROWS, ItemRecord, priority_expression, priority_key
+from app.repositories.item_tier_repository import ItemTierRepository
+from app.config import get_settings
+
+STATE_ROW_ID = 1
+
+# Attempts to top up a session when another client claims the same cards concurrently
+LEASE_CLAIM_ATTEMPTS = 3
+
+
+class DueQueueRepository:
+    """
+    Data access layer for the due queue.
+
+    The queue holds every live item with next_review_date <= horizon_end.
+    Write paths keep individual rows in sync; the roll-over job extends the
+    horizon each day by pulling in items that entered the window, and
+    recomputes every row's priority_key for the new day (overdueness grows
+    at a different rate per item, so no key stays valid across days).
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.core_reads = get_settings().REPOSITORY_READ_MODE == "core"
+
+    @staticmethod
+    def horizon_for(today: date) -> date:
+        """Get the horizon end the queue should cover for a given day."""
+        return today + timedelta(days=DUE_QUEUE_HORIZON_DAYS)
+
+    def sync_item(self, item: LearningItem, commit: bool = True) -> None:
+        """Insert, update or remove the queue row for an item after a write."""
+        in_window = item.next_review_date <= self.horizon_for(date.today())
+        if item.is_deleted or not in_window:
+            self.remove(item.id, commit=commit)
+            return
+
+        # A write (e.g. the review itself) ends any session lease on the card
+        self.db.merge(DueQueueEntry(
+            learning_item_id=item.id,
+            due_date=item.next_review_date,
+            subject_id=item.subject_id,
+            sort_key=item.created_at,
+            interval_days=item.current_interval_days,
+            priority_key=priority_key(
+                item.subject_ref.priority_weight, date.today(), item.next_review_date, item.current_interval_days
+            ),
+            lease_token=None,
+            leased_until=None
+        ))
+        if commit:
+            self.db.commit()
+        else:
+            self.db.flush()
+
+    def remove(self, item_id: str, commit: bool = True) -> None:
+        """Remove an item from the queue."""
+        # Flush pending merges first so they can't re-insert the row afterwards
+        self.db.flush()
+        self.db.execute(
+            delete(DueQueueEntry).where(DueQueueEntry.learning_item_id == item_id)
+        )
+        if commit:
+            self.db.commit()
+
+    def requeue_where(self, conditions: list, values: Dict[str, Any], today: date, commit: bool = True) -> None:
+        """
+        Re-queue the items matching conditions as they will be once `values`
+        are applied to them (set-based, for bulk updates). Runs before the
+        UPDATE, in its transaction, while conditions still select the same
+        items; their session leases end as with any write.
+        """
+        matching = select(LearningItem.id).where(*conditions)
+        self.db.execute(
+            delete(DueQueueEntry).where(
+                DueQueueEntry.learning_item_id.in_(matching)
+            ).execution_options(synchronize_session=False)
+        )
+
+        due_date = values.get("next_review_date", LearningItem.next_review_date)
+        subject_id = values.get("subject_id", LearningItem.subject_id)
+        interval_days = values.get("current_interval_days", LearningItem.current_interval_days)
+        weight = select(Subject.priority_weight).where(Subject.id == subject_id).scalar_subquery()
+        self.db.execute(
+            insert(DueQueueEntry).from_select(
+                ["learning_item_id", "due_date", "subject_id", "sort_key", "interval_days", "priority_key"],
+                select(
+                    LearningItem.id,
+                    due_date,
+                    subject_id,
+                    LearningItem.created_at,
+                    interval_days,
+                    priority_expression(self.db.get_bind().dialect.name, today, due_date, interval_days, weight)
+                ).where(*conditions, due_date <= self.horizon_for(today))
+            )
+        )
+        if commit:
+            self.db.commit()
+
+    def get_due_items(
+        self,
+        due_date: date,
+        subject_id: Optional[int] = None,
+        limit: Optional[int] = None,
+        order: str = "due"
+    ) -> List[ItemRecord]:
+        """
+        Get items due by date, read through the queue: in scheduler order, or
+        with order "priority" most urgent first (a scan of the priority_key
+        index that stops after `limit` rows).
+        """
+        if self.core_reads:
+            queue = DueQueueEntry.__table__
+            statement = ITEM_ROWS.join(
+                queue, queue.c.learning_item_id == LearningItem.__table__.c.id
+            ).where(queue.c.due_date <= due_date)
+            if subject_id is not None:
+                statement = statement.where(queue.c.subject_id == subject_id)
+            statement = statement.where(*self._order_bounds(order, due_date)).order_by(*self._order_by(order))
+            if limit is not None:
+                statement = statement.limit(limit)
+            return self.db.execute(statement).all()
+
+        query = self.db.query(LearningItem).join(
+            DueQueueEntry,
+            DueQueueEntry.learning_item_id == LearningItem.id
+        ).filter(
+            DueQueueEntry.due_date <= due_date
+        )
+
+        if subject_id is not None:
+            query = query.filter(DueQueueEntry.subject_id == subject_id)
+
+        query = query.filter(*self._order_bounds(order, due_date)).order_by(*self._order_by(order))
+        if limit is not None:
+            query = query.limit(limit)
+        return query.all()
+
+    def lease_due_items(
+        self,
+        due_date: date,
+        limit: int,
+        lease_token: str,
+        lease_seconds: int,
+        subject_id: Optional[int] = None,
+        order: str = "due"
+    ) -> Tuple[List[LearningItem], datetime]:
+        """
+        Reserve the next due items for a review session.
+
+        Cards already leased under the same token are handed back first, then
+        the lease is topped up with unleased (or expired) cards in `order`
+        (see get_due_items). The claim is a conditional UPDATE, so concurrent sessions never
+        end up holding the same card.
+
+        Returns:
+            Tuple of (leased items in `order`, lease expiry)
+        """
+        now = datetime.now(timezone.utc)
+        leased_until = now + timedelta(seconds=lease_seconds)
+        claimable = or_(
+            DueQueueEntry.lease_token.is_(None),
+            DueQueueEntry.leased_until < now,
+            DueQueueEntry.lease_token == lease_token
+        )
+
+        for _ in range(LEASE_CLAIM_ATTEMPTS):
+            candidates = select(DueQueueEntry.learning_item_id).where(
+                DueQueueEntry.due_date <= due_date,
+                claimable,
+                *self._order_bounds(order, due_date)
+            )
+            if subject_id is not None:
+                candidates = candidates.where(DueQueueEntry.subject_id == subject_id)
+            candidate_ids = self.db.execute(
+                candidates.order_by(*self._order_by(order)).limit(limit)
+            ).scalars().all()
+
+            claimed = self.db.execute(
+                update(DueQueueEntry).where(
+                    DueQueueEntry.learning_item_id.in_(candidate_ids),
+                    claimable
+                ).values(lease_token=lease_token, leased_until=leased_until)
+            ).rowcount
+            self.db.commit()
+
+            if claimed == len(candidate_ids):
+                break
+
+        query = self.db.query(LearningItem).join(
+            DueQueueEntry,
+            DueQueueEntry.learning_item_id == LearningItem.id
+        ).filter(
+            DueQueueEntry.due_date <= due_date,
+            DueQueueEntry.lease_token == lease_token
+        )
+        if subject_id is not None:
+            query = query.filter(DueQueueEntry.subject_id == subject_id)
+
+        items = query.order_by(*self._order_by(order)).limit(limit).all()
+        return items, leased_until
+
+    def release_lease(self, lease_token: str) -> int:
+        """Release all cards held by a session lease."""
+        released = self.db.execute(
+            update(DueQueueEntry).where(
+                DueQueueEntry.lease_token == lease_token
+            ).values(lease_token=None, leased_until=None)
+        ).rowcount
+        self.db.commit()
+        return released
+
+    def ensure_current(self, today: Optional[date] = None) -> DueQueueState:
+        """Roll the queue over if it has not been rolled over for today yet."""
+        today = today or date.today()
+        # Decided on the primary: a lagging replica would repeat the roll-over
+        with use_primary(self.db):
+            state = self.db.get(DueQueueState, STATE_ROW_ID, populate_existing=True)
+            if state is None:
+                return self.rebuild(today)
+            if state.horizon_end < self.horizon_for(today):
+                return self.roll_over(today)
+            return state
+
+    def roll_over(self, today: Optional[date] = None) -> DueQueueState:
+        """
+        Extend the queue horizon to today + DUE_QUEUE_HORIZON_DAYS.
+        Only items whose due date entered the window since the last
+        roll-over are read (indexed range on next_review_date); cold items
+        among them are promoted back to the hot tier.
+        """
+        today = today or date.today()
+        state = self.db.get(DueQueueState, STATE_ROW_ID)
+        if state is None:
+            return self.rebuild(today)
+
+        new_end = self.horizon_for(today)
+        if state.horizon_end >= new_end:
+            return state
+
+        already_queued = select(DueQueueEntry.learning_item_id)
+        self.db.execute(
+            insert(DueQueueEntry).from_select(
+                ["learning_item_id", "due_date", "subject_id", "sort_key", "interval_days"],
+                self._live_rows_query(
+                    LearningItem.next_review_date > state.horizon_end,
+                    LearningItem.next_review_date <= new_end
+                ).where(LearningItem.id.not_in(already_queued))
+            )
+        )
+        ItemTierRepository(self.db).promote_due(state.horizon_end, new_end, commit=False)
+        self.refresh_priorities(today, commit=False)
+        self._refresh_subject_due_counts(today)
+        state.horizon_end = new_end
+        state.rolled_over_at = datetime.now(timezone.utc)
+        try:
+            self.db.commit()
+        except IntegrityError:
+            # Another worker rolled over concurrently
+            self.db.rollback()
+            state = self.db.get(DueQueueState, STATE_ROW_ID)
+        return state
+
+    def rebuild(self, today: Optional[date] = None) -> DueQueueState:
+        """Rebuild the whole queue from the live items table (promoting cold items in it)."""
+        today = today or date.today()
+        horizon_end = self.horizon_for(today)
+
+        try:
+            self.db.execute(delete(DueQueueEntry))
+            self.db.execute(
+                insert(DueQueueEntry).from_select(
+                    ["learning_item_id", "due_date", "subject_id", "sort_key", "interval_days"],
+                    self._live_rows_query(LearningItem.next_review_date <= horizon_end)
+                )
+            )
+            ItemTierRepository(self.db).promote_due(None, horizon_end, commit=False)
+            self.refresh_priorities(today, commit=False)
+            self._refresh_subject_due_counts(today)
+            state = self.db.get(DueQueueState, STATE_ROW_ID)
+            if state is None:
+                state = DueQueueState(id=STATE_ROW_ID)
+                self.db.add(state)
+            state.horizon_end = horizon_end
+            state.rolled_over_at = datetime.now(timezone.utc)
+            self.db.commit()
+        except IntegrityError:
+            # Another worker rebuilt concurrently (e.g. both found no state row)
+            self.db.rollback()
+            state = self.db.get(DueQueueState, STATE_ROW_ID)
+        return state
+
+    def verify(self) -> Dict[str, List[str]]:
+        """
+        Compare the queue against the live due query up to the horizon.
+
+        Returns:
+            Dictionary with item IDs that are missing from the queue,
+            present but stale (wrong date/subject), or extra
+        """
+        state = self.db.get(DueQueueState, STATE_ROW_ID)
+        if state is None:
+            return {"missing": [], "stale": [], "extra": [], "uninitialized": True}
+
+        live = {
+            row[0]: (row[1], row[2])
+            for row in self.db.execute(
+                self._live_rows_query(LearningItem.next_review_date <= state.horizon_end)
+            )
+        }
+        queued = {
+            row[0]: (row[1], row[2])
+            for row in self.db.execute(
+                select(
+                    DueQueueEntry.learning_item_id,
+                    DueQueueEntry.due_date,
+                    DueQueueEntry.subject_id
+                ).where(DueQueueEntry.due_date <= state.horizon_end)
+            )
+        }
+
+        return {
+            "missing": sorted(set(live) - set(queued)),
+            "stale": sorted(k for k in set(live) & set(queued) if live[k] != queued[k]),
+            "extra": sorted(set(queued) - set(live)),
+            "uninitialized": False
+        }
+
+    def refresh_priorities(self, today: date, subject_id: Optional[int] = None, commit: bool = True) -> None:
+        """Recompute priority_key of every queued item (or one subject's) as of a day (one UPDATE)."""
+        weight = select(Subject.priority_weight).where(
+            Subject.id == DueQueueEntry.subject_id
+        ).scalar_subquery()
+        statement = update(DueQueueEntry).values(
+            priority_key=priority_expression(
+                self.db.get_bind().dialect.name,
+                today,
+                DueQueueEntry.due_date,
+                DueQueueEntry.interval_days,
+                weight
+            )
+        ).execution_options(synchronize_session=False)
+        if subject_id is not None:
+            statement = statement.where(DueQueueEntry.subject_id == subject_id)
+        self.db.execute(statement)
+        if commit:
+            self.db.commit()
+
+    @staticmethod
+    def _order_by(order: str) -> tuple:
+        """ORDER BY clauses of a due read order ("due" or "priority")."""
+        if order == "priority":
+            return (DueQueueEntry.priority_key.desc(), DueQueueEntry.due_date.asc(), DueQueueEntry.sort_key.asc())
+        return (DueQueueEntry.due_date.asc(), DueQueueEntry.sort_key.asc())
+
+    @staticmethod
+    def _order_bounds(order: str, due_date: date) -> tuple:
+        """
+        Conditions implied by a due read, stated on the order's index column.
+        Items due by today have a priority_key >= 0 (weights are never
+        negative); saying so lets the planner range-scan a priority_key index
+        instead of sorting every due row of the subject.
+        """
+        if order == "priority" and due_date <= date.today():
+            return (DueQueueEntry.priority_key >= 0,)
+        return ()
+
+    def _refresh_subject_due_counts(self, today: date) -> None:
+        """Recompute every subject's due-today counter from the queue (one UPDATE)."""
+        due_today = select(func.count()).select_from(DueQueueEntry).where(
+            DueQueueEntry.subject_id == Subject.id,
+            DueQueueEntry.due_date <= today
+        ).scalar_subquery()
+        self.db.execute(
+            update(Subject).values(
+                due_count=due_today,
+                due_count_date=today
+            ).execution_options(synchronize_session=False)
+        )
+
+    @staticmethod
+    def _live_rows_query(*conditions):
+        """Select queue columns from live items matching conditions."""
+        return select(
+            LearningItem.id,
+            LearningItem.next_review_date,
+            LearningItem.subject_id,
+            LearningItem.created_at,
+            LearningItem.current_interval_days
+        ).where(
+            LearningItem.is_deleted == False,
+            *conditions
+        )
@@ -0,0 +1,98 @@
+"""
+Repository for idempotency keys.
+"""
+from sqlalchemy.orm import Session
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy import and_, delete, insert, or_, select, update
+from typing import Optional
+from datetime import datetime
+from app.models.idempotency_key import IdempotencyKey
+
+idempotency_keys = IdempotencyKey.__table__
+
+
+class IdempotencyRepository:
+    """
+    Data access layer for idempotency keys.
+
+    A key is reserved (a row with status_code 0) before its request runs and
+    completed with the response afterwards, so a repeat arriving meanwhile, on
+    any process, sees the reservation instead of running the request again.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def reserve(
+        self,
+        key: bytes,
+        request_hash: bytes,
+        now: datetime,
+        expired_before: datetime,
+        stale_before: datetime
+    ) -> Optional[IdempotencyKey]:
+        """
+        Reserve a key for a request and commit.
+
+        An existing row is taken over if it was created before `expired_before`,
+        or is a reservation made before `stale_before` (e.g. by a process that died).
+
+        Returns:
+            None if the key is now reserved for this request, otherwise the
+            existing row (completed, or in progress elsewhere)
+        """
+        try:
+            self.db.execute(insert(idempotency_keys).values(
+                key=key, request_hash=request_hash, status_code=0, created_at=now
+            ))
+            self.db.commit()
+            return None
+        except IntegrityError:
+            self.db.rollback()
+
+        taken_over = self.db.execute(
+            update(idempotency_keys).where(
+                idempotency_keys.c.key == key,
+                or_(
+                    idempotency_keys.c.created_at < expired_before,
+                    and_(idempotency_keys.c.status_code == 0, idempotency_keys.c.created_at < stale_before)
+                )
+            ).values(request_hash=request_hash, status_code=0, response_body=None, response_headers=None, created_at=now)
+        ).rowcount
+        self.db.commit()
+        if taken_over:
+            return None
+        return self.db.get(IdempotencyKey, key)
+
+    def complete(self, key: bytes, status_code: int, response_body: bytes, response_headers: bytes) -> None:
+        """Store the response (body and serialized headers) of a reserved key and commit."""
+        self.db.execute(
+            update(idempotency_keys).where(
+                idempotency_keys.c.key == key
+            ).values(
+                status_code=status_code, response_body=response_body, response_headers=response_headers
+            )
+        )
+        self.db.commit()
+
+    def release(self, key: bytes) -> None:
+        """Drop a reservation (the request may be retried) and commit."""
+        self.db.execute(delete(idempotency_keys).where(
+            idempotency_keys.c.key == key,
+            idempotency_keys.c.status_code == 0
+        ))
+        self.db.commit()
+
+    def delete_expired(self, created_before: datetime, limit: int = 1000) -> int:
+        """
+        Delete up to `limit` keys created before a cutoff and commit.
+
+        Returns:
+            Number of keys deleted
+        """
+        expired = select(idempotency_keys.c.key).where(
+            idempotency_keys.c.created_at < created_before
+        ).limit(limit).scalar_subquery()
+        deleted = self.db.execute(delete(idempotency_keys).where(idempotency_keys.c.key.in_(expired))).rowcount
+        self.db.commit()
+        return deleted
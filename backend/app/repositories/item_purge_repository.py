@@ -0,0 +1,76 @@
+"""
+Repository for purging soft-deleted items.
+"""
+from sqlalchemy.orm import Session
+from sqlalchemy import delete, func, select
+from typing import List, Tuple
+from datetime import datetime
+from app.models.learning_item import LearningItem
+from app.models.review_history import ReviewHistory
+from app.models.due_queue import DueQueueEntry
+from app.models.item_signature import ItemSignature, ItemSignatureBand
+from app.models.cold_item_content import ColdItemContent
+
+learning_items = LearningItem.__table__
+
+# Tables referencing learning_items, deleted before the items themselves.
+# Explicit rather than ON DELETE CASCADE, which SQLite doesn't enforce by default.
+DEPENDENT_TABLES = (
+    ReviewHistory.__table__,
+    DueQueueEntry.__table__,
+    ItemSignatureBand.__table__,
+    ItemSignature.__table__,
+    ColdItemContent.__table__
+)
+
+
+class ItemPurgeRepository:
+    """Data access layer for hard-deleting soft-deleted items."""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_purgeable_ids(self, deleted_before: datetime, limit: int) -> List[str]:
+        """Get IDs of up to `limit` items soft-deleted before a time, oldest deletion first."""
+        return self.db.execute(
+            select(learning_items.c.id).where(
+                learning_items.c.is_deleted == True,
+                learning_items.c.deleted_at < deleted_before
+            ).order_by(learning_items.c.deleted_at).limit(limit)
+        ).scalars().all()
+
+    def count_purgeable(self, deleted_before: datetime) -> int:
+        """Count items soft-deleted before a time."""
+        return self.db.execute(
+            select(func.count()).select_from(learning_items).where(
+                learning_items.c.is_deleted == True,
+                learning_items.c.deleted_at < deleted_before
+            )
+        ).scalar()
+
+    def purge(self, item_ids: List[str], commit: bool = True) -> Tuple[int, int]:
+        """
+        Hard-delete soft-deleted items and every row derived from them in one
+        transaction. Live items among the IDs are left alone.
+
+        Returns:
+            Tuple of (items deleted, review history rows deleted)
+        """
+        item_ids = self.db.execute(
+            select(learning_items.c.id).where(
+                learning_items.c.id.in_(item_ids),
+                learning_items.c.is_deleted == True
+            )
+        ).scalars().all()
+        if not item_ids:
+            return 0, 0
+
+        reviews = 0
+        for table in DEPENDENT_TABLES:
+            result = self.db.execute(delete(table).where(table.c.learning_item_id.in_(item_ids)))
+            if table is ReviewHistory.__table__:
+                reviews = result.rowcount
+        items = self.db.execute(delete(learning_items).where(learning_items.c.id.in_(item_ids))).rowcount
+        if commit:
+            self.db.commit()
+        return items, reviews
@@ -0,0 +1,96 @@
+"""
+Repository for the near-duplicate (MinHash/LSH) index.
+"""
+from sqlalchemy.orm import Session
+from sqlalchemy import delete, func, insert, select
+from typing import List, Optional, Tuple
+from app.models.item_signature import ItemSignature, ItemSignatureBand
+from app.models.learning_item import LearningItem
+
+
+class ItemSignatureRepository:
+    """Data access layer for item signatures and their LSH buckets."""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def replace(self, item_id: str, signature: bytes, buckets: List[int], commit: bool = True) -> None:
+        """Store an item's signature and buckets, replacing any previous ones."""
+        self.replace_many([(item_id, signature, buckets)], commit=commit)
+
+    def replace_many(self, entries: List[Tuple[str, bytes, List[int]]], commit: bool = True) -> None:
+        """Store signatures and buckets of items, indexed or not: (item_id, signature, buckets) per item."""
+        item_ids = [item_id for item_id, _, _ in entries]
+        self.db.execute(delete(ItemSignatureBand).where(ItemSignatureBand.learning_item_id.in_(item_ids)))
+        self.db.execute(delete(ItemSignature).where(ItemSignature.learning_item_id.in_(item_ids)))
+        self.add_many(entries, commit=commit)
+
+    def add_many(self, entries: List[Tuple[str, bytes, List[int]]], commit: bool = True) -> None:
+        """Index items that aren't indexed yet: (item_id, signature, buckets) per item."""
+        self.db.execute(
+            insert(ItemSignature),
+            [{"learning_item_id": item_id, "signature": signature} for item_id, signature, _ in entries]
+        )
+        self.db.execute(
+            insert(ItemSignatureBand),
+            [
+                {"bucket": bucket, "learning_item_id": item_id}
+                for item_id, _, buckets in entries
+                for bucket in set(buckets)
+            ]
+        )
+        if commit:
+            self.db.commit()
+
+    def remove_deleted(self) -> int:
+        """
+        Remove soft-deleted items from the index and commit.
+
+        Returns:
+            Number of items removed
+        """
+        deleted_ids = select(LearningItem.id).where(LearningItem.is_deleted == True)
+        self.db.execute(delete(ItemSignatureBand).where(ItemSignatureBand.learning_item_id.in_(deleted_ids)))
+        removed = self.db.execute(
+            delete(ItemSignature).where(ItemSignature.learning_item_id.in_(deleted_ids))
+        ).rowcount
+        self.db.commit()
+        return removed
+
+    def remove(self, item_id: str, commit: bool = True) -> None:
+        """Remove an item from the index."""
+        self.db.execute(delete(ItemSignatureBand).where(ItemSignatureBand.learning_item_id == item_id))
+        self.db.execute(delete(ItemSignature).where(ItemSignature.learning_item_id == item_id))
+        if commit:
+            self.db.commit()
+
+    def get_candidates(
+        self,
+        buckets: List[int],
+        exclude_id: Optional[str] = None,
+        limit: int = 500
+    ) -> List[Tuple[str, bytes]]:
+        """
+        Get signatures of items sharing at least one bucket.
+        Bucket lookups are primary key range scans; when a bucket is crowded
+        (e.g. a shared template), the items sharing the most bands are kept.
+
+        Returns:
+            List of (item_id, signature)
+        """
+        matches = select(
+            ItemSignatureBand.learning_item_id,
+            func.count().label("bands")
+        ).where(ItemSignatureBand.bucket.in_(buckets))
+        if exclude_id is not None:
+            matches = matches.where(ItemSignatureBand.learning_item_id != exclude_id)
+        matches = matches.group_by(
+            ItemSignatureBand.learning_item_id
+        ).order_by(func.count().desc()).limit(limit).subquery()
+
+        results = self.db.execute(
+            select(ItemSignature.learning_item_id, ItemSignature.signature).join(
+                matches, matches.c.learning_item_id == ItemSignature.learning_item_id
+            )
+        ).all()
+        return [(item_id, signature) for item_id, signature in results]
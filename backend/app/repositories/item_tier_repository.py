@@ -0,0 +1,157 @@
+"""
+Repository for hot/cold item tiering.
+"""
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy import delete, func, insert, select, update
+from typing import Dict, List, Optional
+from datetime import date
+from app.models.learning_item import LearningItem
+from app.models.cold_item_content import ColdItemContent
+from app.models.due_queue import DueQueueEntry
+
+learning_items = LearningItem.__table__
+cold_contents = ColdItemContent.__table__
+
+# IDs per statement when moving items between tiers
+MOVE_BATCH_SIZE = 1000
+
+
+class ItemTierRepository:
+    """
+    Data access layer for the cold tier.
+
+    Demoting moves an item's content into cold_item_contents and leaves an
+    empty content in its learning_items row, so the hot table stays narrow.
+    Promoting moves it back. Reads see the same content either way (see
+    LearningItem.content and ITEM_ROWS). Moves copy the stored (possibly
+    compressed) value as is and don't touch updated_at.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def demote(
+        self,
+        min_interval_days: int,
+        not_due_before: date,
+        after_id: Optional[str] = None,
+        limit: int = MOVE_BATCH_SIZE
+    ) -> List[str]:
+        """
+        Move the content of up to `limit` hot items to the cold tier and commit.
+        Items are taken in ID order; pass the last returned ID to continue.
+
+        Args:
+            min_interval_days: Only items on at least this interval
+            not_due_before: Only items due after this date (outside the due queue)
+            after_id: Only items with a greater ID
+            limit: Maximum number of items to move
+
+        Returns:
+            IDs of the items moved (empty when none are left)
+        """
+        query = select(learning_items.c.id).where(
+            learning_items.c.is_cold == False,
+            learning_items.c.is_deleted == False,
+            learning_items.c.current_interval_days >= min_interval_days,
+            learning_items.c.next_review_date > not_due_before
+        )
+        if after_id is not None:
+            query = query.where(learning_items.c.id > after_id)
+        item_ids = self.db.execute(query.order_by(learning_items.c.id).limit(limit)).scalars().all()
+        if not item_ids:
+            return []
+
+        self.db.execute(
+            insert(cold_contents).from_select(
+                ["learning_item_id", "content"],
+                select(learning_items.c.id, learning_items.c.content).where(learning_items.c.id.in_(item_ids))
+            )
+        )
+        self.db.execute(
+            update(learning_items).where(
+                learning_items.c.id.in_(item_ids)
+            ).values(content="", is_cold=True, updated_at=learning_items.c.updated_at)
+        )
+        self.db.commit()
+        return item_ids
+
+    def promote_item(self, item: LearningItem) -> None:
+        """Move a cold item's content back into its row and commit."""
+        content = item.content
+        self._promote([item.id])
+        self.db.commit()
+
+        # The loaded object already holds the content; align it without a reload
+        cold_row = item.cold_content
+        set_committed_value(item, "hot_content", content)
+        set_committed_value(item, "is_cold", False)
+        set_committed_value(item, "cold_content", None)
+        if cold_row is not None:
+            self.db.expunge(cold_row)
+
+    def promote_due(self, due_after: Optional[date], due_until: date, commit: bool = True) -> int:
+        """
+        Promote cold live items whose next review falls in (due_after, due_until].
+
+        Returns:
+            Number of items promoted
+        """
+        query = select(learning_items.c.id).where(
+            learning_items.c.is_cold == True,
+            learning_items.c.is_deleted == False,
+            learning_items.c.next_review_date <= due_until
+        )
+        if due_after is not None:
+            query = query.where(learning_items.c.next_review_date > due_after)
+        item_ids = self.db.execute(query).scalars().all()
+
+        for start in range(0, len(item_ids), MOVE_BATCH_SIZE):
+            self._promote(item_ids[start:start + MOVE_BATCH_SIZE])
+        if commit:
+            self.db.commit()
+        return len(item_ids)
+
+    def promote_queued(self, conditions: list, commit: bool = True) -> int:
+        """
+        Promote cold items matching conditions that are in the due queue
+        (e.g. re-queued by a bulk update).
+
+        Returns:
+            Number of items promoted
+        """
+        item_ids = self.db.execute(
+            select(learning_items.c.id).where(
+                *conditions,
+                learning_items.c.is_cold == True,
+                learning_items.c.id.in_(select(DueQueueEntry.learning_item_id))
+            )
+        ).scalars().all()
+
+        for start in range(0, len(item_ids), MOVE_BATCH_SIZE):
+            self._promote(item_ids[start:start + MOVE_BATCH_SIZE])
+        if commit:
+            self.db.commit()
+        return len(item_ids)
+
+    def get_counts(self) -> Dict[str, int]:
+        """Count live items per tier."""
+        counts = dict(self.db.execute(
+            select(learning_items.c.is_cold, func.count()).where(
+                learning_items.c.is_deleted == False
+            ).group_by(learning_items.c.is_cold)
+        ).all())
+        return {"hot": counts.get(False, 0), "cold": counts.get(True, 0)}
+
+    def _promote(self, item_ids: List[str]) -> None:
+        cold_content = select(cold_contents.c.content).where(
+            cold_contents.c.learning_item_id == learning_items.c.id
+        ).scalar_subquery()
+        self.db.execute(
+            update(learning_items).where(
+                learning_items.c.id.in_(item_ids),
+                learning_items.c.is_cold == True
+            ).values(content=cold_content, is_cold=False, updated_at=learning_items.c.updated_at)
+        )
+        self.db.execute(delete(cold_contents).where(cold_contents.c.learning_item_id.in_(item_ids)))
@@ -1,24 +1,94 @@
 """
 Repository for learning items data access.
 """
-from sqlalchemy.orm import Session
-from typing import List, Optional
-from datetime import date, datetime, timezone
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy import Date, Integer, func, case, literal, select, update
+from sqlalchemy.engine import Row
+from typing import Any, List, Optional, Dict, Set, Tuple, Union
+from datetime import date, datetime, timedelta, timezone
 from app.models.learning_item import LearningItem
+from app.models.review_history import ReviewHistory
+from app.models.subject import Subject
+from app.models.cold_item_content import ColdItemContent
+from app.config import get_settings
+
+learning_items = LearningItem.__table__
+subjects = Subject.__table__
+cold_contents = ColdItemContent.__table__
+
+# Core SELECT of the LearningItemResponse fields, used when REPOSITORY_READ_MODE=core.
+# Rows have the same attribute names as LearningItem (subject is the joined name),
+# so they validate straight into the response schemas. Statements derived from it
+# share one shape per query, so the engine's compiled cache skips recompiling.
+# Cold items read their content from the cold tier.
+ITEM_ROWS = select(
+    learning_items.c.id,
+    subjects.c.name.label("subject"),
+    learning_items.c.title,
+    case((learning_items.c.is_cold == True, cold_contents.c.content), else_=learning_items.c.content).label("content"),
+    learning_items.c.created_at,
+    learning_items.c.updated_at,
+    learning_items.c.review_count,
+    learning_items.c.next_review_date,
+    learning_items.c.current_interval_days,
+    learning_items.c.manual_review_count,
+    learning_items.c.is_deleted
+).join_from(
+    learning_items, subjects, subjects.c.id == learning_items.c.subject_id
+).outerjoin(
+    cold_contents, cold_contents.c.learning_item_id == learning_items.c.id
+)
+
+# A read result: a mapped item (orm mode) or a plain row (core mode)
+ItemRecord = Union[LearningItem, Row]
+
+# Orders of due reads: scheduler order, or most urgent first
+DUE_ORDERS = ("due", "priority")
+
+
+def priority_key(weight: float, today: date, due_date: date, interval_days: int) -> float:
+    """
+    Priority of a due item: subject weight * days overdue / interval (at
+    least one day). A card overdue by half its interval outranks one overdue
+    by a tenth of a longer interval. Higher is more urgent.
+    """
+    return weight * (today - due_date).days / max(interval_days, 1)
+
+
+def priority_expression(dialect: str, today: date, due_date, interval_days, weight):
+    """priority_key over columns (SQLite has no date subtraction)."""
+    if dialect == "postgresql":
+        days_overdue = literal(today, Date) - due_date
+    else:
+        days_overdue = func.julianday(literal(today.isoformat())) - func.julianday(due_date)
+    return weight * days_overdue / case((interval_days > 1, interval_days), else_=1)
+
+
+def shift_date_expression(dialect: str, due_date, days: int):
+    """due_date + days over a column (SQLite stores dates as text without date arithmetic)."""
+    if dialect == "postgresql":
+        return due_date + literal(days, Integer)
+    return func.date(due_date, f"{days:+d} days", type_=Date)
 
 
 class LearningItemRepository:
-    """Data access layer for learning items."""
+    """
+    Data access layer for learning items.
+
+    Read-only list queries (get_by_ids, get_all, get_due_items) return plain
+    Core rows instead of mapped objects when REPOSITORY_READ_MODE is "core".
+    Single-item reads stay ORM, since they feed the write paths.
+    """
 
     def __init__(self, db: Session):
         self.db = db
+        self.core_reads = get_settings().REPOSITORY_READ_MODE == "core"
 
     def create(self, item_data: dict) -> LearningItem:
         """Create a new learning item."""
         db_item = LearningItem(**item_data)
         self.db.add(db_item)
         self.db.commit()
-        self.db.refresh(db_item)
         return db_item
 
     def get_by_id(self, item_id: str) -> Optional[LearningItem]:
@@ -28,19 +98,47 @@ class LearningItemRepository:
             LearningItem.is_deleted == False
         ).first()
 
+    def get_by_ids(self, item_ids: List[str]) -> List[ItemRecord]:
+        """Get live items by a list of IDs with a single IN query."""
+        if not item_ids:
+            return []
+        if self.core_reads:
+            return self.db.execute(ITEM_ROWS.where(
+                learning_items.c.id.in_(item_ids),
+                learning_items.c.is_deleted == False
+            )).all()
+        return self.db.query(LearningItem).options(
+            selectinload(LearningItem.cold_content)
+        ).filter(
+            LearningItem.id.in_(item_ids),
+            LearningItem.is_deleted == False
+        ).all()
+
     def get_all(
         self,
-        subject: Optional[str] = None,
+        subject_id: Optional[int] = None,
         skip: int = 0,
         limit: int = 100
-    ) -> List[LearningItem]:
+    ) -> List[ItemRecord]:
         """Get all items with optional filtering."""
-        query = self.db.query(LearningItem).filter(
+        if self.core_reads:
+            # Pick the page from the hot table alone, then read content (either tier) for it
+            page = select(learning_items.c.id).where(learning_items.c.is_deleted == False)
+            if subject_id is not None:
+                page = page.where(learning_items.c.subject_id == subject_id)
+            page = page.order_by(learning_items.c.created_at.desc()).offset(skip).limit(limit)
+            return self.db.execute(
+                ITEM_ROWS.where(learning_items.c.id.in_(page)).order_by(learning_items.c.created_at.desc())
+            ).all()
+
+        query = self.db.query(LearningItem).options(
+            selectinload(LearningItem.cold_content)
+        ).filter(
             LearningItem.is_deleted == False
         )
 
-        if subject:
-            query = query.filter(LearningItem.subject == subject)
+        if subject_id is not None:
+            query = query.filter(LearningItem.subject_id == subject_id)
 
         return query.order_by(
             LearningItem.created_at.desc()
@@ -49,21 +147,62 @@ class LearningItemRepository:
     def get_due_items(
         self,
         due_date: date,
-        subject: Optional[str] = None
-    ) -> List[LearningItem]:
-        """Get all items due for review by date."""
+        subject_id: Optional[int] = None,
+        limit: Optional[int] = None,
+        order: str = "due"
+    ) -> List[ItemRecord]:
+        """
+        Get all items due for review by date (live query, bypasses the due queue).
+        With order "priority" the priority is computed per row as of today and
+        sorted, since there is no stored key to scan.
+        """
+        dialect = self.db.get_bind().dialect.name
+        if self.core_reads:
+            statement = ITEM_ROWS.where(
+                learning_items.c.is_deleted == False,
+                learning_items.c.next_review_date <= due_date
+            )
+            if subject_id is not None:
+                statement = statement.where(learning_items.c.subject_id == subject_id)
+            if order == "priority":
+                statement = statement.order_by(priority_expression(
+                    dialect,
+                    date.today(),
+                    learning_items.c.next_review_date,
+                    learning_items.c.current_interval_days,
+                    subjects.c.priority_weight
+                ).desc())
+            statement = statement.order_by(
+                learning_items.c.next_review_date.asc(),
+                learning_items.c.created_at.asc()
+            )
+            if limit is not None:
+                statement = statement.limit(limit)
+            return self.db.execute(statement).all()
+
         query = self.db.query(LearningItem).filter(
             LearningItem.is_deleted == False,
             LearningItem.next_review_date <= due_date
         )
 
-        if subject:
-            query = query.filter(LearningItem.subject == subject)
+        if subject_id is not None:
+            query = query.filter(LearningItem.subject_id == subject_id)
 
-        return query.order_by(
+        if order == "priority":
+            query = query.join(Subject, Subject.id == LearningItem.subject_id).order_by(priority_expression(
+                dialect,
+                date.today(),
+                LearningItem.next_review_date,
+                LearningItem.current_interval_days,
+                Subject.priority_weight
+            ).desc())
+        query = query.order_by(
             LearningItem.next_review_date.asc(),
             LearningItem.created_at.asc()
-        ).all()
+        )
+        if limit is not None:
+            query = query.limit(limit)
+        return query.all()
 
     def update(self, item_id: str, update_data: dict) -> Optional[LearningItem]:
         """Update an existing item."""
@@ -77,9 +216,79 @@ class LearningItemRepository:
 
         db_item.updated_at = datetime.now(timezone.utc)
         self.db.commit()
-        self.db.refresh(db_item)
+        if "subject_id" in update_data:
+            # Setting the key doesn't move the loaded relationship; it reloads
+            # from the identity map, where the new subject already is
+            self.db.expire(db_item, ["subject_ref"])
         return db_item
 
+    @staticmethod
+    def bulk_conditions(
+        subject_id: Optional[int] = None,
+        item_ids: Optional[List[str]] = None,
+        due_from: Optional[date] = None,
+        due_to: Optional[date] = None
+    ) -> list:
+        """WHERE conditions selecting live items by subject, IDs and/or due date range (inclusive)."""
+        conditions = [LearningItem.is_deleted == False]
+        if subject_id is not None:
+            conditions.append(LearningItem.subject_id == subject_id)
+        if item_ids:
+            conditions.append(LearningItem.id.in_(item_ids))
+        if due_from is not None:
+            conditions.append(LearningItem.next_review_date >= due_from)
+        if due_to is not None:
+            conditions.append(LearningItem.next_review_date <= due_to)
+        return conditions
+
+    def bulk_values(
+        self,
+        today: date,
+        subject_id: Optional[int] = None,
+        shift_days: Optional[int] = None,
+        reset_progress: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Column values (SQL expressions) of a bulk change: move to a subject,
+        shift the next review by N days, and/or reset review progress (back to
+        a day-0 review today, which a shift then moves). Usable both in an
+        UPDATE and in a SELECT of the updated rows.
+        """
+        values: Dict[str, Any] = {}
+        if subject_id is not None:
+            values["subject_id"] = literal(subject_id, Integer)
+        if reset_progress:
+            values["review_count"] = literal(0, Integer)
+            values["current_interval_days"] = literal(0, Integer)
+            values["next_review_date"] = literal(today + timedelta(days=shift_days or 0), Date)
+        elif shift_days:
+            values["next_review_date"] = shift_date_expression(
+                self.db.get_bind().dialect.name, LearningItem.next_review_date, shift_days
+            )
+        return values
+
+    def get_subject_ids_where(self, conditions: list) -> Set[int]:
+        """Get the subjects of the items matching conditions."""
+        return set(self.db.execute(
+            select(LearningItem.subject_id).where(*conditions).distinct()
+        ).scalars().all())
+
+    def update_where(self, conditions: list, values: Dict[str, Any], commit: bool = True) -> int:
+        """
+        Apply values to every item matching conditions in one UPDATE.
+
+        Returns:
+            Number of items updated
+        """
+        updated = self.db.execute(
+            update(LearningItem).where(*conditions).values(
+                **values, updated_at=datetime.now(timezone.utc)
+            ).execution_options(synchronize_session=False)
+        ).rowcount
+        if commit:
+            self.db.commit()
+        return updated
+
     def soft_delete(self, item_id: str) -> bool:
         """Soft delete an item."""
         db_item = self.get_by_id(item_id)
@@ -87,23 +296,17 @@ class LearningItemRepository:
             return False
 
         db_item.is_deleted = True
-        db_item.updated_at = datetime.now(timezone.utc)
+        db_item.updated_at = db_item.deleted_at = datetime.now(timezone.utc)
         self.db.commit()
         return True
 
-    def get_all_subjects(self) -> List[str]:
-        """Get all unique subjects."""
-        results = self.db.query(LearningItem.subject).filter(
-            LearningItem.is_deleted == False
-        ).distinct().order_by(LearningItem.subject).all()
-        return [s[0] for s in results]
-
     def update_review_tracking(
         self,
         item_id: str,
         review_count: int,
         next_review_date: date,
-        interval_days: int
+        interval_days: int,
+        commit: bool = True
     ) -> Optional[LearningItem]:
         """Update review tracking fields after a review."""
         db_item = self.get_by_id(item_id)
@@ -115,11 +318,18 @@ class LearningItemRepository:
         db_item.current_interval_days = interval_days
         db_item.updated_at = datetime.now(timezone.utc)
 
-        self.db.commit()
-        self.db.refresh(db_item)
+        if commit:
+            self.db.commit()
+        else:
+            self.db.flush()
         return db_item
 
-    def update_manual_review_count(self, item_id: str, manual_review_count: int) -> Optional[LearningItem]:
+    def update_manual_review_count(
+        self,
+        item_id: str,
+        manual_review_count: int,
+        commit: bool = True
+    ) -> Optional[LearningItem]:
         """Update manual review count after a manual review."""
         db_item = self.get_by_id(item_id)
         if not db_item:
@@ -128,15 +338,76 @@ class LearningItemRepository:
         db_item.manual_review_count = manual_review_count
         db_item.updated_at = datetime.now(timezone.utc)
 
-        self.db.commit()
-        self.db.refresh(db_item)
+        if commit:
+            self.db.commit()
+        else:
+            self.db.flush()
         return db_item
 
-    def count_all(self, subject: Optional[str] = None) -> int:
+    def get_subject_stats(self, today: date, week_end: date) -> List[Dict]:
+        """
+        Get per-subject statistics with one grouped query.
+        Live items are joined to review_history pre-aggregated per item.
+        """
+        history = select(
+            ReviewHistory.learning_item_id,
+            func.count(ReviewHistory.id).label("total_reviews"),
+            func.sum(case((ReviewHistory.is_manual == True, 1), else_=0)).label("manual_reviews")
+        ).group_by(ReviewHistory.learning_item_id).subquery()
+
+        results = self.db.query(
+            Subject.name,
+            func.count(LearningItem.id),
+            func.sum(case((LearningItem.next_review_date <= today, 1), else_=0)),
+            func.sum(case((LearningItem.next_review_date <= week_end, 1), else_=0)),
+            func.coalesce(func.sum(history.c.total_reviews), 0),
+            func.coalesce(func.sum(history.c.manual_reviews), 0),
+            func.avg(LearningItem.current_interval_days)
+        ).join(
+            Subject, Subject.id == LearningItem.subject_id
+        ).outerjoin(
+            history, history.c.learning_item_id == LearningItem.id
+        ).filter(
+            LearningItem.is_deleted == False
+        ).group_by(
+            Subject.id, Subject.name
+        ).order_by(
+            Subject.name
+        ).all()
+
+        return [
+            {
+                "subject": subject,
+                "total_items": total_items,
+                "items_due_today": due_today or 0,
+                "items_due_this_week": due_week or 0,
+                "total_reviews": int(total_reviews),
+                "manual_reviews": int(manual_reviews),
+                "average_interval_days": round(float(average_interval or 0), 2)
+            }
+            for subject, total_items, due_today, due_week, total_reviews, manual_reviews, average_interval in results
+        ]
+
+    def get_schedule_distribution(self) -> List[Tuple[int, date, int]]:
+        """Count live items per (review_count, next_review_date) pair."""
+        return self.db.execute(
+            select(
+                LearningItem.review_count,
+                LearningItem.next_review_date,
+                func.count()
+            ).where(
+                LearningItem.is_deleted == False
+            ).group_by(
+                LearningItem.review_count,
+                LearningItem.next_review_date
+            )
+        ).all()
+
+    def count_all(self, subject_id: Optional[int] = None) -> int:
         """Count all items."""
         query = self.db.query(LearningItem).filter(
             LearningItem.is_deleted == False
         )
-        if subject:
-            query = query.filter(LearningItem.subject == subject)
+        if subject_id is not None:
+            query = query.filter(LearningItem.subject_id == subject_id)
         return query.count()
@@ -1,10 +1,15 @@
 """
 Repository for review history data access.
 """
-from sqlalchemy.orm import Session
-from sqlalchemy import func
-from typing import List, Dict
+from sqlalchemy.orm import Session, aliased
+from sqlalchemy import Integer, cast, func, select
+from typing import List, Dict, Tuple
+from datetime import date, datetime, time, timedelta, timezone
 from app.models.review_history import ReviewHistory
+from app.models.learning_item import LearningItem
+
+# Ranges shorter than this look up each review's schedule instead of windowing item histories
+LATENESS_LOOKUP_MAX_DAYS = 7
 
 
 class ReviewHistoryRepository:
@@ -13,12 +18,17 @@ class ReviewHistoryRepository:
     def __init__(self, db: Session):
         self.db = db
 
-    def create_review(self, review_data: dict) -> ReviewHistory:
-        """Record a review in history."""
+    def create_review(self, review_data: dict, commit: bool = True) -> ReviewHistory:
+        """
+        Record a review in history.
+        With commit=False the row is only flushed, leaving the transaction to the caller.
+        """
         db_review = ReviewHistory(**review_data)
         self.db.add(db_review)
+        if not commit:
+            self.db.flush()
+            return db_review
         self.db.commit()
-        self.db.refresh(db_review)
         return db_review
 
     def get_item_history(
@@ -33,6 +43,167 @@ class ReviewHistoryRepository:
             ReviewHistory.reviewed_at.desc()
         ).limit(limit).all()
 
+    def get_items_history(
+        self,
+        item_ids: List[str],
+        limit: int = 50
+    ) -> Dict[str, List[ReviewHistory]]:
+        """
+        Get the most recent reviews for many items in one query.
+        Uses ROW_NUMBER() partitioned by item to keep the top `limit` rows per item.
+        """
+        if not item_ids:
+            return {}
+
+        ranked = select(
+            ReviewHistory,
+            func.row_number().over(
+                partition_by=ReviewHistory.learning_item_id,
+                order_by=ReviewHistory.reviewed_at.desc()
+            ).label("row_number")
+        ).where(
+            ReviewHistory.learning_item_id.in_(item_ids)
+        ).subquery()
+        ranked_review = aliased(ReviewHistory, ranked)
+
+        rows = self.db.query(ranked_review).filter(
+            ranked.c.row_number <= limit
+        ).order_by(
+            ranked.c.learning_item_id,
+            ranked.c.row_number
+        ).all()
+
+        history = {item_id: [] for item_id in item_ids}
+        for review in rows:
+            history[review.learning_item_id].append(review)
+        return history
+
+    def get_daily_review_counts(
+        self,
+        start_date: date,
+        end_date: date
+    ) -> Dict[date, Tuple[int, int]]:
+        """
+        Count reviews per UTC day in [start_date, end_date].
+
+        Returns:
+            Dictionary mapping day to (scheduled_count, manual_count);
+            days without reviews are omitted
+        """
+        start = datetime.combine(start_date, time.min, tzinfo=timezone.utc)
+        end = datetime.combine(end_date + timedelta(days=1), time.min, tzinfo=timezone.utc)
+
+        if self.db.get_bind().dialect.name == "postgresql":
+            day = func.date(func.timezone("UTC", ReviewHistory.reviewed_at))
+        else:
+            # SQLite stores the UTC timestamp as text
+            day = func.date(ReviewHistory.reviewed_at)
+
+        results = self.db.query(
+            day,
+            ReviewHistory.is_manual,
+            func.count(ReviewHistory.id)
+        ).filter(
+            ReviewHistory.reviewed_at >= start,
+            ReviewHistory.reviewed_at < end
+        ).group_by(day, ReviewHistory.is_manual).all()
+
+        counts: Dict[date, Tuple[int, int]] = {}
+        for review_day, is_manual, count in results:
+            if isinstance(review_day, str):
+                review_day = date.fromisoformat(review_day)
+            scheduled, manual = counts.get(review_day, (0, 0))
+            counts[review_day] = (scheduled, manual + count) if is_manual else (scheduled + count, manual)
+        return counts
+
+    def get_lateness_counts(
+        self,
+        start_date: date,
+        end_date: date
+    ) -> Dict[date, List[Tuple[int, int, int]]]:
+        """
+        Count scheduled reviews per UTC day, subject and lateness in [start_date, end_date].
+
+        Lateness is the review day minus the day the review was scheduled for:
+        the next_review_date of the item's previous scheduled review, or the
+        creation day for the first review. Short ranges (normally just today)
+        look the previous review up per review through the (item, reviewed_at)
+        index; longer ranges window (LAG) the history of the items reviewed in
+        the range instead.
+
+        Returns:
+            Dictionary mapping day to (subject_id, lateness_days, count) tuples;
+            days without scheduled reviews are omitted
+        """
+        start = datetime.combine(start_date, time.min, tzinfo=timezone.utc)
+        end = datetime.combine(end_date + timedelta(days=1), time.min, tzinfo=timezone.utc)
+        postgresql = self.db.get_bind().dialect.name == "postgresql"
+
+        def utc_day(column):
+            # SQLite stores the UTC timestamp as text
+            return func.date(func.timezone("UTC", column)) if postgresql else func.date(column)
+
+        if (end_date - start_date).days < LATENESS_LOOKUP_MAX_DAYS:
+            previous = aliased(ReviewHistory)
+            scheduled = select(
+                ReviewHistory.learning_item_id,
+                ReviewHistory.reviewed_at,
+                select(previous.next_review_date).where(
+                    previous.learning_item_id == ReviewHistory.learning_item_id,
+                    previous.is_manual == False,
+                    previous.reviewed_at < ReviewHistory.reviewed_at
+                ).order_by(previous.reviewed_at.desc()).limit(1).scalar_subquery().label("due_date")
+            ).where(
+                ReviewHistory.is_manual == False,
+                ReviewHistory.reviewed_at >= start,
+                ReviewHistory.reviewed_at < end
+            ).subquery()
+        else:
+            reviewed_items = select(ReviewHistory.learning_item_id).where(
+                ReviewHistory.is_manual == False,
+                ReviewHistory.reviewed_at >= start,
+                ReviewHistory.reviewed_at < end
+            )
+            scheduled = select(
+                ReviewHistory.learning_item_id,
+                ReviewHistory.reviewed_at,
+                func.lag(ReviewHistory.next_review_date).over(
+                    partition_by=ReviewHistory.learning_item_id,
+                    order_by=ReviewHistory.reviewed_at
+                ).label("due_date")
+            ).where(
+                ReviewHistory.is_manual == False,
+                ReviewHistory.reviewed_at < end,
+                ReviewHistory.learning_item_id.in_(reviewed_items)
+            ).subquery()
+
+        day = utc_day(scheduled.c.reviewed_at)
+        due_date = func.coalesce(scheduled.c.due_date, utc_day(LearningItem.created_at))
+        if postgresql:
+            lateness = day - due_date
+        else:
+            lateness = cast(func.julianday(day) - func.julianday(due_date), Integer)
+
+        results = self.db.execute(
+            select(
+                day,
+                LearningItem.subject_id,
+                lateness,
+                func.count()
+            ).join(
+                LearningItem, LearningItem.id == scheduled.c.learning_item_id
+            ).where(
+                scheduled.c.reviewed_at >= start
+            ).group_by(day, LearningItem.subject_id, lateness)
+        ).all()
+
+        counts: Dict[date, List[Tuple[int, int, int]]] = {}
+        for review_day, subject_id, lateness_days, count in results:
+            if isinstance(review_day, str):
+                review_day = date.fromisoformat(review_day)
+            counts.setdefault(review_day, []).append((subject_id, int(lateness_days), count))
+        return counts
+
     def get_total_reviews(self) -> int:
         """Get total count of all reviews."""
         return self.db.query(ReviewHistory).count()
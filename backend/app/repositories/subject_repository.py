@@ -0,0 +1,145 @@
+"""
+Repository for subjects data access.
+"""
+from sqlalchemy.orm import Session
+from sqlalchemy import update, select, func, case
+from sqlalchemy.exc import IntegrityError
+from typing import Iterable, List, Optional, Dict
+from datetime import date
+from app.models.subject import Subject
+from app.models.learning_item import LearningItem
+from app.models.due_queue import DueQueueEntry
+
+
+class SubjectRepository:
+    """Data access layer for subjects and their cached counters."""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_by_name(self, name: str) -> Optional[Subject]:
+        """Get a subject by its name (unique index lookup)."""
+        return self.db.query(Subject).filter(Subject.name == name).first()
+
+    def get_id_by_name(self, name: str) -> Optional[int]:
+        """Resolve a subject name to its ID."""
+        subject = self.get_by_name(name)
+        return subject.id if subject else None
+
+    def get_or_create(self, name: str) -> Subject:
+        """
+        Get a subject by name, creating it if needed.
+        Does not commit; the row is written with the caller's transaction.
+        """
+        subject = self.get_by_name(name)
+        if subject:
+            return subject
+
+        try:
+            with self.db.begin_nested():
+                subject = Subject(name=name, live_count=0, due_count=0, due_count_date=date.today())
+                self.db.add(subject)
+        except IntegrityError:
+            # Created concurrently by another request
+            subject = self.get_by_name(name)
+        return subject
+
+    def get_names_in_use(self) -> List[str]:
+        """Get names of subjects that have live items, ordered by name."""
+        results = self.db.query(Subject.name).filter(
+            Subject.live_count > 0
+        ).order_by(Subject.name).all()
+        return [s[0] for s in results]
+
+    def get_names_by_id(self, subject_ids: List[int]) -> Dict[int, str]:
+        """Get subject names for a list of IDs."""
+        if not subject_ids:
+            return {}
+        return dict(self.db.query(Subject.id, Subject.name).filter(Subject.id.in_(subject_ids)).all())
+
+    def get_due_counts(self, today: date) -> Optional[Dict[str, int]]:
+        """
+        Get cached due-today counts by subject name.
+
+        Returns:
+            Dictionary of subjects with due items, or None if the counters
+            have not been refreshed for today yet
+        """
+        results = self.db.query(Subject.name, Subject.due_count, Subject.due_count_date).filter(
+            Subject.live_count > 0
+        ).all()
+        if any(due_count_date != today for _, _, due_count_date in results):
+            return None
+        return {name: due_count for name, due_count, _ in results if due_count > 0}
+
+    def adjust_counts(
+        self,
+        subject_id: int,
+        today: date,
+        live_delta: int = 0,
+        due_delta: int = 0
+    ) -> None:
+        """
+        Apply counter deltas from a write (no commit; part of the caller's transaction).
+        The due counter is only adjusted when it is current for today; a stale one
+        is recomputed by the next due queue roll-over anyway.
+        """
+        if live_delta:
+            self.db.execute(
+                update(Subject).where(Subject.id == subject_id).values(
+                    live_count=Subject.live_count + live_delta
+                )
+            )
+        if due_delta:
+            self.db.execute(
+                update(Subject).where(
+                    Subject.id == subject_id,
+                    Subject.due_count_date == today
+                ).values(due_count=Subject.due_count + due_delta)
+            )
+
+    def recount_live(self) -> None:
+        """Recompute every subject's live item counter from learning_items."""
+        live = select(func.count()).select_from(LearningItem).where(
+            LearningItem.subject_id == Subject.id,
+            LearningItem.is_deleted == False
+        ).scalar_subquery()
+        self.db.execute(
+            update(Subject).values(live_count=live).execution_options(synchronize_session=False)
+        )
+        self.db.commit()
+
+    def recount(self, subject_ids: Iterable[int], today: date) -> None:
+        """
+        Recompute the live counter, and the due counter if it is current for
+        today, of some subjects (no commit; part of the caller's transaction).
+        """
+        live = select(func.count()).select_from(LearningItem).where(
+            LearningItem.subject_id == Subject.id,
+            LearningItem.is_deleted == False
+        ).scalar_subquery()
+        due_today = select(func.count()).select_from(DueQueueEntry).where(
+            DueQueueEntry.subject_id == Subject.id,
+            DueQueueEntry.due_date <= today
+        ).scalar_subquery()
+        self.db.execute(
+            update(Subject).where(Subject.id.in_(list(subject_ids))).values(
+                live_count=live,
+                due_count=case((Subject.due_count_date == today, due_today), else_=Subject.due_count)
+            ).execution_options(synchronize_session=False)
+        )
+
+    def rename(self, subject: Subject, new_name: str) -> Subject:
+        """Rename a subject (single-row update)."""
+        subject.name = new_name
+        self.db.commit()
+        return subject
+
+    def set_priority_weight(self, subject: Subject, weight: float, commit: bool = True) -> Subject:
+        """Set a subject's weight in the priority due order."""
+        subject.priority_weight = weight
+        if commit:
+            self.db.commit()
+        else:
+            self.db.flush()
+        return subject
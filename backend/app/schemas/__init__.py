@@ -5,20 +5,72 @@ from app.schemas.learning_item import (
     LearningItemCreate,
     LearningItemUpdate,
     LearningItemResponse,
-    LearningItemListResponse
+    LearningItemCreateResponse,
+    SimilarItem,
+    SimilarItemsResponse,
+    LearningItemListResponse,
+    LearningItemBatchGetRequest,
+    LearningItemBatchGetResponse,
+    LearningItemBulkFilter,
+    LearningItemBulkUpdate,
+    LearningItemBulkUpdateResponse
+)
+from app.schemas.subject import (
+    SubjectRename,
+    SubjectPriorityUpdate,
+    SubjectResponse
 )
 from app.schemas.review import (
     ReviewResponse,
+    ReviewHistoryBatchRequest,
+    ReviewHistoryBatchResponse,
     DueItemsResponse,
-    ReviewStatsResponse
+    ReviewSessionResponse,
+    ReviewActivityDay,
+    ReviewActivityResponse,
+    ReviewStatsResponse,
+    SubjectStatsResponse,
+    AdherenceSummary,
+    SubjectAdherence,
+    AdherenceResponse
+)
+from app.schemas.simulation import (
+    IntervalLadder,
+    SimulationRequest,
+    SimulationScenario,
+    SimulationResponse
 )
 
 __all__ = [
     "LearningItemCreate",
     "LearningItemUpdate",
     "LearningItemResponse",
+    "LearningItemCreateResponse",
+    "SimilarItem",
+    "SimilarItemsResponse",
     "LearningItemListResponse",
+    "LearningItemBatchGetRequest",
+    "LearningItemBatchGetResponse",
+    "LearningItemBulkFilter",
+    "LearningItemBulkUpdate",
+    "LearningItemBulkUpdateResponse",
+    "SubjectRename",
+    "SubjectPriorityUpdate",
+    "SubjectResponse",
     "ReviewResponse",
+    "ReviewHistoryBatchRequest",
+    "ReviewHistoryBatchResponse",
     "DueItemsResponse",
-    "ReviewStatsResponse"
+    "ReviewSessionResponse",
+    "ReviewActivityDay",
+    "ReviewActivityResponse",
+    "ReviewStatsResponse",
+    "SubjectStatsResponse",
+    "AdherenceSummary",
+    "SubjectAdherence",
+    "AdherenceResponse",
+    "IntervalLadder",
+    "SimulationRequest",
+    "SimulationScenario",
+    "SimulationResponse"
 ]
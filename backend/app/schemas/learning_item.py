@@ -1,9 +1,11 @@
 """
 Pydantic schemas for Learning Items.
 """
-from pydantic import BaseModel, Field, ConfigDict
-from datetime import datetime, date
+from pydantic import BaseModel, Field, ConfigDict, model_validator
+from sqlalchemy.engine import Row
+from datetime import date
 from typing import List, Optional
+from app.schemas.types import UtcDatetime
 
 
 class LearningItemCreate(BaseModel):
@@ -26,8 +28,8 @@ class LearningItemResponse(BaseModel):
     subject: str
     title: str
     content: str
-    created_at: datetime
-    updated_at: datetime
+    created_at: UtcDatetime
+    updated_at: UtcDatetime
     review_count: int
     next_review_date: date
     current_interval_days: int
@@ -36,8 +38,67 @@ class LearningItemResponse(BaseModel):
 
     model_config = ConfigDict(from_attributes=True)
 
+    @model_validator(mode="before")
+    @classmethod
+    def _from_row(cls, data):
+        """Read Core rows (REPOSITORY_READ_MODE=core) by key; attribute access on rows is slower."""
+        if isinstance(data, Row):
+            return data._mapping
+        return data
+
+
+class SimilarItem(BaseModel):
+    """Schema for a near-duplicate of an item."""
+    id: str
+    subject: str
+    title: str
+    similarity: float = Field(..., description="Estimated Jaccard similarity of title and content")
+
+
+class LearningItemCreateResponse(LearningItemResponse):
+    """Schema for a created learning item, with existing near-duplicates."""
+    duplicates: List[SimilarItem] = []
+
+
+class SimilarItemsResponse(BaseModel):
+    """Schema for the near-duplicates of an item."""
+    id: str
+    similar: List[SimilarItem]
+
 
 class LearningItemListResponse(BaseModel):
     """Schema for list of learning items."""
     items: List[LearningItemResponse]
     total: int
+
+
+class LearningItemBatchGetRequest(BaseModel):
+    """Schema for fetching many learning items by ID."""
+    ids: List[str] = Field(..., min_length=1, max_length=500, description="Item IDs")
+
+
+class LearningItemBatchGetResponse(BaseModel):
+    """Schema for batch get response."""
+    items: List[LearningItemResponse]
+    missing: List[str]
+
+
+class LearningItemBulkFilter(BaseModel):
+    """Items a bulk update applies to (live items matching every given field)."""
+    subject: Optional[str] = Field(None, min_length=1, max_length=255)
+    ids: Optional[List[str]] = Field(None, min_length=1, max_length=500, description="Item IDs")
+    due_from: Optional[date] = Field(None, description="Next review on or after this date")
+    due_to: Optional[date] = Field(None, description="Next review on or before this date")
+
+
+class LearningItemBulkUpdate(BaseModel):
+    """Schema for a bulk update: a filter and the changes to apply."""
+    filter: LearningItemBulkFilter
+    set_subject: Optional[str] = Field(None, min_length=1, max_length=255, description="Move the items to this subject")
+    shift_days: Optional[int] = Field(None, ge=-3650, le=3650, description="Move each next review by N days")
+    reset_progress: bool = Field(False, description="Restart the schedule (day-0 review today)")
+
+
+class LearningItemBulkUpdateResponse(BaseModel):
+    """Schema for bulk update response."""
+    updated: int
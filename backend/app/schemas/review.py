@@ -1,17 +1,18 @@
 """
 Pydantic schemas for Reviews.
 """
-from pydantic import BaseModel, ConfigDict
-from datetime import datetime, date
+from pydantic import BaseModel, ConfigDict, Field
+from datetime import date
 from typing import List, Dict
 from app.schemas.learning_item import LearningItemResponse
+from app.schemas.types import UtcDatetime
 
 
 class ReviewResponse(BaseModel):
     """Schema for review history response."""
     id: str
     learning_item_id: str
-    reviewed_at: datetime
+    reviewed_at: UtcDatetime
     interval_days: int
     next_review_date: date
     review_number: int
@@ -20,6 +21,18 @@ class ReviewResponse(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+class ReviewHistoryBatchRequest(BaseModel):
+    """Schema for fetching review history of many items."""
+    item_ids: List[str] = Field(..., min_length=1, max_length=500, description="Item IDs")
+    limit: int = Field(50, ge=1, le=200, description="Maximum number of reviews per item")
+
+
+class ReviewHistoryBatchResponse(BaseModel):
+    """Schema for batch review history response."""
+    histories: Dict[str, List[ReviewResponse]]
+    missing: List[str]
+
+
 class DueItemsResponse(BaseModel):
     """Schema for due items response."""
     items: List[LearningItemResponse]
@@ -27,6 +40,28 @@ class DueItemsResponse(BaseModel):
     by_subject: Dict[str, int]
 
 
+class ReviewSessionResponse(BaseModel):
+    """Schema for review session prefetch response."""
+    items: List[LearningItemResponse]
+    lease_token: str
+    lease_expires_at: UtcDatetime
+
+
+class ReviewActivityDay(BaseModel):
+    """Schema for review counts on one day."""
+    date: date
+    scheduled: int
+    manual: int
+    total: int
+
+
+class ReviewActivityResponse(BaseModel):
+    """Schema for review activity heatmap response."""
+    from_date: date
+    to_date: date
+    days: List[ReviewActivityDay]
+
+
 class ReviewStatsResponse(BaseModel):
     """Schema for review statistics response."""
     total_items: int
@@ -34,3 +69,41 @@ class ReviewStatsResponse(BaseModel):
     items_due_today: int
     items_due_this_week: int
     reviews_by_interval: Dict[int, int]
+
+
+class SubjectStatsResponse(BaseModel):
+    """Schema for per-subject statistics response."""
+    subject: str
+    total_items: int
+    items_due_today: int
+    items_due_this_week: int
+    total_reviews: int
+    manual_reviews: int
+    average_interval_days: float
+
+
+class AdherenceSummary(BaseModel):
+    """Schema for schedule adherence of a set of scheduled reviews."""
+    reviews: int
+    on_time_rate: float
+    mean_lateness_days: float
+    p50_lateness_days: int
+    p90_lateness_days: int
+    p99_lateness_days: int
+    max_lateness_days: int
+    distribution: Dict[str, int]
+    current_streak_days: int
+    longest_streak_days: int
+
+
+class SubjectAdherence(AdherenceSummary):
+    """Schema for schedule adherence of one subject."""
+    subject: str
+
+
+class AdherenceResponse(BaseModel):
+    """Schema for review adherence analytics response."""
+    from_date: date
+    to_date: date
+    overall: AdherenceSummary
+    by_subject: List[SubjectAdherence]
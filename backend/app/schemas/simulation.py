@@ -0,0 +1,44 @@
+"""
+Pydantic schemas for schedule simulations.
+"""
+from pydantic import BaseModel, Field
+from datetime import date
+from typing import List
+
+# Longest projection in one call (about three years)
+MAX_SIMULATION_DAYS = 1095
+
+
+class IntervalLadder(BaseModel):
+    """Schema for a candidate interval configuration."""
+    name: str = Field(..., min_length=1, max_length=100)
+    intervals: List[int] = Field(..., min_length=1, max_length=50, description="Days per review count, like REVIEW_INTERVALS")
+    cycle_back_to_level: int = Field(..., ge=0, description="Ladder index used after the last interval, like CYCLE_BACK_TO_LEVEL")
+
+
+class SimulationRequest(BaseModel):
+    """Schema for a schedule simulation request."""
+    ladders: List[IntervalLadder] = Field(default_factory=list, max_length=10, description="Candidates (current is always included)")
+    days: int = Field(365, ge=1, le=MAX_SIMULATION_DAYS)
+    new_items_per_day: int = Field(0, ge=0, le=100000, description="Items assumed to be added each day")
+
+
+class SimulationScenario(BaseModel):
+    """Schema for the projection of one interval ladder."""
+    name: str
+    intervals: List[int]
+    cycle_back_to_level: int
+    total_reviews: int
+    mean_per_day: float
+    p95_per_day: float
+    peak_per_day: int
+    peak_date: date
+    daily: List[int]
+
+
+class SimulationResponse(BaseModel):
+    """Schema for schedule simulation response."""
+    start_date: date
+    days: int
+    items: int
+    scenarios: List[SimulationScenario]
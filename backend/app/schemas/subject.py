@@ -0,0 +1,25 @@
+"""
+Pydantic schemas for Subjects.
+"""
+from pydantic import BaseModel, Field, ConfigDict
+
+
+class SubjectRename(BaseModel):
+    """Schema for renaming a subject."""
+    name: str = Field(..., min_length=1, max_length=255, description="New subject name")
+
+
+class SubjectPriorityUpdate(BaseModel):
+    """Schema for setting a subject's weight in the priority due order."""
+    priority_weight: float = Field(..., ge=0, le=100, description="Multiplies the subject's item priorities (default 1)")
+
+
+class SubjectResponse(BaseModel):
+    """Schema for subject response."""
+    id: int
+    name: str
+    live_count: int
+    due_count: int
+    priority_weight: float
+
+    model_config = ConfigDict(from_attributes=True)
@@ -0,0 +1,18 @@
+"""
+Shared field types for request/response schemas.
+"""
+from datetime import datetime, timezone
+from typing import Annotated
+
+from pydantic import AfterValidator
+
+
+def _as_utc(value: datetime) -> datetime:
+    # SQLite returns naive UTC values, PostgreSQL and Python-side defaults aware ones
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+# A timestamp serialized the same way whatever produced it: UTC with a "Z" suffix
+UtcDatetime = Annotated[datetime, AfterValidator(_as_utc)]
@@ -3,5 +3,18 @@ Service layer for business logic.
 """
 from app.services.spaced_repetition_service import SpacedRepetitionService
 from app.services.learning_item_service import LearningItemService
+from app.services.review_write_behind import ReviewWriteBehind
+from app.services.schedule_simulation_service import ScheduleSimulationService
+from app.services.review_analytics_service import ReviewAnalyticsService
+from app.services.item_purge_service import ItemPurgeService
+from app.services.idempotency_store import IdempotencyStore
 
-__all__ = ["SpacedRepetitionService", "LearningItemService"]
+__all__ = [
+    "SpacedRepetitionService",
+    "LearningItemService",
+    "ReviewWriteBehind",
+    "ScheduleSimulationService",
+    "ReviewAnalyticsService",
+    "ItemPurgeService",
+    "IdempotencyStore"
+]
@@ -0,0 +1,164 @@
+"""
+Idempotency Store - Stored responses for requests sent with an Idempotency-Key.
+"""
+import logging
+import threading
+import time
+from collections import OrderedDict
+from datetime import timedelta, timezone
+from typing import Callable, ContextManager, Dict, Optional
+
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.core.idempotency import StoredResponse, decode_headers, encode_headers
+from app.database import open_session
+from app.models.types import utc_now
+from app.repositories.idempotency_repository import IdempotencyRepository
+
+logger = logging.getLogger(__name__)
+
+
+class IdempotencyStore:
+    """
+    Dedupe store for idempotent requests: the idempotency_keys table, fronted
+    by an in-memory LRU of recently completed responses.
+
+    A key is reserved in the database before its request runs, so a repeat
+    that arrives while it runs (on any process) is told so instead of running
+    it twice. Completed responses are kept for ttl_seconds; expired rows are
+    deleted in small batches, at most once per purge_interval_seconds per database.
+
+    Memory lookups (cached) are safe on the event loop; the other methods
+    touch the database and belong in a worker thread.
+    """
+
+    def __init__(
+        self,
+        session_scope: Callable[[Optional[str]], ContextManager[Session]] = open_session,
+        ttl_seconds: float = 86400,
+        lock_seconds: float = 60,
+        cache_size: int = 10000,
+        purge_interval_seconds: float = 60
+    ):
+        self.session_scope = session_scope
+        self.ttl_seconds = ttl_seconds
+        self.lock_seconds = lock_seconds
+        self.cache_size = cache_size
+        self.purge_interval_seconds = purge_interval_seconds
+        self._cache: "OrderedDict[bytes, tuple]" = OrderedDict()
+        self._last_purge: Dict[Optional[str], float] = {}
+        self._lock = threading.Lock()
+
+        # Counters for monitoring
+        self.cache_hits = 0
+        self.stored_hits = 0
+        self.reserved = 0
+        self.purged = 0
+
+    def cached(self, key: bytes) -> Optional[StoredResponse]:
+        """Get a completed response from memory, if it is there and not expired."""
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is None:
+                return None
+            expires_at, stored = entry
+            if expires_at <= time.monotonic():
+                del self._cache[key]
+                return None
+            self._cache.move_to_end(key)
+            self.cache_hits += 1
+            return stored
+
+    def begin(self, tenant: Optional[str], key: bytes, request_hash: bytes) -> Optional[StoredResponse]:
+        """
+        Reserve a key for a request about to run.
+
+        Returns:
+            None if the request should run (call complete() or release() after),
+            otherwise what is stored for the key
+        """
+        now = utc_now()
+        with self.session_scope(tenant) as db:
+            row = IdempotencyRepository(db).reserve(
+                key, request_hash, now,
+                expired_before=now - timedelta(seconds=self.ttl_seconds),
+                stale_before=now - timedelta(seconds=self.lock_seconds)
+            )
+            if row is None:
+                self.reserved += 1
+                return None
+            stored = StoredResponse(
+                row.request_hash, row.status_code, row.response_body or b"", decode_headers(row.response_headers)
+            )
+            created_at = row.created_at
+
+        self.stored_hits += 1
+        if stored.status_code:
+            if created_at.tzinfo is None:  # SQLite returns naive UTC
+                created_at = created_at.replace(tzinfo=timezone.utc)
+            self._remember(key, stored, self.ttl_seconds - (now - created_at).total_seconds())
+        return stored
+
+    def complete(self, tenant: Optional[str], key: bytes, stored: StoredResponse) -> None:
+        """Store the response of a reserved key."""
+        with self.session_scope(tenant) as db:
+            repo = IdempotencyRepository(db)
+            repo.complete(key, stored.status_code, stored.body, encode_headers(stored.headers))
+            self._remember(key, stored, self.ttl_seconds)
+            self._purge_expired(repo, tenant)
+
+    def release(self, tenant: Optional[str], key: bytes) -> None:
+        """Drop a reservation whose request failed, so it can be retried."""
+        with self.session_scope(tenant) as db:
+            IdempotencyRepository(db).release(key)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            cached = len(self._cache)
+        return {
+            "cached": cached,
+            "cache_hits": self.cache_hits,
+            "stored_hits": self.stored_hits,
+            "reserved": self.reserved,
+            "purged": self.purged
+        }
+
+    def _remember(self, key: bytes, stored: StoredResponse, ttl: float) -> None:
+        if ttl <= 0 or self.cache_size <= 0:
+            return
+        with self._lock:
+            self._cache[key] = (time.monotonic() + ttl, stored)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def _purge_expired(self, repo: IdempotencyRepository, tenant: Optional[str]) -> None:
+        now = time.monotonic()
+        with self._lock:
+            if now - self._last_purge.get(tenant, float("-inf")) < self.purge_interval_seconds:
+                return
+            self._last_purge[tenant] = now
+        try:
+            self.purged += repo.delete_expired(utc_now() - timedelta(seconds=self.ttl_seconds))
+        except Exception:
+            logger.exception("Deleting expired idempotency keys failed")
+
+
+_store: Optional[IdempotencyStore] = None
+_store_lock = threading.Lock()
+
+
+def get_idempotency_store() -> IdempotencyStore:
+    """Get the process-wide idempotency store."""
+    global _store
+    if _store is None:
+        settings = get_settings()
+        with _store_lock:
+            if _store is None:
+                _store = IdempotencyStore(
+                    ttl_seconds=settings.IDEMPOTENCY_TTL_SECONDS,
+                    lock_seconds=settings.IDEMPOTENCY_LOCK_SECONDS,
+                    cache_size=settings.IDEMPOTENCY_CACHE_SIZE
+                )
+    return _store
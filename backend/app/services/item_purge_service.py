@@ -0,0 +1,118 @@
+"""
+Item Purge Service - Hard-delete soft-deleted items after a retention period.
+"""
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.repositories.item_purge_repository import ItemPurgeRepository
+from app.repositories.cache_version_repository import CacheVersionRepository
+from app.services.learning_item_service import review_activity_cache
+from app.services.review_analytics_service import adherence_cache
+
+
+class ItemPurgeService:
+    """
+    Service for purging soft-deleted items.
+
+    Items deleted more than `retention_days` ago are removed with their review
+    history, due queue entries, near-duplicate index rows and cold content.
+    Each batch is its own short transaction, so writers are blocked only for
+    one batch at a time; a run stops after its time budget and the next run
+    simply continues with what is left.
+
+    Purging history changes past days, whose review activity and adherence
+    are cached per process. Each batch bumps both caches' versions in its
+    transaction, so every process (API workers included, whoever ran the
+    purge) recomputes those days on its next read.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.purge_repo = ItemPurgeRepository(db)
+        self.cache_version_repo = CacheVersionRepository(db)
+
+    def purge_deleted(
+        self,
+        retention_days: int,
+        batch_size: int,
+        pause_ms: int = 0,
+        time_budget: Optional[float] = None,
+        echo: Callable[[str], None] = print
+    ) -> Dict:
+        """
+        Purge items soft-deleted more than `retention_days` ago.
+
+        Args:
+            retention_days: Keep items deleted within this many days
+            batch_size: Items per transaction
+            pause_ms: Pause between batches to leave room for application writes
+            time_budget: Stop after this many seconds (None = until done)
+            echo: Progress callback, one line per batch
+
+        Returns:
+            Dictionary with items_purged, reviews_purged, remaining and complete
+        """
+        deleted_before = datetime.now(timezone.utc) - timedelta(days=retention_days)
+        total = self.purge_repo.count_purgeable(deleted_before)
+        started = time.monotonic()
+        items_purged = reviews_purged = 0
+
+        while True:
+            if time_budget is not None and time.monotonic() - started >= time_budget:
+                break
+            item_ids = self.purge_repo.get_purgeable_ids(deleted_before, batch_size)
+            if not item_ids:
+                break
+            items, reviews = self.purge_repo.purge(item_ids, commit=False)
+            if reviews:
+                # Past days' review counts no longer match the history
+                self.cache_version_repo.bump(review_activity_cache.name, commit=False)
+                self.cache_version_repo.bump(adherence_cache.name, commit=False)
+            self.db.commit()
+            items_purged += items
+            reviews_purged += reviews
+            elapsed = time.monotonic() - started
+            echo(
+                f"purge: {items_purged:,}/{total:,} items, {reviews_purged:,} reviews "
+                f"({items_purged / elapsed if elapsed > 0 else 0:,.0f} items/s)"
+            )
+            if pause_ms:
+                time.sleep(pause_ms / 1000)
+
+        remaining = self.purge_repo.count_purgeable(deleted_before)
+        return {
+            "items_purged": items_purged,
+            "reviews_purged": reviews_purged,
+            "remaining": remaining,
+            "complete": remaining == 0
+        }
+
+    def optimize(self, vacuum: bool = False, analyze: bool = False, echo: Callable[[str], None] = print) -> List[str]:
+        """
+        Reclaim space and/or refresh planner statistics after a purge.
+
+        VACUUM rewrites the whole SQLite file under an exclusive lock (run it
+        off-peak); on PostgreSQL it only marks dead rows reusable and doesn't block.
+
+        Returns:
+            The statements run
+        """
+        statements = []
+        if vacuum:
+            statements.append("VACUUM")
+        if analyze:
+            statements.append("ANALYZE")
+        if not statements:
+            return statements
+
+        # Neither statement may run inside a transaction
+        with self.db.get_bind().connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            for statement in statements:
+                started = time.monotonic()
+                conn.execute(text(statement))
+                echo(f"{statement}: {time.monotonic() - started:.1f}s")
+        return statements
@@ -1,16 +1,41 @@
 """
 Learning Item Service - Business logic for managing learning items.
 """
-from datetime import date, datetime, timezone
-from typing import List, Optional, Dict, Tuple
+from contextlib import nullcontext
+from datetime import date, datetime, timedelta, timezone
+from typing import List, Optional, Dict, Tuple, Union
 from sqlalchemy.orm import Session
+import numpy as np
+import uuid
 
 from app.models.learning_item import LearningItem
 from app.models.review_history import ReviewHistory
-from app.repositories.learning_item_repository import LearningItemRepository
+from app.models.subject import Subject
+from app.models.due_queue import DueQueueState
+from app.repositories.learning_item_repository import DUE_ORDERS, ItemRecord, LearningItemRepository
 from app.repositories.review_history_repository import ReviewHistoryRepository
+from app.repositories.due_queue_repository import DueQueueRepository
+from app.repositories.subject_repository import SubjectRepository
+from app.repositories.item_signature_repository import ItemSignatureRepository
+from app.repositories.item_tier_repository import ItemTierRepository
+from app.repositories.cache_version_repository import CacheVersionRepository
 from app.services.spaced_repetition_service import SpacedRepetitionService
-from app.core.exceptions import ItemNotFoundException
+from app.services.review_analytics_service import adherence_cache
+from app.core.exceptions import AppException, ItemNotFoundException, ValidationException
+from app.core.single_flight import coalesce
+from app.core.day_cache import ClosedDayCache
+from app.core import minhash
+from app.config import get_settings
+from app.database import primary_session, read_only, use_primary
+
+# Per-day review counts per tenant; past days are cached until a purge bumps the cache version
+review_activity_cache = ClosedDayCache("review_activity")
+
+# Returned by _resolve_subject_id when a subject filter names an unknown subject
+NO_SUCH_SUBJECT = -1
+
+# Near-duplicate candidates re-scored per lookup (those sharing the most LSH bands)
+SIMILAR_MAX_CANDIDATES = 500
 
 
 class LearningItemService:
@@ -20,8 +45,14 @@ class LearningItemService:
     """
 
     def __init__(self, db: Session):
+        self.db = db
         self.item_repo = LearningItemRepository(db)
         self.review_repo = ReviewHistoryRepository(db)
+        self.due_queue_repo = DueQueueRepository(db)
+        self.subject_repo = SubjectRepository(db)
+        self.signature_repo = ItemSignatureRepository(db)
+        self.tier_repo = ItemTierRepository(db)
+        self.cache_version_repo = CacheVersionRepository(db)
         self.sr_service = SpacedRepetitionService()
 
     def create_item(
@@ -42,31 +73,69 @@ class LearningItemService:
         Returns:
             Created LearningItem
         """
+        today = date.today()
+        subject_row = self.subject_repo.get_or_create(subject.strip())
         db_item = self.item_repo.create({
-            "subject": subject.strip(),
+            "subject_id": subject_row.id,
             "title": title.strip(),
             "content": content.strip(),
             "review_count": 0,
-            "next_review_date": date.today(),  # Day 0 review
+            "next_review_date": today,  # Day 0 review
             "current_interval_days": 0
         })
+        self.subject_repo.adjust_counts(subject_row.id, today, live_delta=1, due_delta=1)
+        self.due_queue_repo.sync_item(db_item)
+        self._index_signature(db_item)
         return db_item
 
     def get_item_by_id(self, item_id: str) -> LearningItem:
-        """Get a single item by ID."""
+        """Get a single item by ID (a cold item is promoted back to the hot tier)."""
+        item = self._get_stored_item(item_id)
+        if item.is_cold:
+            self.tier_repo.promote_item(item)
+        return item
+
+    def _get_stored_item(self, item_id: str) -> LearningItem:
+        """Get a single item by ID without promoting it (for read_only methods)."""
         item = self.item_repo.get_by_id(item_id)
         if not item:
             raise ItemNotFoundException(f"Learning item with ID {item_id} not found")
         return item
 
+    @read_only
+    def get_items_by_ids(self, item_ids: List[str]) -> Tuple[List[ItemRecord], List[str]]:
+        """
+        Get many items by ID in one query.
+
+        Returns:
+            Tuple of (found items in request order, IDs not found)
+        """
+        unique_ids = list(dict.fromkeys(item_ids))
+        found = {item.id: item for item in self.item_repo.get_by_ids(unique_ids)}
+        items = [found[item_id] for item_id in unique_ids if item_id in found]
+        missing = [item_id for item_id in unique_ids if item_id not in found]
+        return items, missing
+
+    @read_only
     def get_all_items(
         self,
         subject: Optional[str] = None,
         skip: int = 0,
         limit: int = 100
-    ) -> List[LearningItem]:
+    ) -> List[ItemRecord]:
         """Get all items with optional filtering."""
-        return self.item_repo.get_all(subject=subject, skip=skip, limit=limit)
+        subject_id = self._resolve_subject_id(subject)
+        if subject_id == NO_SUCH_SUBJECT:
+            return []
+        return self.item_repo.get_all(subject_id=subject_id, skip=skip, limit=limit)
+
+    @read_only
+    def count_items(self, subject: Optional[str] = None) -> int:
+        """Count live items with optional subject filter."""
+        subject_id = self._resolve_subject_id(subject)
+        if subject_id == NO_SUCH_SUBJECT:
+            return 0
+        return self.item_repo.count_all(subject_id=subject_id)
 
     def update_item(
         self,
@@ -76,9 +145,12 @@ class LearningItemService:
         content: Optional[str] = None
     ) -> LearningItem:
         """Update an existing item."""
+        item = self.get_item_by_id(item_id)
+        old_subject_id = item.subject_id
+
         update_data = {}
         if subject is not None:
-            update_data["subject"] = subject.strip()
+            update_data["subject_id"] = self.subject_repo.get_or_create(subject.strip()).id
         if title is not None:
             update_data["title"] = title.strip()
         if content is not None:
@@ -87,15 +159,103 @@ class LearningItemService:
         item = self.item_repo.update(item_id, update_data)
         if not item:
             raise ItemNotFoundException(f"Learning item with ID {item_id} not found")
+        if title is not None or content is not None:
+            self._index_signature(item)
+
+        # Move the item between subject counters and re-key its queue row
+        if item.subject_id != old_subject_id:
+            today = date.today()
+            is_due = int(item.next_review_date <= today)
+            self.subject_repo.adjust_counts(old_subject_id, today, live_delta=-1, due_delta=-is_due)
+            self.subject_repo.adjust_counts(item.subject_id, today, live_delta=1, due_delta=is_due)
+            self.due_queue_repo.sync_item(item)
+            # Cached adherence of closed days is broken down by the items' current subject
+            self.cache_version_repo.bump(adherence_cache.name)
         return item
 
     def delete_item(self, item_id: str) -> bool:
         """Soft delete an item."""
+        item = self.get_item_by_id(item_id)
+        subject_id = item.subject_id
+        today = date.today()
+        was_due = int(item.next_review_date <= today)
+
         success = self.item_repo.soft_delete(item_id)
         if not success:
             raise ItemNotFoundException(f"Learning item with ID {item_id} not found")
+        self.subject_repo.adjust_counts(subject_id, today, live_delta=-1, due_delta=-was_due)
+        self.due_queue_repo.remove(item_id)
+        self.signature_repo.remove(item_id)
         return True
 
+    @read_only
+    def get_similar_items(
+        self,
+        item_id: str,
+        limit: int = 10,
+        min_similarity: Optional[float] = None
+    ) -> List[Dict]:
+        """
+        Get live items whose title and content nearly match an item's.
+
+        Raises:
+            ItemNotFoundException: If item not found
+        """
+        return self.find_duplicates(self._get_stored_item(item_id), limit, min_similarity)
+
+    def find_duplicates(
+        self,
+        item: ItemRecord,
+        limit: int = 10,
+        min_similarity: Optional[float] = None
+    ) -> List[Dict]:
+        """
+        Find near-duplicates of an item through the MinHash/LSH index.
+        Only items sharing an LSH bucket with the item are scored, so the
+        cost doesn't grow with the number of items.
+
+        Args:
+            item: Item to compare
+            limit: Maximum number of items to return
+            min_similarity: Minimum estimated Jaccard similarity of title and
+                content (defaults to DUPLICATE_SIMILARITY_THRESHOLD)
+
+        Returns:
+            Items with id, subject, title and similarity, most similar first
+        """
+        if min_similarity is None:
+            min_similarity = get_settings().DUPLICATE_SIMILARITY_THRESHOLD
+        signature = minhash.signature(item.title, item.content)
+        candidates = self.signature_repo.get_candidates(
+            minhash.band_keys(signature), exclude_id=item.id, limit=SIMILAR_MAX_CANDIDATES
+        )
+        if not candidates:
+            return []
+
+        scores = minhash.similarities(
+            signature, np.stack([minhash.from_bytes(stored) for _, stored in candidates])
+        )
+        ranked = sorted(
+            ((float(score), item_id) for (item_id, _), score in zip(candidates, scores) if score >= min_similarity),
+            reverse=True
+        )[:limit]
+        found = {record.id: record for record in self.item_repo.get_by_ids([item_id for _, item_id in ranked])}
+        return [
+            {
+                "id": item_id,
+                "subject": found[item_id].subject,
+                "title": found[item_id].title,
+                "similarity": round(score, 3)
+            }
+            for score, item_id in ranked
+            if item_id in found
+        ]
+
+    def _index_signature(self, item: LearningItem) -> None:
+        """Store the MinHash signature and LSH buckets of an item's current text."""
+        signature = minhash.signature(item.title, item.content)
+        self.signature_repo.replace(item.id, minhash.to_bytes(signature), minhash.band_keys(signature))
+
     def mark_as_reviewed(self, item_id: str) -> Tuple[LearningItem, ReviewHistory]:
         """
         Mark an item as reviewed and calculate next review date.
@@ -112,9 +272,66 @@ class LearningItemService:
         """
         # Get the item
         item = self.get_item_by_id(item_id)
+        return self._record_review(item, datetime.now(timezone.utc))
+
+    def manual_review(self, item_id: str) -> Tuple[LearningItem, ReviewHistory]:
+        """
+        Record a manual review without affecting the schedule.
+        Only increments manual_review_count.
+        Does NOT change next_review_date or current_interval_days.
+
+        Args:
+            item_id: ID of the item to manually review
+
+        Returns:
+            Tuple of (updated_item, review_history)
+
+        Raises:
+            ItemNotFoundException: If item not found
+        """
+        # Get the item
+        item = self.get_item_by_id(item_id)
+        return self._record_manual_review(item, datetime.now(timezone.utc))
+
+    def apply_review_batch(
+        self,
+        reviews: List[Tuple[str, bool, datetime]]
+    ) -> List[Union[Tuple[LearningItem, ReviewHistory], AppException]]:
+        """
+        Apply many review submissions in a single transaction (group commit).
+        Reviews of the same item are applied in order.
+
+        Args:
+            reviews: List of (item_id, is_manual, reviewed_at)
+
+        Returns:
+            One entry per review: (updated_item, review_history), or the
+            exception for that review (e.g. item deleted since it was submitted)
+        """
+        results = []
+        for item_id, is_manual, reviewed_at in reviews:
+            item = self.item_repo.get_by_id(item_id)
+            if not item:
+                results.append(ItemNotFoundException(f"Learning item with ID {item_id} not found"))
+                continue
+
+            record = self._record_manual_review if is_manual else self._record_review
+            results.append(record(item, reviewed_at, commit=False))
+
+        self.db.commit()
+        return results
+
+    def _record_review(
+        self,
+        item: LearningItem,
+        reviewed_at: datetime,
+        commit: bool = True
+    ) -> Tuple[LearningItem, ReviewHistory]:
+        """Write a scheduled review for an item and reschedule it."""
+        today = date.today()
+        was_due = int(item.next_review_date <= today)
 
         # Calculate next review
-        reviewed_at = datetime.now(timezone.utc)
         new_review_count = item.review_count + 1
         next_review_date, interval_days = self.sr_service.calculate_next_review(
             current_review_count=new_review_count,
@@ -123,87 +340,151 @@ class LearningItemService:
 
         # Create review history entry
         review = self.review_repo.create_review({
-            "learning_item_id": item_id,
+            "learning_item_id": item.id,
             "reviewed_at": reviewed_at,
             "interval_days": interval_days,
             "next_review_date": next_review_date,
             "review_number": new_review_count
-        })
+        }, commit=commit)
 
         # Update item with new review tracking
         updated_item = self.item_repo.update_review_tracking(
-            item_id=item_id,
+            item_id=item.id,
             review_count=new_review_count,
             next_review_date=next_review_date,
-            interval_days=interval_days
+            interval_days=interval_days,
+            commit=commit
         )
+        is_due = int(updated_item.next_review_date <= today)
+        self.subject_repo.adjust_counts(updated_item.subject_id, today, due_delta=is_due - was_due)
+        self.due_queue_repo.sync_item(updated_item, commit=commit)
 
         return updated_item, review
 
-    def manual_review(self, item_id: str) -> Tuple[LearningItem, ReviewHistory]:
-        """
-        Record a manual review without affecting the schedule.
-        Only increments manual_review_count.
-        Does NOT change next_review_date or current_interval_days.
-
-        Args:
-            item_id: ID of the item to manually review
-
-        Returns:
-            Tuple of (updated_item, review_history)
-
-        Raises:
-            ItemNotFoundException: If item not found
-        """
-        # Get the item
-        item = self.get_item_by_id(item_id)
-
+    def _record_manual_review(
+        self,
+        item: LearningItem,
+        reviewed_at: datetime,
+        commit: bool = True
+    ) -> Tuple[LearningItem, ReviewHistory]:
+        """Write a manual review for an item, leaving its schedule unchanged."""
         # Calculate new manual review count
-        reviewed_at = datetime.now(timezone.utc)
         new_manual_count = item.manual_review_count + 1
 
         # Create review history entry with is_manual=True
         review = self.review_repo.create_review({
-            "learning_item_id": item_id,
+            "learning_item_id": item.id,
             "reviewed_at": reviewed_at,
             "interval_days": item.current_interval_days,  # Keep current interval
             "next_review_date": item.next_review_date,  # Keep current schedule
             "review_number": new_manual_count,
             "is_manual": True  # Mark as manual review
-        })
+        }, commit=commit)
 
         # Update item with new manual review count only
         updated_item = self.item_repo.update_manual_review_count(
-            item_id=item_id,
-            manual_review_count=new_manual_count
+            item_id=item.id,
+            manual_review_count=new_manual_count,
+            commit=commit
         )
 
         return updated_item, review
 
+    @read_only
     def get_due_items(
         self,
         subject: Optional[str] = None,
-        target_date: Optional[date] = None
-    ) -> List[LearningItem]:
+        target_date: Optional[date] = None,
+        limit: Optional[int] = None,
+        order: str = "due"
+    ) -> List[ItemRecord]:
         """
-        Get all items due for review.
+        Get items due for review.
+        Served from the materialized due queue when the date is inside its
+        horizon, otherwise from the live items table. The queue is rolled
+        over (or rebuilt) first if it is behind today: a write, made on its
+        own primary session so this one keeps reading from the replica.
 
         Args:
             subject: Optional filter by subject
             target_date: Optional target date (defaults to today)
+            limit: Optional maximum number of items (next N due)
+            order: "due" (scheduler order) or "priority" (subject weight * days
+                overdue / interval as of today, most urgent first)
 
         Returns:
             List of items due for review
+
+        Raises:
+            ValidationException: If the order is unknown
         """
+        self._check_due_order(order)
         due_date = target_date or date.today()
-        return self.item_repo.get_due_items(due_date, subject)
+        subject_id = self._resolve_subject_id(subject)
+        if subject_id == NO_SUCH_SUBJECT:
+            return []
+        state = self._roll_due_queue_over()
+        if due_date <= state.horizon_end:
+            return self.due_queue_repo.get_due_items(due_date, subject_id, limit, order)
+        return self.item_repo.get_due_items(due_date, subject_id, limit, order)
+
+    def get_review_session(
+        self,
+        n: int,
+        subject: Optional[str] = None,
+        lease_token: Optional[str] = None,
+        order: str = "due"
+    ) -> Tuple[List[LearningItem], str, datetime]:
+        """
+        Lease the next N due items for a review session.
+
+        Cards stay reserved for the lease token until they are reviewed or
+        the lease expires, so another device asking for its next cards gets
+        different ones. Passing the same token again returns the unanswered
+        cards of that session topped up to N.
 
+        Args:
+            n: Number of cards to serve
+            subject: Optional filter by subject
+            lease_token: Token from a previous call (a new one is issued if omitted)
+            order: "due" or "priority" (see get_due_items)
+
+        Returns:
+            Tuple of (items in `order`, lease_token, lease_expires_at)
+        """
+        self._check_due_order(order)
+        lease_token = lease_token or uuid.uuid4().hex
+        lease_seconds = get_settings().REVIEW_SESSION_LEASE_SECONDS
+        subject_id = self._resolve_subject_id(subject)
+        if subject_id == NO_SUCH_SUBJECT:
+            return [], lease_token, datetime.now(timezone.utc) + timedelta(seconds=lease_seconds)
+
+        today = date.today()
+        self.due_queue_repo.ensure_current(today)
+        items, leased_until = self.due_queue_repo.lease_due_items(
+            due_date=today,
+            limit=n,
+            lease_token=lease_token,
+            lease_seconds=lease_seconds,
+            subject_id=subject_id,
+            order=order
+        )
+        return items, lease_token, leased_until
+
+    def release_review_session(self, lease_token: str) -> int:
+        """Release the cards held by a review session lease."""
+        return self.due_queue_repo.release_lease(lease_token)
+
+    @coalesce
+    @read_only
     def get_due_items_by_subject(
         self,
         target_date: Optional[date] = None
     ) -> Dict[str, int]:
         """
         Get count of due items grouped by subject.
+        For today this reads the cached subject counters (O(#subjects)),
+        rolling the due queue over first (see get_due_items).
 
         Args:
             target_date: Optional target date (defaults to today)
@@ -211,6 +492,13 @@ class LearningItemService:
         Returns:
             Dictionary mapping subject to count
         """
+        today = date.today()
+        if target_date is None or target_date == today:
+            self._roll_due_queue_over(today)
+            counts = self.subject_repo.get_due_counts(today)
+            if counts is not None:
+                return counts
+
         due_items = self.get_due_items(target_date=target_date)
 
         by_subject = {}
@@ -219,6 +507,8 @@ class LearningItemService:
 
         return by_subject
 
+    @coalesce
+    @read_only
     def get_review_stats(self) -> Dict:
         """
         Get overall review statistics.
@@ -228,12 +518,11 @@ class LearningItemService:
         """
         total_items = self.item_repo.count_all()
         total_reviews = self.review_repo.get_total_reviews()
-        items_due_today = len(self.get_due_items())
+        items_due_today = sum(self.get_due_items_by_subject().values())
 
         # Items due this week
-        from datetime import timedelta
         week_from_now = date.today() + timedelta(days=7)
-        items_due_week = len(self.item_repo.get_due_items(week_from_now))
+        items_due_week = len(self.get_due_items(target_date=week_from_now))
 
         reviews_by_interval = self.review_repo.get_reviews_by_interval()
 
@@ -245,12 +534,207 @@ class LearningItemService:
             "reviews_by_interval": reviews_by_interval
         }
 
+    @coalesce
+    @read_only
+    def get_subject_stats(self) -> List[Dict]:
+        """
+        Get statistics for every subject.
+
+        Returns:
+            One dictionary per subject with item, due and review counts
+            and the average current interval
+        """
+        today = date.today()
+        return self.item_repo.get_subject_stats(today, today + timedelta(days=7))
+
+    @coalesce
+    @read_only
     def get_all_subjects(self) -> List[str]:
-        """Get all unique subjects."""
-        return self.item_repo.get_all_subjects()
+        """Get all subjects that have live items."""
+        return self.subject_repo.get_names_in_use()
+
+    def rename_subject(self, name: str, new_name: str) -> Subject:
+        """
+        Rename a subject for all of its items (single-row update).
+
+        Raises:
+            ItemNotFoundException: If the subject doesn't exist
+            ValidationException: If another subject already uses the new name
+        """
+        subject = self.subject_repo.get_by_name(name)
+        if not subject:
+            raise ItemNotFoundException(f"Subject {name} not found")
+
+        new_name = new_name.strip()
+        existing = self.subject_repo.get_by_name(new_name)
+        if existing and existing.id != subject.id:
+            raise ValidationException(f"Subject {new_name} already exists")
+        return self.subject_repo.rename(subject, new_name)
 
+    def set_subject_priority(self, name: str, weight: float) -> Subject:
+        """
+        Set a subject's weight in the priority due order and re-rank its queued items.
+
+        Raises:
+            ItemNotFoundException: If the subject doesn't exist
+        """
+        subject = self.subject_repo.get_by_name(name)
+        if not subject:
+            raise ItemNotFoundException(f"Subject {name} not found")
+
+        self.subject_repo.set_priority_weight(subject, weight, commit=False)
+        self.due_queue_repo.refresh_priorities(date.today(), subject.id)
+        return subject
+
+    def bulk_update(
+        self,
+        subject: Optional[str] = None,
+        item_ids: Optional[List[str]] = None,
+        due_from: Optional[date] = None,
+        due_to: Optional[date] = None,
+        set_subject: Optional[str] = None,
+        shift_days: Optional[int] = None,
+        reset_progress: bool = False
+    ) -> int:
+        """
+        Change every live item matching a filter with one set-based UPDATE.
+        The due queue (with priorities), cold tier and subject counters are
+        brought in line in the same transaction.
+
+        Args:
+            subject: Only items of this subject
+            item_ids: Only these items
+            due_from: Only items due on or after this date
+            due_to: Only items due on or before this date
+            set_subject: Move the items to this subject (created if needed)
+            shift_days: Move each item's next review by this many days
+            reset_progress: Restart the items' schedule (day-0 review today)
+
+        Returns:
+            Number of items updated
+
+        Raises:
+            ValidationException: If the filter or the change is empty, or the due range is reversed
+        """
+        if set_subject is None and not shift_days and not reset_progress:
+            raise ValidationException("Nothing to change: give set_subject, shift_days or reset_progress")
+        if subject is None and not item_ids and due_from is None and due_to is None:
+            raise ValidationException("Filter by at least one of subject, ids, due_from or due_to")
+        if due_from is not None and due_to is not None and due_from > due_to:
+            raise ValidationException("due_from must not be after due_to")
+
+        subject_id = self._resolve_subject_id(subject)
+        if subject_id == NO_SUCH_SUBJECT:
+            return 0
+        conditions = self.item_repo.bulk_conditions(subject_id, item_ids, due_from, due_to)
+        subject_ids = self.item_repo.get_subject_ids_where(conditions)
+        if not subject_ids:
+            return 0
+
+        today = date.today()
+        target_id = None
+        if set_subject is not None:
+            target_id = self.subject_repo.get_or_create(set_subject.strip()).id
+            subject_ids.add(target_id)
+        values = self.item_repo.bulk_values(today, target_id, shift_days, reset_progress)
+
+        # Queue rows and promotions first, while conditions still select the same items
+        self.due_queue_repo.requeue_where(conditions, values, today, commit=False)
+        self.tier_repo.promote_queued(conditions, commit=False)
+        updated = self.item_repo.update_where(conditions, values, commit=False)
+        self.subject_repo.recount(subject_ids, today)
+        if target_id is not None:
+            # Cached adherence of closed days is broken down by the items' current subject
+            self.cache_version_repo.bump(adherence_cache.name, commit=False)
+        self.db.commit()
+        return updated
+
+    def _roll_due_queue_over(self, today: Optional[date] = None) -> DueQueueState:
+        """
+        Roll the due queue over (if behind today) on a separate primary session,
+        so read-only methods don't become writers of their own session.
+        """
+        with primary_session(self.db) as maintenance:
+            return DueQueueRepository(maintenance).ensure_current(today)
+
+    @staticmethod
+    def _check_due_order(order: str) -> None:
+        if order not in DUE_ORDERS:
+            raise ValidationException(f"order must be one of: {', '.join(DUE_ORDERS)}")
+
+    def _resolve_subject_id(self, subject: Optional[str]) -> Optional[int]:
+        """
+        Resolve an optional subject filter to its ID.
+
+        Returns:
+            None for no filter, the subject ID, or NO_SUCH_SUBJECT
+        """
+        if not subject:
+            return None
+        subject_id = self.subject_repo.get_id_by_name(subject)
+        return NO_SUCH_SUBJECT if subject_id is None else subject_id
+
+    @read_only
+    def get_review_activity(self, start_date: date, end_date: date) -> List[Dict]:
+        """
+        Get review counts per UTC day, split into scheduled and manual.
+        Closed days are cached until the cache's version in the database
+        changes (purge); only days not cached yet (normally just today) are
+        queried.
+
+        Args:
+            start_date: First day (inclusive)
+            end_date: Last day (inclusive)
+
+        Returns:
+            One entry per day with scheduled, manual and total counts
+        """
+        today = datetime.now(timezone.utc).date()
+        days = [start_date + timedelta(days=offset) for offset in range((end_date - start_date).days + 1)]
+        past_and_today = [day for day in days if day <= today]
+
+        tenant = self.db.info.get("tenant")
+        with use_primary(self.db):
+            version = self.cache_version_repo.get(review_activity_cache.name)
+        counts, missing = review_activity_cache.get_many(tenant, version, past_and_today)
+        if missing:
+            # Closed days are cached, so they are never read from a lagging replica
+            with use_primary(self.db) if min(missing) < today else nullcontext():
+                fresh = self.review_repo.get_daily_review_counts(min(missing), max(missing))
+            for day in missing:
+                counts[day] = fresh.get(day, (0, 0))
+                review_activity_cache.put(tenant, version, day, counts[day], today)
+
+        activity = []
+        for day in days:
+            scheduled, manual = counts.get(day, (0, 0))
+            activity.append({
+                "date": day,
+                "scheduled": scheduled,
+                "manual": manual,
+                "total": scheduled + manual
+            })
+        return activity
+
+    @read_only
     def get_review_history(self, item_id: str, limit: int = 50) -> List[ReviewHistory]:
         """Get review history for a specific item."""
         # Verify item exists
-        self.get_item_by_id(item_id)
+        self._get_stored_item(item_id)
         return self.review_repo.get_item_history(item_id, limit)
+
+    @read_only
+    def get_review_histories(
+        self,
+        item_ids: List[str],
+        limit: int = 50
+    ) -> Tuple[Dict[str, List[ReviewHistory]], List[str]]:
+        """
+        Get review history for many items with one existence query and one history query.
+
+        Returns:
+            Tuple of (history keyed by item ID, IDs not found)
+        """
+        items, missing = self.get_items_by_ids(item_ids)
+        history = self.review_repo.get_items_history([item.id for item in items], limit)
+        return history, missing
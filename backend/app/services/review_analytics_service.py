@@ -0,0 +1,165 @@
+"""
+Review Analytics Service - Adherence to the review schedule.
+"""
+from contextlib import nullcontext
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, List, Tuple
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.core.day_cache import ClosedDayCache
+from app.database import read_only, use_primary
+from app.repositories.cache_version_repository import CacheVersionRepository
+from app.repositories.review_history_repository import ReviewHistoryRepository
+from app.repositories.subject_repository import SubjectRepository
+
+# Lateness counts per tenant, UTC day and subject; past days are cached until a purge or moving
+# items to another subject bumps the cache version
+adherence_cache = ClosedDayCache("review_adherence")
+
+# Lateness histogram: bucket i holds lateness in [LATENESS_EDGES[i-1], LATENESS_EDGES[i])
+LATENESS_EDGES = [0, 1, 2, 3, 7, 14, 30]
+LATENESS_BUCKETS = ["early", "on_time", "1_day", "2_days", "3_6_days", "7_13_days", "14_29_days", "30_plus_days"]
+
+
+def summarize_lateness(
+    lateness: np.ndarray,
+    counts: np.ndarray,
+    day_index: np.ndarray,
+    num_days: int
+) -> Dict:
+    """
+    Summarize weighted lateness samples.
+
+    A review is on time when done on (or before) its scheduled day. A streak
+    day has scheduled reviews and none of them late; today doesn't break the
+    current streak before any review is done.
+
+    Args:
+        lateness: Days late per sample (negative = early)
+        counts: Reviews per sample
+        day_index: Day of each sample (0 = first day of the range)
+        num_days: Number of days in the range
+
+    Returns:
+        Dictionary with rates, lateness percentiles, histogram and streaks
+    """
+    total = int(counts.sum())
+    histogram = np.bincount(np.digitize(lateness, LATENESS_EDGES), weights=counts, minlength=len(LATENESS_BUCKETS))
+    summary = {
+        "reviews": total,
+        "on_time_rate": 0.0,
+        "mean_lateness_days": 0.0,
+        "p50_lateness_days": 0,
+        "p90_lateness_days": 0,
+        "p99_lateness_days": 0,
+        "max_lateness_days": 0,
+        "distribution": {bucket: int(count) for bucket, count in zip(LATENESS_BUCKETS, histogram)},
+        "current_streak_days": 0,
+        "longest_streak_days": 0
+    }
+    if total == 0:
+        return summary
+
+    order = np.argsort(lateness, kind="stable")
+    sorted_lateness = lateness[order]
+    cumulative = np.cumsum(counts[order])
+
+    def percentile(pct: float) -> int:
+        rank = max(1, int(np.ceil(pct / 100 * total)))
+        return int(sorted_lateness[np.searchsorted(cumulative, rank)])
+
+    late = lateness > 0
+    reviews_per_day = np.bincount(day_index, weights=counts, minlength=num_days)
+    late_per_day = np.bincount(day_index, weights=counts * late, minlength=num_days)
+    good_days = (reviews_per_day > 0) & (late_per_day == 0)
+    if reviews_per_day[-1] == 0:
+        good_days = good_days[:-1]
+
+    # Run lengths of consecutive good days
+    edges = np.diff(np.concatenate(([0], good_days.astype(np.int8), [0])))
+    run_lengths = np.flatnonzero(edges == -1) - np.flatnonzero(edges == 1)
+
+    summary.update({
+        "on_time_rate": round(float(counts[~late].sum() / total), 4),
+        "mean_lateness_days": round(float((lateness * counts).sum() / total), 2),
+        "p50_lateness_days": percentile(50),
+        "p90_lateness_days": percentile(90),
+        "p99_lateness_days": percentile(99),
+        "max_lateness_days": int(sorted_lateness[-1]),
+        "current_streak_days": int(run_lengths[-1]) if len(good_days) and good_days[-1] else 0,
+        "longest_streak_days": int(run_lengths.max()) if len(run_lengths) else 0
+    })
+    return summary
+
+
+class ReviewAnalyticsService:
+    """
+    Analytics over review history.
+    Per-day aggregates come from one windowed SQL query and are combined with NumPy.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.review_repo = ReviewHistoryRepository(db)
+        self.subject_repo = SubjectRepository(db)
+        self.cache_version_repo = CacheVersionRepository(db)
+
+    @read_only
+    def get_adherence(self, start_date: date, end_date: date) -> Dict:
+        """
+        Get schedule adherence of scheduled reviews, overall and per subject.
+        Closed days are cached until the cache's version in the database
+        changes (purge, subject moves); only days not cached yet (normally
+        just today) are queried.
+
+        Args:
+            start_date: First day (inclusive, UTC)
+            end_date: Last day (inclusive, UTC)
+
+        Returns:
+            Dictionary with the overall summary and one summary per subject
+        """
+        today = datetime.now(timezone.utc).date()
+        # Future days have no reviews and would end every streak
+        end_date = max(min(end_date, today), start_date)
+        num_days = (end_date - start_date).days + 1
+        days = [start_date + timedelta(days=offset) for offset in range(num_days)]
+
+        tenant = self.db.info.get("tenant")
+        with use_primary(self.db):
+            version = self.cache_version_repo.get(adherence_cache.name)
+        per_day, missing = adherence_cache.get_many(tenant, version, days)
+        if missing:
+            # Closed days are cached, so they are never read from a lagging replica
+            with use_primary(self.db) if min(missing) < today else nullcontext():
+                fresh = self.review_repo.get_lateness_counts(min(missing), max(missing))
+            for day in missing:
+                per_day[day] = fresh.get(day, [])
+                adherence_cache.put(tenant, version, day, per_day[day], today)
+
+        samples: List[Tuple[int, int, int, int]] = [
+            ((day - start_date).days, subject_id, lateness, count)
+            for day, rows in per_day.items()
+            for subject_id, lateness, count in rows
+        ]
+        data = np.array(samples, dtype=np.int64).reshape(-1, 4)
+        day_index, subject_ids, lateness, counts = data.T
+
+        names = self.subject_repo.get_names_by_id(np.unique(subject_ids).tolist())
+        by_subject = []
+        for subject_id in np.unique(subject_ids):
+            mask = subject_ids == subject_id
+            by_subject.append({
+                "subject": names.get(int(subject_id), str(subject_id)),
+                **summarize_lateness(lateness[mask], counts[mask], day_index[mask], num_days)
+            })
+        by_subject.sort(key=lambda summary: summary["subject"])
+
+        return {
+            "from_date": start_date,
+            "to_date": end_date,
+            "overall": summarize_lateness(lateness, counts, day_index, num_days),
+            "by_subject": by_subject
+        }
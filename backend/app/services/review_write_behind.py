@@ -0,0 +1,210 @@
+"""
+Review Write-Behind - Group commit for review submissions.
+"""
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from datetime import datetime, timezone
+from typing import List, Optional, Tuple
+
+from app.config import get_settings
+from app.database import SessionLocal
+from app.core.exceptions import ServiceUnavailableException
+from app.models.review_history import ReviewHistory
+from app.services.learning_item_service import LearningItemService
+
+logger = logging.getLogger(__name__)
+
+
+class _PendingReview:
+    """A validated review submission waiting for its group commit."""
+
+    __slots__ = ("item_id", "is_manual", "reviewed_at", "future")
+
+    def __init__(self, item_id: str, is_manual: bool):
+        self.item_id = item_id
+        self.is_manual = is_manual
+        self.reviewed_at = datetime.now(timezone.utc)
+        self.future: Future = Future()
+
+
+class ReviewWriteBehind:
+    """
+    Background writer that drains review submissions in batched transactions.
+
+    Request threads enqueue a review and block until the batch containing it
+    has committed, so an acknowledged review is always durable. Under bursts
+    many requests share one transaction instead of each taking the SQLite
+    write lock for several commits.
+    """
+
+    def __init__(
+        self,
+        session_factory=SessionLocal,
+        interval_ms: int = 5,
+        max_batch: int = 200,
+        max_pending: int = 2000,
+        timeout_seconds: float = 10.0
+    ):
+        self.session_factory = session_factory
+        self.interval = interval_ms / 1000
+        self.max_batch = max_batch
+        self.timeout_seconds = timeout_seconds
+        self._queue: "queue.Queue[Optional[_PendingReview]]" = queue.Queue(maxsize=max_pending)
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._stopping = False
+
+        # Counters for monitoring
+        self.batches_committed = 0
+        self.reviews_committed = 0
+
+    def submit(self, item_id: str, is_manual: bool = False) -> Optional[ReviewHistory]:
+        """
+        Queue a review and wait for its group commit.
+
+        Returns:
+            The committed review, or None if the wait timed out while its batch
+            was already being committed (the review will be recorded; it must
+            not be submitted again)
+
+        Raises:
+            ServiceUnavailableException: If the queue is full, the writer is
+                stopping, or the wait timed out before the review was picked up
+                (it is cancelled, so a retry records it once)
+            AppException: If the review could not be applied (e.g. item not found)
+        """
+        if self._stopping:
+            raise ServiceUnavailableException("Review writer is shutting down, retry shortly")
+        self._ensure_started()
+
+        pending = _PendingReview(item_id, is_manual)
+        try:
+            self._queue.put_nowait(pending)
+        except queue.Full:
+            raise ServiceUnavailableException("Too many pending reviews, retry shortly")
+
+        try:
+            return pending.future.result(timeout=self.timeout_seconds)
+        except FutureTimeoutError:
+            if pending.future.cancel():
+                raise ServiceUnavailableException("Review was not committed in time, retry shortly")
+            if pending.future.done():
+                return pending.future.result()
+            return None
+
+    def pending_count(self) -> int:
+        """Get the number of reviews waiting for a commit."""
+        return self._queue.qsize()
+
+    def stop(self, timeout: float = 30.0) -> None:
+        """Stop accepting reviews and flush everything already queued."""
+        with self._lock:
+            self._stopping = True
+            thread = self._thread
+        if thread is None:
+            return
+        # Sentinel goes through the same queue, after every pending review
+        self._queue.put(None)
+        thread.join(timeout)
+        with self._lock:
+            self._thread = None
+            self._stopping = False
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run,
+                    name="review-write-behind",
+                    daemon=True
+                )
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            batch, stop = self._collect_batch()
+            # Drop reviews whose request gave up (cancelled); the others can't be cancelled from here on
+            batch = [pending for pending in batch if pending.future.set_running_or_notify_cancel()]
+            if batch:
+                self._commit_batch(batch)
+            if stop:
+                return
+
+    def _collect_batch(self) -> Tuple[List[_PendingReview], bool]:
+        """Block for the first review, then gather more for one interval."""
+        first = self._queue.get()
+        if first is None:
+            return [], True
+
+        batch = [first]
+        deadline = time.monotonic() + self.interval
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            try:
+                pending = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if pending is None:
+                return batch, True
+            batch.append(pending)
+        return batch, False
+
+    def _commit_batch(self, batch: List[_PendingReview]) -> None:
+        db = self.session_factory(expire_on_commit=False)
+        try:
+            service = LearningItemService(db)
+            results = service.apply_review_batch([
+                (pending.item_id, pending.is_manual, pending.reviewed_at)
+                for pending in batch
+            ])
+        except Exception as exc:
+            db.rollback()
+            db.close()
+            if len(batch) > 1:
+                # Isolate the failing submission instead of failing the whole group
+                for pending in batch:
+                    self._commit_batch([pending])
+                return
+            logger.exception("Review write-behind batch failed")
+            batch[0].future.set_exception(exc)
+            return
+        db.close()
+
+        self.batches_committed += 1
+        for pending, result in zip(batch, results):
+            if isinstance(result, Exception):
+                pending.future.set_exception(result)
+            else:
+                self.reviews_committed += 1
+                pending.future.set_result(result[1])
+
+
+_writer: Optional[ReviewWriteBehind] = None
+_writer_lock = threading.Lock()
+
+
+def get_review_writer() -> ReviewWriteBehind:
+    """Get the process-wide review writer."""
+    global _writer
+    if _writer is None:
+        settings = get_settings()
+        with _writer_lock:
+            if _writer is None:
+                _writer = ReviewWriteBehind(
+                    interval_ms=settings.REVIEW_WRITE_BEHIND_INTERVAL_MS,
+                    max_batch=settings.REVIEW_WRITE_BEHIND_MAX_BATCH,
+                    max_pending=settings.REVIEW_WRITE_BEHIND_MAX_PENDING,
+                    timeout_seconds=settings.REVIEW_WRITE_BEHIND_TIMEOUT_SECONDS
+                )
+    return _writer
+
+
+def flush_review_writer() -> None:
+    """Flush pending reviews (application shutdown hook)."""
+    if _writer is not None:
+        _writer.stop()
@@ -0,0 +1,155 @@
+"""
+Schedule Simulation Service - What-if projections of daily review load.
+"""
+from datetime import date, timedelta
+from typing import Dict, List, Optional
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.core.constants import REVIEW_INTERVALS, CYCLE_BACK_TO_LEVEL
+from app.core.exceptions import ValidationException
+from app.database import read_only
+from app.repositories.learning_item_repository import LearningItemRepository
+
+
+def simulate_review_load(
+    review_counts,
+    due_offsets,
+    intervals: List[int],
+    cycle_back_to_level: int,
+    days: int,
+    weights=None
+) -> np.ndarray:
+    """
+    Project reviews per day, assuming every item is reviewed on its due day.
+
+    Items are held in arrays (or as cohorts of identical items via weights)
+    and each simulated day advances all items due that day at once, with the
+    same rule as SpacedRepetitionService.calculate_next_review.
+
+    Args:
+        review_counts: Reviews completed per item (or cohort)
+        due_offsets: Days from the first simulated day until each item is
+            due; overdue items (negative) are reviewed on day 0
+        intervals: Interval ladder in days (index = review count)
+        cycle_back_to_level: Ladder index used once the ladder is exhausted
+        days: Number of days to simulate
+        weights: Items per entry (default: one)
+
+    Returns:
+        Array with the number of reviews on each day
+    """
+    counts = np.array(review_counts, dtype=np.int32)
+    due = np.maximum(np.asarray(due_offsets, dtype=np.int32), 0)
+    weights = np.ones(len(counts), dtype=np.int64) if weights is None else np.asarray(weights, dtype=np.int64)
+
+    # Items first due after the horizon never show up in the projection
+    within = due < days
+    counts, due, weights = counts[within], due[within], weights[within]
+
+    # next_interval[c] = interval after the c-th review; the extra last slot is the cycle-back interval
+    next_interval = np.array(list(intervals) + [intervals[cycle_back_to_level]], dtype=np.int32)
+    ladder_end = len(intervals)
+
+    load = np.zeros(days, dtype=np.int64)
+    for day in range(days):
+        due_today = np.flatnonzero(due == day)
+        if due_today.size == 0:
+            continue
+        load[day] = weights[due_today].sum()
+        reviewed = counts[due_today] + 1
+        counts[due_today] = reviewed
+        due[due_today] = day + next_interval[np.minimum(reviewed, ladder_end)]
+    return load
+
+
+class ScheduleSimulationService:
+    """
+    Projects the daily review load of the current item population under
+    candidate interval ladders, before REVIEW_INTERVALS is changed.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.item_repo = LearningItemRepository(db)
+
+    @read_only
+    def simulate(
+        self,
+        ladders: List[Dict],
+        days: int = 365,
+        new_items_per_day: int = 0,
+        start_date: Optional[date] = None
+    ) -> Dict:
+        """
+        Simulate the current ladder and each candidate ladder.
+
+        Starts from the live items' review_count and next_review_date (their
+        already scheduled dates stand; a ladder applies from their next review).
+
+        Args:
+            ladders: Candidates as {"name", "intervals", "cycle_back_to_level"}
+            days: Number of days to project
+            new_items_per_day: Items assumed to be added each day (due on creation)
+            start_date: First simulated day (defaults to today)
+
+        Returns:
+            Dictionary with the population size and one projection per ladder
+
+        Raises:
+            ValidationException: If a ladder is not a valid interval configuration
+        """
+        for ladder in ladders:
+            self._check_ladder(ladder)
+
+        start_date = start_date or date.today()
+        distribution = self.item_repo.get_schedule_distribution()
+
+        counts = [review_count for review_count, _, _ in distribution]
+        offsets = [(next_review_date - start_date).days for _, next_review_date, _ in distribution]
+        weights = [items for _, _, items in distribution]
+        if new_items_per_day:
+            counts += [0] * days
+            offsets += list(range(days))
+            weights += [new_items_per_day] * days
+
+        scenarios = [{
+            "name": "current",
+            "intervals": list(REVIEW_INTERVALS),
+            "cycle_back_to_level": CYCLE_BACK_TO_LEVEL
+        }] + list(ladders)
+
+        results = []
+        for scenario in scenarios:
+            load = simulate_review_load(
+                counts, offsets,
+                scenario["intervals"], scenario["cycle_back_to_level"],
+                days, weights
+            )
+            peak_day = int(load.argmax())
+            results.append({
+                **scenario,
+                "total_reviews": int(load.sum()),
+                "mean_per_day": round(float(load.mean()), 2),
+                "p95_per_day": round(float(np.percentile(load, 95)), 2),
+                "peak_per_day": int(load[peak_day]),
+                "peak_date": start_date + timedelta(days=peak_day),
+                "daily": load.tolist()
+            })
+
+        return {
+            "start_date": start_date,
+            "days": days,
+            "items": sum(weights[:len(distribution)]),
+            "scenarios": results
+        }
+
+    @staticmethod
+    def _check_ladder(ladder: Dict) -> None:
+        intervals, cycle = ladder["intervals"], ladder["cycle_back_to_level"]
+        if cycle >= len(intervals):
+            raise ValidationException(f"Ladder {ladder['name']}: cycle_back_to_level must index into intervals")
+        # Only the creation entry may be 0 days; a review always moves the item forward
+        if intervals[0] < 0 or any(days < 1 for days in intervals[1:]) or intervals[cycle] < 1:
+            raise ValidationException(f"Ladder {ladder['name']}: intervals must be at least 1 day (the first may be 0)")
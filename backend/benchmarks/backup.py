@@ -0,0 +1,143 @@
+"""
+Benchmark: online SQLite backup throughput and its impact on write latency.
+
+Seeds a database, then keeps a writer thread submitting reviews (one commit
+per review, like POST /reviews/{item_id}) while a snapshot is taken, and
+compares write latency with the latency before the backup. A second snapshot
+after a fixed number of further reviews shows how much an incremental
+snapshot adds; the last snapshot is verified and restored to a scratch file.
+
+Usage:
+    python -m benchmarks.backup --items 200000 --step-pages 256 --pause-ms 20
+    python -m benchmarks.backup --items 200000 --wal
+"""
+import argparse
+import os
+import random
+import sqlite3
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+
+from benchmarks.common import summarize_ms, use_temp_database
+
+WORDS = "memory review interval spaced repetition learning recall practice concept chapter example theory".split()
+
+
+def seed(items: int) -> list:
+    from sqlalchemy import insert
+    from app.database import engine
+    from app.models.learning_item import LearningItem
+    from app.models.subject import Subject
+    from app.models.types import generate_id, utc_now
+
+    rng = random.Random(42)
+    ids = []
+    with engine.begin() as conn:
+        subject_id = conn.execute(insert(Subject).values(name="bench", live_count=items)).inserted_primary_key[0]
+        for start in range(0, items, 5000):
+            rows = []
+            for i in range(start, min(items, start + 5000)):
+                ids.append(generate_id())
+                rows.append({
+                    "id": ids[-1], "subject_id": subject_id, "title": f"Item {i}",
+                    "content": " ".join(rng.choice(WORDS) for _ in range(rng.randint(40, 200))),
+                    "created_at": utc_now(), "updated_at": utc_now(), "review_count": 0,
+                    "next_review_date": date.today(), "current_interval_days": 0,
+                    "manual_review_count": 0, "is_deleted": False
+                })
+            conn.execute(insert(LearningItem), rows)
+    return ids
+
+
+class Writer(threading.Thread):
+    """Submits reviews back to back, recording each one's latency in the current phase."""
+
+    def __init__(self, item_ids):
+        super().__init__(daemon=True)
+        self.item_ids = item_ids
+        self.phases = {}
+        self.phase = None
+        self.stopped = threading.Event()
+
+    def run(self):
+        from app.database import SessionLocal
+        from app.services.learning_item_service import LearningItemService
+
+        rng = random.Random(1)
+        while not self.stopped.is_set():
+            phase = self.phase
+            db = SessionLocal()
+            try:
+                start = time.perf_counter()
+                LearningItemService(db).manual_review(rng.choice(self.item_ids))
+                if phase:
+                    self.phases.setdefault(phase, []).append(time.perf_counter() - start)
+            finally:
+                db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=200000)
+    parser.add_argument("--step-pages", type=int, default=256)
+    parser.add_argument("--pause-ms", type=float, default=20)
+    parser.add_argument("--chunk-kb", type=int, default=64)
+    parser.add_argument("--baseline-seconds", type=float, default=5)
+    parser.add_argument("--reviews-between", type=int, default=1000, help="Reviews between the two snapshots")
+    parser.add_argument("--wal", action="store_true", help="Run SQLite in WAL mode (SQLITE_WAL)")
+    args = parser.parse_args()
+
+    if args.wal:
+        os.environ["SQLITE_WAL"] = "true"
+    url = use_temp_database("backup.db")
+    from app.core.backup import BackupStore
+    from app.database import init_db
+
+    init_db(echo=lambda message: None)
+    item_ids = seed(args.items)
+    path = url.replace("sqlite:///", "")
+    print(f"{args.items} items, database {os.path.getsize(path) / 2**20:.1f}MB")
+
+    store = BackupStore(tempfile.mkdtemp(prefix="review_tool_backups_"), chunk_bytes=args.chunk_kb * 1024)
+    writer = Writer(item_ids)
+    writer.start()
+    writer.phase = "no backup"
+    time.sleep(args.baseline_seconds)
+
+    for phase in ("first snapshot", "incremental snapshot"):
+        writer.phase = phase
+        # In its own process, like `manage.py backup create` next to the server
+        with ProcessPoolExecutor(1) as pool:
+            manifest = pool.submit(
+                store.create_snapshot, path, step_pages=args.step_pages, pause_ms=args.pause_ms
+            ).result()
+        size_mb = manifest["size"] / 2**20
+        print(
+            f"{phase}: {size_mb:.1f}MB in {manifest['duration_seconds']:.2f}s "
+            f"({size_mb / manifest['duration_seconds']:.0f}MB/s incl. pauses), {manifest['steps']} steps, "
+            f"{manifest['restarts']} restarts, {manifest['new_bytes'] / 2**20:.1f}MB new chunks"
+        )
+        writer.phase = "between snapshots"
+        while len(writer.phases.get("between snapshots", [])) < args.reviews_between:
+            time.sleep(0.05)
+    writer.stopped.set()
+    writer.join()
+
+    for phase in ("no backup", "first snapshot", "between snapshots", "incremental snapshot"):
+        print(summarize_ms(f"review write ({phase})", writer.phases.get(phase, [])))
+
+    start = time.perf_counter()
+    store.verify(manifest)
+    restored = os.path.join(store.directory, "restored.db")
+    store.restore(manifest, restored)
+    print(f"Verified and restored in {time.perf_counter() - start:.2f}s")
+    with sqlite3.connect(restored) as conn:
+        print(f"restored: {conn.execute('SELECT count(*) FROM learning_items').fetchone()[0]} items, "
+              f"{conn.execute('SELECT count(*) FROM review_history').fetchone()[0]} reviews")
+
+
+if __name__ == '__main__':
+    main()
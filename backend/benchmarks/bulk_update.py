@@ -0,0 +1,100 @@
+"""
+Benchmark: moving and rescheduling a subject's items, one PUT per item vs
+one PATCH /learning-items/bulk.
+
+Seeds items in a few subjects, then moves --move items to another subject
+with PUT /learning-items/{id} each, moves them back with a single bulk
+request, and shifts the whole subject's schedule by a week.
+
+Usage:
+    python -m benchmarks.bulk_update --items 50000 --move 1000
+"""
+import argparse
+import random
+import time
+from datetime import date, timedelta
+
+from benchmarks.common import use_temp_database
+
+
+def seed(items: int) -> list:
+    from sqlalchemy import insert
+    from app.database import engine
+    from app.models.learning_item import LearningItem
+    from app.models.subject import Subject
+    from app.models.types import generate_id, utc_now
+
+    rng = random.Random(5)
+    today = date.today()
+    ids = []
+    with engine.begin() as conn:
+        subject_ids = [
+            conn.execute(insert(Subject).values(name=f"subject-{i}", live_count=0)).inserted_primary_key[0]
+            for i in range(4)
+        ]
+        for start in range(0, items, 5000):
+            rows = []
+            for i in range(start, min(items, start + 5000)):
+                ids.append(generate_id())
+                rows.append({
+                    "id": ids[-1], "subject_id": subject_ids[0] if i % 2 == 0 else rng.choice(subject_ids),
+                    "title": f"Item {i}", "content": f"Content of item {i}",
+                    "created_at": utc_now(), "updated_at": utc_now(), "review_count": 2,
+                    "next_review_date": today + timedelta(days=rng.randint(-5, 10)),
+                    "current_interval_days": 3, "manual_review_count": 0, "is_deleted": False
+                })
+            conn.execute(insert(LearningItem), rows)
+    return ids
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=50000)
+    parser.add_argument("--move", type=int, default=1000)
+    args = parser.parse_args()
+
+    use_temp_database("bulk_update.db")
+    from sqlalchemy import select
+    from fastapi.testclient import TestClient
+    from app.database import SessionLocal, init_db
+    from app.main import app
+    from app.models.learning_item import LearningItem
+    from app.models.subject import Subject
+    from app.repositories.subject_repository import SubjectRepository
+
+    init_db(echo=lambda message: None)
+    seed(args.items)
+    with SessionLocal() as db:
+        SubjectRepository(db).recount_live()
+    client = TestClient(app)
+    client.get("/api/v1/reviews/due?limit=1").raise_for_status()  # Build the due queue
+
+    with SessionLocal() as db:
+        ids = db.execute(
+            select(LearningItem.id).join(Subject).where(Subject.name == "subject-0").limit(args.move)
+        ).scalars().all()
+
+    start = time.perf_counter()
+    for item_id in ids:
+        client.put(f"/api/v1/learning-items/{item_id}", json={"subject": "moved"}).raise_for_status()
+    per_item = time.perf_counter() - start
+    print(f"PUT per item: moved {len(ids)} items in {per_item * 1000:.0f}ms ({per_item / len(ids) * 1000:.2f}ms/item)")
+
+    for start_index in range(0, len(ids), 500):
+        start = time.perf_counter()
+        response = client.patch("/api/v1/learning-items/bulk", json={
+            "filter": {"ids": ids[start_index:start_index + 500]}, "set_subject": "subject-0"
+        })
+        response.raise_for_status()
+        print(f"PATCH /bulk (ids): moved {response.json()['updated']} items back in "
+              f"{(time.perf_counter() - start) * 1000:.0f}ms")
+
+    start = time.perf_counter()
+    response = client.patch("/api/v1/learning-items/bulk", json={"filter": {"subject": "subject-0"}, "shift_days": 7})
+    response.raise_for_status()
+    print(f"PATCH /bulk (subject): shifted {response.json()['updated']} items by a week in "
+          f"{(time.perf_counter() - start) * 1000:.0f}ms")
+
+
+if __name__ == '__main__':
+    main()
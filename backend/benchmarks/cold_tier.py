@@ -0,0 +1,138 @@
+"""
+Benchmark: due and scan queries before and after moving long-interval items
+to the cold tier.
+
+Seeds a mature collection: most items on long intervals and not due for
+weeks, the rest due within the due queue horizon. Times the due reads (queue
+and live query), the roll-over/rebuild scan and per-subject stats, then
+demotes (`manage.py tiering demote`), VACUUMs so the hot table is rewritten
+compactly, and times them again.
+
+Usage:
+    python -m benchmarks.cold_tier --items 100000 --cold-share 0.8
+"""
+import argparse
+import os
+import random
+import time
+from datetime import date, timedelta
+
+from benchmarks.common import percentile, use_temp_database
+
+WORDS = "memory review interval spaced repetition learning recall practice concept chapter example theory".split()
+
+
+def seed(items: int, cold_share: float) -> None:
+    from sqlalchemy import insert
+    from app.database import engine
+    from app.models.learning_item import LearningItem
+    from app.models.subject import Subject
+    from app.models.types import generate_id, utc_now
+
+    rng = random.Random(42)
+    today = date.today()
+    with engine.begin() as conn:
+        subject_ids = [
+            conn.execute(insert(Subject).values(name=f"subject-{i}", live_count=0)).inserted_primary_key[0]
+            for i in range(8)
+        ]
+        for start in range(0, items, 5000):
+            rows = []
+            for i in range(start, min(items, start + 5000)):
+                long_interval = rng.random() < cold_share
+                rows.append({
+                    "id": generate_id(),
+                    "subject_id": rng.choice(subject_ids),
+                    "title": f"Item {i}",
+                    "content": " ".join(rng.choice(WORDS) for _ in range(rng.randint(60, 400))),
+                    "created_at": utc_now(),
+                    "updated_at": utc_now(),
+                    "review_count": 6 if long_interval else rng.randint(0, 3),
+                    "next_review_date": today + timedelta(
+                        days=rng.randint(8, 60) if long_interval else rng.randint(-3, 7)
+                    ),
+                    "current_interval_days": rng.choice([7, 30]) if long_interval else rng.choice([0, 1, 3]),
+                    "manual_review_count": 0,
+                    "is_deleted": False
+                })
+            conn.execute(insert(LearningItem), rows)
+
+
+def timed(func, repeat: int) -> float:
+    func()  # Warm up
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return percentile(samples, 50)
+
+
+def run_queries(repeat: int) -> dict:
+    from app.database import SessionLocal
+    from app.repositories.due_queue_repository import DueQueueRepository
+    from app.repositories.learning_item_repository import LearningItemRepository
+
+    today = date.today()
+    db = SessionLocal()
+    try:
+        items = LearningItemRepository(db)
+        queue = DueQueueRepository(db)
+        queue.ensure_current(today)
+        return {
+            "due queue (today)": timed(lambda: queue.get_due_items(today), repeat),
+            "live due query (today)": timed(lambda: items.get_due_items(today), repeat),
+            "due queue rebuild": timed(lambda: queue.rebuild(today), repeat),
+            "subject stats": timed(lambda: items.get_subject_stats(today, today + timedelta(days=7)), repeat),
+            "list page (100)": timed(lambda: items.get_all(skip=0, limit=100), repeat)
+        }
+    finally:
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=100000)
+    parser.add_argument("--cold-share", type=float, default=0.8)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    url = use_temp_database("cold_tier.db")
+    from sqlalchemy import text
+    from app.config import get_settings
+    from app.database import SessionLocal, engine, init_db
+    from app.repositories.due_queue_repository import DueQueueRepository
+    from app.repositories.item_tier_repository import ItemTierRepository
+
+    init_db(echo=lambda message: None)
+    seed(args.items, args.cold_share)
+    path = url.replace("sqlite:///", "")
+
+    print(f"{args.items} items, {args.cold_share:.0%} on long intervals; database {os.path.getsize(path) / 2**20:.1f}MB")
+    before = run_queries(args.repeat)
+
+    start = time.perf_counter()
+    db = SessionLocal()
+    try:
+        horizon_end = DueQueueRepository(db).ensure_current().horizon_end
+        tier_repo = ItemTierRepository(db)
+        last_id, moved = None, 0
+        while True:
+            batch = tier_repo.demote(get_settings().COLD_TIER_MIN_INTERVAL_DAYS, horizon_end, after_id=last_id)
+            if not batch:
+                break
+            last_id, moved = batch[-1], moved + len(batch)
+    finally:
+        db.close()
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text("VACUUM"))
+    print(f"Demoted {moved} items in {time.perf_counter() - start:.1f}s (incl. VACUUM)")
+    after = run_queries(args.repeat)
+
+    print(f"{'query':28s} {'hot only':>10s} {'tiered':>10s}")
+    for name in before:
+        print(f"{name:28s} {before[name]:8.1f}ms {after[name]:8.1f}ms  x{before[name] / after[name]:.1f}")
+
+
+if __name__ == '__main__':
+    main()
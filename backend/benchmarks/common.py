@@ -0,0 +1,35 @@
+"""
+Shared helpers for benchmark scripts.
+"""
+import os
+import statistics
+import tempfile
+
+
+def use_temp_database(name: str = "bench.db") -> str:
+    """
+    Point the app at a throwaway SQLite database.
+    Must be called before anything from `app` is imported.
+    """
+    if "DATABASE_URL" not in os.environ:
+        path = os.path.join(tempfile.mkdtemp(prefix="review_tool_bench_"), name)
+        os.environ["DATABASE_URL"] = f"sqlite:///{path}"
+    return os.environ["DATABASE_URL"]
+
+
+def percentile(values, pct: float) -> float:
+    """Get a percentile (0-100) of a list of numbers."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def summarize_ms(label: str, seconds) -> str:
+    """Format latency samples (in seconds) as p50/p95/p99 milliseconds."""
+    ms = [s * 1000 for s in seconds]
+    return (
+        f"{label}: n={len(ms)} mean={statistics.mean(ms):.3f}ms "
+        f"p50={percentile(ms, 50):.3f}ms p95={percentile(ms, 95):.3f}ms p99={percentile(ms, 99):.3f}ms"
+    )
@@ -0,0 +1,115 @@
+"""
+Benchmark: storage size and read latency with content compression at rest,
+and response size/latency with gzip response compression (RESPONSE_COMPRESSION).
+
+Each CONTENT_COMPRESSION mode runs in its own process and database.
+Latencies are measured in-process with the test client, so compressed
+responses include the client's decoding time as well.
+
+Usage:
+    python -m benchmarks.content_compression --items 500 --requests 50
+"""
+import argparse
+import os
+import random
+import subprocess
+import sys
+import time
+
+from benchmarks.common import percentile
+
+MODES = ["off", "zlib", "zstd"]
+ENCODINGS = ["identity", "gzip"]
+
+# Vocabulary with a natural-ish word frequency, so content compresses like prose
+WORDS = (
+    "the of and to in is that for it as was with be by on not he this are or his from at which "
+    "but have an they you were her she there been one all we their has would when if so no will "
+    "memory review interval spaced repetition learning recall practice knowledge concept chapter "
+    "example theory method result evidence analysis structure function process system pattern"
+).split()
+
+
+def make_article(rng: random.Random, size: int) -> str:
+    words = []
+    length = 0
+    while length < size:
+        word = rng.choice(WORDS[:40]) if rng.random() < 0.6 else rng.choice(WORDS)
+        words.append(word)
+        length += len(word) + 1
+    sentences = [" ".join(words[i:i + 14]).capitalize() + "." for i in range(0, len(words), 14)]
+    return "\n".join(" ".join(sentences[i:i + 6]) for i in range(0, len(sentences), 6))
+
+
+def run_mode(args) -> None:
+    from benchmarks.common import use_temp_database
+    use_temp_database(f"content_{args.mode}.db")
+
+    from fastapi.testclient import TestClient
+    from app.database import SessionLocal, engine, init_db
+    from app.main import app
+    from app.services.learning_item_service import LearningItemService
+
+    init_db(echo=lambda message: None)
+    rng = random.Random(42)
+    db = SessionLocal()
+    try:
+        service = LearningItemService(db)
+        for i in range(args.items):
+            service.create_item(f"subject-{i % 8}", f"Item {i}", make_article(rng, rng.randint(2000, 20000)))
+    finally:
+        db.close()
+
+    with engine.connect() as conn:
+        pages = conn.exec_driver_sql("PRAGMA page_count").scalar()
+        page_size = conn.exec_driver_sql("PRAGMA page_size").scalar()
+        content_bytes = conn.exec_driver_sql("SELECT SUM(LENGTH(content)) FROM learning_items").scalar()
+    print(
+        f"{args.mode:5s} storage: db={pages * page_size / 1024 / 1024:.1f}MB "
+        f"content={content_bytes / 1024 / 1024:.1f}MB"
+    )
+
+    client = TestClient(app)
+    for path in ("/api/v1/learning-items?limit=100", "/api/v1/reviews/due?limit=100"):
+        for encoding in ENCODINGS:
+            headers = {"Accept-Encoding": encoding}
+            client.get(path, headers=headers)  # Warm up
+            latencies = []
+            size = 0
+            for _ in range(args.requests):
+                start = time.perf_counter()
+                response = client.get(path, headers=headers)
+                latencies.append(time.perf_counter() - start)
+                size = int(response.headers["content-length"])
+            served = response.headers.get("content-encoding", "identity")
+            print(
+                f"{args.mode:5s} {path:35s} {encoding:8s} (served {served:8s}) "
+                f"p50={percentile(latencies, 50) * 1000:.2f}ms size={size / 1024:.0f}KB"
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=500)
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--mode", choices=MODES, help="Run a single mode in this process")
+    args = parser.parse_args()
+
+    if args.mode:
+        run_mode(args)
+        return
+
+    for mode in MODES:
+        env = {key: value for key, value in os.environ.items() if key != "DATABASE_URL"}
+        env["CONTENT_COMPRESSION"] = mode
+        env["RESPONSE_COMPRESSION"] = "true"
+        subprocess.run(
+            [sys.executable, "-m", "benchmarks.content_compression", "--mode", mode,
+             "--items", str(args.items), "--requests", str(args.requests)],
+            env=env,
+            check=True
+        )
+
+
+if __name__ == '__main__':
+    main()
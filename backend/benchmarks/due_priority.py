@@ -0,0 +1,118 @@
+"""
+Benchmark: top-N due reads in priority order on a large backlog.
+
+Seeds a collection after a long break (most items overdue by days to weeks,
+on intervals from 1 to 60 days), builds the due queue, then times the next N
+due items in scheduler order, in priority order through the stored
+priority_key index, and in priority order computed per row by the live query
+(a full sort of the backlog). Also prints the query plans.
+
+Usage:
+    python -m benchmarks.due_priority --items 100000 --limit 20
+"""
+import argparse
+import random
+import time
+from datetime import date, timedelta
+
+from benchmarks.common import summarize_ms, use_temp_database
+
+
+def seed(items: int, overdue_share: float) -> None:
+    from sqlalchemy import insert
+    from app.database import engine
+    from app.models.learning_item import LearningItem
+    from app.models.subject import Subject
+    from app.models.types import generate_id, utc_now
+
+    rng = random.Random(46)
+    today = date.today()
+    with engine.begin() as conn:
+        subject_ids = [
+            conn.execute(insert(Subject).values(name=f"subject-{i}", live_count=0)).inserted_primary_key[0]
+            for i in range(8)
+        ]
+        for start in range(0, items, 5000):
+            rows = []
+            for _ in range(start, min(items, start + 5000)):
+                overdue = rng.random() < overdue_share
+                rows.append({
+                    "id": generate_id(),
+                    "subject_id": rng.choice(subject_ids),
+                    "title": "Item",
+                    "content": "x" * 200,
+                    "created_at": utc_now(),
+                    "updated_at": utc_now(),
+                    "review_count": 3,
+                    "next_review_date": today + timedelta(
+                        days=-rng.randint(0, 30) if overdue else rng.randint(1, 90)
+                    ),
+                    "current_interval_days": rng.choice([1, 3, 7, 14, 30, 60]),
+                    "manual_review_count": 0,
+                    "is_deleted": False
+                })
+            conn.execute(insert(LearningItem), rows)
+
+
+def timed(func, repeat: int):
+    func()  # Warm up
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=100000)
+    parser.add_argument("--overdue-share", type=float, default=0.4)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    use_temp_database("due_priority.db")
+    from sqlalchemy import text
+    from app.database import SessionLocal, init_db
+    from app.repositories.due_queue_repository import DueQueueRepository
+    from app.repositories.learning_item_repository import LearningItemRepository
+
+    init_db(echo=lambda message: None)
+    seed(args.items, args.overdue_share)
+    today = date.today()
+    db = SessionLocal()
+    try:
+        queue = DueQueueRepository(db)
+        start = time.perf_counter()
+        queue.rebuild(today)
+        print(f"{args.items} items, due queue built with priorities in {(time.perf_counter() - start) * 1000:.0f}ms")
+        start = time.perf_counter()
+        queue.refresh_priorities(today)
+        print(f"Daily priority refresh: {(time.perf_counter() - start) * 1000:.0f}ms")
+
+        items = LearningItemRepository(db)
+        print(summarize_ms(f"queue, due order, next {args.limit}",
+                           timed(lambda: queue.get_due_items(today, limit=args.limit), args.repeat)))
+        print(summarize_ms(f"queue, priority order, next {args.limit}",
+                           timed(lambda: queue.get_due_items(today, limit=args.limit, order="priority"), args.repeat)))
+        print(summarize_ms(f"live query, priority computed, next {args.limit}",
+                           timed(lambda: items.get_due_items(today, limit=args.limit, order="priority"), args.repeat)))
+
+        print(summarize_ms(f"queue, priority order, one subject, next {args.limit}",
+                           timed(lambda: queue.get_due_items(today, 1, args.limit, "priority"), args.repeat)))
+
+        for label, query in (
+            ("priority (all subjects)", "SELECT learning_item_id FROM due_queue WHERE due_date <= :today "
+                                        "AND priority_key >= 0 ORDER BY priority_key DESC, due_date, sort_key LIMIT :limit"),
+            ("priority (one subject)", "SELECT learning_item_id FROM due_queue WHERE due_date <= :today AND subject_id = 1 "
+                                       "AND priority_key >= 0 ORDER BY priority_key DESC, due_date, sort_key LIMIT :limit")
+        ):
+            plan = db.execute(text("EXPLAIN QUERY PLAN " + query), {"today": today, "limit": args.limit}).all()
+            print(f"plan, {label}: " + "; ".join(row[-1] for row in plan))
+    finally:
+        db.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+"""
+Benchmark: cost of the Idempotency-Key header on the first request, and of replays.
+
+Times POST /learning-items/ and POST /reviews/{item_id} without the header,
+with a fresh key (reservation + stored response), and repeated keys answered
+from the in-memory cache and from the idempotency_keys table.
+
+Usage:
+    python -m benchmarks.idempotency --requests 500
+"""
+import argparse
+import random
+import string
+import time
+import uuid
+
+from benchmarks.common import summarize_ms, use_temp_database
+
+
+def payload(rng: random.Random) -> dict:
+    """A new item with text of its own (identical texts would crowd the near-duplicate index)."""
+    words = ["".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 9))) for _ in range(80)]
+    return {"subject": "bench", "title": " ".join(words[:4]), "content": " ".join(words)}
+
+
+def send(client, url: str, body=None, key=None) -> float:
+    headers = {"Idempotency-Key": key} if key else {}
+    start = time.perf_counter()
+    response = client.post(url, json=body, headers=headers)
+    elapsed = time.perf_counter() - start
+    response.raise_for_status()
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=500)
+    args = parser.parse_args()
+
+    use_temp_database("idempotency.db")
+    from fastapi.testclient import TestClient
+    from app.database import init_db
+    from app.main import app
+    from app.services.idempotency_store import get_idempotency_store
+
+    init_db(echo=lambda message: None)
+    client = TestClient(app)
+    rng = random.Random(3)
+    create_url = "/api/v1/learning-items/"
+    for _ in range(50):  # Warm up
+        send(client, create_url, payload(rng))
+
+    # Requests with and without a key alternate, so both see the same database size
+    plain, first, sent = [], [], []
+    for _ in range(args.requests):
+        plain.append(send(client, create_url, payload(rng)))
+        body, key = payload(rng), str(uuid.uuid4())
+        first.append(send(client, create_url, body, key))
+        sent.append((body, key))
+    cached = [send(client, create_url, body, key) for body, key in sent]
+    get_idempotency_store()._cache.clear()
+    stored = [send(client, create_url, body, key) for body, key in sent]
+    print(summarize_ms("POST /learning-items/ (no key)", plain))
+    print(summarize_ms("POST /learning-items/ (new key)", first))
+    print(summarize_ms("POST /learning-items/ (repeat, memory)", cached))
+    print(summarize_ms("POST /learning-items/ (repeat, table)", stored))
+
+    review_urls = [f"/api/v1/reviews/{client.post(create_url, json=payload(rng)).json()['id']}" for _ in range(2 * args.requests)]
+    plain, first, sent = [], [], []
+    for plain_url, keyed_url in zip(review_urls[::2], review_urls[1::2]):
+        plain.append(send(client, plain_url))
+        key = str(uuid.uuid4())
+        first.append(send(client, keyed_url, key=key))
+        sent.append((keyed_url, key))
+    cached = [send(client, url, key=key) for url, key in sent]
+    print(summarize_ms("POST /reviews/{id} (no key)", plain))
+    print(summarize_ms("POST /reviews/{id} (new key)", first))
+    print(summarize_ms("POST /reviews/{id} (repeat, memory)", cached))
+
+if __name__ == '__main__':
+    main()
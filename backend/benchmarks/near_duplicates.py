@@ -0,0 +1,128 @@
+"""
+Benchmark: near-duplicate lookups on a large item set.
+
+Seeds items (a share of them lightly edited copies of others, as left by
+bulk-entered decks), indexes them like `manage.py duplicates rebuild`, then
+times POST /learning-items/ (which reports duplicates) and
+GET /learning-items/{id}/similar, and checks how many seeded copies are found.
+
+Usage:
+    python -m benchmarks.near_duplicates --items 100000 --requests 200
+"""
+import argparse
+import random
+import string
+import time
+from datetime import date, datetime, timezone
+
+from benchmarks.common import summarize_ms, use_temp_database
+
+
+def make_vocabulary(rng: random.Random, size: int = 20000):
+    return ["".join(rng.choices(string.ascii_lowercase, k=rng.randint(2, 10))) for _ in range(size)]
+
+
+def make_text(rng: random.Random, vocabulary, words: int) -> str:
+    return " ".join(rng.choice(vocabulary) for _ in range(words)).capitalize() + "."
+
+
+def edit(rng: random.Random, vocabulary, text: str) -> str:
+    """Copy with a couple of words replaced (a near-duplicate)."""
+    words = text.split()
+    for _ in range(2):
+        words[rng.randrange(len(words))] = rng.choice(vocabulary)
+    return " ".join(words)
+
+
+def seed(items: int, duplicate_share: float):
+    from sqlalchemy import insert
+    from app.core import minhash
+    from app.database import SessionLocal
+    from app.models.learning_item import LearningItem
+    from app.models.subject import Subject
+    from app.models.types import generate_id
+    from app.repositories.item_signature_repository import ItemSignatureRepository
+
+    rng = random.Random(7)
+    vocabulary = make_vocabulary(rng)
+    now = datetime.now(timezone.utc)
+    originals, copies = [], []
+    db = SessionLocal()
+    try:
+        subject_id = db.execute(insert(Subject).values(name="bench", live_count=items)).inserted_primary_key[0]
+        signature_repo = ItemSignatureRepository(db)
+        for start in range(0, items, 1000):
+            rows = []
+            for _ in range(min(1000, items - start)):
+                if originals and rng.random() < duplicate_share:
+                    source_id, title, content = rng.choice(originals)
+                    content = edit(rng, vocabulary, content)
+                    copies.append((generate_id(), source_id))
+                    item_id = copies[-1][0]
+                else:
+                    item_id = generate_id()
+                    title = make_text(rng, vocabulary, 4)
+                    content = make_text(rng, vocabulary, rng.randint(30, 120))
+                    originals.append((item_id, title, content))
+                rows.append({
+                    "id": item_id, "subject_id": subject_id, "title": title, "content": content,
+                    "created_at": now, "updated_at": now, "review_count": 0,
+                    "next_review_date": date.today(), "current_interval_days": 0,
+                    "manual_review_count": 0, "is_deleted": False
+                })
+            db.execute(insert(LearningItem), rows)
+            entries = []
+            for row in rows:
+                signature = minhash.signature(row["title"], row["content"])
+                entries.append((row["id"], minhash.to_bytes(signature), minhash.band_keys(signature)))
+            signature_repo.add_many(entries)
+    finally:
+        db.close()
+    return rng, vocabulary, originals, copies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=100000)
+    parser.add_argument("--duplicate-share", type=float, default=0.05)
+    parser.add_argument("--requests", type=int, default=200)
+    args = parser.parse_args()
+
+    use_temp_database("near_duplicates.db")
+    from fastapi.testclient import TestClient
+    from app.database import init_db
+    from app.main import app
+
+    init_db(echo=lambda message: None)
+    start = time.perf_counter()
+    rng, vocabulary, originals, copies = seed(args.items, args.duplicate_share)
+    print(f"Seeded and indexed {args.items} items ({len(copies)} near-duplicates) in {time.perf_counter() - start:.1f}s")
+
+    client = TestClient(app)
+    similar, found = [], 0
+    for copy_id, source_id in rng.sample(copies, min(args.requests, len(copies))):
+        start = time.perf_counter()
+        response = client.get(f"/api/v1/learning-items/{copy_id}/similar")
+        similar.append(time.perf_counter() - start)
+        found += source_id in {item["id"] for item in response.json()["similar"]}
+    print(summarize_ms("GET /{id}/similar", similar))
+    print(f"source item found for {found}/{len(similar)} near-duplicates")
+
+    unique, duplicate = [], []
+    for i in range(args.requests):
+        _, title, content = rng.choice(originals)
+        is_copy = i % 2 == 0
+        payload = {
+            "subject": "bench",
+            "title": title if is_copy else make_text(rng, vocabulary, 4),
+            "content": edit(rng, vocabulary, content) if is_copy else make_text(rng, vocabulary, 80)
+        }
+        start = time.perf_counter()
+        client.post("/api/v1/learning-items/", json=payload).raise_for_status()
+        (duplicate if is_copy else unique).append(time.perf_counter() - start)
+    print(summarize_ms("POST / (new text)", unique))
+    print(summarize_ms("POST / (near-duplicate)", duplicate))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,116 @@
+"""
+Benchmark: memory and CPU per 10k rows for the ORM and Core read paths.
+
+Loads the same page of learning items through LearningItemRepository.get_all
+in both REPOSITORY_READ_MODE settings, once as returned by the repository
+and once including validation into LearningItemResponse. CPU time is the
+median over the repeats; peak memory is measured in a separate tracemalloc
+run, since tracing slows execution down.
+
+Usage:
+    python -m benchmarks.read_paths --rows 10000 --repeat 5
+"""
+import argparse
+import gc
+import random
+import statistics
+import time
+import tracemalloc
+from datetime import date, timedelta
+
+from benchmarks.common import use_temp_database
+
+MODES = ["orm", "core"]
+
+
+def seed(rows: int) -> None:
+    from sqlalchemy import insert
+    from app.database import engine
+    from app.models.learning_item import LearningItem
+    from app.models.subject import Subject
+    from app.models.types import generate_id, utc_now
+
+    rng = random.Random(42)
+    today = date.today()
+    with engine.begin() as conn:
+        subject_ids = [
+            conn.execute(insert(Subject).values(name=f"subject-{i}", live_count=0)).inserted_primary_key[0]
+            for i in range(8)
+        ]
+        conn.execute(insert(LearningItem), [
+            {
+                "id": generate_id(),
+                "subject_id": rng.choice(subject_ids),
+                "title": f"Item {i}",
+                "content": "Some learning content. " * rng.randint(5, 40),
+                "created_at": utc_now(),
+                "updated_at": utc_now(),
+                "review_count": rng.randint(0, 8),
+                "next_review_date": today + timedelta(days=rng.randint(-30, 60)),
+                "current_interval_days": rng.choice([0, 1, 2, 4, 7, 15, 30]),
+                "manual_review_count": 0,
+                "is_deleted": False
+            }
+            for i in range(rows)
+        ])
+
+
+def load(mode: str, rows: int, validate: bool) -> int:
+    from app.database import SessionLocal
+    from app.repositories.learning_item_repository import LearningItemRepository
+    from app.schemas.learning_item import LearningItemResponse
+
+    db = SessionLocal()
+    try:
+        repo = LearningItemRepository(db)
+        repo.core_reads = mode == "core"
+        items = repo.get_all(skip=0, limit=rows)
+        if validate:
+            items = [LearningItemResponse.model_validate(item) for item in items]
+        return len(items)
+    finally:
+        db.close()
+
+
+def measure(mode: str, rows: int, validate: bool, repeat: int) -> tuple:
+    load(mode, rows, validate)  # Warm up (statement cache, type processors)
+
+    cpu = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.process_time()
+        loaded = load(mode, rows, validate)
+        cpu.append(time.process_time() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    load(mode, rows, validate)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return loaded, statistics.median(cpu), peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    use_temp_database("read_paths.db")
+    from app.database import init_db
+    init_db(echo=lambda message: None)
+    seed(args.rows)
+
+    per_10k = 10000 / args.rows
+    for validate in (False, True):
+        stage = "rows + response models" if validate else "rows"
+        for mode in MODES:
+            loaded, cpu, peak = measure(mode, args.rows, validate, args.repeat)
+            print(
+                f"{mode:4s} {stage:22s} rows={loaded} "
+                f"cpu={cpu * per_10k * 1000:.1f}ms/10k peak={peak * per_10k / 1024 / 1024:.1f}MB/10k"
+            )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,193 @@
+"""
+Replay a recorded workload (WORKLOAD_RECORDING=true) against the API.
+
+Requests are sent with their recorded spacing divided by --speed (0 sends
+them back to back), from up to --concurrency threads. Anonymized values are
+mapped onto the target: item IDs onto its live items, subjects onto its
+subjects, both consistently (the same recorded item always hits the same
+target item), and free text becomes filler of the recorded length.
+
+Without --url the app runs in-process on DATABASE_URL (a temporary SQLite
+database if unset); --seed creates items first so there is something to
+review. Reports latency percentiles and error rates per route, next to the
+recorded latency.
+
+Usage:
+    python -m benchmarks.replay data/workload.jsonl --seed 2000 --speed 10 --concurrency 8
+    python -m benchmarks.replay data/workload.jsonl --url http://localhost:8000 --speed 0
+"""
+import argparse
+import json
+import re
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+from urllib.parse import quote
+
+from benchmarks.common import percentile
+
+API = "/api/v1"
+
+# Anonymized values written by app.core.workload.Anonymizer
+TOKEN = re.compile(r"^(id|s|k):([0-9a-f]{16})$")
+
+
+def load_trace(path: str) -> List[Dict]:
+    with open(path, encoding="utf-8") as trace:
+        entries = [json.loads(line) for line in trace if line.strip()]
+    entries.sort(key=lambda entry: entry["ts"])
+    return entries
+
+
+class TargetMapping:
+    """Maps anonymized tokens onto items and subjects of the target database."""
+
+    def __init__(self, item_ids: List[str], subjects: List[str]):
+        self.item_ids = item_ids or ["00000000-0000-0000-0000-000000000000"]
+        self.subjects = subjects or ["replay"]
+
+    def value(self, value):
+        if isinstance(value, list):
+            return [self.value(element) for element in value]
+        if isinstance(value, dict):
+            if set(value) == {"$text"}:
+                return "x" * max(1, value["$text"])
+            return {key: self.value(element) for key, element in value.items()}
+        match = TOKEN.match(value) if isinstance(value, str) else None
+        if match:
+            kind, digest = match.groups()
+            if kind == "id":
+                return self.item_ids[int(digest, 16) % len(self.item_ids)]
+            if kind == "s":
+                return self.subjects[int(digest, 16) % len(self.subjects)]
+            return digest
+        return value
+
+    def request(self, entry: Dict) -> Dict:
+        path_params = {key: quote(str(self.value(value)), safe="") for key, value in entry["path_params"].items()}
+        return {
+            "method": entry["method"],
+            "url": entry["route"].format(**path_params),
+            "params": {key: self.value(value) for key, value in entry["query"].items()},
+            "json": self.value(entry["body"]) if entry.get("body") is not None else None
+        }
+
+
+def seed_items(client, count: int) -> None:
+    for i in range(count):
+        client.post(f"{API}/learning-items/", json={
+            "subject": f"replay-{i % 12}",
+            "title": f"Replay item {i}",
+            "content": f"Seeded content for replay item {i}. " * 10
+        })
+
+
+def collect_targets(client) -> TargetMapping:
+    item_ids, skip = [], 0
+    while True:
+        page = client.get(f"{API}/learning-items/", params={"skip": skip, "limit": 500}).json()["items"]
+        item_ids += [item["id"] for item in page]
+        if len(page) < 500:
+            break
+        skip += 500
+    subjects = client.get(f"{API}/learning-items/subjects").json()
+    return TargetMapping(sorted(item_ids), sorted(subjects))
+
+
+def replay(client, entries: List[Dict], mapping: TargetMapping, speed: float, concurrency: int) -> Dict:
+    results = defaultdict(lambda: {"latencies": [], "errors": 0, "client_errors": 0, "recorded": []})
+    lock = threading.Lock()
+    lateness = []
+
+    def send(entry: Dict, due: float) -> None:
+        request = mapping.request(entry)
+        start = time.perf_counter()
+        try:
+            status = client.request(
+                request["method"], request["url"], params=request["params"], json=request["json"]
+            ).status_code
+        except Exception:
+            status = None
+        elapsed = time.perf_counter() - start
+        with lock:
+            route = results[f"{entry['method']} {entry['route']}"]
+            route["latencies"].append(elapsed)
+            route["recorded"].append(entry["duration_ms"] / 1000)
+            lateness.append(max(0.0, start - due))
+            if status is None or status >= 500:
+                route["errors"] += 1
+            elif status >= 400:
+                route["client_errors"] += 1
+
+    first_ts = entries[0]["ts"]
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for entry in entries:
+            due = started + ((entry["ts"] - first_ts) / speed if speed > 0 else 0)
+            delay = due - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            pool.submit(send, entry, due)
+    return {"routes": results, "elapsed": time.perf_counter() - started, "lateness": lateness}
+
+
+def report(outcome: Dict) -> None:
+    routes = outcome["routes"]
+    total = sum(len(route["latencies"]) for route in routes.values())
+    print(f"{'route':55s} {'n':>6s} {'p50':>8s} {'p95':>8s} {'p99':>8s} {'rec p50':>8s} {'5xx':>6s} {'4xx':>6s}")
+    for name in sorted(routes, key=lambda key: -len(routes[key]["latencies"])):
+        route = routes[name]
+        n = len(route["latencies"])
+        ms = [latency * 1000 for latency in route["latencies"]]
+        print(
+            f"{name:55s} {n:6d} {percentile(ms, 50):8.2f} {percentile(ms, 95):8.2f} {percentile(ms, 99):8.2f} "
+            f"{percentile(route['recorded'], 50) * 1000:8.2f} "
+            f"{route['errors'] / n:6.1%} {route['client_errors'] / n:6.1%}"
+        )
+    print(
+        f"{total} requests in {outcome['elapsed']:.1f}s ({total / outcome['elapsed']:.0f} req/s), "
+        f"start lateness p95={percentile(outcome['lateness'], 95) * 1000:.1f}ms "
+        f"(high lateness means --concurrency can't keep up with --speed)"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("trace", help="JSON lines file written by WORKLOAD_RECORDING")
+    parser.add_argument("--url", help="Base URL of a running server (default: in-process app)")
+    parser.add_argument("--speed", type=float, default=1.0, help="Speed-up factor (0 = no delays)")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=0, help="Items to create before replaying")
+    args = parser.parse_args()
+
+    entries = load_trace(args.trace)
+    if not entries:
+        print("Trace is empty")
+        return
+
+    if args.url:
+        import httpx
+        client = httpx.Client(base_url=args.url, timeout=60)
+    else:
+        from benchmarks.common import use_temp_database
+        use_temp_database("replay.db")
+        from fastapi.testclient import TestClient
+        from app.database import init_db
+        from app.main import app
+        init_db(echo=lambda message: None)
+        client = TestClient(app)
+
+    with client:
+        seed_items(client, args.seed)
+        mapping = collect_targets(client)
+        print(
+            f"Replaying {len(entries)} requests onto {len(mapping.item_ids)} items / "
+            f"{len(mapping.subjects)} subjects at speed {args.speed or 'max'}, concurrency {args.concurrency}"
+        )
+        report(replay(client, entries, mapping, args.speed, args.concurrency))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,119 @@
+"""
+Benchmark: adherence analytics on a large review history.
+
+Seeds items with a history of scheduled reviews (some on time, some late),
+then times GET /reviews/analytics/adherence cold (every day of the range
+queried) and warm (closed days cached, only today queried).
+
+Usage:
+    python -m benchmarks.review_adherence --items 100000 --reviews 20 --days 90
+"""
+import argparse
+import random
+import time
+from datetime import datetime, time as dt_time, timedelta, timezone
+
+from benchmarks.common import summarize_ms, use_temp_database
+
+
+def seed(items: int, reviews_per_item: int) -> None:
+    from sqlalchemy import insert
+    from app.database import engine
+    from app.models.learning_item import LearningItem
+    from app.models.review_history import ReviewHistory
+    from app.models.subject import Subject
+    from app.models.types import generate_id
+
+    rng = random.Random(42)
+    today = datetime.now(timezone.utc).date()
+    with engine.begin() as conn:
+        subject_ids = [
+            conn.execute(insert(Subject).values(name=f"subject-{i}", live_count=0)).inserted_primary_key[0]
+            for i in range(10)
+        ]
+        for start in range(0, items, 1000):
+            item_rows, review_rows = [], []
+            for _ in range(min(1000, items - start)):
+                item_id = generate_id()
+                day = today - timedelta(days=rng.randint(reviews_per_item * 3, reviews_per_item * 6))
+                created_at = datetime.combine(day, dt_time(9), tzinfo=timezone.utc)
+                due = day
+                for number in range(1, reviews_per_item + 1):
+                    reviewed = due + timedelta(days=rng.choice([0, 0, 0, 0, 1, 2, 5]))
+                    if reviewed > today:
+                        break
+                    due = reviewed + timedelta(days=rng.choice([1, 3, 7]))
+                    review_rows.append({
+                        "id": generate_id(),
+                        "learning_item_id": item_id,
+                        "reviewed_at": datetime.combine(reviewed, dt_time(rng.randint(6, 22)), tzinfo=timezone.utc),
+                        "interval_days": (due - reviewed).days,
+                        "next_review_date": due,
+                        "review_number": number,
+                        "is_manual": False
+                    })
+                item_rows.append({
+                    "id": item_id,
+                    "subject_id": rng.choice(subject_ids),
+                    "title": "Item",
+                    "content": "Content",
+                    "created_at": created_at,
+                    "updated_at": created_at,
+                    "review_count": len(review_rows),
+                    "next_review_date": due,
+                    "current_interval_days": 0,
+                    "manual_review_count": 0,
+                    "is_deleted": False
+                })
+            conn.execute(insert(LearningItem), item_rows)
+            conn.execute(insert(ReviewHistory), review_rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=100000)
+    parser.add_argument("--reviews", type=int, default=20)
+    parser.add_argument("--days", type=int, default=90)
+    parser.add_argument("--requests", type=int, default=20)
+    args = parser.parse_args()
+
+    use_temp_database("review_adherence.db")
+    from fastapi.testclient import TestClient
+    from app.database import engine, init_db
+    from app.main import app
+    from app.services.review_analytics_service import adherence_cache
+
+    init_db(echo=lambda message: None)
+    start = time.perf_counter()
+    seed(args.items, args.reviews)
+    with engine.connect() as conn:
+        history = conn.exec_driver_sql("SELECT COUNT(*) FROM review_history").scalar()
+    print(f"Seeded {args.items} items / {history} reviews in {time.perf_counter() - start:.1f}s")
+
+    client = TestClient(app)
+    today = datetime.now(timezone.utc).date()
+    params = {"from": str(today - timedelta(days=args.days - 1)), "to": str(today)}
+
+    cold = []
+    for _ in range(3):
+        adherence_cache.clear()
+        start = time.perf_counter()
+        client.get("/api/v1/reviews/analytics/adherence", params=params).raise_for_status()
+        cold.append(time.perf_counter() - start)
+    print(summarize_ms(f"cold ({args.days} days queried)", cold))
+
+    warm = []
+    for _ in range(args.requests):
+        start = time.perf_counter()
+        response = client.get("/api/v1/reviews/analytics/adherence", params=params)
+        warm.append(time.perf_counter() - start)
+    print(summarize_ms("warm (today queried)", warm))
+    overall = response.json()["overall"]
+    print(
+        f"reviews={overall['reviews']} on_time_rate={overall['on_time_rate']} "
+        f"p90_lateness={overall['p90_lateness_days']}d"
+    )
+
+
+if __name__ == '__main__':
+    main()
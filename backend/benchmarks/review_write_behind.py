@@ -0,0 +1,95 @@
+"""
+Benchmark: review submissions per second, synchronous path vs write-behind group commit.
+
+Usage:
+    python -m benchmarks.review_write_behind --items 200 --reviews 2000 --threads 32
+"""
+import argparse
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.common import use_temp_database, summarize_ms
+
+use_temp_database()
+
+from app.database import Base, engine, SessionLocal  # noqa: E402
+from app.services.learning_item_service import LearningItemService  # noqa: E402
+from app.services.review_write_behind import ReviewWriteBehind  # noqa: E402
+
+
+def create_items(count: int) -> list:
+    db = SessionLocal()
+    try:
+        service = LearningItemService(db)
+        return [service.create_item("bench", f"Item {i}", "content").id for i in range(count)]
+    finally:
+        db.close()
+
+
+def review_sync(item_id: str) -> None:
+    db = SessionLocal()
+    try:
+        LearningItemService(db).mark_as_reviewed(item_id)
+    finally:
+        db.close()
+
+
+def make_review_write_behind(writer: ReviewWriteBehind):
+    def review(item_id: str) -> None:
+        db = SessionLocal()
+        try:
+            LearningItemService(db).get_item_by_id(item_id)
+        finally:
+            db.close()
+        writer.submit(item_id)
+    return review
+
+
+def run(label: str, submit, item_ids: list, reviews: int, threads: int) -> None:
+    targets = [random.choice(item_ids) for _ in range(reviews)]
+    latencies = []
+    errors = 0
+
+    def timed(item_id):
+        start = time.perf_counter()
+        submit(item_id)
+        return time.perf_counter() - start
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        for future in [pool.submit(timed, item_id) for item_id in targets]:
+            try:
+                latencies.append(future.result())
+            except Exception:
+                errors += 1
+    elapsed = time.perf_counter() - started
+
+    print(f"{label}: {len(latencies) / elapsed:,.0f} reviews/sec ({errors} errors, {elapsed:.2f}s)")
+    if latencies:
+        print("  " + summarize_ms("latency", latencies))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=200)
+    parser.add_argument("--reviews", type=int, default=2000)
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--interval-ms", type=int, default=5)
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    item_ids = create_items(args.items)
+    print(f"Database: {engine.url} ({args.items} items, {args.threads} threads)\n")
+
+    run("synchronous", review_sync, item_ids, args.reviews, args.threads)
+
+    writer = ReviewWriteBehind(interval_ms=args.interval_ms)
+    run("write-behind", make_review_write_behind(writer), item_ids, args.reviews, args.threads)
+    writer.stop()
+    print(f"  {writer.batches_committed} group commits, "
+          f"{writer.reviews_committed / max(writer.batches_committed, 1):.1f} reviews per commit")
+
+
+if __name__ == '__main__':
+    main()
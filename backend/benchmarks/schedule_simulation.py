@@ -0,0 +1,46 @@
+"""
+Benchmark: run time of the review load simulation for a large population.
+
+Simulates per-item arrays (no cohort grouping, the worst case for the
+endpoint) with review counts and due dates spread like a mature collection.
+
+Usage:
+    python -m benchmarks.schedule_simulation --items 1000000 --days 365
+"""
+import argparse
+import time
+
+import numpy as np
+
+from app.core.constants import REVIEW_INTERVALS, CYCLE_BACK_TO_LEVEL
+from app.services.schedule_simulation_service import simulate_review_load
+
+LADDERS = {
+    "current": (REVIEW_INTERVALS, CYCLE_BACK_TO_LEVEL),
+    "gentle": ([0, 1, 2, 4, 8, 16, 32], 5),
+    "long": ([0, 1, 3, 7, 30, 90, 180], 5),
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=1_000_000)
+    parser.add_argument("--days", type=int, default=365)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    counts = rng.integers(0, 10, args.items)
+    offsets = rng.integers(-14, 60, args.items)
+
+    for name, (intervals, cycle_back_to_level) in LADDERS.items():
+        start = time.perf_counter()
+        load = simulate_review_load(counts, offsets, intervals, cycle_back_to_level, args.days)
+        elapsed = time.perf_counter() - start
+        print(
+            f"{name:8s} {args.items} items x {args.days} days: {elapsed:.2f}s "
+            f"(total={load.sum()} mean/day={load.mean():.0f} peak/day={load.max()})"
+        )
+
+
+if __name__ == '__main__':
+    main()
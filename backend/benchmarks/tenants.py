@@ -0,0 +1,87 @@
+"""
+Benchmark: database-per-tenant routing with 1k tenants.
+
+Runs the app in-process with TENANCY_ENABLED and one SQLite file per tenant
+in a temporary directory. Every tenant is created through the API (the
+first request creates its schema, then a few items are added). Then
+GET /reviews/due requests are spread over the tenants with a skewed
+(Zipf-like) popularity, so a few tenants are hot and most are rarely seen.
+Latency is reported separately for requests whose tenant engine was still
+open (pool hit) and those that had to reopen it (pool miss).
+
+Usage:
+    python -m benchmarks.tenants --tenants 1000 --max-engines 64 --requests 5000
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from benchmarks.common import summarize_ms, use_temp_database
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tenants", type=int, default=1000)
+    parser.add_argument("--items", type=int, default=5, help="Items created per tenant")
+    parser.add_argument("--max-engines", type=int, default=64)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--skew", type=float, default=1.1, help="Zipf exponent of tenant popularity")
+    args = parser.parse_args()
+
+    use_temp_database("tenants_default.db")
+    tenant_dir = tempfile.mkdtemp(prefix="review_tool_tenants_")
+    os.environ["TENANCY_ENABLED"] = "true"
+    os.environ["TENANT_DATABASE_URL"] = f"sqlite:///{tenant_dir}/{{tenant}}.db"
+    os.environ["TENANT_MAX_ENGINES"] = str(args.max_engines)
+    from fastapi.testclient import TestClient
+    from app.database import tenant_pool
+    from app.main import app
+
+    client = TestClient(app)
+    tenants = [f"tenant-{i:05d}" for i in range(args.tenants)]
+
+    first, create = [], []
+    started = time.perf_counter()
+    for tenant in tenants:
+        headers = {"X-Tenant-ID": tenant}
+        start = time.perf_counter()
+        client.get("/api/v1/reviews/due", headers=headers).raise_for_status()
+        first.append(time.perf_counter() - start)
+        for i in range(args.items):
+            start = time.perf_counter()
+            client.post(
+                "/api/v1/learning-items/",
+                json={"subject": f"subject-{i % 2}", "title": f"Item {i}", "content": "Some content " * 20},
+                headers=headers
+            ).raise_for_status()
+            create.append(time.perf_counter() - start)
+    elapsed = time.perf_counter() - started
+    size = sum(os.path.getsize(os.path.join(tenant_dir, name)) for name in os.listdir(tenant_dir))
+    print(f"{args.tenants} tenants created in {elapsed:.1f}s ({size / args.tenants / 1024:.0f}KB per tenant file)")
+    print(summarize_ms("first request (schema created)", first))
+    print(summarize_ms("POST /learning-items/", create))
+
+    rng = random.Random(47)
+    weights = [1 / (rank + 1) ** args.skew for rank in range(args.tenants)]
+    picks = rng.choices(tenants, weights=weights, k=args.requests)
+    hits, misses = [], []
+    for tenant in picks:
+        opened = tenant_pool.stats()["opened"]
+        start = time.perf_counter()
+        client.get("/api/v1/reviews/due", headers={"X-Tenant-ID": tenant}).raise_for_status()
+        seconds = time.perf_counter() - start
+        (misses if tenant_pool.stats()["opened"] > opened else hits).append(seconds)
+
+    stats = tenant_pool.stats()
+    print(f"\nGET /reviews/due x{args.requests}, pool of {args.max_engines} engines: "
+          f"hit rate {len(hits) / args.requests:.1%}, {stats['evicted']} evictions")
+    print(summarize_ms("pool hit", hits))
+    if misses:
+        print(summarize_ms("pool miss (engine reopened)", misses))
+    print(f"open engines at the end: {stats['open']}")
+
+
+if __name__ == '__main__':
+    main()
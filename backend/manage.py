@@ -0,0 +1,390 @@
+"""
+Maintenance commands for the review tool backend.
+
+Usage:
+    python manage.py due-queue rebuild     # Rebuild the due queue from learning_items
+    python manage.py due-queue verify      # Compare the due queue with the live due query
+    python manage.py due-queue rollover    # Extend the queue horizon (run daily after midnight)
+    python manage.py subjects recount      # Recompute cached subject counters
+    python manage.py content compress      # Rewrite item content with the current CONTENT_COMPRESSION
+    python manage.py duplicates rebuild    # Rebuild the near-duplicate index from learning_items
+    python manage.py tiering demote        # Move long-interval items not due soon to the cold tier
+    python manage.py tiering status        # Count hot and cold items
+    python manage.py items purge           # Hard-delete items soft-deleted more than PURGE_RETENTION_DAYS ago
+    python manage.py backup create         # Online incremental snapshot of the SQLite database
+    python manage.py backup list           # List snapshots
+    python manage.py backup verify         # Check a snapshot's chunk and file checksums
+    python manage.py backup restore        # Restore a snapshot (stop the server first)
+    python manage.py backup prune          # Keep the newest snapshots, drop unused chunks
+"""
+import argparse
+import os
+import sys
+
+from sqlalchemy import bindparam, select, update
+from sqlalchemy.engine import make_url
+
+from app.config import get_settings
+from app.core import minhash
+from app.core.backup import BackupError, BackupStore
+from app.database import SessionLocal, init_db
+from app.models.cold_item_content import ColdItemContent
+from app.models.learning_item import LearningItem
+from app.repositories.due_queue_repository import DueQueueRepository
+from app.repositories.item_signature_repository import ItemSignatureRepository
+from app.repositories.item_tier_repository import ItemTierRepository
+from app.repositories.learning_item_repository import ITEM_ROWS
+from app.repositories.subject_repository import SubjectRepository
+from app.services.item_purge_service import ItemPurgeService
+
+
+def due_queue_rebuild(args) -> int:
+    init_db()
+    db = SessionLocal()
+    try:
+        state = DueQueueRepository(db).rebuild()
+        print(f"[OK] Due queue rebuilt (horizon ends {state.horizon_end})")
+        return 0
+    finally:
+        db.close()
+
+
+def due_queue_verify(args) -> int:
+    db = SessionLocal()
+    try:
+        report = DueQueueRepository(db).verify()
+    finally:
+        db.close()
+
+    if report["uninitialized"]:
+        print("[ERROR] Due queue has not been built yet, run: python manage.py due-queue rebuild")
+        return 1
+
+    problems = 0
+    for kind in ("missing", "stale", "extra"):
+        ids = report[kind]
+        problems += len(ids)
+        print(f"{kind}: {len(ids)}")
+        for item_id in ids[:20]:
+            print(f"  {item_id}")
+
+    if problems:
+        print("\n[ERROR] Due queue does not match the live query, run: python manage.py due-queue rebuild")
+        return 1
+    print("\n[OK] Due queue matches the live query")
+    return 0
+
+
+def due_queue_rollover(args) -> int:
+    db = SessionLocal()
+    try:
+        state = DueQueueRepository(db).roll_over()
+        print(f"[OK] Due queue rolled over (horizon ends {state.horizon_end})")
+        return 0
+    finally:
+        db.close()
+
+
+def subjects_recount(args) -> int:
+    db = SessionLocal()
+    try:
+        SubjectRepository(db).recount_live()
+        # Rebuilding the due queue also refreshes the due counters
+        DueQueueRepository(db).rebuild()
+        print("[OK] Subject counters recomputed")
+        return 0
+    finally:
+        db.close()
+
+
+def content_compress(args) -> int:
+    """Rewrite stored content so every row uses the current compression setting."""
+    items = LearningItem.__table__
+    cold = ColdItemContent.__table__
+    db = SessionLocal()
+    try:
+        total = 0
+        for table, key, extra in (
+            (items, items.c.id, {"updated_at": items.c.updated_at}),  # Not a user edit
+            (cold, cold.c.learning_item_id, {})
+        ):
+            rewrite = update(table).where(key == bindparam("item_id")).values(
+                content=bindparam("item_content"), **extra
+            )
+            last_id = None
+            while True:
+                query = select(key, table.c.content).order_by(key).limit(args.batch_size)
+                if last_id is not None:
+                    query = query.where(key > last_id)
+                rows = db.execute(query).all()
+                if not rows:
+                    break
+                db.execute(rewrite, [{"item_id": row[0], "item_content": row[1]} for row in rows])
+                db.commit()
+                last_id = rows[-1][0]
+                total += len(rows)
+                print(f"  {total} rows rewritten")
+        print(f"[OK] Content of {total} rows rewritten")
+        return 0
+    finally:
+        db.close()
+
+
+def duplicates_rebuild(args) -> int:
+    """
+    Recompute every live item's signature (e.g. items created before the index existed).
+    Each batch replaces its items' entries in one transaction, so the index stays
+    usable and items created meanwhile (indexed by the API) don't collide with it.
+    """
+    items = LearningItem.__table__
+    init_db()
+    db = SessionLocal()
+    try:
+        signature_repo = ItemSignatureRepository(db)
+        last_id, total = None, 0
+        while True:
+            # ITEM_ROWS reads content from either tier
+            query = ITEM_ROWS.where(items.c.is_deleted == False).order_by(items.c.id).limit(args.batch_size)
+            if last_id is not None:
+                query = query.where(items.c.id > last_id)
+            rows = db.execute(query).all()
+            if not rows:
+                break
+            entries = []
+            for row in rows:
+                signature = minhash.signature(row.title, row.content)
+                entries.append((row.id, minhash.to_bytes(signature), minhash.band_keys(signature)))
+            signature_repo.replace_many(entries)
+            last_id = rows[-1].id
+            total += len(rows)
+            print(f"  {total} items indexed")
+        removed = signature_repo.remove_deleted()
+        print(f"[OK] Near-duplicate index rebuilt ({total} items, {removed} deleted items removed)")
+        return 0
+    finally:
+        db.close()
+
+
+def tiering_demote(args) -> int:
+    """Move items to the cold tier in batches (run daily, after the due queue roll-over)."""
+    init_db()
+    db = SessionLocal()
+    try:
+        min_interval = args.min_interval if args.min_interval is not None else get_settings().COLD_TIER_MIN_INTERVAL_DAYS
+        # Items inside the due queue horizon stay hot
+        horizon_end = DueQueueRepository(db).ensure_current().horizon_end
+        tier_repo = ItemTierRepository(db)
+        last_id, total = None, 0
+        while True:
+            moved = tier_repo.demote(min_interval, horizon_end, after_id=last_id, limit=args.batch_size)
+            if not moved:
+                break
+            last_id = moved[-1]
+            total += len(moved)
+            print(f"  {total} items demoted")
+        print(f"[OK] {total} items moved to the cold tier (interval >= {min_interval} days, due after {horizon_end})")
+        return 0
+    finally:
+        db.close()
+
+
+def tiering_status(args) -> int:
+    db = SessionLocal()
+    try:
+        counts = ItemTierRepository(db).get_counts()
+        print(f"hot: {counts['hot']}")
+        print(f"cold: {counts['cold']}")
+        return 0
+    finally:
+        db.close()
+
+
+def items_purge(args) -> int:
+    """Purge soft-deleted items past the retention period, then optionally VACUUM/ANALYZE."""
+    settings = get_settings()
+    init_db()
+    db = SessionLocal()
+    try:
+        service = ItemPurgeService(db)
+        result = service.purge_deleted(
+            retention_days=args.retention_days if args.retention_days is not None else settings.PURGE_RETENTION_DAYS,
+            batch_size=args.batch_size or settings.PURGE_BATCH_SIZE,
+            pause_ms=settings.PURGE_BATCH_PAUSE_MS,
+            time_budget=args.time_budget
+        )
+        db.close()  # Release the connection before VACUUM
+        service.optimize(vacuum=args.vacuum, analyze=args.analyze)
+    finally:
+        db.close()
+
+    print(f"[OK] Purged {result['items_purged']} items and {result['reviews_purged']} reviews")
+    if not result["complete"]:
+        print(f"[WARN] {result['remaining']} items left (time budget used up), run again to continue")
+    return 0
+
+
+def _sqlite_path(url: str) -> str:
+    parsed = make_url(url)
+    if parsed.get_backend_name() != "sqlite" or not parsed.database:
+        raise BackupError("Backups work on SQLite database files; use pg_dump or WAL archiving for PostgreSQL")
+    return parsed.database
+
+
+def _backup_store() -> BackupStore:
+    settings = get_settings()
+    return BackupStore(settings.BACKUP_DIR, chunk_bytes=settings.BACKUP_CHUNK_BYTES)
+
+
+def backup_create(args) -> int:
+    settings = get_settings()
+    store = _backup_store()
+    try:
+        manifest = store.create_snapshot(
+            args.source or _sqlite_path(settings.DATABASE_URL),
+            step_pages=args.step_pages or settings.BACKUP_STEP_PAGES,
+            pause_ms=settings.BACKUP_STEP_PAUSE_MS if args.pause_ms is None else args.pause_ms
+        )
+    except BackupError as e:
+        print(f"[ERROR] {e}")
+        return 1
+
+    size_mb = manifest["size"] / 2**20
+    print(f"[OK] Snapshot {manifest['id']}: {size_mb:.1f}MB in {manifest['duration_seconds']:.1f}s "
+          f"({size_mb / max(manifest['duration_seconds'], 1e-6):.1f}MB/s)")
+    print(f"  {manifest['new_chunks']}/{len(manifest['chunks'])} chunks new "
+          f"({manifest['new_bytes'] / 2**20:.1f}MB stored), sha256 {manifest['sha256'][:16]}...")
+    if manifest["journal_mode"] == "wal":
+        print("  Copied from one read snapshot (WAL mode), writers were not blocked")
+    else:
+        print(f"  {manifest['steps']} steps, {manifest['restarts']} restarts; writers held off "
+              f"p50 {manifest['step_ms_p50']:.1f}ms, max {manifest['step_ms_max']:.1f}ms per step")
+    if settings.BACKUP_KEEP > 0:
+        pruned = store.prune(settings.BACKUP_KEEP)
+        if pruned["snapshots"]:
+            print(f"  Pruned {pruned['snapshots']} old snapshots ({pruned['chunks']} chunks)")
+    return 0
+
+
+def backup_list(args) -> int:
+    for manifest in _backup_store().list_snapshots():
+        print(f"{manifest['id']}  {manifest['size'] / 2**20:8.1f}MB  "
+              f"+{manifest['new_bytes'] / 2**20:.1f}MB  {manifest['source']}")
+    return 0
+
+
+def backup_verify(args) -> int:
+    store = _backup_store()
+    try:
+        manifests = store.list_snapshots() if args.all else [store.get_snapshot(args.snapshot)]
+    except BackupError as e:
+        print(f"[ERROR] {e}")
+        return 1
+
+    failed = 0
+    for manifest in manifests:
+        try:
+            store.verify(manifest)
+            print(f"[OK] {manifest['id']}")
+        except BackupError as e:
+            print(f"[ERROR] {e}")
+            failed += 1
+    return 1 if failed else 0
+
+
+def backup_restore(args) -> int:
+    store = _backup_store()
+    try:
+        manifest = store.get_snapshot(args.snapshot)
+        target = args.target or _sqlite_path(get_settings().DATABASE_URL)
+        if os.path.exists(target) and not args.force:
+            print(f"[ERROR] {target} exists; stop the server and pass --force to replace it")
+            return 1
+        store.restore(manifest, target)
+    except BackupError as e:
+        print(f"[ERROR] {e}")
+        return 1
+    print(f"[OK] Restored snapshot {manifest['id']} to {target}")
+    return 0
+
+
+def backup_prune(args) -> int:
+    keep = args.keep if args.keep is not None else get_settings().BACKUP_KEEP
+    if keep < 1:
+        print("[ERROR] Nothing to prune: pass --keep N with N >= 1 (BACKUP_KEEP=0 keeps all snapshots)")
+        return 1
+    pruned = _backup_store().prune(keep)
+    print(f"[OK] Deleted {pruned['snapshots']} snapshots and {pruned['chunks']} unused chunks")
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Review tool maintenance commands")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    due_queue = commands.add_parser("due-queue", help="Materialized due queue maintenance")
+    due_queue_actions = due_queue.add_subparsers(dest="action", required=True)
+    due_queue_actions.add_parser("rebuild").set_defaults(func=due_queue_rebuild)
+    due_queue_actions.add_parser("verify").set_defaults(func=due_queue_verify)
+    due_queue_actions.add_parser("rollover").set_defaults(func=due_queue_rollover)
+
+    subjects = commands.add_parser("subjects", help="Subject maintenance")
+    subjects_actions = subjects.add_subparsers(dest="action", required=True)
+    subjects_actions.add_parser("recount").set_defaults(func=subjects_recount)
+
+    content = commands.add_parser("content", help="Item content maintenance")
+    content_actions = content.add_subparsers(dest="action", required=True)
+    compress = content_actions.add_parser("compress")
+    compress.add_argument("--batch-size", type=int, default=500)
+    compress.set_defaults(func=content_compress)
+
+    duplicates = commands.add_parser("duplicates", help="Near-duplicate index maintenance")
+    duplicates_actions = duplicates.add_subparsers(dest="action", required=True)
+    rebuild = duplicates_actions.add_parser("rebuild")
+    rebuild.add_argument("--batch-size", type=int, default=1000)
+    rebuild.set_defaults(func=duplicates_rebuild)
+
+    tiering = commands.add_parser("tiering", help="Hot/cold item tiering")
+    tiering_actions = tiering.add_subparsers(dest="action", required=True)
+    demote = tiering_actions.add_parser("demote")
+    demote.add_argument("--batch-size", type=int, default=1000)
+    demote.add_argument("--min-interval", type=int, help="Default: COLD_TIER_MIN_INTERVAL_DAYS")
+    demote.set_defaults(func=tiering_demote)
+    tiering_actions.add_parser("status").set_defaults(func=tiering_status)
+
+    items = commands.add_parser("items", help="Learning item maintenance")
+    items_actions = items.add_subparsers(dest="action", required=True)
+    purge = items_actions.add_parser("purge")
+    purge.add_argument("--retention-days", type=int, help="Default: PURGE_RETENTION_DAYS")
+    purge.add_argument("--batch-size", type=int, help="Default: PURGE_BATCH_SIZE")
+    purge.add_argument("--time-budget", type=float, help="Stop after this many seconds")
+    purge.add_argument("--vacuum", action="store_true", help="Reclaim space afterwards (locks SQLite while it runs)")
+    purge.add_argument("--analyze", action="store_true", help="Refresh planner statistics afterwards")
+    purge.set_defaults(func=items_purge)
+
+    backup = commands.add_parser("backup", help="SQLite backups")
+    backup_actions = backup.add_subparsers(dest="action", required=True)
+    create = backup_actions.add_parser("create")
+    create.add_argument("--source", help="Database file (default: DATABASE_URL)")
+    create.add_argument("--step-pages", type=int, help="Default: BACKUP_STEP_PAGES")
+    create.add_argument("--pause-ms", type=float, help="Default: BACKUP_STEP_PAUSE_MS")
+    create.set_defaults(func=backup_create)
+    backup_actions.add_parser("list").set_defaults(func=backup_list)
+    verify = backup_actions.add_parser("verify")
+    verify.add_argument("snapshot", nargs="?", help="Snapshot ID (default: latest)")
+    verify.add_argument("--all", action="store_true", help="Verify every snapshot")
+    verify.set_defaults(func=backup_verify)
+    restore = backup_actions.add_parser("restore")
+    restore.add_argument("snapshot", nargs="?", help="Snapshot ID (default: latest)")
+    restore.add_argument("--target", help="Database file to write (default: DATABASE_URL)")
+    restore.add_argument("--force", action="store_true", help="Replace an existing database file")
+    restore.set_defaults(func=backup_restore)
+    prune = backup_actions.add_parser("prune")
+    prune.add_argument("--keep", type=int, help="Snapshots to keep, at least 1 (default: BACKUP_KEEP)")
+    prune.set_defaults(func=backup_prune)
+
+    return parser
+
+
+if __name__ == '__main__':
+    args = build_parser().parse_args()
+    sys.exit(args.func(args))
@@ -1,47 +1,92 @@
 """
-Migration script to add manual review fields.
+Schema migrations for the database in DATABASE_URL (SQLite or PostgreSQL).
+
+Usage:
+    python migrate.py                      # Apply pending migrations (same as `upgrade`)
+    python migrate.py upgrade --time-budget 50 --batch-size 500 --pause-ms 20
+    python migrate.py status               # Show applied/pending migrations and backfill progress
+    python migrate.py stamp                # Mark all migrations as applied (schema already current)
+    python migrate.py native-ids           # Convert IDs to native storage (ID_STORAGE=native)
+
+Backfills run in chunks that each commit with their progress; a run stopped
+by the time budget, a timeout or Ctrl-C resumes where it left off.
 """
-import sqlite3
+import argparse
 import sys
 
-def migrate():
-    conn = sqlite3.connect('data/review_tool.db')
-    cursor = conn.cursor()
-
-    try:
-        # Check if columns already exist
-        cursor.execute("PRAGMA table_info(learning_items)")
-        columns = [col[1] for col in cursor.fetchall()]
-
-        # Add manual_review_count if it doesn't exist
-        if 'manual_review_count' not in columns:
-            print("Adding manual_review_count column to learning_items...")
-            cursor.execute("ALTER TABLE learning_items ADD COLUMN manual_review_count INTEGER DEFAULT 0 NOT NULL")
-            print("[OK] Added manual_review_count column")
-        else:
-            print("[OK] manual_review_count column already exists")
-
-        # Check review_history table
-        cursor.execute("PRAGMA table_info(review_history)")
-        columns = [col[1] for col in cursor.fetchall()]
-
-        # Add is_manual if it doesn't exist
-        if 'is_manual' not in columns:
-            print("Adding is_manual column to review_history...")
-            cursor.execute("ALTER TABLE review_history ADD COLUMN is_manual BOOLEAN DEFAULT 0 NOT NULL")
-            print("[OK] Added is_manual column")
-        else:
-            print("[OK] is_manual column already exists")
-
-        conn.commit()
-        print("\n[SUCCESS] Migration completed successfully!")
-
-    except Exception as e:
-        print(f"\n[ERROR] Migration failed: {e}")
-        conn.rollback()
-        sys.exit(1)
-    finally:
-        conn.close()
+from app.config import get_settings
+from app.database import create_tables, engine
+from app.migrations import get_status, stamp, upgrade
+from app.migrations.native_ids import convert_ids_to_native
+
+
+def run_upgrade(args) -> int:
+    result = upgrade(
+        engine,
+        create_all=create_tables,
+        batch_size=args.batch_size,
+        pause_ms=args.pause_ms,
+        time_budget=args.time_budget
+    )
+    if not result["complete"]:
+        return 2
+    print("\n[SUCCESS] Schema is up to date")
+    return 0
+
+
+def run_status(args) -> int:
+    status = get_status(engine)
+    for name in status["applied"]:
+        print(f"[applied] {name}")
+    for migration in status["pending"]:
+        print(f"[pending] {migration['name']} - {migration['description']}")
+        for backfill in migration["backfills"]:
+            state = "done" if backfill["done"] else f"{backfill['rows_done']:,} rows"
+            print(f"          {backfill['step']}: {state}")
+    return 0
+
+
+def run_stamp(args) -> int:
+    stamp(engine)
+    print("[OK] All migrations marked as applied")
+    return 0
+
+
+def run_native_ids(args) -> int:
+    if get_settings().ID_STORAGE != "native":
+        print("[ERROR] Set ID_STORAGE=native first")
+        return 1
+    if not convert_ids_to_native(
+        engine,
+        batch_size=args.batch_size,
+        pause_ms=args.pause_ms,
+        time_budget=args.time_budget
+    ):
+        return 2
+    print("\n[SUCCESS] IDs use native storage")
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    settings = get_settings()
+    chunking = argparse.ArgumentParser(add_help=False)
+    chunking.add_argument("--batch-size", type=int, default=settings.MIGRATION_BATCH_SIZE,
+                          help="Rows per backfill transaction")
+    chunking.add_argument("--pause-ms", type=int, default=settings.MIGRATION_BATCH_PAUSE_MS,
+                          help="Pause between backfill chunks")
+    chunking.add_argument("--time-budget", type=float, default=settings.MIGRATION_TIME_BUDGET_SECONDS or None,
+                          help="Stop after this many seconds (resume with the next run)")
+
+    parser = argparse.ArgumentParser(description="Review tool schema migrations")
+    commands = parser.add_subparsers(dest="command")
+    commands.add_parser("upgrade", parents=[chunking]).set_defaults(func=run_upgrade)
+    commands.add_parser("status").set_defaults(func=run_status)
+    commands.add_parser("stamp").set_defaults(func=run_stamp)
+    commands.add_parser("native-ids", parents=[chunking]).set_defaults(func=run_native_ids)
+    return parser
+
 
 if __name__ == '__main__':
-    migrate()
+    argv = sys.argv[1:] or ["upgrade"]
+    args = build_parser().parse_args(argv)
+    sys.exit(args.func(args))
@@ -0,0 +1,95 @@
+"""
+Shared test fixtures.
+
+Settings and engines are created when `app` is first imported, so the
+environment is pointed at a scratch SQLite database before that. Optional
+features are switched off here; tests enable them on the settings object
+(monkeypatch) or build their own middleware/engines.
+"""
+import os
+import tempfile
+
+DATA_DIR = tempfile.mkdtemp(prefix="review-tool-tests-")
+os.environ.update({
+    "DATABASE_URL": f"sqlite:///{DATA_DIR}/test.db",
+    "DATA_DIR": DATA_DIR,
+    "DATABASE_REPLICA_URLS": "[]",
+    "TENANCY_ENABLED": "false",
+    "REVIEW_WRITE_BEHIND": "false",
+    "IDEMPOTENCY_ENABLED": "false",
+    "RESPONSE_COMPRESSION": "false",
+    "PROFILING_ENABLED": "false",
+    "WORKLOAD_RECORDING": "false",
+    "CONTENT_COMPRESSION": "off",
+    "REPOSITORY_READ_MODE": os.environ.get("REPOSITORY_READ_MODE", "orm"),
+})
+
+import pytest  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.config import get_settings  # noqa: E402
+from app import database  # noqa: E402
+from app.database import Base, SessionLocal, create_db_engine, engine, init_db  # noqa: E402
+from app.main import app  # noqa: E402
+from app.services.learning_item_service import review_activity_cache  # noqa: E402
+from app.services.review_analytics_service import adherence_cache  # noqa: E402
+
+
+@pytest.fixture(scope="session", autouse=True)
+def schema():
+    init_db(echo=lambda message: None)
+
+
+@pytest.fixture(autouse=True)
+def clean_database():
+    """Every test starts with empty tables and empty in-process caches."""
+    with engine.begin() as conn:
+        for table in reversed(Base.metadata.sorted_tables):
+            conn.execute(table.delete())
+    review_activity_cache.clear()
+    adherence_cache.clear()
+    yield
+
+
+@pytest.fixture
+def settings():
+    return get_settings()
+
+
+@pytest.fixture
+def db():
+    session = SessionLocal()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def replica(tmp_path):
+    """
+    An empty read replica (its own SQLite file) registered for read routing.
+    Nothing replicates into it: tests copy in what a lagging replica would hold.
+    """
+    replica_engine = create_db_engine(f"sqlite:///{tmp_path}/replica.db")
+    Base.metadata.create_all(replica_engine)
+    database.replica_engines.append(replica_engine)
+    yield replica_engine
+    database.replica_engines.remove(replica_engine)
+    replica_engine.dispose()
+
+
+@pytest.fixture
+def client():
+    return TestClient(app)
+
+
+@pytest.fixture
+def create_item(client):
+    """Create an item through the API and return its JSON."""
+    def create(subject: str = "Physics", title: str = "Item", content: str = "Some content", **fields):
+        response = client.post(
+            "/api/v1/learning-items/",
+            json={"subject": subject, "title": title, "content": content, **fields}
+        )
+        assert response.status_code == 201, response.text
+        return response.json()
+    return create
@@ -0,0 +1,118 @@
+"""
+Online incremental SQLite backups: snapshots, verification, restore and pruning.
+"""
+import argparse
+import os
+import sqlite3
+
+import pytest
+
+import manage
+from app.core.backup import BackupError, BackupStore
+
+
+@pytest.fixture
+def source(tmp_path):
+    path = str(tmp_path / "source.db")
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE notes (id INTEGER PRIMARY KEY, body TEXT)")
+    conn.executemany("INSERT INTO notes (body) VALUES (?)", [(f"note {i} " * 50,) for i in range(500)])
+    conn.commit()
+    conn.close()
+    return path
+
+
+@pytest.fixture
+def store(tmp_path):
+    return BackupStore(str(tmp_path / "backups"), chunk_bytes=16 * 1024)
+
+
+def write(path, body):
+    conn = sqlite3.connect(path)
+    conn.execute("INSERT INTO notes (body) VALUES (?)", (body,))
+    conn.commit()
+    conn.close()
+
+
+def notes(path):
+    conn = sqlite3.connect(path)
+    try:
+        return conn.execute("SELECT COUNT(*) FROM notes").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def quiet(_):
+    pass
+
+
+def test_snapshot_is_copied_in_steps_and_restores(store, source, tmp_path):
+    manifest = store.create_snapshot(source, step_pages=4, pause_ms=0, echo=quiet)
+    assert manifest["journal_mode"] != "wal"
+    assert manifest["steps"] > 1 and manifest["restarts"] == 0
+    assert manifest["new_chunks"] == len(manifest["chunks"])
+    assert manifest["size"] == manifest["page_count"] * manifest["page_size"]
+
+    store.verify(manifest)
+    target = str(tmp_path / "restored.db")
+    store.restore(manifest, target)
+    assert notes(target) == 500
+
+
+def test_later_snapshots_store_only_changed_chunks(store, source):
+    first = store.create_snapshot(source, pause_ms=0, echo=quiet)
+    write(source, "one more")
+    second = store.create_snapshot(source, pause_ms=0, echo=quiet)
+    assert second["id"] != first["id"]
+    assert 0 < second["new_chunks"] < len(second["chunks"])
+    assert [m["id"] for m in store.list_snapshots()] == [first["id"], second["id"]]
+    assert store.get_snapshot()["id"] == second["id"]
+
+
+def test_wal_databases_are_copied_in_one_step(store, source):
+    conn = sqlite3.connect(source)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.close()
+    manifest = store.create_snapshot(source, step_pages=4, pause_ms=0, echo=quiet)
+    assert (manifest["journal_mode"], manifest["steps"]) == ("wal", 1)
+
+
+def test_verify_detects_missing_and_corrupt_chunks(store, source, tmp_path):
+    manifest = store.create_snapshot(source, pause_ms=0, echo=quiet)
+    first = store._chunk_path(manifest["chunks"][0])
+    with open(first, "r+b") as chunk:
+        chunk.write(b"garbage")
+    with pytest.raises(BackupError, match="corrupt"):
+        store.verify(manifest)
+    os.remove(first)
+    with pytest.raises(BackupError, match="missing"):
+        store.restore(manifest, str(tmp_path / "restored.db"))
+    assert not os.path.exists(tmp_path / "restored.db")
+
+
+def test_prune_keeps_the_newest_snapshots_and_their_chunks(store, source):
+    snapshots = []
+    for index in range(3):
+        write(source, f"change {index}")
+        snapshots.append(store.create_snapshot(source, pause_ms=0, echo=quiet))
+
+    assert store.prune(0) == {"snapshots": 0, "chunks": 0}
+    pruned = store.prune(1)
+    assert pruned["snapshots"] == 2 and pruned["chunks"] > 0
+    assert [m["id"] for m in store.list_snapshots()] == [snapshots[-1]["id"]]
+    store.verify(snapshots[-1])
+
+
+def test_cli_restore_refuses_to_overwrite_without_force(settings, monkeypatch, store, source, tmp_path):
+    monkeypatch.setattr(settings, "BACKUP_DIR", store.directory)
+    monkeypatch.setattr(settings, "BACKUP_KEEP", 0)
+    assert manage.backup_create(argparse.Namespace(source=source, step_pages=None, pause_ms=0)) == 0
+    assert manage.backup_verify(argparse.Namespace(snapshot=None, all=True)) == 0
+
+    target = str(tmp_path / "live.db")
+    args = argparse.Namespace(snapshot=None, target=target, force=False)
+    assert manage.backup_restore(args) == 0
+    assert manage.backup_restore(args) == 1
+    args.force = True
+    assert manage.backup_restore(args) == 0
+    assert notes(target) == 500
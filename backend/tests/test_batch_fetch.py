@@ -0,0 +1,51 @@
+"""
+Batch fetch endpoints for items and review histories.
+"""
+from sqlalchemy import event
+
+from app.database import engine
+
+
+def test_batch_get_items_keeps_request_order_and_lists_missing(client, create_item):
+    first, second, deleted = (create_item(title=f"t{index}") for index in range(3))
+    client.delete(f"/api/v1/learning-items/{deleted['id']}")
+    response = client.post("/api/v1/learning-items/batch-get", json={"ids": [second["id"], "nope", first["id"], deleted["id"]]})
+    assert response.status_code == 200
+    body = response.json()
+    assert [item["id"] for item in body["items"]] == [second["id"], first["id"]]
+    assert sorted(body["missing"]) == sorted(["nope", deleted["id"]])
+
+
+def test_batch_get_rejects_too_many_ids(client):
+    assert client.post("/api/v1/learning-items/batch-get", json={"ids": ["x"] * 501}).status_code == 422
+
+
+def test_history_batch_limits_reviews_per_item(client, create_item):
+    reviewed, unreviewed = create_item(title="a"), create_item(title="b")
+    for _ in range(3):
+        assert client.post(f"/api/v1/reviews/{reviewed['id']}/manual").status_code == 201
+    body = client.post(
+        "/api/v1/reviews/history/batch",
+        json={"item_ids": [reviewed["id"], unreviewed["id"], "nope"], "limit": 2}
+    ).json()
+    assert [review["review_number"] for review in body["histories"][reviewed["id"]]] == [3, 2]
+    assert body["histories"][unreviewed["id"]] == []
+    assert body["missing"] == ["nope"]
+
+
+def test_batch_get_query_count_does_not_grow_with_ids(client, create_item):
+    ids = [create_item(title=f"t{index}")["id"] for index in range(20)]
+    statements = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", count)
+    try:
+        client.post("/api/v1/learning-items/batch-get", json={"ids": ids[:2]})
+        few = len(statements)
+        statements.clear()
+        client.post("/api/v1/learning-items/batch-get", json={"ids": ids})
+        assert len(statements) == few
+    finally:
+        event.remove(engine, "before_cursor_execute", count)
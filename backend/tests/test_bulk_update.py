@@ -0,0 +1,73 @@
+"""
+Set-based bulk updates: move subjects, shift schedules, reset progress.
+"""
+from datetime import date, timedelta
+
+ITEMS = "/api/v1/learning-items/"
+BULK = "/api/v1/learning-items/bulk"
+
+
+def bulk(client, **body):
+    return client.patch(BULK, json=body)
+
+
+def due(client):
+    return client.get("/api/v1/reviews/due").json()
+
+
+def test_move_items_to_another_subject(client, create_item):
+    items = [create_item(subject="a", title=f"t{index}") for index in range(3)]
+    create_item(subject="b")
+
+    assert bulk(client, filter={"subject": "a"}, set_subject="c").json() == {"updated": 3}
+    assert {client.get(f"{ITEMS}{item['id']}").json()["subject"] for item in items} == {"c"}
+    assert client.get(f"{ITEMS}subjects").json() == ["b", "c"]
+    assert due(client)["by_subject"] == {"b": 1, "c": 3}
+
+
+def test_shift_selected_items(client, create_item):
+    items = [create_item(title=f"t{index}") for index in range(3)]
+    ids = [item["id"] for item in items[:2]]
+
+    assert bulk(client, filter={"ids": ids}, shift_days=7).json() == {"updated": 2}
+    week = (date.today() + timedelta(days=7)).isoformat()
+    assert [client.get(f"{ITEMS}{item_id}").json()["next_review_date"] for item_id in ids] == [week, week]
+    assert [item["id"] for item in due(client)["items"]] == [items[2]["id"]]
+
+
+def test_due_range_filter(client, create_item):
+    early, late = create_item(title="early"), create_item(title="late")
+    bulk(client, filter={"ids": [late["id"]]}, shift_days=10)
+    today = date.today()
+
+    response = bulk(client, filter={"due_from": (today + timedelta(days=5)).isoformat()}, shift_days=-10)
+    assert response.json() == {"updated": 1}
+    assert client.get(f"{ITEMS}{late['id']}").json()["next_review_date"] == today.isoformat()
+    assert client.get(f"{ITEMS}{early['id']}").json()["next_review_date"] == today.isoformat()
+
+
+def test_reset_progress(client, create_item):
+    item = create_item()
+    client.post(f"/api/v1/reviews/{item['id']}")
+    assert due(client)["total_due"] == 0
+
+    assert bulk(client, filter={"ids": [item["id"]]}, reset_progress=True).json() == {"updated": 1}
+    reset = client.get(f"{ITEMS}{item['id']}").json()
+    assert (reset["review_count"], reset["next_review_date"]) == (0, date.today().isoformat())
+    assert due(client)["total_due"] == 1
+
+
+def test_deleted_items_and_unknown_subjects_are_not_changed(client, create_item):
+    deleted = create_item(subject="a")
+    client.delete(f"{ITEMS}{deleted['id']}")
+    assert bulk(client, filter={"subject": "a"}, shift_days=1).json() == {"updated": 0}
+    assert bulk(client, filter={"subject": "missing"}, shift_days=1).json() == {"updated": 0}
+
+
+def test_empty_or_inconsistent_requests_are_rejected(client):
+    today = date.today()
+    assert bulk(client, filter={"subject": "a"}).status_code == 400
+    assert bulk(client, filter={}, shift_days=1).status_code == 400
+    reversed_range = {"due_from": today.isoformat(), "due_to": (today - timedelta(days=1)).isoformat()}
+    assert bulk(client, filter=reversed_range, shift_days=1).status_code == 400
+    assert bulk(client, filter={"ids": []}, shift_days=1).status_code == 422
@@ -0,0 +1,96 @@
+"""
+Hot/cold tiering: content of items not due for a while lives in cold_item_contents.
+"""
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import text
+
+from app.repositories.due_queue_repository import DueQueueRepository
+from app.repositories.item_tier_repository import ItemTierRepository
+from app.services.learning_item_service import LearningItemService
+
+ITEMS = "/api/v1/learning-items/"
+
+
+def content(index):
+    return (f"content number {index} " * 20).strip()
+
+
+def stored(db, item_id):
+    return db.execute(
+        text("SELECT is_cold, content, updated_at FROM learning_items WHERE id = :id"), {"id": item_id}
+    ).one()
+
+
+def cold_rows(db):
+    return db.execute(text("SELECT COUNT(*) FROM cold_item_contents")).scalar()
+
+
+@pytest.fixture
+def tiered(create_item, db):
+    """
+    Six items, the first four demoted: items 0-3 have a long interval and are
+    due after the queue horizon, item 4 is due soon and item 5 has a short interval.
+    """
+    ids = [create_item(title=f"t{index}", content=content(index))["id"] for index in range(6)]
+    today = date.today()
+    move = text("UPDATE learning_items SET current_interval_days = 30, next_review_date = :due WHERE id = :id")
+    for item_id in ids[:4]:
+        db.execute(move, {"due": today + timedelta(days=20), "id": item_id})
+    db.execute(move, {"due": today + timedelta(days=3), "id": ids[4]})
+    db.commit()
+
+    queue = DueQueueRepository(db)
+    horizon = queue.rebuild().horizon_end
+    tiers = ItemTierRepository(db)
+    demoted = tiers.demote(7, horizon, limit=2)
+    demoted += tiers.demote(7, horizon, after_id=demoted[-1])
+    assert sorted(demoted) == sorted(ids[:4])
+    return ids
+
+
+def test_demoted_items_move_their_content(db, tiered):
+    assert ItemTierRepository(db).get_counts() == {"hot": 2, "cold": 4}
+    assert stored(db, tiered[0]).content == ""
+    assert stored(db, tiered[5]).content == content(5)
+    assert cold_rows(db) == 4
+
+
+def test_list_and_batch_reads_include_cold_content(client, tiered):
+    client.cookies.clear()
+    listed = {item["id"]: item["content"] for item in client.get(ITEMS).json()["items"]}
+    batch = {item["id"]: item["content"] for item in client.post(f"{ITEMS}batch-get", json={"ids": tiered}).json()["items"]}
+    for index, item_id in enumerate(tiered):
+        assert listed[item_id] == batch[item_id] == content(index)
+
+
+def test_due_reads_past_the_horizon_include_cold_content(db, tiered):
+    far = LearningItemService(db).get_due_items(target_date=date.today() + timedelta(days=25))
+    assert {item.id for item in far} == set(tiered)
+    assert all(item.content.startswith("content number") for item in far)
+
+
+def test_reading_a_cold_item_promotes_it_without_touching_updated_at(client, db, tiered):
+    before = stored(db, tiered[1])
+    assert client.get(f"{ITEMS}{tiered[1]}").json()["content"] == content(1)
+    after = stored(db, tiered[1])
+    assert not after.is_cold
+    assert after.content == content(1)
+    assert after.updated_at == before.updated_at
+    assert cold_rows(db) == 3
+
+
+def test_updating_a_cold_item(client, db, tiered):
+    assert client.put(f"{ITEMS}{tiered[2]}", json={"content": "brand new"}).json()["content"] == "brand new"
+    assert stored(db, tiered[2]).content == "brand new"
+    assert cold_rows(db) == 3
+
+
+def test_roll_over_promotes_items_entering_the_window(db, tiered):
+    db.execute(text("UPDATE learning_items SET next_review_date = :due WHERE id = :id"),
+               {"due": date.today() + timedelta(days=2), "id": tiered[3]})
+    db.execute(text("UPDATE due_queue_state SET horizon_end = :today"), {"today": date.today()})
+    db.commit()
+    DueQueueRepository(db).ensure_current()
+    assert ItemTierRepository(db).get_counts() == {"hot": 3, "cold": 3}
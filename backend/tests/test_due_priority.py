@@ -0,0 +1,63 @@
+"""
+Priority due order: subject weight * days overdue / interval, from the queue and the live query.
+"""
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import text
+
+from app.repositories.due_queue_repository import DueQueueRepository
+
+DUE = "/api/v1/reviews/due"
+
+
+@pytest.fixture
+def overdue(create_item, db):
+    """
+    (interval, days overdue) -> priority: a (10, 5) 0.5, b (1, 3) 3, c (4, 4) 1,
+    d (0, 0) 0 with the interval taken as one day; e is due next week.
+    """
+    schedule = {"a": (10, 5), "b": (1, 3), "c": (4, 4), "d": (0, 0), "e": (7, -7)}
+    ids = {title: create_item(subject="heavy" if title == "a" else "light", title=title)["id"] for title in schedule}
+    for title, (interval, days_overdue) in schedule.items():
+        db.execute(
+            text("UPDATE learning_items SET current_interval_days = :interval, next_review_date = :due WHERE id = :id"),
+            {"interval": interval, "due": date.today() - timedelta(days=days_overdue), "id": ids[title]}
+        )
+    db.commit()
+    DueQueueRepository(db).rebuild()
+    return ids
+
+
+def titles(response):
+    return [item["title"] for item in response.json()["items"]]
+
+
+def test_due_order_is_by_date_and_priority_by_overdueness(client, overdue):
+    assert titles(client.get(DUE)) == ["a", "c", "b", "d"]
+    assert titles(client.get(DUE, params={"order": "priority"})) == ["b", "c", "a", "d"]
+    assert titles(client.get(DUE, params={"order": "priority", "limit": 2})) == ["b", "c"]
+    assert titles(client.get(DUE, params={"order": "priority", "subject": "light"})) == ["b", "c", "d"]
+
+
+def test_live_query_past_the_horizon_ranks_the_same(client, overdue, db):
+    horizon = DueQueueRepository(db).ensure_current().horizon_end
+    far = {"order": "priority", "target_date": (horizon + timedelta(days=1)).isoformat()}
+    # e isn't overdue today, so it ranks with d
+    assert titles(client.get(DUE, params=far))[:3] == ["b", "c", "a"]
+
+
+def test_subject_weight_reranks_queued_items(client, overdue):
+    response = client.patch("/api/v1/learning-items/subjects/heavy", json={"priority_weight": 10})
+    assert response.json()["priority_weight"] == 10
+    assert titles(client.get(DUE, params={"order": "priority"})) == ["a", "b", "c", "d"]
+    assert client.patch("/api/v1/learning-items/subjects/missing", json={"priority_weight": 2}).status_code == 404
+
+
+def test_session_leases_in_priority_order(client, overdue):
+    session = client.get("/api/v1/reviews/session/next", params={"n": 2, "order": "priority"}).json()
+    assert [item["title"] for item in session["items"]] == ["b", "c"]
+
+
+def test_unknown_order_is_rejected(client):
+    assert client.get(DUE, params={"order": "random"}).status_code == 400
@@ -0,0 +1,83 @@
+"""
+Materialized due queue: kept in sync on write, rolled over daily, rebuilt on demand.
+"""
+from datetime import date, timedelta
+
+from sqlalchemy import text
+
+from app.models.due_queue import DueQueueState
+from app.repositories.due_queue_repository import STATE_ROW_ID, DueQueueRepository
+
+
+def test_writes_keep_queue_in_sync(client, db, create_item):
+    items = [create_item(subject=subject) for subject in ("Math", "Math", "Art")]
+    due = client.get("/api/v1/reviews/due").json()
+    assert due["total_due"] == 3
+    assert due["by_subject"] == {"Math": 2, "Art": 1}
+
+    assert client.post(f"/api/v1/reviews/{items[0]['id']}").status_code == 201
+    assert client.put(f"/api/v1/learning-items/{items[1]['id']}", json={"subject": "Art"}).status_code == 200
+    assert client.delete(f"/api/v1/learning-items/{items[2]['id']}").status_code == 204
+
+    due = client.get("/api/v1/reviews/due").json()
+    assert [item["id"] for item in due["items"]] == [items[1]["id"]]
+    assert due["by_subject"] == {"Art": 1}
+    assert DueQueueRepository(db).verify() == {"missing": [], "stale": [], "extra": [], "uninitialized": False}
+
+
+def test_due_limit_returns_next_items(client, create_item):
+    for index in range(3):
+        create_item(title=f"Item {index}")
+    due = client.get("/api/v1/reviews/due", params={"limit": 2}).json()
+    assert len(due["items"]) == 2
+    assert due["total_due"] == 3
+
+
+def test_dates_past_horizon_read_live_table(client, db, create_item):
+    item = create_item()
+    far = date.today() + timedelta(days=30)
+    db.execute(text("UPDATE learning_items SET next_review_date = :due"), {"due": far})
+    db.commit()
+    due = client.get("/api/v1/reviews/due", params={"target_date": str(far)}).json()
+    assert [entry["id"] for entry in due["items"]] == [item["id"]]
+
+
+def test_roll_over_pulls_in_items_entering_window(db, create_item):
+    item = create_item()
+    repo = DueQueueRepository(db)
+    today = date.today()
+    repo.ensure_current(today)
+    # As if the last roll-over was three days ago, and the item is due just inside today's window
+    db.execute(text("UPDATE learning_items SET next_review_date = :due"), {"due": today + timedelta(days=6)})
+    db.execute(text("DELETE FROM due_queue"))
+    db.execute(text("UPDATE due_queue_state SET horizon_end = :end"), {"end": today + timedelta(days=4)})
+    db.commit()
+
+    state = repo.ensure_current(today)
+    assert state.horizon_end == repo.horizon_for(today)
+    assert [entry.id for entry in repo.get_due_items(today + timedelta(days=6), None, None, "due")] == [item["id"]]
+    assert repo.verify()["missing"] == []
+
+
+def test_concurrent_rebuild_keeps_winner_state(db, create_item):
+    create_item()
+    db.execute(text("DELETE FROM due_queue_state"))
+    db.commit()
+    # Another worker rebuilds first; this session still saw no state row
+    from app.database import SessionLocal
+    with SessionLocal() as other:
+        DueQueueRepository(other).rebuild(date.today())
+
+    real_get = db.get
+    seen = []
+
+    def stale_get(model, ident, **kwargs):
+        if model is DueQueueState and not seen:
+            seen.append(ident)
+            return None
+        return real_get(model, ident, **kwargs)
+
+    db.get = stale_get
+    state = DueQueueRepository(db).rebuild(date.today())
+    assert seen == [STATE_ROW_ID]
+    assert state is not None and state.horizon_end == DueQueueRepository.horizon_for(date.today())
@@ -0,0 +1,76 @@
+"""
+Idempotency-Key replay: off by default, stored responses replayed when enabled.
+"""
+import pytest
+from fastapi.testclient import TestClient
+
+from app.config import Settings
+from app.core.idempotency import IdempotencyMiddleware, request_hash, request_key
+from app.main import app
+from app.services.idempotency_store import IdempotencyStore
+
+ITEMS = "/api/v1/learning-items/"
+
+
+@pytest.fixture
+def store():
+    return IdempotencyStore(cache_size=100)
+
+
+@pytest.fixture
+def keyed(store):
+    return TestClient(IdempotencyMiddleware(app, store=store))
+
+
+def review_count(client, item_id):
+    return client.get(f"{ITEMS}{item_id}").json()["review_count"]
+
+
+def test_disabled_by_default(client, create_item):
+    assert Settings.model_fields["IDEMPOTENCY_ENABLED"].default is False
+    item = create_item()
+    for _ in range(2):
+        client.post(f"/api/v1/reviews/{item['id']}", headers={"Idempotency-Key": "k1"})
+    assert review_count(client, item["id"]) == 2
+
+
+def test_repeats_get_the_stored_response(keyed, create_item):
+    item = create_item()
+    first = keyed.post(f"/api/v1/reviews/{item['id']}", headers={"Idempotency-Key": "k1"})
+    repeat = keyed.post(f"/api/v1/reviews/{item['id']}", headers={"Idempotency-Key": "k1"})
+
+    assert repeat.status_code == first.status_code == 201
+    assert repeat.json() == first.json()
+    assert repeat.headers["Idempotent-Replayed"] == "true"
+    assert "Idempotent-Replayed" not in first.headers
+    assert review_count(keyed, item["id"]) == 1
+
+
+def test_repeats_are_replayed_from_the_table_after_a_restart(keyed, create_item):
+    headers = {"Idempotency-Key": "k2"}
+    created = keyed.post(ITEMS, json={"subject": "s", "title": "t", "content": "c"}, headers=headers).json()
+    restarted = TestClient(IdempotencyMiddleware(app, store=IdempotencyStore()))
+    repeat = restarted.post(ITEMS, json={"subject": "s", "title": "t", "content": "c"}, headers=headers)
+    assert repeat.json()["id"] == created["id"]
+    assert keyed.get(ITEMS).json()["total"] == 1
+
+
+def test_a_key_reused_for_another_body_is_rejected(keyed):
+    headers = {"Idempotency-Key": "k3"}
+    keyed.post(ITEMS, json={"subject": "s", "title": "t", "content": "c"}, headers=headers)
+    assert keyed.post(ITEMS, json={"subject": "s", "title": "other", "content": "c"}, headers=headers).status_code == 400
+
+
+def test_a_key_still_running_gets_409(keyed, store, create_item):
+    path = f"/api/v1/reviews/{create_item()['id']}"
+    assert store.begin(None, request_key(None, "POST", path, "k4"), request_hash(b"", b"")) is None
+    assert keyed.post(path, headers={"Idempotency-Key": "k4"}).status_code == 409
+
+
+def test_keys_are_per_route(keyed, create_item):
+    item = create_item()
+    headers = {"Idempotency-Key": "k5"}
+    assert keyed.post("/api/v1/reviews/missing", headers=headers).status_code == 404
+    keyed.post(f"/api/v1/reviews/{item['id']}", headers=headers)
+    assert review_count(keyed, item["id"]) == 1
+    assert keyed.post(ITEMS, json={"subject": "s", "title": "t", "content": "c"}, headers=headers).status_code == 201
@@ -0,0 +1,85 @@
+"""
+Primary key generation (uuid4/uuid7) and native UUID storage (CompactUUID).
+"""
+import time
+import uuid
+
+from sqlalchemy import Column, MetaData, Table, create_engine, select, text
+
+from app.migrations.native_ids import convert_ids_to_native
+from app.models.types import CompactUUID, generate_id, uuid7
+
+
+def test_uuid7_sets_version_variant_and_timestamp():
+    before = time.time_ns() // 1_000_000
+    value = uuid7()
+    after = time.time_ns() // 1_000_000
+    assert value.version == 7
+    assert value.variant == uuid.RFC_4122
+    assert before <= value.int >> 80 <= after
+
+
+def test_uuid7_keys_sort_by_creation_time():
+    keys = []
+    for _ in range(3):
+        keys.append(str(uuid7()))
+        time.sleep(0.002)
+    assert keys == sorted(keys)
+
+
+def test_generate_id_follows_id_scheme(settings, monkeypatch):
+    monkeypatch.setattr(settings, "ID_SCHEME", "uuid7")
+    assert uuid.UUID(generate_id()).version == 7
+    monkeypatch.setattr(settings, "ID_SCHEME", "uuid4")
+    assert uuid.UUID(generate_id()).version == 4
+
+
+def compact_table():
+    metadata = MetaData()
+    table = Table("things", metadata, Column("id", CompactUUID(), primary_key=True))
+    engine = create_engine("sqlite://")
+    metadata.create_all(engine)
+    return engine, table
+
+
+def test_compact_uuid_stores_16_bytes_and_reads_strings():
+    engine, table = compact_table()
+    key = str(uuid7())
+    with engine.begin() as conn:
+        conn.execute(table.insert().values(id=key))
+        assert conn.execute(text("SELECT typeof(id), length(id) FROM things")).one() == ("blob", 16)
+        assert conn.execute(select(table.c.id).where(table.c.id == key)).scalar() == key
+        # Uppercase and hyphen-less forms address the same row
+        assert conn.execute(select(table.c.id).where(table.c.id == key.upper().replace("-", ""))).scalar() == key
+
+
+def test_compact_uuid_treats_non_uuids_as_no_match():
+    engine, table = compact_table()
+    with engine.begin() as conn:
+        conn.execute(table.insert().values(id=str(uuid.uuid4())))
+        assert conn.execute(select(table.c.id).where(table.c.id == "not-a-uuid")).all() == []
+
+
+def test_text_ids_are_converted_to_blobs_in_place(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path}/ids.db")
+    item_id, review_id = str(uuid.uuid4()), str(uuid.uuid4())
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE learning_items (id VARCHAR(36) PRIMARY KEY)"))
+        conn.execute(text("CREATE TABLE review_history (id VARCHAR(36) PRIMARY KEY, learning_item_id VARCHAR(36))"))
+        conn.execute(text("INSERT INTO learning_items VALUES (:id)"), {"id": item_id})
+        conn.execute(text("INSERT INTO review_history VALUES (:id, :item)"), {"id": review_id, "item": item_id})
+
+    assert convert_ids_to_native(engine, batch_size=1, echo=lambda message: None)
+
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT typeof(id), typeof(learning_item_id) FROM review_history")).one() == (
+            "blob", "blob"
+        )
+        history = Table(
+            "review_history", MetaData(),
+            Column("id", CompactUUID(), primary_key=True),
+            Column("learning_item_id", CompactUUID())
+        )
+        assert conn.execute(select(history).where(history.c.learning_item_id == item_id)).one() == (review_id, item_id)
+    # Running it again finds nothing left to convert
+    assert convert_ids_to_native(engine, echo=lambda message: None)
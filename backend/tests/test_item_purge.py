@@ -0,0 +1,77 @@
+"""
+Batched purge of soft-deleted items and their history.
+"""
+import argparse
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import text
+
+import manage
+from app.repositories.cache_version_repository import CacheVersionRepository
+from app.services.item_purge_service import ItemPurgeService
+from app.services.learning_item_service import review_activity_cache
+from app.services.review_analytics_service import adherence_cache
+
+ITEMS = "/api/v1/learning-items/"
+
+
+@pytest.fixture
+def deleted(client, create_item, db):
+    """Five items with one review each: three deleted 40 days ago, one today, one live."""
+    ids = [create_item(title=f"t{index}")["id"] for index in range(5)]
+    for item_id in ids:
+        client.post(f"/api/v1/reviews/{item_id}")
+    for item_id in ids[:4]:
+        client.delete(f"{ITEMS}{item_id}")
+    db.execute(
+        text("UPDATE learning_items SET deleted_at = :when WHERE id IN (:a, :b, :c)"),
+        {"when": datetime.now(timezone.utc) - timedelta(days=40), "a": ids[0], "b": ids[1], "c": ids[2]}
+    )
+    db.commit()
+    return ids
+
+
+def count(db, table):
+    return db.execute(text(f"SELECT COUNT(*) FROM {table}")).scalar()
+
+
+def test_purge_removes_expired_items_in_batches(db, deleted):
+    log = []
+    result = ItemPurgeService(db).purge_deleted(retention_days=30, batch_size=2, echo=log.append)
+
+    assert result == {"items_purged": 3, "reviews_purged": 3, "remaining": 0, "complete": True}
+    assert len(log) == 2 and log[-1].startswith("purge: 3/3 items, 3 reviews")
+    remaining = set(db.execute(text("SELECT id FROM learning_items")).scalars())
+    assert remaining == set(deleted[3:])
+    assert count(db, "review_history") == 2
+    assert count(db, "due_queue") == 1
+
+
+def test_purge_stops_when_the_time_budget_is_used_up(db, deleted):
+    result = ItemPurgeService(db).purge_deleted(retention_days=30, batch_size=1, time_budget=0, echo=lambda _: None)
+    assert result == {"items_purged": 0, "reviews_purged": 0, "remaining": 3, "complete": False}
+
+
+def test_purge_invalidates_the_history_caches(db, deleted):
+    repo = CacheVersionRepository(db)
+    before = repo.get(review_activity_cache.name), repo.get(adherence_cache.name)
+    ItemPurgeService(db).purge_deleted(retention_days=30, batch_size=10, echo=lambda _: None)
+    assert (repo.get(review_activity_cache.name), repo.get(adherence_cache.name)) == (before[0] + 1, before[1] + 1)
+
+
+def test_admin_endpoint_purges_and_analyzes(client, db, deleted, settings, monkeypatch):
+    monkeypatch.setattr(settings, "ADMIN_TOKEN", "secret")
+    response = client.post(
+        "/api/v1/admin/purge", params={"retention_days": 0, "analyze": True}, headers={"X-Admin-Token": "secret"}
+    ).json()
+    assert response["items_purged"] == 4 and response["complete"]
+    assert response["log"][-1].startswith("ANALYZE:")
+    assert count(db, "learning_items") == 1
+
+
+def test_cli_purges_with_the_configured_retention(db, deleted, settings, monkeypatch):
+    monkeypatch.setattr(settings, "PURGE_RETENTION_DAYS", 30)
+    args = argparse.Namespace(retention_days=None, batch_size=None, time_budget=None, vacuum=False, analyze=False)
+    assert manage.items_purge(args) == 0
+    assert count(db, "learning_items") == 2
@@ -0,0 +1,114 @@
+"""
+Versioned migrations: bookkeeping, resumable backfills and idempotent DDL.
+"""
+import types
+
+import pytest
+from sqlalchemy import Column, Integer, create_engine, inspect, text
+
+from app.migrations import runner
+from app.migrations.context import MigrationContext, MigrationPaused
+from app.migrations.runner import Migration, get_status, load_migrations, upgrade
+
+
+def quiet(message):
+    pass
+
+
+@pytest.fixture
+def scratch(tmp_path):
+    """A pre-existing database with a learning_items table and 5 rows."""
+    engine = create_engine(f"sqlite:///{tmp_path}/scratch.db")
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE learning_items (id INTEGER PRIMARY KEY, value INTEGER)"))
+        conn.execute(text("INSERT INTO learning_items (value) VALUES (0), (0), (0), (0), (0)"))
+    yield engine
+    engine.dispose()
+
+
+def values(engine):
+    with engine.connect() as conn:
+        return conn.execute(text("SELECT value FROM learning_items ORDER BY id")).scalars().all()
+
+
+def migration(version, upgrade_fn):
+    module = types.ModuleType(f"app.migrations.versions.v{version:04d}_test")
+    module.VERSION = version
+    module.__doc__ = f"Test migration {version}."
+    module.upgrade = upgrade_fn
+    return Migration(module)
+
+
+def test_shipped_migrations_are_ordered_and_named_by_version():
+    migrations = load_migrations()
+    assert [m.version for m in migrations] == list(range(1, len(migrations) + 1))
+    for m in migrations:
+        assert m.name.startswith(f"v{m.version:04d}_")
+        assert m.description
+
+
+def test_fresh_database_is_created_and_stamped(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path}/fresh.db")
+    created = []
+
+    def create_all():
+        with engine.begin() as conn:
+            conn.execute(text("CREATE TABLE learning_items (id INTEGER PRIMARY KEY)"))
+        created.append(True)
+
+    assert upgrade(engine, create_all=create_all, echo=quiet) == {"applied": [], "complete": True}
+    assert created == [True]
+    status = get_status(engine)
+    assert status["pending"] == []
+    assert len(status["applied"]) == len(load_migrations())
+
+
+def test_pending_migrations_run_once_in_order(scratch, monkeypatch):
+    runs = []
+    migrations = [migration(2, lambda ctx: runs.append(2)), migration(1, lambda ctx: runs.append(1))]
+    monkeypatch.setattr(runner, "load_migrations", lambda: sorted(migrations, key=lambda m: m.version))
+
+    result = upgrade(scratch, echo=quiet)
+    assert result == {"applied": ["v0001_test", "v0002_test"], "complete": True}
+    assert upgrade(scratch, echo=quiet) == {"applied": [], "complete": True}
+    assert runs == [1, 2]
+
+
+def test_paused_backfill_resumes_after_its_last_chunk(scratch, monkeypatch):
+    budget = {"chunks": 2}
+
+    def backfill(ctx):
+        ctx.backfill("bump", "learning_items", "value = value + 1")
+
+    def check_budget(self):
+        if budget["chunks"] == 0:
+            raise MigrationPaused()
+        budget["chunks"] -= 1
+
+    monkeypatch.setattr(runner, "load_migrations", lambda: [migration(1, backfill)])
+    monkeypatch.setattr(MigrationContext, "check_budget", check_budget)
+
+    assert upgrade(scratch, batch_size=2, echo=quiet) == {"applied": [], "complete": False}
+    assert values(scratch) == [1, 1, 1, 1, 0]
+    backfills = get_status(scratch)["pending"][0]["backfills"]
+    assert backfills == [{"step": "bump", "rows_done": 4, "done": False}]
+
+    budget["chunks"] = 10
+    assert upgrade(scratch, batch_size=2, echo=quiet)["complete"]
+    # Every row updated exactly once across both runs
+    assert values(scratch) == [1, 1, 1, 1, 1]
+    assert get_status(scratch)["pending"] == []
+
+
+def test_ddl_helpers_can_be_repeated(scratch):
+    ctx = MigrationContext(scratch, 1, echo=quiet)
+    for _ in range(2):
+        ctx.add_column("learning_items", Column("extra", Integer, nullable=False, server_default="0"))
+        ctx.create_index("ix_learning_items_extra", "learning_items", "extra")
+    assert ctx.has_column("learning_items", "extra")
+    assert ctx.has_index("learning_items", "ix_learning_items_extra")
+
+    ctx.drop_index("ix_learning_items_extra")
+    ctx.drop_column("learning_items", "extra")
+    ctx.drop_column("learning_items", "extra")
+    assert [column["name"] for column in inspect(scratch).get_columns("learning_items")] == ["id", "value"]
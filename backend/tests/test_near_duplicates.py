@@ -0,0 +1,88 @@
+"""
+Near-duplicate detection: MinHash signatures, LSH bands and the index rebuild.
+"""
+import argparse
+
+import numpy as np
+from sqlalchemy import text
+
+import manage
+from app.core import minhash
+from app.repositories.item_signature_repository import ItemSignatureRepository
+
+ITEMS = "/api/v1/learning-items/"
+TEXT = (
+    "Plants convert light energy into chemical energy stored in glucose, "
+    "using water and carbon dioxide from the air."
+)
+
+
+def test_signature_ignores_case_and_punctuation():
+    first = minhash.signature("Photosynthesis", TEXT)
+    second = minhash.signature("photosynthesis!", TEXT.upper())
+    assert first.shape == (minhash.NUM_PERM,)
+    assert np.array_equal(first, second)
+    assert minhash.band_keys(first) == minhash.band_keys(second)
+    assert len(minhash.band_keys(first)) == minhash.BANDS
+
+
+def test_similarity_estimates_jaccard():
+    base = minhash.signature("t", TEXT)
+    near = minhash.signature("t", TEXT.replace("carbon dioxide", "CO2"))
+    far = minhash.signature("t", "The powerhouse of the cell produces ATP by oxidative phosphorylation.")
+    scores = minhash.similarities(base, np.stack([base, near, far]))
+    assert scores[0] == 1.0
+    assert 0.3 < scores[1] < 1.0
+    assert scores[2] < 0.1
+
+
+def test_signature_bytes_round_trip():
+    sig = minhash.signature("t", TEXT)
+    assert np.array_equal(minhash.from_bytes(minhash.to_bytes(sig)), sig)
+
+
+def test_create_reports_duplicates_and_similar_lists_them(client, create_item):
+    original = create_item(subject="bio", title="Photosynthesis", content=TEXT)
+    assert original["duplicates"] == []
+    assert create_item(title="Mitochondria", content="The powerhouse of the cell produces ATP.")["duplicates"] == []
+
+    copy = create_item(subject="bio2", title="Photosynthesis!", content=TEXT.upper())
+    assert [(d["id"], d["similarity"], d["subject"]) for d in copy["duplicates"]] == [(original["id"], 1.0, "bio")]
+    similar = client.get(f"{ITEMS}{original['id']}/similar").json()["similar"]
+    assert [d["id"] for d in similar] == [copy["id"]]
+
+
+def test_index_follows_updates_and_deletes(client, create_item):
+    original = create_item(title="Photosynthesis", content=TEXT)
+    copy = create_item(title="Photosynthesis", content=TEXT)
+    near = create_item(title="Photosynthesis", content=TEXT.replace("carbon dioxide", "CO2"))
+
+    def similar_ids():
+        response = client.get(f"{ITEMS}{original['id']}/similar", params={"min_similarity": 0.3})
+        return {d["id"] for d in response.json()["similar"]}
+
+    assert similar_ids() == {copy["id"], near["id"]}
+    client.put(f"{ITEMS}{copy['id']}", json={"content": "Completely different text about volcanoes."})
+    assert similar_ids() == {near["id"]}
+    client.delete(f"{ITEMS}{near['id']}")
+    assert similar_ids() == set()
+
+
+def test_similar_validates_input(client, create_item):
+    item = create_item()
+    assert client.get(f"{ITEMS}missing/similar").status_code == 404
+    assert client.get(f"{ITEMS}{item['id']}/similar", params={"min_similarity": 2}).status_code == 422
+
+
+def test_rebuild_indexes_live_items_and_drops_stale_rows(client, create_item, db):
+    items = [create_item(title=f"t{index}", content=f"some content number {index} here") for index in range(5)]
+    client.delete(f"{ITEMS}{items[0]['id']}")
+    ItemSignatureRepository(db).replace(items[0]["id"], b"\0" * 512, [1, 2])
+    db.execute(text("DELETE FROM item_signatures WHERE learning_item_id = :id"), {"id": items[1]["id"]})
+    db.commit()
+
+    assert manage.duplicates_rebuild(argparse.Namespace(batch_size=2)) == 0
+    indexed = set(db.execute(text("SELECT learning_item_id FROM item_signatures")).scalars())
+    assert indexed == {item["id"] for item in items[1:]}
+    bands = db.execute(text("SELECT COUNT(DISTINCT learning_item_id) FROM item_signature_bands")).scalar()
+    assert bands == 4
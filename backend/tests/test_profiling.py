@@ -0,0 +1,101 @@
+"""
+Request profiling: signed tokens, the middleware and the admin endpoints.
+"""
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.profiling import (
+    ProfileStore,
+    ProfilingMiddleware,
+    RequestProfile,
+    install_sql_capture,
+    profile_store,
+    sign_profile_token,
+    verify_profile_token,
+)
+from app.database import engine
+from app.main import app
+
+ADMIN = {"X-Admin-Token": "secret"}
+
+
+@pytest.fixture(scope="module", autouse=True)
+def sql_capture():
+    # Listeners stay on the engine; they only act inside a profiled request
+    install_sql_capture(engine)
+
+
+@pytest.fixture
+def profiled(settings, monkeypatch):
+    monkeypatch.setattr(settings, "ADMIN_TOKEN", "secret")
+    profile_store.clear()
+    yield TestClient(ProfilingMiddleware(app, secret="secret", interval_ms=1))
+    profile_store.clear()
+
+
+def token(expires_in=60, secret="secret"):
+    return {"X-Profile-Token": sign_profile_token(secret, int(time.time()) + expires_in)}
+
+
+def test_token_verification():
+    valid = sign_profile_token("secret", int(time.time()) + 60)
+    assert verify_profile_token("secret", valid)
+    assert not verify_profile_token("other", valid)
+    assert not verify_profile_token("", valid)
+    assert not verify_profile_token("secret", sign_profile_token("secret", int(time.time()) - 1))
+    assert not verify_profile_token("secret", "garbage")
+    assert not verify_profile_token("secret", "²:" + valid.partition(":")[2])
+
+
+def test_requests_are_profiled_only_with_a_valid_token(profiled, create_item):
+    create_item()
+    assert "x-profile-id" not in profiled.get("/api/v1/reviews/stats").headers
+    assert "x-profile-id" not in profiled.get("/api/v1/reviews/stats", headers=token(secret="wrong")).headers
+
+    response = profiled.get("/api/v1/reviews/stats", headers=token())
+    profile = profile_store.get(response.headers["x-profile-id"])
+    assert profile.trigger == "token"
+    assert profile.status_code == 200
+    assert profile.path == "/api/v1/reviews/stats"
+    assert profile.statements and all("statement" in s and s["duration_ms"] >= 0 for s in profile.statements)
+    assert len(profile_store.list()) == 1
+
+
+def test_sampled_requests_are_profiled():
+    client = TestClient(ProfilingMiddleware(app, sample_rate=1.0, store=ProfileStore()))
+    middleware = client.app
+    response = client.get("/health")
+    assert middleware.store.get(response.headers["x-profile-id"]).trigger == "sampled"
+
+
+def test_store_keeps_the_newest_profiles():
+    store = ProfileStore(max_profiles=2)
+    profiles = [RequestProfile("GET", f"/{index}", "token") for index in range(3)]
+    for profile in profiles:
+        store.add(profile)
+    assert [p.path for p in store.list()] == ["/2", "/1"]
+    assert store.get(profiles[0].id) is None
+
+
+def test_admin_endpoints_serve_profiles(profiled, create_item):
+    create_item()
+    profile_id = profiled.get("/api/v1/reviews/due", headers=token()).headers["x-profile-id"]
+
+    listed = profiled.get("/api/v1/admin/profiles", headers=ADMIN).json()
+    assert [p["id"] for p in listed] == [profile_id]
+    assert listed[0]["sql_count"] > 0
+
+    detail = profiled.get(f"/api/v1/admin/profiles/{profile_id}", headers=ADMIN).json()
+    assert detail["sql"][0]["statement"]
+    assert profiled.get(f"/api/v1/admin/profiles/{profile_id}/collapsed", headers=ADMIN).status_code == 200
+    assert profiled.get("/api/v1/admin/profiles/missing", headers=ADMIN).status_code == 404
+
+
+def test_minted_token_is_accepted(profiled):
+    minted = profiled.post("/api/v1/admin/profiles/token", params={"ttl_seconds": 60}, headers=ADMIN).json()
+    assert minted["header"] == "X-Profile-Token"
+    assert verify_profile_token("secret", minted["value"])
+    response = profiled.get("/health", headers={minted["header"]: minted["value"]})
+    assert "x-profile-id" in response.headers
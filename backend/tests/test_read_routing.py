@@ -0,0 +1,69 @@
+"""
+Read routing with a primary and a replica, each its own SQLite file.
+
+The replica fixture stays empty, so a response built from the replica shows
+no items while the primary has them.
+"""
+import time
+
+from app.database import PRIMARY_COOKIE
+from app.models.due_queue import DueQueueState
+
+ITEMS = "/api/v1/learning-items/"
+
+
+def test_reads_go_to_the_replica(client, create_item, replica):
+    create_item()
+    client.cookies.clear()
+    assert client.get(ITEMS).json()["total"] == 0
+    assert client.get("/api/v1/reviews/due").json()["items"] == []
+
+
+def test_writes_go_to_the_primary_and_pin_the_client(client, replica):
+    response = client.post(ITEMS, json={"subject": "Physics", "title": "Item", "content": "Some content"})
+    assert response.status_code == 201
+    assert float(response.cookies[PRIMARY_COOKIE]) > time.time()
+    # The cookie sends this client's reads to the primary
+    assert client.get(ITEMS).json()["total"] == 1
+
+
+def test_pinned_cookie_reads_the_primary(client, create_item, replica):
+    create_item()
+    client.cookies.clear()
+    client.cookies.set(PRIMARY_COOKIE, str(time.time() + 60))
+    assert client.get(ITEMS).json()["total"] == 1
+
+
+def test_expired_cookie_reads_the_replica(client, create_item, replica):
+    create_item()
+    client.cookies.clear()
+    client.cookies.set(PRIMARY_COOKIE, str(time.time() - 1))
+    assert client.get(ITEMS).json()["total"] == 0
+
+
+def test_due_queue_roll_over_keeps_the_request_on_the_replica(client, create_item, db, replica):
+    create_item()
+    db.query(DueQueueState).delete()
+    db.commit()
+    client.cookies.clear()
+
+    # Rebuilding the queue writes to the primary, yet both numbers still come from the replica
+    response = client.get("/api/v1/reviews/stats")
+    stats = response.json()
+    assert (stats["total_items"], stats["items_due_today"]) == (0, 0)
+    assert PRIMARY_COOKIE not in response.cookies
+
+    db.expire_all()
+    assert db.get(DueQueueState, 1) is not None
+
+    response = client.get("/api/v1/reviews/due")
+    assert response.json()["items"] == []
+    assert PRIMARY_COOKIE not in response.cookies
+
+
+def test_without_replicas_everything_reads_the_primary(client, create_item):
+    create_item()
+    client.cookies.clear()
+    response = client.get(ITEMS)
+    assert response.json()["total"] == 1
+    assert PRIMARY_COOKIE not in response.cookies
@@ -0,0 +1,95 @@
+"""
+Review activity heatmap and its closed-day cache.
+"""
+from datetime import date, datetime, timedelta, timezone
+
+from app.core.day_cache import ClosedDayCache
+from app.models.review_history import ReviewHistory
+from app.repositories.cache_version_repository import CacheVersionRepository
+from app.services.learning_item_service import review_activity_cache
+
+ACTIVITY = "/api/v1/reviews/activity"
+
+
+def today():
+    return datetime.now(timezone.utc).date()
+
+
+def activity(client):
+    """Counts of yesterday and today, as (scheduled, manual)."""
+    yesterday = today() - timedelta(days=1)
+    days = client.get(ACTIVITY, params={"from": yesterday.isoformat(), "to": today().isoformat()}).json()["days"]
+    assert [day["date"] for day in days] == [yesterday.isoformat(), today().isoformat()]
+    return [(day["scheduled"], day["manual"]) for day in days]
+
+
+def review_yesterday(client, create_item, db):
+    """One scheduled and one manual review, moved to yesterday noon."""
+    item = create_item()
+    client.post(f"/api/v1/reviews/{item['id']}")
+    client.post(f"/api/v1/reviews/{item['id']}/manual")
+    noon = datetime.combine(today() - timedelta(days=1), datetime.min.time().replace(hour=12), tzinfo=timezone.utc)
+    db.query(ReviewHistory).update({ReviewHistory.reviewed_at: noon})
+    db.commit()
+    return item
+
+
+def test_activity_splits_scheduled_and_manual(client, create_item):
+    item = create_item()
+    client.post(f"/api/v1/reviews/{item['id']}")
+    client.post(f"/api/v1/reviews/{item['id']}/manual")
+    client.post(f"/api/v1/reviews/{item['id']}/manual")
+    assert activity(client) == [(0, 0), (1, 2)]
+
+
+def test_range_is_validated(client):
+    assert client.get(ACTIVITY, params={"from": "2024-02-01", "to": "2024-01-01"}).status_code == 400
+    assert client.get(ACTIVITY, params={"from": "2020-01-01", "to": "2024-01-01"}).status_code == 400
+
+
+def test_closed_days_are_cached_until_their_version_is_bumped(client, create_item, db):
+    review_yesterday(client, create_item, db)
+    assert activity(client) == [(1, 1), (0, 0)]
+
+    db.query(ReviewHistory).filter(ReviewHistory.is_manual == True).delete()
+    db.commit()
+    assert activity(client) == [(1, 1), (0, 0)]
+
+    # What a purge in any process does
+    CacheVersionRepository(db).bump(review_activity_cache.name)
+    assert activity(client) == [(1, 0), (0, 0)]
+
+
+def test_closed_days_are_read_from_the_primary(client, create_item, db, replica):
+    item = review_yesterday(client, create_item, db)
+    client.post(f"/api/v1/reviews/{item['id']}")
+    client.cookies.clear()  # Not pinned to the primary by its own writes
+
+    # Yesterday is missing from the cache: read (with today) from the primary
+    assert activity(client) == [(1, 1), (1, 0)]
+    # Only today is read now, from the (empty) replica
+    assert activity(client) == [(1, 1), (0, 0)]
+
+
+def test_cache_version_bump_creates_then_increments(db):
+    repo = CacheVersionRepository(db)
+    assert repo.get("test") == 0
+    repo.bump("test")
+    repo.bump("test")
+    assert repo.get("test") == 2
+    assert repo.get("other") == 0
+
+
+def test_closed_day_cache_drops_scopes_of_other_versions():
+    cache = ClosedDayCache("test")
+    day, today_ = date(2024, 1, 1), date(2024, 1, 3)
+    cache.put("tenant", 1, day, "v1", today_)
+    cache.put("tenant", 1, today_, "open", today_)
+    assert cache.get_many("tenant", 1, [day, today_]) == ({day: "v1"}, [today_])
+    assert cache.get_many("other", 1, [day]) == ({}, [day])
+
+    assert cache.get_many("tenant", 2, [day]) == ({}, [day])
+    cache.put("tenant", 2, day, "v2", today_)
+    # A request that read the old version before the bump can't put it back
+    cache.put("tenant", 1, day, "v1", today_)
+    assert cache.get_many("tenant", 2, [day]) == ({day: "v2"}, [])
@@ -0,0 +1,124 @@
+"""
+Schedule adherence analytics and its versioned closed-day cache.
+"""
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.models.learning_item import LearningItem
+from app.models.review_history import ReviewHistory
+from app.models.subject import Subject
+from app.repositories import review_history_repository
+from app.repositories.cache_version_repository import CacheVersionRepository
+from app.repositories.review_history_repository import ReviewHistoryRepository
+from app.services.review_analytics_service import adherence_cache
+
+ADHERENCE = "/api/v1/reviews/analytics/adherence"
+
+
+def today():
+    return datetime.now(timezone.utc).date()
+
+
+def noon(days_ago):
+    return datetime.combine(today() - timedelta(days=days_ago), datetime.min.time(), tzinfo=timezone.utc) \
+        + timedelta(hours=12)
+
+
+@pytest.fixture
+def history(db):
+    """
+    Item a (subject A): on time, on time, a manual review (ignored), 2 days late.
+    Item b (subject B): 1 day late, 1 day late (today).
+    """
+    subject_a, subject_b = Subject(name="A", live_count=1), Subject(name="B", live_count=1)
+    db.add_all([subject_a, subject_b])
+    db.flush()
+    a = LearningItem(subject_id=subject_a.id, title="a", content="x", created_at=noon(10),
+                     next_review_date=today(), review_count=3)
+    b = LearningItem(subject_id=subject_b.id, title="b", content="x", created_at=noon(3),
+                     next_review_date=today(), review_count=2)
+    db.add_all([a, b])
+    db.flush()
+
+    def review(item, days_ago, next_due_days_ago, manual=False):
+        db.add(ReviewHistory(
+            learning_item_id=item.id, reviewed_at=noon(days_ago), interval_days=1,
+            next_review_date=today() - timedelta(days=next_due_days_ago), review_number=1, is_manual=manual
+        ))
+
+    review(a, 10, 9)
+    review(a, 9, 6)
+    review(a, 5, 0, manual=True)
+    review(a, 4, -3)
+    review(b, 2, 1)
+    review(b, 0, -3)
+    db.commit()
+    return a, b
+
+
+def adherence(client, days=20):
+    return client.get(ADHERENCE, params={"from": (today() - timedelta(days=days)).isoformat()}).json()
+
+
+def by_subject(result):
+    return {summary["subject"]: summary["reviews"] for summary in result["by_subject"]}
+
+
+def test_adherence_overall_and_per_subject(client, history):
+    result = adherence(client)
+    overall = result["overall"]
+    assert overall["reviews"] == 5
+    assert overall["distribution"]["on_time"] == 2
+    assert overall["distribution"]["1_day"] == 2
+    assert overall["distribution"]["2_days"] == 1
+    assert overall["on_time_rate"] == 0.4
+    assert (overall["p50_lateness_days"], overall["max_lateness_days"]) == (1, 2)
+    assert (overall["longest_streak_days"], overall["current_streak_days"]) == (2, 0)
+    subject_a = next(summary for summary in result["by_subject"] if summary["subject"] == "A")
+    assert subject_a["reviews"] == 3
+    assert subject_a["on_time_rate"] == round(2 / 3, 4)
+
+
+def test_closed_days_are_cached_but_today_is_not(client, history):
+    adherence(client)
+    assert len(adherence_cache) == 20
+
+
+def test_range_is_validated(client):
+    assert client.get(ADHERENCE, params={"from": today().isoformat(),
+                                         "to": (today() - timedelta(days=1)).isoformat()}).status_code == 400
+    future = {"from": (today() + timedelta(days=5)).isoformat(), "to": (today() + timedelta(days=6)).isoformat()}
+    assert client.get(ADHERENCE, params=future).json()["overall"]["reviews"] == 0
+
+
+def test_window_and_lookup_query_paths_agree(db, history, monkeypatch):
+    repo = ReviewHistoryRepository(db)
+    window = repo.get_lateness_counts(today() - timedelta(days=20), today())
+    monkeypatch.setattr(review_history_repository, "LATENESS_LOOKUP_MAX_DAYS", 100)
+    assert repo.get_lateness_counts(today() - timedelta(days=20), today()) == window
+
+
+def test_subject_moves_invalidate_the_cache_in_every_process(client, db, history):
+    a, b = history
+    assert by_subject(adherence(client)) == {"A": 3, "B": 2}
+    repo = CacheVersionRepository(db)
+    version = repo.get(adherence_cache.name)
+
+    client.put(f"/api/v1/learning-items/{a.id}", json={"subject": "B"})
+    # Other processes see the version change, not just this process's cache
+    assert repo.get(adherence_cache.name) == version + 1
+    assert by_subject(adherence(client)) == {"B": 5}
+
+    client.patch("/api/v1/learning-items/bulk", json={"filter": {"subject": "B"}, "set_subject": "C"})
+    assert repo.get(adherence_cache.name) == version + 2
+    assert by_subject(adherence(client)) == {"C": 5}
+
+
+def test_edits_that_keep_the_subject_keep_the_cache(client, db, history):
+    a, b = history
+    adherence(client)
+    version = CacheVersionRepository(db).get(adherence_cache.name)
+    client.put(f"/api/v1/learning-items/{a.id}", json={"title": "renamed"})
+    client.patch("/api/v1/learning-items/bulk", json={"filter": {"subject": "A"}, "shift_days": 1})
+    assert CacheVersionRepository(db).get(adherence_cache.name) == version
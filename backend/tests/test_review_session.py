@@ -0,0 +1,63 @@
+"""
+Review session prefetch: the next N due cards, leased to one session at a time.
+"""
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import text
+
+SESSION = "/api/v1/reviews/session/next"
+
+
+def titles(response):
+    return [item["title"] for item in response["items"]]
+
+
+def make_items(create_item, subjects="AABAB"):
+    return [create_item(subject=subject, title=f"t{index}") for index, subject in enumerate(subjects)]
+
+
+def test_session_serves_cards_with_content_in_due_order(client, create_item):
+    make_items(create_item)
+    session = client.get(SESSION, params={"n": 2}).json()
+    assert titles(session) == ["t0", "t1"]
+    assert session["items"][0]["content"] == "Some content"
+    assert session["lease_token"]
+    assert datetime.fromisoformat(session["lease_expires_at"].replace("Z", "+00:00")) > datetime.now(timezone.utc)
+
+
+def test_leased_cards_are_not_served_to_another_session(client, create_item):
+    make_items(create_item)
+    first = client.get(SESSION, params={"n": 2}).json()
+    second = client.get(SESSION, params={"n": 2}).json()
+    assert titles(second) == ["t2", "t3"]
+    assert first["lease_token"] != second["lease_token"]
+
+
+def test_same_token_keeps_unanswered_cards_and_tops_up(client, create_item):
+    make_items(create_item)
+    first = client.get(SESSION, params={"n": 2}).json()
+    assert client.post(f"/api/v1/reviews/{first['items'][0]['id']}").status_code == 201
+    again = client.get(SESSION, params={"n": 2, "lease": first["lease_token"]}).json()
+    assert again["lease_token"] == first["lease_token"]
+    assert titles(again) == ["t1", "t2"]
+
+
+def test_released_lease_frees_its_cards(client, create_item):
+    make_items(create_item)
+    first = client.get(SESSION, params={"n": 2}).json()
+    assert client.delete(f"/api/v1/reviews/session/{first['lease_token']}").status_code == 204
+    assert titles(client.get(SESSION, params={"n": 2}).json()) == ["t0", "t1"]
+
+
+def test_expired_leases_free_their_cards(client, db, create_item):
+    make_items(create_item)
+    client.get(SESSION, params={"n": 5})
+    db.execute(text("UPDATE due_queue SET leased_until = :past"), {"past": datetime.now(timezone.utc) - timedelta(seconds=1)})
+    db.commit()
+    assert len(client.get(SESSION, params={"n": 5}).json()["items"]) == 5
+
+
+def test_subject_filter(client, create_item):
+    make_items(create_item)
+    assert titles(client.get(SESSION, params={"n": 5, "subject": "B"}).json()) == ["t2", "t4"]
+    assert client.get(SESSION, params={"n": 5, "subject": "Nope"}).json()["items"] == []
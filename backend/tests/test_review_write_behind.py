@@ -0,0 +1,111 @@
+"""
+Review write-behind: group commit, failure isolation and request timeouts.
+"""
+import threading
+
+import pytest
+
+from app.api.v1 import reviews
+from app.core.exceptions import ItemNotFoundException, ServiceUnavailableException
+from app.database import SessionLocal
+from app.services.review_write_behind import ReviewWriteBehind
+
+
+@pytest.fixture
+def make_writer():
+    writers = []
+
+    def make(**options):
+        writer = ReviewWriteBehind(**options)
+        writers.append(writer)
+        return writer
+    yield make
+    for writer in writers:
+        writer.stop()
+
+
+def review_count(client, item_id):
+    return client.get(f"/api/v1/learning-items/{item_id}").json()["review_count"]
+
+
+def test_concurrent_reviews_share_a_batch(client, create_item, make_writer):
+    items = [create_item(title=f"t{index}") for index in range(8)]
+    writer = make_writer(interval_ms=50)
+    results = {}
+
+    def submit(item_id):
+        results[item_id] = writer.submit(item_id)
+
+    threads = [threading.Thread(target=submit, args=(item["id"],)) for item in items]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert writer.reviews_committed == 8
+    assert writer.batches_committed < 8
+    for item in items:
+        assert results[item["id"]].learning_item_id == item["id"]
+        assert review_count(client, item["id"]) == 1
+
+
+def test_failing_review_does_not_fail_its_batch(client, create_item, make_writer):
+    item = create_item()
+    writer = make_writer(interval_ms=50)
+    errors = []
+
+    def submit_missing():
+        try:
+            writer.submit("missing-item")
+        except ItemNotFoundException as exc:
+            errors.append(exc)
+
+    thread = threading.Thread(target=submit_missing)
+    thread.start()
+    assert writer.submit(item["id"]).learning_item_id == item["id"]
+    thread.join()
+
+    assert len(errors) == 1
+    assert review_count(client, item["id"]) == 1
+
+
+def test_timed_out_reviews_are_cancelled_unless_already_committing(client, create_item, make_writer):
+    running, queued = create_item(title="running"), create_item(title="queued")
+    picked_up, release = threading.Event(), threading.Event()
+
+    def gated_session(**options):
+        picked_up.set()
+        release.wait(5)
+        return SessionLocal(**options)
+
+    writer = make_writer(session_factory=gated_session, interval_ms=1, timeout_seconds=0.2)
+    outcome = {}
+    thread = threading.Thread(target=lambda: outcome.update(running=writer.submit(running["id"])))
+    thread.start()
+    assert picked_up.wait(5)
+
+    # Still queued behind the stuck batch: cancelled, so the retry is safe
+    with pytest.raises(ServiceUnavailableException):
+        writer.submit(queued["id"])
+    thread.join()
+    # Already committing: the caller is told nothing and must not resubmit
+    assert outcome["running"] is None
+
+    release.set()
+    writer.stop()
+    assert writer.reviews_committed == 1
+    assert review_count(client, running["id"]) == 1
+    assert review_count(client, queued["id"]) == 0
+
+
+def test_route_answers_202_when_review_is_still_committing(client, create_item, settings, monkeypatch):
+    item = create_item()
+
+    class CommittingWriter:
+        def submit(self, item_id, is_manual=False):
+            return None
+
+    monkeypatch.setattr(settings, "REVIEW_WRITE_BEHIND", True)
+    monkeypatch.setattr(reviews, "get_review_writer", lambda: CommittingWriter())
+    assert client.post(f"/api/v1/reviews/{item['id']}").status_code == 202
+    assert client.post(f"/api/v1/reviews/{item['id']}/manual").status_code == 202
@@ -0,0 +1,68 @@
+"""
+Review load simulation over candidate interval ladders.
+"""
+import random
+from datetime import date, datetime, timedelta
+
+from app.core.constants import CYCLE_BACK_TO_LEVEL, REVIEW_INTERVALS
+from app.services.schedule_simulation_service import simulate_review_load
+from app.services.spaced_repetition_service import SpacedRepetitionService
+
+SIMULATE = "/api/v1/reviews/simulate"
+
+
+def reference_load(review_counts, due_offsets, days):
+    """Step every item one review at a time with the live scheduler."""
+    scheduler = SpacedRepetitionService()
+    start = date(2026, 1, 1)
+    load = [0] * days
+    for count, offset in zip(review_counts, due_offsets):
+        day = max(offset, 0)
+        while day < days:
+            load[day] += 1
+            count += 1
+            next_date, _ = scheduler.calculate_next_review(
+                count, datetime.combine(start + timedelta(days=day), datetime.min.time())
+            )
+            day = (next_date - start).days
+    return load
+
+
+def test_vectorized_simulation_matches_the_scheduler():
+    rng = random.Random(3)
+    review_counts = [rng.randint(0, 7) for _ in range(300)]
+    due_offsets = [rng.randint(-5, 40) for _ in range(300)]
+    simulated = simulate_review_load(
+        review_counts, due_offsets, REVIEW_INTERVALS, CYCLE_BACK_TO_LEVEL, 120
+    )
+    assert simulated.tolist() == reference_load(review_counts, due_offsets, 120)
+
+
+def test_endpoint_compares_current_and_candidate_ladders(client, create_item):
+    for index in range(20):
+        create_item(title=f"t{index}")
+    result = client.post(SIMULATE, json={
+        "days": 60,
+        "ladders": [{"name": "gentle", "intervals": [0, 1, 2, 4, 8, 16], "cycle_back_to_level": 5}]
+    }).json()
+
+    current, gentle = result["scenarios"]
+    assert result["items"] == 20
+    assert current["name"] == "current" and len(current["daily"]) == 60
+    assert current["daily"][:5] == [20, 20, 0, 0, 20]
+    assert current["total_reviews"] == sum(current["daily"])
+    assert gentle["daily"][:4] == [20, 20, 0, 20]
+
+
+def test_new_items_per_day_join_the_load(client, create_item):
+    for index in range(20):
+        create_item(title=f"t{index}")
+    daily = client.post(SIMULATE, json={"days": 10, "new_items_per_day": 5}).json()["scenarios"][0]["daily"]
+    assert daily[:3] == [25, 30, 10]
+
+
+def test_invalid_ladders_are_rejected(client):
+    not_increasing = {"name": "bad", "intervals": [0, 0, 3], "cycle_back_to_level": 1}
+    cycle_out_of_range = {"name": "bad", "intervals": [0, 1], "cycle_back_to_level": 2}
+    assert client.post(SIMULATE, json={"ladders": [not_increasing]}).status_code == 400
+    assert client.post(SIMULATE, json={"ladders": [cycle_out_of_range]}).status_code == 400
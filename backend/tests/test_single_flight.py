@@ -0,0 +1,130 @@
+"""
+Single-flight: concurrent identical calls share one computation.
+"""
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from app.core import single_flight
+from app.core.single_flight import SingleFlight, coalesce
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.005)
+
+
+def run_concurrently(group, key, followers, fn):
+    """Start a leader blocked in fn's gate, then `followers` identical calls."""
+    gate = threading.Event()
+    results, errors = [], []
+
+    def call():
+        try:
+            results.append(group.do(key, lambda: fn(gate), name="test"))
+        except Exception as exc:
+            errors.append(exc)
+
+    threads = [threading.Thread(target=call) for _ in range(followers + 1)]
+    threads[0].start()
+    wait_for(lambda: group.stats().get("test", {}).get("in_flight") == 1)
+    for thread in threads[1:]:
+        thread.start()
+    wait_for(lambda: group.stats()["test"]["coalesced"] == followers)
+    gate.set()
+    for thread in threads:
+        thread.join()
+    return results, errors
+
+
+def test_identical_calls_share_one_execution():
+    group = SingleFlight()
+    runs = []
+
+    def compute(gate):
+        runs.append(1)
+        gate.wait(5)
+        return {"value": 42}
+
+    results, errors = run_concurrently(group, ("test", 1), 5, compute)
+    assert not errors
+    assert runs == [1]
+    assert results == [{"value": 42}] * 6
+    assert group.stats() == {"test": {"executed": 1, "coalesced": 5, "in_flight": 0}}
+
+
+def test_waiters_receive_the_leaders_exception():
+    group = SingleFlight()
+
+    def compute(gate):
+        gate.wait(5)
+        raise ValueError("boom")
+
+    results, errors = run_concurrently(group, ("test", 1), 3, compute)
+    assert results == []
+    assert len(errors) == 4 and all(isinstance(error, ValueError) for error in errors)
+
+
+def test_finished_calls_are_not_cached():
+    group = SingleFlight()
+    assert group.do(("test", 1), lambda: 1, name="test") == 1
+    assert group.do(("test", 1), lambda: 2, name="test") == 2
+    assert group.stats()["test"]["executed"] == 2
+
+
+def test_coalesce_keys_by_tenant_and_primary_pin(monkeypatch):
+    group = SingleFlight()
+    monkeypatch.setattr(single_flight, "single_flight_group", group)
+    gate = threading.Event()
+
+    class Service:
+        def __init__(self, **info):
+            self.db = SimpleNamespace(info=info)
+
+        @coalesce
+        def read(self, value):
+            gate.wait(5)
+            return (self.db.info.get("tenant"), value)
+
+    callers = [{}, {}, {"pin_primary": True}, {"wrote": True}, {"tenant": "t1"}]
+    results = [None] * len(callers)
+
+    def call(index):
+        results[index] = Service(**callers[index]).read(7)
+
+    threads = [threading.Thread(target=call, args=(index,)) for index in range(len(callers))]
+    for thread in threads:
+        thread.start()
+    name = Service.read.__qualname__
+    wait_for(lambda: group.stats().get(name, {}).get("in_flight") == 3
+             and group.stats()[name]["coalesced"] == 2)
+    gate.set()
+    for thread in threads:
+        thread.join()
+
+    # Replica readers share one call and primary readers another; a tenant never shares
+    assert group.stats()[name]["executed"] == 3
+    assert group.stats()[name]["coalesced"] == 2
+    assert results[:4] == [(None, 7)] * 4
+    assert results[4] == ("t1", 7)
+
+
+@pytest.fixture
+def admin_token(settings, monkeypatch):
+    monkeypatch.setattr(settings, "ADMIN_TOKEN", "secret")
+    return {"X-Admin-Token": "secret"}
+
+
+def test_metrics_require_the_admin_token(client, admin_token):
+    assert client.get("/api/v1/admin/metrics").status_code == 403
+    assert client.get("/api/v1/admin/metrics", headers={"X-Admin-Token": "wrong"}).status_code == 403
+    metrics = client.get("/api/v1/admin/metrics", headers=admin_token).json()
+    assert "single_flight" in metrics
+
+
+def test_admin_endpoints_are_disabled_without_a_token(client):
+    assert client.get("/api/v1/admin/metrics").status_code == 403
@@ -0,0 +1,51 @@
+"""
+Per-subject statistics: one grouped query over items and their reviews.
+"""
+from sqlalchemy import event
+
+from app.database import engine
+
+STATS = "/api/v1/reviews/stats/by-subject"
+
+
+def test_stats_per_subject(client, create_item):
+    items = [create_item(subject=subject, title=f"t{index}") for index, subject in enumerate("aabab")]
+    client.post(f"/api/v1/reviews/{items[0]['id']}")
+    client.post(f"/api/v1/reviews/{items[0]['id']}")
+    client.post(f"/api/v1/reviews/{items[1]['id']}/manual")
+    client.delete(f"/api/v1/learning-items/{items[4]['id']}")
+    interval = client.get(f"/api/v1/learning-items/{items[0]['id']}").json()["current_interval_days"]
+
+    stats = {row["subject"]: row for row in client.get(STATS).json()}
+    assert stats["a"] == {
+        "subject": "a",
+        "total_items": 3,
+        "items_due_today": 2,
+        "items_due_this_week": 3,
+        "total_reviews": 3,
+        "manual_reviews": 1,
+        "average_interval_days": interval / 3
+    }
+    # Deleted items and their reviews are left out
+    assert stats["b"]["total_items"] == 1
+    assert stats["b"]["total_reviews"] == 0
+
+
+def test_stats_are_empty_without_items(client):
+    assert client.get(STATS).json() == []
+
+
+def test_stats_take_one_query(client, create_item):
+    for subject in "abcde":
+        create_item(subject=subject)
+    statements = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", count)
+    try:
+        assert len(client.get(STATS).json()) == 5
+    finally:
+        event.remove(engine, "before_cursor_execute", count)
+    assert len(statements) == 1
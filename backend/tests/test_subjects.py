@@ -0,0 +1,62 @@
+"""
+Subjects table: names, cached live/due counters and renames.
+"""
+from app.models.subject import Subject
+from app.repositories.due_queue_repository import DueQueueRepository
+
+SUBJECTS = "/api/v1/learning-items/subjects"
+
+
+def counters(db):
+    db.expire_all()
+    return {subject.name: (subject.live_count, subject.due_count) for subject in db.query(Subject)}
+
+
+def make_items(client, create_item):
+    items = [create_item(subject=subject, title=f"t{index}") for index, subject in enumerate("aabab")]
+    client.post(f"/api/v1/reviews/{items[0]['id']}")
+    client.put(f"/api/v1/learning-items/{items[1]['id']}", json={"subject": "c"})
+    client.delete(f"/api/v1/learning-items/{items[2]['id']}")
+    return items
+
+
+def test_counters_follow_creates_reviews_moves_and_deletes(client, create_item, db):
+    make_items(client, create_item)
+    assert counters(db) == {"a": (2, 1), "b": (1, 1), "c": (1, 1)}
+    assert client.get("/api/v1/reviews/due").json()["by_subject"] == {"a": 1, "b": 1, "c": 1}
+
+    # The roll-over recount agrees with the incremental updates
+    DueQueueRepository(db).rebuild()
+    assert counters(db) == {"a": (2, 1), "b": (1, 1), "c": (1, 1)}
+
+
+def test_subject_list_has_subjects_with_live_items(client, create_item):
+    item = create_item(subject="b")
+    create_item(subject="a")
+    assert client.get(SUBJECTS).json() == ["a", "b"]
+    client.delete(f"/api/v1/learning-items/{item['id']}")
+    assert client.get(SUBJECTS).json() == ["a"]
+
+
+def test_rename_updates_every_item(client, create_item):
+    items = make_items(client, create_item)
+    renamed = client.put(f"{SUBJECTS}/a", json={"name": "Algebra"})
+    assert renamed.status_code == 200
+    assert renamed.json()["live_count"] == 2
+
+    assert client.get(f"/api/v1/learning-items/{items[0]['id']}").json()["subject"] == "Algebra"
+    assert client.get("/api/v1/learning-items/", params={"subject": "Algebra"}).json()["total"] == 2
+    assert client.get(SUBJECTS).json() == ["Algebra", "b", "c"]
+
+
+def test_rename_rejects_taken_and_unknown_names(client, create_item):
+    create_item(subject="a")
+    create_item(subject="b")
+    assert client.put(f"{SUBJECTS}/a", json={"name": "b"}).status_code == 400
+    assert client.put(f"{SUBJECTS}/zz", json={"name": "c"}).status_code == 404
+
+
+def test_unknown_subject_filter_matches_nothing(client, create_item):
+    create_item(subject="a")
+    assert client.get("/api/v1/learning-items/", params={"subject": "zz"}).json()["total"] == 0
+    assert client.get("/api/v1/reviews/due", params={"subject": "zz"}).json()["items"] == []
@@ -0,0 +1,95 @@
+"""
+Database-per-tenant routing through the LRU tenant engine pool.
+"""
+import os
+
+import pytest
+from sqlalchemy import text
+
+from app import database
+from app.core.exceptions import ValidationException
+from app.database import TenantEnginePool
+
+ITEMS = "/api/v1/learning-items/"
+
+
+@pytest.fixture
+def make_pool(tmp_path):
+    pools = []
+
+    def make(max_engines=8, idle_seconds=300):
+        pool = TenantEnginePool(f"sqlite:///{tmp_path}/{{tenant}}.db", max_engines, idle_seconds)
+        pools.append(pool)
+        return pool
+
+    yield make
+    for pool in pools:
+        pool.dispose_all()
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(database.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_first_use_creates_the_tenant_schema_once(make_pool, tmp_path):
+    pool = make_pool()
+    for _ in range(2):
+        with pool.session("alice") as db:
+            assert db.execute(text("SELECT COUNT(*) FROM learning_items")).scalar() == 0
+    assert os.path.exists(tmp_path / "alice.db")
+    assert pool.stats() == {"open": 1, "hits": 1, "opened": 1, "evicted": 0, "schemas_prepared": 1}
+
+
+def test_least_recently_used_engines_are_evicted(make_pool):
+    pool = make_pool(max_engines=2)
+    for tenant in ("a", "b", "a", "c"):
+        with pool.session(tenant):
+            pass
+    assert list(pool._engines) == ["a", "c"]
+    assert pool.stats()["evicted"] == 1
+
+
+def test_idle_engines_are_evicted(make_pool, clock):
+    pool = make_pool(idle_seconds=60)
+    with pool.session("a"):
+        pass
+    clock[0] += 61
+    with pool.session("b"):
+        pass
+    assert list(pool._engines) == ["b"]
+
+
+def test_engines_in_use_are_never_evicted(make_pool, clock):
+    pool = make_pool(max_engines=1, idle_seconds=60)
+    with pool.session("a"):
+        clock[0] += 61
+        with pool.session("b"):
+            assert list(pool._engines) == ["a", "b"]
+    with pool.session("c"):
+        pass
+    assert list(pool._engines) == ["c"]
+
+
+@pytest.mark.parametrize("key", [None, "", "Alice", "../etc", "x" * 65])
+def test_malformed_tenant_keys_are_rejected(key):
+    with pytest.raises(ValidationException):
+        TenantEnginePool.tenant_key(key)
+
+
+def test_schema_per_tenant_needs_postgresql():
+    with pytest.raises(ValueError):
+        TenantEnginePool("sqlite:///./shared.db", 8, 300)
+
+
+def test_requests_are_served_from_their_tenant_database(client, make_pool, monkeypatch):
+    monkeypatch.setattr(database, "tenant_pool", make_pool())
+    alice, bob = {"X-Tenant-ID": "alice"}, {"X-Tenant-ID": "bob"}
+
+    created = client.post(ITEMS, json={"subject": "s", "title": "t", "content": "c"}, headers=alice).json()
+    assert client.get(f"{ITEMS}{created['id']}", headers=alice).status_code == 200
+    assert client.get(f"{ITEMS}{created['id']}", headers=bob).status_code == 404
+    assert client.get(ITEMS, headers=bob).json()["total"] == 0
+    assert client.get(ITEMS).status_code == 400
@@ -0,0 +1,52 @@
+"""
+Timestamps are serialized the same way (UTC, "Z" suffix) whichever path produced them.
+"""
+from datetime import datetime, timedelta, timezone
+
+from app.schemas.review import ReviewResponse
+
+ITEMS = "/api/v1/learning-items"
+
+
+def timestamps(item):
+    return item["created_at"], item["updated_at"]
+
+
+def test_item_timestamps_match_across_write_and_read_paths(client, create_item):
+    created = create_item()
+    assert all(value.endswith("Z") for value in timestamps(created))
+
+    fetched = client.get(f"{ITEMS}/{created['id']}").json()
+    listed = client.get(f"{ITEMS}/").json()["items"][0]
+    batch = client.post(f"{ITEMS}/batch-get", json={"ids": [created["id"]]}).json()["items"][0]
+    due = client.get("/api/v1/reviews/due").json()["items"][0]
+    session = client.get("/api/v1/reviews/session/next", params={"n": 1}).json()
+    assert timestamps(fetched) == timestamps(listed) == timestamps(batch) == timestamps(due) == timestamps(created)
+    assert timestamps(session["items"][0]) == timestamps(created)
+    assert session["lease_expires_at"].endswith("Z")
+
+    updated = client.put(f"{ITEMS}/{created['id']}", json={"title": "Renamed"}).json()
+    assert updated["created_at"] == created["created_at"]
+    assert updated["updated_at"].endswith("Z")
+    assert timestamps(client.get(f"{ITEMS}/{created['id']}").json()) == timestamps(updated)
+
+
+def test_review_timestamps_match_across_write_and_read_paths(client, create_item):
+    item = create_item()
+    review = client.post(f"/api/v1/reviews/{item['id']}").json()
+    assert review["reviewed_at"].endswith("Z")
+
+    history = client.get(f"/api/v1/reviews/history/{item['id']}").json()
+    batch = client.post("/api/v1/reviews/history/batch", json={"item_ids": [item["id"]]}).json()
+    assert history[0]["reviewed_at"] == batch["histories"][item["id"]][0]["reviewed_at"] == review["reviewed_at"]
+
+
+def test_naive_and_aware_values_serialize_alike():
+    naive = datetime(2024, 5, 1, 12, 30)
+    aware = datetime(2024, 5, 1, 14, 30, tzinfo=timezone(timedelta(hours=2)))
+    fields = dict(
+        id="r", learning_item_id="i", interval_days=1, next_review_date="2024-05-02", review_number=1, is_manual=False
+    )
+    assert ReviewResponse(reviewed_at=naive, **fields).model_dump_json() == \
+        ReviewResponse(reviewed_at=aware, **fields).model_dump_json()
+    assert '"reviewed_at":"2024-05-01T12:30:00Z"' in ReviewResponse(reviewed_at=naive, **fields).model_dump_json()
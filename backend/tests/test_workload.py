@@ -0,0 +1,86 @@
+"""
+Workload recording (anonymized traces) and their replay.
+"""
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.workload import Anonymizer, WorkloadRecorder, WorkloadRecordingMiddleware
+from app.main import app
+from benchmarks.replay import TargetMapping, collect_targets, load_trace, replay
+
+
+@pytest.fixture
+def trace(tmp_path):
+    return str(tmp_path / "trace" / "workload.jsonl")
+
+
+@pytest.fixture
+def recording(trace):
+    return TestClient(WorkloadRecordingMiddleware(app, WorkloadRecorder(trace, salt="salt")))
+
+
+def record_session(recording):
+    ids = [
+        recording.post("/api/v1/learning-items/", json={
+            "subject": f"Secret Subject {index % 2}", "title": "private title", "content": "private content"
+        }).json()["id"]
+        for index in range(4)
+    ]
+    recording.get("/api/v1/learning-items/", params={"subject": "Secret Subject 0", "limit": 10})
+    recording.get(f"/api/v1/learning-items/{ids[0]}")
+    recording.post(f"/api/v1/reviews/{ids[1]}")
+    session = recording.get("/api/v1/reviews/session/next", params={"n": 2}).json()
+    recording.get("/api/v1/reviews/session/next", params={"n": 2, "lease": session["lease_token"]})
+    recording.post("/api/v1/learning-items/batch-get", json={"ids": ids[:2]})
+    recording.get("/api/v1/reviews/due", params={"target_date": "2030-01-01"})
+    recording.get("/api/v1/admin/metrics")
+    recording.get("/no-such-route")
+    return ids, session["lease_token"]
+
+
+def test_trace_keeps_routes_and_drops_identifying_values(recording, trace):
+    ids, lease = record_session(recording)
+    raw = open(trace, encoding="utf-8").read()
+    for secret in ("Secret", "private", ids[0], lease):
+        assert secret not in raw
+
+    entries = [json.loads(line) for line in raw.splitlines()]
+    # Admin calls and unmatched paths are not recorded
+    assert len(entries) == 11
+    created = entries[0]["body"]
+    assert created["subject"].startswith("s:")
+    assert created["title"] == {"$text": 13} and created["content"] == {"$text": 15}
+    lookup = entries[5]
+    assert lookup["route"] == "/api/v1/learning-items/{item_id}"
+    assert lookup["path_params"]["item_id"].startswith("id:")
+    assert entries[-1]["query"] == {"target_date": "2030-01-01"}
+    assert all(entry["status"] < 500 and entry["duration_ms"] >= 0 for entry in entries)
+
+
+def test_same_values_get_the_same_token_within_a_salt():
+    first, second = Anonymizer("salt"), Anonymizer("salt")
+    assert first.value("item_id", "abc") == second.value("item_id", "abc")
+    assert first.value("item_id", "abc") != Anonymizer("other").value("item_id", "abc")
+    assert first.value("subject", "abc").startswith("s:")
+    assert first.value("limit", "10") == "10"
+    assert first.value("note", "free text") == {"$text": 9}
+
+
+def test_mapping_is_consistent_per_token():
+    mapping = TargetMapping(["a", "b", "c"], ["x", "y"])
+    token = Anonymizer("salt").value("item_id", "recorded")
+    assert mapping.value(token) == mapping.value(token)
+    assert mapping.value(token) in ("a", "b", "c")
+    assert mapping.value({"$text": 4}) == "xxxx"
+
+
+def test_recorded_trace_replays_without_errors(recording, trace, client):
+    record_session(recording)
+    entries = load_trace(trace)
+    outcome = replay(client, entries, collect_targets(client), speed=0, concurrency=2)
+
+    routes = outcome["routes"]
+    assert sum(len(route["latencies"]) for route in routes.values()) == len(entries)
+    assert all(route["errors"] == 0 for route in routes.values())